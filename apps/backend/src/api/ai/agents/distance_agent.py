@@ -313,7 +313,7 @@ Remember: You have access to real-time Google Maps data - use it! Never guess di
 
         # Use existing PricingService to calculate travel fee
         # This ensures 100% consistency with website pricing
-        result = self.pricing_service.calculate_travel_distance(destination)
+        result = await self.pricing_service.calculate_travel_distance(destination)
 
         if result["status"] != "success":
             # Handle API errors gracefully
@@ -385,7 +385,7 @@ Remember: You have access to real-time Google Maps data - use it! Never guess di
             }
 
         # Use PricingService to calculate distance
-        result = self.pricing_service.calculate_travel_distance(destination)
+        result = await self.pricing_service.calculate_travel_distance(destination)
 
         if result["status"] != "success":
             return {
@@ -1,9 +1,17 @@
 """
 AI Response Caching Module
 
-Provides semantic caching for AI responses to reduce API costs and improve response times.
+Provides semantic caching for AI responses to reduce API costs and improve response times,
+plus a shared embedding cache with micro-batched provider calls.
 """
 
+from .embedding_cache import EmbeddingBatcher, EmbeddingCache, get_embedding_cache
 from .semantic_cache import SemanticCache, CacheConfig
 
-__all__ = ["SemanticCache", "CacheConfig"]
+__all__ = [
+    "SemanticCache",
+    "CacheConfig",
+    "EmbeddingCache",
+    "EmbeddingBatcher",
+    "get_embedding_cache",
+]
@@ -0,0 +1,282 @@
+"""
+Embedding Cache + Micro-Batching
+
+Content-hashed embedding cache shared by every process (in-memory LRU in
+front of Redis), plus a micro-batcher that merges concurrent embed calls
+into a single provider request.
+
+Why:
+- Inbound messages repeat a lot ("How much does it cost?") and intent
+  examples are identical in every worker, so most embeddings can be
+  served without calling the provider at all
+- Under load many coroutines embed one message each; batching them turns
+  N provider round trips into one
+
+Keys are sha256(model + text), so a model change never serves stale
+vectors. Vectors are stored in Redis as packed float32 blobs.
+
+Usage:
+    embedder = EmbeddingBatcher(
+        provider, cache=get_embedding_cache(), model="text-embedding-3-small"
+    )
+    vectors = await embedder.embed(["How much for 50 people?"])  # (1, dim) float32
+
+Author: MyHibachi AI Team
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is a hard dependency in prod
+    aioredis = None  # type: ignore
+
+KEY_PREFIX = "ai:embedding:"
+DEFAULT_TTL_SECONDS = 60 * 60 * 24 * 30  # Embeddings of a fixed model never change
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache: in-process LRU, then Redis.
+
+    Redis failures degrade to memory-only caching; they never fail a lookup.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        redis_url: str | None = None,
+        max_memory_entries: int = 20000,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        use_redis: bool = True,
+    ):
+        self._redis = redis_client
+        self._redis_url = redis_url
+        self._redis_disabled = not use_redis or (redis_client is None and aioredis is None)
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, model: str) -> str:
+        digest = hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+        return f"{KEY_PREFIX}{digest}"
+
+    def _get_redis(self):
+        if self._redis_disabled:
+            return None
+        if self._redis is None:
+            try:
+                if self._redis_url is None:
+                    from core.config import get_settings
+
+                    self._redis_url = get_settings().redis_url
+                self._redis = aioredis.from_url(self._redis_url, decode_responses=False)
+            except Exception as e:
+                logger.warning(f"Embedding cache using memory only: {e}")
+                self._redis_disabled = True
+                return None
+        return self._redis
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Look up keys; returns only the ones found."""
+        found: dict[str, np.ndarray] = {}
+        remote: list[str] = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = vector
+                self.memory_hits += 1
+            else:
+                remote.append(key)
+
+        client = self._get_redis()
+        if remote and client is not None:
+            try:
+                blobs = await client.mget(remote)
+                for key, blob in zip(remote, blobs):
+                    if blob:
+                        vector = np.frombuffer(blob, dtype="<f4")
+                        self._remember(key, vector)
+                        found[key] = vector
+                        self.redis_hits += 1
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis read failed: {e}")
+
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, vectors: dict[str, np.ndarray]) -> None:
+        for key, vector in vectors.items():
+            self._remember(key, vector)
+
+        client = self._get_redis()
+        if not vectors or client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, vector in vectors.items():
+                pipe.set(key, np.asarray(vector, dtype="<f4").tobytes(), ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache Redis write failed: {e}")
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+# =============================================================================
+# Micro-batcher
+# =============================================================================
+
+
+class EmbeddingBatcher:
+    """
+    Cached, micro-batched front end for ``provider.embed``.
+
+    Cache misses from concurrent callers are collected for up to
+    ``max_wait_ms`` (or until ``max_batch`` texts are pending) and sent as
+    one provider request. Identical texts in flight share one result.
+    """
+
+    def __init__(
+        self,
+        provider,
+        cache: EmbeddingCache | None = None,
+        model: str | None = None,
+        max_batch: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.provider = provider
+        self.cache = cache or EmbeddingCache()
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending: dict[str, str] = {}  # key -> text, waiting for the next flush
+        self._inflight: dict[str, asyncio.Future] = {}  # key -> result (pending or sent)
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.provider_calls = 0
+        self.provider_texts = 0
+
+    @property
+    def model_id(self) -> str:
+        return self.model or type(self.provider).__name__
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts (cached + batched). Returns a (len(texts), dim) float32 array."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        keys = [self.cache.make_key(text, self.model_id) for text in texts]
+        found = await self.cache.get_many(list(dict.fromkeys(keys)))
+
+        waiting: dict[str, asyncio.Future] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in waiting:
+                continue
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                self._pending[key] = text
+            waiting[key] = future
+
+        if waiting:
+            self._schedule_flush()
+            results = await asyncio.gather(*waiting.values())
+            found.update(zip(waiting.keys(), results))
+
+        return np.stack([np.asarray(found[key], dtype=np.float32) for key in keys])
+
+    def _schedule_flush(self) -> None:
+        if len(self._pending) >= self.max_batch:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            asyncio.ensure_future(self._flush())
+        elif self._timer is None and self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(
+                self.max_wait, lambda: asyncio.ensure_future(self._flush())
+            )
+
+    async def _flush(self) -> None:
+        self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        keys = list(batch)
+        try:
+            self.provider_calls += 1
+            self.provider_texts += len(keys)
+            response = await self.provider.embed([batch[key] for key in keys])
+            vectors = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(keys, response["embeddings"])
+            }
+            if len(vectors) != len(keys):
+                raise ValueError(
+                    f"Provider returned {len(vectors)} embeddings for {len(keys)} texts"
+                )
+        except Exception as e:
+            for key in keys:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        await self.cache.set_many(vectors)
+        for key, vector in vectors.items():
+            future = self._inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(vector)
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            **self.cache.get_stats(),
+            "provider_calls": self.provider_calls,
+            "provider_texts": self.provider_texts,
+        }
+
+
+# Process-wide cache so every embedding consumer shares one LRU
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the shared embedding cache instance."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
@@ -10,6 +10,16 @@ avoiding false positives. Critical safety features:
 4. Short TTL for dynamic content (bookings, availability)
 5. Longer TTL for static content (policies, pricing, menu)
 
+Lookup path:
+- Embeddings live in an in-process VectorIndex partitioned by intent
+  (see vector_index.py), so a lookup is a matvec over one intent's
+  vectors instead of a Redis SCAN + GET + JSON decode per cached entry
+- Vectors are persisted to Redis as packed float32 blobs in one hash per
+  intent, with an append log so other workers pick up new entries
+  incrementally
+- All Redis calls use redis.asyncio (no blocking I/O in the event loop)
+- Hits, misses and stores are also counted per intent
+
 Expected Impact:
 - 40-60% reduction in OpenAI API calls
 - $500-1000/month cost savings
@@ -23,15 +33,17 @@ Created: November 10, 2025
 import hashlib
 import json
 import logging
+import time
 from dataclasses import dataclass
-from datetime import timedelta
 from typing import Any
 
 import numpy as np
-from redis import Redis
+from redis.asyncio import Redis
 
 from core.config import get_settings
 
+from .vector_index import VectorIndex, pack_vector, unpack_vector
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
@@ -52,7 +64,12 @@ class CacheConfig:
 
     # Cache size limits
     max_cache_size_mb: int = 100  # Max Redis memory for cache
-    max_embedding_cache: int = 10000  # Max embeddings to store
+    max_embedding_cache: int = 10000  # Max embeddings stored per intent
+
+    # Vector index
+    max_candidates: int = 5  # Nearest matches validated per lookup
+    index_sync_interval: float = 1.0  # Seconds between checks for other workers' stores
+    index_log_size: int = 10000  # Recent stores replayable incrementally per intent
 
     # Safety features
     enable_cache_validation: bool = True  # Validate cached responses before returning
@@ -67,30 +84,43 @@ class SemanticCache:
     Implements multiple safety layers to prevent wrong answers.
     """
 
+    # Partition used for entries stored without an intent
+    NO_INTENT = "_none"
+
     def __init__(
         self,
         redis_client: Redis | None = None,
         embedding_provider=None,
         config: CacheConfig | None = None,
+        index: VectorIndex | None = None,
     ):
         """
         Initialize semantic cache.
 
         Args:
-            redis_client: Redis client for caching (creates new if None)
+            redis_client: Async Redis client for caching (creates new if None)
             embedding_provider: Provider for generating embeddings
             config: Cache configuration (uses defaults if None)
+            index: In-process vector index (creates new if None)
         """
         self.redis = redis_client or self._create_redis_client()
         self.embedding_provider = embedding_provider
         self.config = config or CacheConfig()
+        self.index = index or VectorIndex()
         self.logger = logging.getLogger(__name__)
 
         # Cache prefixes for organization
-        self.EMBEDDING_PREFIX = "ai:cache:embedding:"
         self.RESPONSE_PREFIX = "ai:cache:response:"
         self.METADATA_PREFIX = "ai:cache:metadata:"
         self.STATS_PREFIX = "ai:cache:stats:"
+        self.VECTORS_PREFIX = "ai:cache:vectors:"  # hash per intent: cache_key -> blob
+        self.VECTOR_LOG_PREFIX = "ai:cache:vectorlog:"  # zset per intent: seq -> cache_key
+        self.VECTOR_SEQ_PREFIX = "ai:cache:vectorseq:"  # counter per intent
+        self.INTENTS_KEY = "ai:cache:intents"  # set of intents with vectors
+
+        # Index sync state per intent partition
+        self._synced_seq: dict[str, int] = {}
+        self._last_sync: dict[str, float] = {}
 
         self.logger.info(
             f"Semantic cache initialized (threshold={self.config.similarity_threshold}, "
@@ -98,13 +128,11 @@ class SemanticCache:
         )
 
     def _create_redis_client(self) -> Redis:
-        """Create Redis client from settings."""
-        return Redis(
-            host=settings.redis_host,
-            port=settings.redis_port,
-            password=settings.redis_password,
+        """Create async Redis client from settings."""
+        return Redis.from_url(
+            settings.redis_url,
             db=1,  # Use separate DB for cache
-            decode_responses=False,  # We handle encoding
+            decode_responses=False,  # We handle encoding (vectors are binary)
         )
 
     async def get_embedding(self, text: str) -> list[float]:
@@ -219,6 +247,10 @@ class SemanticCache:
         # Default to dynamic
         return self.config.ttl_dynamic
 
+    def _partition(self, intent: str | None) -> str:
+        """Vector index partition for an intent."""
+        return intent or self.NO_INTENT
+
     async def check_cache(
         self,
         query: str,
@@ -232,7 +264,8 @@ class SemanticCache:
         Multiple layers of validation:
 
         1. Embedding similarity > 0.97 (very high threshold)
-        2. Intent must match exactly (if provided)
+        2. Intent must match exactly (if provided) - only the intent's
+           partition of the vector index is searched
         3. Context must match (if context-aware mode enabled)
         4. Validate cached response is still valid
 
@@ -256,89 +289,73 @@ class SemanticCache:
             # Get embedding for query
             query_embedding = await self.get_embedding(query)
 
-            # Search for similar embeddings in cache
-            # We scan through cached embeddings to find matches
-            cursor = 0
-            best_match = None
-            best_similarity = 0.0
+            # SAFETY CHECK: Intent must match -> search that intent only
+            if self.config.intent_match_required and intent:
+                partitions = [self._partition(intent)]
+            else:
+                partitions = await self._known_partitions()
 
-            # Scan through cached embeddings
-            while True:
-                cursor, keys = self.redis.scan(
-                    cursor, match=f"{self.EMBEDDING_PREFIX}*", count=100
-                )
+            for partition in partitions:
+                await self._sync_partition(partition)
 
-                for key in keys:
-                    cached_embedding_bytes = self.redis.get(key)
-                    if not cached_embedding_bytes:
-                        continue
-
-                    # Deserialize embedding
-                    cached_embedding = json.loads(cached_embedding_bytes)
-
-                    # Compute similarity
-                    similarity = self._compute_cosine_similarity(
-                        query_embedding, cached_embedding
-                    )
-
-                    # Check if this is our best match
-                    if similarity > best_similarity and similarity >= self.config.similarity_threshold:
-                        # Extract cache key from embedding key
-                        cache_key = key.decode().replace(self.EMBEDDING_PREFIX, "")
-
-                        # Get metadata to validate intent match
-                        metadata_key = f"{self.METADATA_PREFIX}{cache_key}"
-                        metadata_bytes = self.redis.get(metadata_key)
-
-                        if metadata_bytes:
-                            metadata = json.loads(metadata_bytes)
-
-                            # SAFETY CHECK: Intent must match
-                            if self.config.intent_match_required and intent:
-                                if metadata.get("intent") != intent:
-                                    if self.config.log_cache_mismatches:
-                                        self.logger.warning(
-                                            f"Similar query found (sim={similarity:.3f}) but "
-                                            f"intent mismatch: {metadata.get('intent')} != {intent}. "
-                                            f"Preventing wrong answer!"
-                                        )
-                                    continue
-
-                            # SAFETY CHECK: Context must match if enabled
-                            if self.config.context_aware and context:
-                                cached_context = metadata.get("context", {})
-                                if cached_context.get("customer_id") != context.get("customer_id"):
-                                    self.logger.debug("Context mismatch - different customer")
-                                    continue
-
-                            best_match = cache_key
-                            best_similarity = similarity
+            candidates = self.index.search(
+                query_embedding,
+                partitions=partitions,
+                threshold=self.config.similarity_threshold,
+                k=self.config.max_candidates,
+            )
 
-                if cursor == 0:
-                    break
+            if candidates:
+                # One round trip for every candidate's metadata + response
+                pipe = self.redis.pipeline(transaction=False)
+                for match in candidates:
+                    pipe.get(f"{self.METADATA_PREFIX}{match.key}")
+                    pipe.get(f"{self.RESPONSE_PREFIX}{match.key}")
+                values = await pipe.execute()
+
+                for i, match in enumerate(candidates):
+                    metadata_bytes, response_bytes = values[2 * i], values[2 * i + 1]
+                    if not metadata_bytes or not response_bytes:
+                        # Entry expired or was cleared; drop the stale vector
+                        await self._forget(match.partition, match.key)
+                        continue
 
-            # If we found a good match, return cached response
-            if best_match:
-                response_key = f"{self.RESPONSE_PREFIX}{best_match}"
-                response_bytes = self.redis.get(response_key)
+                    metadata = json.loads(metadata_bytes)
+
+                    # SAFETY CHECK: Intent must match (defence in depth)
+                    if self.config.intent_match_required and intent:
+                        if metadata.get("intent") != intent:
+                            if self.config.log_cache_mismatches:
+                                self.logger.warning(
+                                    f"Similar query found (sim={match.similarity:.3f}) but "
+                                    f"intent mismatch: {metadata.get('intent')} != {intent}. "
+                                    f"Preventing wrong answer!"
+                                )
+                            continue
+
+                    # SAFETY CHECK: Context must match if enabled
+                    if self.config.context_aware and context:
+                        cached_context = metadata.get("context", {})
+                        if cached_context.get("customer_id") != context.get("customer_id"):
+                            self.logger.debug("Context mismatch - different customer")
+                            continue
 
-                if response_bytes:
                     cached_response = json.loads(response_bytes)
-                    cached_response["similarity"] = best_similarity
+                    cached_response["similarity"] = match.similarity
                     cached_response["cache_hit"] = True
 
                     # Update stats
-                    self._increment_stat("hits")
+                    await self._increment_stat("hits", intent=intent)
 
                     self.logger.info(
-                        f"Cache HIT! Similarity={best_similarity:.3f}, "
+                        f"Cache HIT! Similarity={match.similarity:.3f}, "
                         f"Intent={intent}, Saved API call"
                     )
 
                     return cached_response
 
             # No match found
-            self._increment_stat("misses")
+            await self._increment_stat("misses", intent=intent)
             return None
 
         except Exception as e:
@@ -376,14 +393,8 @@ class SemanticCache:
 
             # Determine TTL based on intent
             ttl = self._determine_ttl(intent)
-
-            # Store embedding
-            embedding_key = f"{self.EMBEDDING_PREFIX}{cache_key}"
-            self.redis.setex(
-                embedding_key,
-                ttl,
-                json.dumps(query_embedding),
-            )
+            expires_at = time.time() + ttl
+            partition = self._partition(intent)
 
             # Store response
             response_data = {
@@ -396,13 +407,6 @@ class SemanticCache:
             if metadata:
                 response_data.update(metadata)
 
-            response_key = f"{self.RESPONSE_PREFIX}{cache_key}"
-            self.redis.setex(
-                response_key,
-                ttl,
-                json.dumps(response_data),
-            )
-
             # Store metadata
             metadata_data = {
                 "intent": intent,
@@ -410,15 +414,40 @@ class SemanticCache:
                 "query_length": len(query),
                 "response_length": len(response),
             }
-            metadata_key = f"{self.METADATA_PREFIX}{cache_key}"
-            self.redis.setex(
-                metadata_key,
-                ttl,
-                json.dumps(metadata_data),
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(f"{self.RESPONSE_PREFIX}{cache_key}", ttl, json.dumps(response_data))
+            pipe.setex(f"{self.METADATA_PREFIX}{cache_key}", ttl, json.dumps(metadata_data))
+
+            # Store embedding as a packed float32 blob + append to the replay log
+            pipe.hset(
+                f"{self.VECTORS_PREFIX}{partition}",
+                cache_key,
+                pack_vector(query_embedding, expires_at),
             )
+            pipe.hlen(f"{self.VECTORS_PREFIX}{partition}")
+            pipe.sadd(self.INTENTS_KEY, partition)
+            pipe.incr(f"{self.VECTOR_SEQ_PREFIX}{partition}")
+            results = await pipe.execute()
+
+            stored = int(results[-3])
+            seq = int(results[-1])
+            log_key = f"{self.VECTOR_LOG_PREFIX}{partition}"
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zadd(log_key, {cache_key: seq})
+            pipe.zremrangebyrank(log_key, 0, -(self.config.index_log_size + 1))
+            await pipe.execute()
+
+            self.index.add(partition, cache_key, query_embedding, expires_at)
+            if seq == self._synced_seq.get(partition, 0) + 1:
+                # Nobody else stored since our last sync; skip replaying our own write
+                self._synced_seq[partition] = seq
+
+            if stored > self.config.max_embedding_cache:
+                await self._evict(partition, stored)
 
             # Update stats
-            self._increment_stat("stores")
+            await self._increment_stat("stores", intent=intent)
 
             self.logger.debug(
                 f"Cached response: intent={intent}, ttl={ttl}s, "
@@ -431,11 +460,132 @@ class SemanticCache:
             self.logger.error(f"Failed to store response in cache: {e}", exc_info=True)
             return False
 
-    def _increment_stat(self, stat_name: str, amount: int = 1) -> None:
-        """Increment cache statistics counter."""
+    # =========================================================================
+    # Vector index persistence
+    # =========================================================================
+
+    async def _known_partitions(self) -> list[str]:
+        """All intent partitions with stored vectors (local and in Redis)."""
+        members = await self.redis.smembers(self.INTENTS_KEY)
+        remote = {_decode(m) for m in members or ()}
+        return sorted(remote | set(self.index.partitions))
+
+    async def _sync_partition(self, partition: str, force: bool = False) -> None:
+        """
+        Bring one partition of the in-process index up to date with Redis.
+
+        Replays the append log when only a few entries are new; reloads the
+        whole hash when this process is too far behind (or the cache was
+        cleared). Checks at most every ``index_sync_interval`` seconds.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_sync.get(partition, -1e9) < self.config.index_sync_interval:
+            return
+        self._last_sync[partition] = now
+
+        remote_seq = int(await self.redis.get(f"{self.VECTOR_SEQ_PREFIX}{partition}") or 0)
+        local_seq = self._synced_seq.get(partition, 0)
+        if remote_seq == local_seq:
+            return
+
+        vectors_key = f"{self.VECTORS_PREFIX}{partition}"
+        if remote_seq < local_seq or remote_seq - local_seq > self.config.index_log_size:
+            await self._load_partition(partition)
+        else:
+            keys = await self.redis.zrangebyscore(
+                f"{self.VECTOR_LOG_PREFIX}{partition}", local_seq + 1, remote_seq
+            )
+            keys = [_decode(k) for k in keys]
+            blobs = await self.redis.hmget(vectors_key, keys) if keys else []
+            for key, blob in zip(keys, blobs):
+                if blob:
+                    vector, expires_at = unpack_vector(blob)
+                    self.index.add(partition, key, vector, expires_at)
+
+        self._synced_seq[partition] = remote_seq
+
+    async def _load_partition(self, partition: str) -> None:
+        """Full reload of one partition from its Redis hash (drops expired blobs)."""
+        vectors_key = f"{self.VECTORS_PREFIX}{partition}"
+        entries = await self.redis.hgetall(vectors_key)
+        now = time.time()
+
+        self.index.clear(partition)
+        expired = []
+        for key, blob in (entries or {}).items():
+            vector, expires_at = unpack_vector(blob)
+            if expires_at <= now:
+                expired.append(key)
+                continue
+            self.index.add(partition, _decode(key), vector, expires_at)
+
+        if expired:
+            await self.redis.hdel(vectors_key, *expired)
+
+        self.logger.info(
+            f"Loaded {self.index.partition_size(partition)} cached vectors for intent "
+            f"'{partition}' ({len(expired)} expired)"
+        )
+
+    async def _evict(self, partition: str, stored: int) -> None:
+        """
+        Shrink one partition back under ``max_embedding_cache``.
+
+        Drops expired vectors and then those closest to expiry (the oldest
+        stores within a TTL class), down to 90% of the cap so the full hash
+        scan is amortised over many stores. Their responses go with them.
+        """
+        vectors_key = f"{self.VECTORS_PREFIX}{partition}"
+        entries = await self.redis.hgetall(vectors_key)
+        target = self.config.max_embedding_cache * 9 // 10
+        if len(entries or {}) <= target:
+            return
+
+        by_expiry = sorted(
+            (unpack_vector(blob)[1], _decode(key)) for key, blob in entries.items()
+        )
+        evicted = [key for _, key in by_expiry[: len(by_expiry) - target]]
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hdel(vectors_key, *evicted)
+        pipe.zrem(f"{self.VECTOR_LOG_PREFIX}{partition}", *evicted)
+        pipe.delete(
+            *(f"{self.RESPONSE_PREFIX}{key}" for key in evicted),
+            *(f"{self.METADATA_PREFIX}{key}" for key in evicted),
+        )
+        await pipe.execute()
+
+        for key in evicted:
+            self.index.remove(partition, key)
+
+        self.logger.info(
+            f"Evicted {len(evicted)} cached vectors for intent '{partition}' "
+            f"({stored} stored, cap {self.config.max_embedding_cache})"
+        )
+
+    async def _forget(self, partition: str, cache_key: str) -> None:
+        """Drop a vector whose response is gone."""
+        self.index.remove(partition, cache_key)
         try:
-            key = f"{self.STATS_PREFIX}{stat_name}"
-            self.redis.incrby(key, amount)
+            await self.redis.hdel(f"{self.VECTORS_PREFIX}{partition}", cache_key)
+        except Exception as e:
+            self.logger.debug(f"Failed to drop stale vector {cache_key}: {e}")
+
+    # =========================================================================
+    # Statistics
+    # =========================================================================
+
+    async def _increment_stat(
+        self, stat_name: str, amount: int = 1, intent: str | None = None
+    ) -> None:
+        """Increment global and per-intent cache statistics counters."""
+        try:
+            partition = self._partition(intent)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incrby(f"{self.STATS_PREFIX}{stat_name}", amount)
+            pipe.hincrby(f"{self.STATS_PREFIX}intent:{partition}", stat_name, amount)
+            pipe.sadd(f"{self.STATS_PREFIX}intents", partition)
+            await pipe.execute()
         except Exception as e:
             self.logger.error(f"Failed to update stat {stat_name}: {e}")
 
@@ -444,12 +594,13 @@ class SemanticCache:
         Get cache statistics.
 
         Returns:
-            Dictionary with cache performance metrics
+            Dictionary with cache performance metrics, including
+            ``by_intent`` hit rates
         """
         try:
-            hits = int(self.redis.get(f"{self.STATS_PREFIX}hits") or 0)
-            misses = int(self.redis.get(f"{self.STATS_PREFIX}misses") or 0)
-            stores = int(self.redis.get(f"{self.STATS_PREFIX}stores") or 0)
+            hits = int(await self.redis.get(f"{self.STATS_PREFIX}hits") or 0)
+            misses = int(await self.redis.get(f"{self.STATS_PREFIX}misses") or 0)
+            stores = int(await self.redis.get(f"{self.STATS_PREFIX}stores") or 0)
 
             total_requests = hits + misses
             hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0.0
@@ -466,6 +617,8 @@ class SemanticCache:
                 "total_requests": total_requests,
                 "hit_rate_percent": round(hit_rate, 2),
                 "estimated_savings_usd": round(estimated_savings, 2),
+                "indexed_vectors": len(self.index),
+                "by_intent": await self._get_intent_stats(),
                 "config": {
                     "similarity_threshold": self.config.similarity_threshold,
                     "intent_match_required": self.config.intent_match_required,
@@ -476,6 +629,33 @@ class SemanticCache:
             self.logger.error(f"Failed to get cache stats: {e}")
             return {}
 
+    async def _get_intent_stats(self) -> dict[str, dict[str, Any]]:
+        """Hits, misses, stores and hit rate per intent."""
+        intents = sorted(
+            _decode(m) for m in await self.redis.smembers(f"{self.STATS_PREFIX}intents") or ()
+        )
+        if not intents:
+            return {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for intent in intents:
+            pipe.hgetall(f"{self.STATS_PREFIX}intent:{intent}")
+        counters = await pipe.execute()
+
+        by_intent = {}
+        for intent, raw in zip(intents, counters):
+            values = {_decode(k): int(v) for k, v in (raw or {}).items()}
+            hits, misses = values.get("hits", 0), values.get("misses", 0)
+            total = hits + misses
+            by_intent[intent] = {
+                "hits": hits,
+                "misses": misses,
+                "stores": values.get("stores", 0),
+                "hit_rate_percent": round(hits / total * 100, 2) if total else 0.0,
+                "indexed_vectors": self.index.partition_size(intent),
+            }
+        return by_intent
+
     async def clear_cache(self, pattern: str | None = None) -> int:
         """
         Clear cache entries matching pattern.
@@ -495,17 +675,26 @@ class SemanticCache:
             deleted_count = 0
 
             while True:
-                cursor, keys = self.redis.scan(cursor, match=pattern, count=1000)
+                cursor, keys = await self.redis.scan(cursor, match=pattern, count=1000)
 
                 if keys:
-                    deleted_count += self.redis.delete(*keys)
+                    deleted_count += await self.redis.delete(*keys)
 
                 if cursor == 0:
                     break
 
+            # Responses may be gone; rebuild the index from Redis on next lookup
+            self.index.clear()
+            self._synced_seq.clear()
+            self._last_sync.clear()
+
             self.logger.info(f"Cleared {deleted_count} cache entries matching '{pattern}'")
             return deleted_count
 
         except Exception as e:
             self.logger.error(f"Failed to clear cache: {e}")
             return 0
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -20,73 +20,124 @@ from api.ai.cache.semantic_cache import CacheConfig, SemanticCache
 
 
 class MockRedis:
-    """Mock Redis client for testing."""
+    """Mock async Redis client for testing."""
 
     def __init__(self):
         self.store = {}
-        self.stats = {}
+        self.hashes = {}
+        self.sets = {}
+        self.zsets = {}
 
-    def get(self, key):
+    @staticmethod
+    def _key(key):
+        return key.decode() if isinstance(key, bytes) else str(key)
+
+    async def get(self, key):
         """Get value from mock store."""
-        # Normalize key to string for lookup
-        key_str = key.decode() if isinstance(key, bytes) else str(key)
-        
-        # Check both store and stats
-        if key_str in self.store:
-            value = self.store[key_str]
-            if value is None:
-                return None
-            if isinstance(value, bytes):
-                return value
-            return value.encode() if isinstance(value, str) else value
-        elif key_str in self.stats:
-            # Return stats value as string
-            return str(self.stats[key_str]).encode()
-        
-        return None
-
-    def setex(self, key, ttl, value):
+        value = self.store.get(self._key(key))
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    async def setex(self, key, ttl, value):
         """Set value with expiry."""
-        # Normalize key to string for storage
-        key_str = key.decode() if isinstance(key, bytes) else str(key)
-        self.store[key_str] = value
+        self.store[self._key(key)] = value
         return True
 
-    def scan(self, cursor, match, count):
+    async def incr(self, key):
+        return await self.incrby(key, 1)
+
+    async def incrby(self, key, amount):
+        """Increment counter."""
+        key_str = self._key(key)
+        self.store[key_str] = int(self.store.get(key_str, 0)) + amount
+        return self.store[key_str]
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(self._key(key), {})[field.encode()] = value
+        return 1
+
+    async def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(self._key(key), {})
+        fields[field.encode()] = int(fields.get(field.encode(), 0)) + amount
+        return fields[field.encode()]
+
+    async def hmget(self, key, fields):
+        stored = self.hashes.get(self._key(key), {})
+        return [stored.get(f.encode() if isinstance(f, str) else f) for f in fields]
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(self._key(key), {}))
+
+    async def hdel(self, key, *fields):
+        stored = self.hashes.get(self._key(key), {})
+        return sum(
+            stored.pop(f.encode() if isinstance(f, str) else f, None) is not None
+            for f in fields
+        )
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(self._key(key), set()).update(
+            m.encode() if isinstance(m, str) else m for m in members
+        )
+
+    async def smembers(self, key):
+        return set(self.sets.get(self._key(key), set()))
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(self._key(key), {}).update(
+            {m.encode(): score for m, score in mapping.items()}
+        )
+
+    async def zrangebyscore(self, key, low, high):
+        members = self.zsets.get(self._key(key), {})
+        return [m for m, score in sorted(members.items(), key=lambda i: i[1]) if low <= score <= high]
+
+    async def zremrangebyrank(self, key, start, end):
+        return 0
+
+    def pipeline(self, transaction=True):
+        return MockPipeline(self)
+
+    async def scan(self, cursor, match, count):
         """Scan keys matching pattern."""
         # Convert match pattern to simple prefix check
         prefix = match.replace("*", "")
-        # Return all keys that start with prefix
-        matching_keys = []
-        for k in self.store.keys():
-            key_str = k.decode() if isinstance(k, bytes) else str(k)
-            if key_str.startswith(prefix):
-                matching_keys.append(k.encode() if isinstance(k, str) else k)
-        return 0, matching_keys
-
-    def incrby(self, key, amount):
-        """Increment counter."""
-        key_str = key.decode() if isinstance(key, bytes) else str(key)
-        self.stats[key_str] = self.stats.get(key_str, 0) + amount
-        return self.stats[key_str]
+        keys = set(self.store) | set(self.hashes) | set(self.sets) | set(self.zsets)
+        return 0, [k.encode() for k in keys if k.startswith(prefix)]
 
-    def delete(self, *keys):
+    async def delete(self, *keys):
         """Delete keys."""
         count = 0
         for key in keys:
-            # Handle both string and bytes keys
-            str_key = key.decode() if isinstance(key, bytes) else key
-            bytes_key = key.encode() if isinstance(key, str) else key
-            
-            if str_key in self.store:
-                del self.store[str_key]
-                count += 1
-            elif bytes_key in self.store:
-                del self.store[bytes_key]
-                count += 1
+            key_str = self._key(key)
+            for container in (self.store, self.hashes, self.sets, self.zsets):
+                if key_str in container:
+                    del container[key_str]
+                    count += 1
         return count
 
 
+class MockPipeline:
+    """Queues calls and runs them against MockRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
 @pytest.fixture
 def mock_redis():
     """Fixture for mock Redis client."""
@@ -375,5 +426,49 @@ async def test_error_handling_returns_none(semantic_cache, mock_embedding_provid
     assert stored is False
 
 
+@pytest.mark.asyncio
+async def test_hit_rate_reported_per_intent(semantic_cache):
+    """Stats include hits/misses/hit rate broken down by intent."""
+    semantic_cache.config.context_aware = False
+    await semantic_cache.store_response("What is on the menu?", "Chicken, steak, shrimp.", intent="menu")
+    await semantic_cache.check_cache("What is on the menu?", intent="menu")  # hit
+    await semantic_cache.check_cache("When do you open?", intent="hours")  # miss
+
+    stats = await semantic_cache.get_stats()
+
+    assert stats["by_intent"]["menu"]["hits"] == 1
+    assert stats["by_intent"]["menu"]["hit_rate_percent"] == 100.0
+    assert stats["by_intent"]["hours"]["misses"] == 1
+    assert stats["by_intent"]["hours"]["hit_rate_percent"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_other_worker_sees_stored_vectors(mock_redis, mock_embedding_provider):
+    """A second process picks up vectors from the Redis blobs, not its own memory."""
+    config = CacheConfig(context_aware=False, index_sync_interval=0.0)
+    writer = SemanticCache(mock_redis, mock_embedding_provider, config)
+    reader = SemanticCache(mock_redis, mock_embedding_provider, config)
+
+    await writer.store_response("Do you cater weddings?", "Yes!", intent="faq")
+    cached = await reader.check_cache("Do you cater weddings?", intent="faq")
+
+    assert cached is not None
+    assert cached["response"] == "Yes!"
+    assert reader.index.partition_size("faq") == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_response_drops_vector(semantic_cache, mock_redis):
+    """If Redis expired the response, the vector is removed from the index."""
+    semantic_cache.config.context_aware = False
+    await semantic_cache.store_response("Where are you located?", "Bay Area", intent="location")
+    mock_redis.store = {
+        k: v for k, v in mock_redis.store.items() if not k.startswith(semantic_cache.RESPONSE_PREFIX)
+    }
+
+    assert await semantic_cache.check_cache("Where are you located?", intent="location") is None
+    assert semantic_cache.index.partition_size("location") == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,375 @@
+"""
+In-Process Vector Index for the Semantic Cache
+
+NumPy-backed approximate nearest-neighbour index, partitioned by intent.
+Replaces the SCAN-over-every-embedding lookup in SemanticCache.
+
+Layout per partition:
+- One contiguous float32 matrix of L2-normalized vectors (cosine = dot)
+- Small partitions are searched exactly (one matvec)
+- Once a partition reaches ``ivf_min_size`` it is clustered with spherical
+  k-means into ~sqrt(n) inverted lists; a lookup scores the centroids and
+  then only the ``nprobe`` closest lists
+
+With the cache's 0.97 similarity threshold, a match is a near-duplicate of
+the query and almost always lives in the query's closest list, so recall
+at that threshold stays effectively exact while a 100k partition is
+answered from a few thousand vectors.
+
+The index holds no Redis state; SemanticCache persists vectors as packed
+float32 blobs and replays them into the index (see pack_vector).
+
+Author: MyHibachi AI Team
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_EXPIRY_DTYPE = np.dtype("<f8")
+_VECTOR_DTYPE = np.dtype("<f4")
+
+
+# =============================================================================
+# Blob encoding
+# =============================================================================
+
+
+def pack_vector(vector, expires_at: float) -> bytes:
+    """Pack an embedding as ``<f8 expires_at`` + ``<f4`` components."""
+    return (
+        np.asarray([expires_at], dtype=_EXPIRY_DTYPE).tobytes()
+        + np.asarray(vector, dtype=_VECTOR_DTYPE).tobytes()
+    )
+
+
+def unpack_vector(blob: bytes) -> tuple[np.ndarray, float]:
+    """Inverse of pack_vector."""
+    expires_at = float(np.frombuffer(blob[:8], dtype=_EXPIRY_DTYPE)[0])
+    return np.frombuffer(blob[8:], dtype=_VECTOR_DTYPE), expires_at
+
+
+def _normalize(vector) -> np.ndarray | None:
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0 or not math.isfinite(norm):
+        return None
+    return vec / norm
+
+
+# =============================================================================
+# Partition
+# =============================================================================
+
+
+@dataclass
+class VectorMatch:
+    """A candidate returned by VectorIndex.search."""
+
+    key: str
+    partition: str
+    similarity: float
+
+
+class _Partition:
+    """Vectors for one intent, with an optional IVF coarse quantizer."""
+
+    def __init__(self, dim: int, ivf_min_size: int, nprobe: int):
+        self.dim = dim
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.expires = np.empty(0, dtype=np.float64)
+        self.alive = np.empty(0, dtype=bool)
+        self.keys: list[str | None] = []
+        self.rows: dict[str, int] = {}
+        self.size = 0  # rows in use (alive or dead)
+
+        self.centroids: np.ndarray | None = None
+        self.trained_size = 0
+        self._list_members: list[list[int]] = []
+        self._list_arrays: list[tuple[np.ndarray, np.ndarray] | None] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # -- mutation ------------------------------------------------------------
+
+    def add(self, key: str, vector: np.ndarray, expires_at: float) -> None:
+        row = self.rows.get(key)
+        if row is None:
+            row = self._append_row()
+            self.rows[key] = row
+            self.keys[row] = key
+        else:
+            self._unassign(row)
+
+        self.vectors[row] = vector
+        self.expires[row] = expires_at
+        self.alive[row] = True
+        self._assign(np.asarray([row]))
+
+        if len(self) >= self.ivf_min_size and len(self) >= 2 * self.trained_size:
+            self.train()
+
+    def remove(self, key: str) -> bool:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self.keys[row] = None
+        self._unassign(row)
+
+        if self.size > 1024 and len(self.rows) < self.size // 2:
+            self._compact()
+        return True
+
+    def _append_row(self) -> int:
+        if self.size == len(self.vectors):
+            capacity = max(64, 2 * len(self.vectors))
+            vectors = np.empty((capacity, self.dim), dtype=np.float32)
+            vectors[: self.size] = self.vectors[: self.size]
+            self.vectors = vectors
+            expires = np.zeros(capacity, dtype=np.float64)
+            expires[: self.size] = self.expires[: self.size]
+            self.expires = expires
+            alive = np.zeros(capacity, dtype=bool)
+            alive[: self.size] = self.alive[: self.size]
+            self.alive = alive
+            self.keys.extend([None] * (capacity - len(self.keys)))
+        row = self.size
+        self.size += 1
+        return row
+
+    def _compact(self) -> None:
+        live = np.flatnonzero(self.alive[: self.size])
+        keys = [self.keys[row] for row in live]
+        self.vectors = self.vectors[live].copy()
+        self.expires = self.expires[live].copy()
+        self.alive = np.ones(len(live), dtype=bool)
+        self.keys = keys
+        self.rows = {key: row for row, key in enumerate(keys)}
+        self.size = len(live)
+        self._rebuild_lists()
+
+    # -- IVF -----------------------------------------------------------------
+
+    def train(self, iterations: int = 6, seed: int = 0) -> None:
+        """Cluster live vectors into ~sqrt(n) inverted lists (spherical k-means)."""
+        live = np.flatnonzero(self.alive[: self.size])
+        n = len(live)
+        nlist = min(1024, max(8, int(math.sqrt(n))))
+        if n < nlist * 4:
+            return
+
+        rng = np.random.default_rng(seed)
+        sample_rows = live if n <= 16 * nlist else rng.choice(live, 16 * nlist, replace=False)
+        sample = self.vectors[sample_rows]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            sums[empty] = centroids[empty]  # Keep the old centroid for empty lists
+            norms[empty] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        self.centroids = centroids
+        self.trained_size = n
+        self._rebuild_lists()
+        logger.debug(f"Vector partition trained: n={n}, nlist={nlist}")
+
+    def _rebuild_lists(self) -> None:
+        if self.centroids is None:
+            return
+        nlist = len(self.centroids)
+        self._list_members = [[] for _ in range(nlist)]
+        self._list_arrays = [None] * nlist
+        live = np.flatnonzero(self.alive[: self.size])
+        self._assign(live)
+
+    def _assign(self, rows: np.ndarray) -> None:
+        if self.centroids is None or len(rows) == 0:
+            return
+        # Chunked so assigning a large partition doesn't allocate n × nlist at once
+        for start in range(0, len(rows), 8192):
+            chunk = rows[start : start + 8192]
+            labels = np.argmax(self.vectors[chunk] @ self.centroids.T, axis=1)
+            for row, label in zip(chunk.tolist(), labels.tolist()):
+                self._list_members[label].append(row)
+                self._list_arrays[label] = None
+
+    def _unassign(self, row: int) -> None:
+        if self.centroids is None:
+            return
+        label = int(np.argmax(self.centroids @ self.vectors[row]))
+        members = self._list_members[label]
+        try:
+            members.remove(row)
+            self._list_arrays[label] = None
+        except ValueError:
+            pass
+
+    def _list_block(self, label: int) -> tuple[np.ndarray, np.ndarray]:
+        """Rows of one inverted list plus a contiguous copy of their vectors."""
+        block = self._list_arrays[label]
+        if block is None:
+            rows = np.asarray(self._list_members[label], dtype=np.int64)
+            block = (rows, self.vectors[rows])
+            self._list_arrays[label] = block
+        return block
+
+    # -- search --------------------------------------------------------------
+
+    def _score(self, query: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(rows, similarities) for the rows a query has to look at."""
+        if self.centroids is None:
+            return np.arange(self.size), self.vectors[: self.size] @ query
+
+        nprobe = min(self.nprobe, len(self.centroids))
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        blocks = [self._list_block(int(label)) for label in probe]
+        rows = np.concatenate([rows for rows, _ in blocks])
+        scores = np.concatenate([vectors @ query for _, vectors in blocks])
+        return rows, scores
+
+    def search(
+        self, query: np.ndarray, k: int, threshold: float, now: float
+    ) -> tuple[list[tuple[str, float]], list[str]]:
+        """
+        Top-k rows with similarity >= threshold.
+
+        Returns:
+            (matches best-first, keys found expired)
+        """
+        rows, scores = self._score(query)
+        if len(rows) == 0:
+            return [], []
+
+        hit = (scores >= threshold) & self.alive[rows]
+        if not hit.any():
+            return [], []
+
+        rows, scores = rows[hit], scores[hit]
+        expired = self.expires[rows] <= now
+        expired_keys = [self.keys[row] for row in rows[expired]]
+        rows, scores = rows[~expired], scores[~expired]
+
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores)
+        return [(self.keys[rows[i]], float(scores[i])) for i in order], expired_keys
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+
+class VectorIndex:
+    """
+    Intent-partitioned in-memory vector index.
+
+    Usage:
+        index = VectorIndex()
+        index.add("menu", cache_key, embedding, expires_at=time.time() + ttl)
+        matches = index.search(query_embedding, partitions=["menu"], threshold=0.97)
+    """
+
+    def __init__(self, ivf_min_size: int = 4096, nprobe: int = 8):
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self._partitions: dict[str, _Partition] = {}
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self._partitions.values())
+
+    @property
+    def partitions(self) -> list[str]:
+        return list(self._partitions)
+
+    def partition_size(self, partition: str) -> int:
+        part = self._partitions.get(partition)
+        return len(part) if part else 0
+
+    def add(self, partition: str, key: str, vector, expires_at: float) -> bool:
+        """Add or replace a vector. Returns False for zero/invalid vectors."""
+        normalized = _normalize(vector)
+        if normalized is None:
+            return False
+
+        part = self._partitions.get(partition)
+        if part is None:
+            part = _Partition(len(normalized), self.ivf_min_size, self.nprobe)
+            self._partitions[partition] = part
+        elif part.dim != len(normalized):
+            logger.warning(
+                f"Vector dim {len(normalized)} != partition dim {part.dim} "
+                f"for '{partition}', resetting partition"
+            )
+            part = _Partition(len(normalized), self.ivf_min_size, self.nprobe)
+            self._partitions[partition] = part
+
+        part.add(key, normalized, expires_at)
+        return True
+
+    def remove(self, partition: str, key: str) -> bool:
+        part = self._partitions.get(partition)
+        return part.remove(key) if part else False
+
+    def clear(self, partition: str | None = None) -> None:
+        if partition is None:
+            self._partitions.clear()
+        else:
+            self._partitions.pop(partition, None)
+
+    def search(
+        self,
+        vector,
+        partitions: list[str] | None = None,
+        threshold: float = 0.0,
+        k: int = 5,
+        now: float | None = None,
+    ) -> list[VectorMatch]:
+        """
+        Find up to k vectors with cosine similarity >= threshold.
+
+        Expired entries found along the way are dropped from the index.
+
+        Args:
+            vector: Query embedding (any norm)
+            partitions: Partitions to search (None = all)
+            threshold: Minimum cosine similarity
+            k: Maximum number of matches
+            now: Current epoch seconds (for expiry)
+
+        Returns:
+            Matches sorted by similarity, best first
+        """
+        query = _normalize(vector)
+        if query is None:
+            return []
+        now = time.time() if now is None else now
+
+        matches: list[VectorMatch] = []
+        for name in partitions if partitions is not None else list(self._partitions):
+            part = self._partitions.get(name)
+            if part is None or part.dim != len(query) or len(part) == 0:
+                continue
+            found, expired = part.search(query, k, threshold, now)
+            for key in expired:
+                part.remove(key)
+            matches.extend(VectorMatch(key, name, sim) for key, sim in found)
+
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches[:k]
@@ -2,10 +2,18 @@
 Production Knowledge Base Service
 Integrated with actual database and real business data
 Supports AI chat with context from bookings, menu, reviews, and FAQs
+
+Search uses an in-memory inverted index with BM25 scoring (keywords are
+indexed as a boosted field), kept up to date incrementally by
+add/update/delete_knowledge_chunk. A query only touches the postings of
+its own terms, and the top results are selected with a heap.
 """
 
+from collections import defaultdict
 from datetime import datetime, timezone
+import heapq
 import logging
+import math
 import re
 from typing import Any
 from uuid import uuid4
@@ -17,13 +25,192 @@ from sqlalchemy.ext.asyncio import AsyncSession
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Words ignored for keyword extraction and search
+STOP_WORDS = frozenset(
+    {
+        "the",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "a",
+        "an",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+        "may",
+        "might",
+        "must",
+        "can",
+        "this",
+        "that",
+        "these",
+        "those",
+        "i",
+        "you",
+        "he",
+        "she",
+        "it",
+        "we",
+        "they",
+        "me",
+        "him",
+        "her",
+        "us",
+        "them",
+    }
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stop words removed and plurals folded."""
+    terms = []
+    for word in re.findall(r"\w+", text.lower()):
+        if word in STOP_WORDS:
+            continue
+        # Light plural folding so "payments" matches "payment"
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class BM25Index:
+    """
+    Incremental inverted index with BM25 scoring.
+
+    Each chunk is indexed from its content plus its keywords; keyword terms
+    count ``keyword_weight`` times (a simple BM25F field boost).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, keyword_weight: float = 2.0):
+        self.k1 = k1
+        self.b = b
+        self.keyword_weight = keyword_weight
+
+        self.postings: dict[str, dict[str, float]] = {}  # term -> {chunk_id: tf}
+        self.keyword_postings: dict[str, set[str]] = {}  # term -> chunk_ids (keyword field)
+        self.doc_terms: dict[str, dict[str, float]] = {}  # chunk_id -> {term: tf}
+        self.doc_lengths: dict[str, float] = {}
+        self.total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, chunk_id: str, content: str, keywords: list[str]) -> None:
+        """Index a chunk (replaces any previous version of it)."""
+        self.remove(chunk_id)
+
+        terms: dict[str, float] = defaultdict(float)
+        for term in tokenize(content):
+            terms[term] += 1.0
+        keyword_terms = set()
+        for keyword in keywords:
+            for term in tokenize(keyword):
+                terms[term] += self.keyword_weight
+                keyword_terms.add(term)
+
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[chunk_id] = tf
+        for term in keyword_terms:
+            self.keyword_postings.setdefault(term, set()).add(chunk_id)
+
+        length = sum(terms.values())
+        self.doc_terms[chunk_id] = dict(terms)
+        self.doc_lengths[chunk_id] = length
+        self.total_length += length
+
+    def remove(self, chunk_id: str) -> None:
+        terms = self.doc_terms.pop(chunk_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            plist = self.postings.get(term)
+            if plist is not None:
+                plist.pop(chunk_id, None)
+                if not plist:
+                    del self.postings[term]
+            kw = self.keyword_postings.get(term)
+            if kw is not None:
+                kw.discard(chunk_id)
+                if not kw:
+                    del self.keyword_postings[term]
+
+        self.total_length -= self.doc_lengths.pop(chunk_id)
+
+    def clear(self) -> None:
+        self.postings.clear()
+        self.keyword_postings.clear()
+        self.doc_terms.clear()
+        self.doc_lengths.clear()
+        self.total_length = 0.0
+
+    def _idf(self, term: str) -> float:
+        n = len(self.doc_lengths)
+        df = len(self.postings.get(term, ()))
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, query: str) -> tuple[dict[str, float], set[str]]:
+        """
+        Normalized BM25 scores for every chunk sharing a term with the query.
+
+        Scores are divided by the query's BM25 upper bound
+        (sum of idf × (k1 + 1)), so they fall in [0, 1) and unmatched query
+        words lower the score, as in the old matching ratio.
+
+        Returns:
+            (chunk_id -> score, chunk_ids matched through the keyword field)
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms or not self.doc_lengths:
+            return {}, set()
+
+        avg_length = self.total_length / len(self.doc_lengths) or 1.0
+        scores: dict[str, float] = defaultdict(float)
+        keyword_hits: set[str] = set()
+        upper_bound = 0.0
+
+        for term in query_terms:
+            idf = self._idf(term)
+            upper_bound += idf * (self.k1 + 1)
+            for chunk_id, tf in self.postings.get(term, {}).items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[chunk_id] / avg_length)
+                scores[chunk_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+            keyword_hits.update(self.keyword_postings.get(term, ()))
+
+        if upper_bound <= 0:
+            return {}, set()
+        return {cid: s / upper_bound for cid, s in scores.items()}, keyword_hits
+
 
 class ProductionKnowledgeBaseService:
     """Production-ready knowledge base integrated with real business data"""
 
     def __init__(self):
         self.chunks_cache = {}  # Redis-backed cache in production (fallback to memory for now)
-        self.keywords_index = {}  # Fast keyword lookup
+        self.search_index = BM25Index()  # Inverted index over content + keywords
         logger.info("KnowledgeBase: Initializing production knowledge base service")
 
         # Load business configuration from settings
@@ -420,12 +607,7 @@ class ProductionKnowledgeBaseService:
                 },
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
-
-            # Build keyword index
-            for keyword in knowledge["keywords"]:
-                if keyword not in self.keywords_index:
-                    self.keywords_index[keyword] = []
-                self.keywords_index[keyword].append(chunk_id)
+            self._index_chunk(chunk_id)
 
         logger.info(
             f"KnowledgeBase: Loaded {len(business_knowledge)} business knowledge chunks (business + admin system)"
@@ -509,7 +691,10 @@ class ProductionKnowledgeBaseService:
         self, query: str, limit: int = 10, min_score: float = 0.3, db: AsyncSession | None = None
     ) -> list[dict[str, Any]]:
         """
-        Enhanced text search with keyword matching + database integration
+        BM25 search over the inverted index + database integration
+
+        Only chunks sharing at least one (non stop-word) term with the query
+        are scored; score = normalized BM25 + priority boost, capped at 1.0.
 
         Args:
             query: Search query from user
@@ -519,38 +704,28 @@ class ProductionKnowledgeBaseService:
         """
         results = []
 
-        # Normalize query
-        query_words = re.findall(r"\w+", query.lower())
-
-        # Score chunks based on keyword and content matching
-        for chunk_id, chunk_data in self.chunks_cache.items():
-            content = chunk_data.get("content", "").lower()
-            keywords = chunk_data.get("metadata", {}).get("keywords", [])
-            priority = chunk_data.get("metadata", {}).get("priority", 5)
-
-            # Calculate score
-            keyword_matches = sum(1 for word in query_words if word in keywords)
-            content_matches = sum(1 for word in query_words if word in content)
-
-            # Weight: keyword matches > content matches, boost by priority
-            base_score = (
-                (keyword_matches * 2 + content_matches) / (len(query_words) * 2)
-                if query_words
-                else 0
+        # BM25 over the postings of the query terms only
+        scores, keyword_hits = self.search_index.score(query)
+
+        def ranked():
+            for chunk_id, base_score in scores.items():
+                priority = self.chunks_cache[chunk_id].get("metadata", {}).get("priority", 5)
+                priority_boost = priority / 10  # Priority 10 = +1.0 boost
+                yield min(base_score + (priority_boost * 0.2), 1.0), chunk_id  # Cap at 1.0
+
+        for total_score, chunk_id in heapq.nlargest(limit, ranked()):
+            if total_score < min_score:
+                break
+            chunk_data = self.chunks_cache[chunk_id]
+            results.append(
+                {
+                    "id": chunk_id,
+                    "content": chunk_data.get("content", ""),
+                    "metadata": chunk_data.get("metadata", {}),
+                    "score": total_score,
+                    "match_type": "keyword" if chunk_id in keyword_hits else "content",
+                }
             )
-            priority_boost = priority / 10  # Priority 10 = +1.0 boost
-            total_score = min(base_score + (priority_boost * 0.2), 1.0)  # Cap at 1.0
-
-            if total_score >= min_score:
-                results.append(
-                    {
-                        "id": chunk_id,
-                        "content": chunk_data.get("content", ""),
-                        "metadata": chunk_data.get("metadata", {}),
-                        "score": total_score,
-                        "match_type": "keyword" if keyword_matches > 0 else "content",
-                    }
-                )
 
         # Enrich with database data if session provided
         if db:
@@ -580,73 +755,23 @@ class ProductionKnowledgeBaseService:
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
 
-        # Update keyword index
-        for keyword in metadata.get("keywords", []):
-            if keyword not in self.keywords_index:
-                self.keywords_index[keyword] = []
-            self.keywords_index[keyword].append(chunk_id)
-
+        self._index_chunk(chunk_id)
         return chunk_id
 
+    def _index_chunk(self, chunk_id: str) -> None:
+        """(Re)index one chunk from chunks_cache."""
+        chunk = self.chunks_cache[chunk_id]
+        self.search_index.add(
+            chunk_id,
+            chunk.get("content", ""),
+            chunk.get("metadata", {}).get("keywords", []),
+        )
+
     def _extract_keywords(self, content: str) -> list[str]:
         """Simple keyword extraction from content"""
         # Remove common words and extract meaningful terms
-        common_words = {
-            "the",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "a",
-            "an",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-            "must",
-            "can",
-            "this",
-            "that",
-            "these",
-            "those",
-            "i",
-            "you",
-            "he",
-            "she",
-            "it",
-            "we",
-            "they",
-            "me",
-            "him",
-            "her",
-            "us",
-            "them",
-        }
-
         words = re.findall(r"\w+", content.lower())
-        keywords = [word for word in words if len(word) > 2 and word not in common_words]
+        keywords = [word for word in words if len(word) > 2 and word not in STOP_WORDS]
 
         # Return unique keywords, limit to 10
         return list(dict.fromkeys(keywords))[:10]
@@ -667,20 +792,12 @@ class ProductionKnowledgeBaseService:
                 self.chunks_cache[chunk_id]["metadata"].update(metadata)
 
             self.chunks_cache[chunk_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self._index_chunk(chunk_id)
 
     async def delete_knowledge_chunk(self, chunk_id: str):
         """Delete a knowledge chunk"""
         if chunk_id in self.chunks_cache:
-            # Remove from keyword index
-            keywords = self.chunks_cache[chunk_id].get("metadata", {}).get("keywords", [])
-            for keyword in keywords:
-                if keyword in self.keywords_index:
-                    self.keywords_index[keyword] = [
-                        cid for cid in self.keywords_index[keyword] if cid != chunk_id
-                    ]
-                    if not self.keywords_index[keyword]:
-                        del self.keywords_index[keyword]
-
+            self.search_index.remove(chunk_id)
             del self.chunks_cache[chunk_id]
 
     async def get_chunk_count(self) -> int:
@@ -690,15 +807,16 @@ class ProductionKnowledgeBaseService:
     async def clear_knowledge_base(self):
         """Clear all knowledge base data"""
         self.chunks_cache.clear()
-        self.keywords_index.clear()
+        self.search_index.clear()
 
     def get_stats(self) -> dict[str, Any]:
         """Get knowledge base statistics"""
         return {
             "total_chunks": len(self.chunks_cache),
-            "total_keywords": len(self.keywords_index),
+            "total_keywords": len(self.search_index.keyword_postings),
+            "total_terms": len(self.search_index.postings),
             "has_index": True,
-            "encoder_model": "production_keyword_matching",
+            "encoder_model": "bm25_inverted_index",
             "embedding_dim": 0,
             "service_type": "production_integrated",
             "database_enrichment": True,
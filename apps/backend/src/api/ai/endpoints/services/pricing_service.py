@@ -2,6 +2,7 @@
 Real-time Pricing Service with Google Maps Travel Fee Calculation
 Pulls actual pricing data from database, menu configuration, and FAQ data
 Calculates accurate travel fees using Google Maps Distance Matrix API
+(async, cached and coalesced via services.scheduling.distance_service)
 NO MORE HARDCODED PRICES - Always use real data from system
 """
 
@@ -18,7 +19,13 @@ from db.models.identity import Station
 
 # Import models
 # TODO: Legacy booking models not migrated yet - needs refactor
-import requests
+import httpx
+from services.scheduling.distance_service import (
+    DistanceServiceError,
+    RouteDistance,
+    RouteNotFoundError,
+    get_distance_service,
+)
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -133,6 +140,8 @@ class PricingService:
         self._station_coordinates = None
         if self.db and self.station_id:
             self._load_station_location()
+        else:
+            self._load_station_from_env()
 
     def _sync_from_ssot(self) -> None:
         """
@@ -229,12 +238,16 @@ class PricingService:
                 "No station location found in environment variables (BUSINESS_ADDRESS, BUSINESS_CITY, BUSINESS_STATE, BUSINESS_ZIP)"
             )
 
-    def calculate_travel_distance(
+    async def calculate_travel_distance(
         self, destination_address: str, destination_zipcode: str | None = None
     ) -> dict[str, Any]:
         """
         Calculate travel distance using Google Maps Distance Matrix API
 
+        Lookups go through the shared DistanceService: repeated addresses are
+        served from travel_cache, concurrent identical lookups share one API
+        call, and ZIP-only destinations use the precomputed ZIP table.
+
         Args:
             destination_address: Full customer address or partial location
             destination_zipcode: Optional ZIP code for more accurate results
@@ -270,7 +283,7 @@ class PricingService:
                 customer_address=destination,
             )
             return (
-                self._estimate_travel_from_zip(destination_zipcode)
+                await self._estimate_travel_from_zip(destination_zipcode)
                 if destination_zipcode
                 else {
                     "status": "api_unavailable",
@@ -295,92 +308,32 @@ class PricingService:
             }
 
         try:
-            # Call Google Maps Distance Matrix API
-            url = "https://maps.googleapis.com/maps/api/distancematrix/json"
-            params = {
-                "origins": self._station_address,
-                "destinations": destination,
-                "key": self._google_maps_api_key,
-                "units": "imperial",  # Miles
+            route = await get_distance_service().get_distance(self._station_address, destination)
+        except RouteNotFoundError as e:
+            logger.warning(f"Routing error for {destination}: {e.status}")
+            return {
+                "status": "routing_error",
+                "message": "Could not find route to your location. Please verify your address is complete and correct.",
+                "distance_miles": None,
+                "travel_fee": None,
+                "requires_full_address": True,
             }
-
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
-
-            if data.get("status") != "OK":
-                logger.error(
-                    f"Google Maps API error: {data.get('status')} - {data.get('error_message')}"
-                )
-                # Alert admin about API error
-                get_admin_alert_service().alert_api_error(
-                    service_name="Google Maps Distance Matrix API",
-                    error_message=f"API Status: {data.get('status')} - {data.get('error_message', 'Unknown error')}",
-                    customer_address=destination,
-                )
-                return {
-                    "status": "api_error",
-                    "message": "Unable to calculate travel distance right now. Please call us at (916) 740-8768 and we'll provide an immediate quote!",
-                    "distance_miles": None,
-                    "travel_fee": None,
-                    "requires_admin_follow_up": True,
-                }
-
-            element = data["rows"][0]["elements"][0]
-
-            if element.get("status") != "OK":
-                logger.warning(f"Routing error for {destination}: {element.get('status')}")
-                return {
-                    "status": "routing_error",
-                    "message": "Could not find route to your location. Please verify your address is complete and correct.",
-                    "distance_miles": None,
-                    "travel_fee": None,
-                    "requires_full_address": True,
-                }
-
-            # Extract distance and duration
-            distance_meters = element["distance"]["value"]
-            distance_miles = distance_meters / 1609.34
-            duration_text = element["duration"]["text"]
-
-            # Calculate travel fee
-            free_miles = self.TRAVEL_PRICING["free_radius_miles"]
-            per_mile_rate = self.TRAVEL_PRICING["per_mile_after"]
-
-            if distance_miles <= free_miles:
-                travel_fee = Decimal("0.00")
-                billable_miles = 0.0
-            else:
-                billable_miles = distance_miles - free_miles
-                travel_fee = Decimal(str(billable_miles * per_mile_rate))
-
-            # Add polite note if only ZIP provided
-            note = None
-            if is_zip_only:
-                note = (
-                    "📍 Friendly reminder: With your full street address, we can provide an exact travel fee "
-                    "using real-time route calculation. The ZIP code estimate shown is close, but the actual "
-                    "distance may vary slightly depending on your exact location."
-                )
-
+        except DistanceServiceError as e:
+            logger.error(f"Google Maps API error: {e.status} - {e.message}")
+            # Alert admin about API error
+            get_admin_alert_service().alert_api_error(
+                service_name="Google Maps Distance Matrix API",
+                error_message=f"API Status: {e.status} - {e.message or 'Unknown error'}",
+                customer_address=destination,
+            )
             return {
-                "status": "success",
-                "distance_miles": round(distance_miles, 1),
-                "distance_text": f"{round(distance_miles, 1)} miles",
-                "drive_time": duration_text,
-                "travel_fee": float(travel_fee),
-                "breakdown": {
-                    "total_distance": round(distance_miles, 1),
-                    "free_miles": free_miles,
-                    "billable_miles": round(billable_miles, 1),
-                    "rate_per_mile": per_mile_rate,
-                },
-                "from": self._station_address,
-                "to": destination,
-                "requires_full_address": is_zip_only,
-                "note": note if is_zip_only else f"First {free_miles} miles are complimentary!",
+                "status": "api_error",
+                "message": "Unable to calculate travel distance right now. Please call us at (916) 740-8768 and we'll provide an immediate quote!",
+                "distance_miles": None,
+                "travel_fee": None,
+                "requires_admin_follow_up": True,
             }
-
-        except requests.Timeout:
+        except httpx.TimeoutException:
             logger.exception("Google Maps API timeout")
             get_admin_alert_service().alert_api_error(
                 service_name="Google Maps",
@@ -407,19 +360,78 @@ class PricingService:
                 "requires_admin_follow_up": True,
             }
 
-    def _estimate_travel_from_zip(self, zipcode: str) -> dict[str, Any]:
+        return self._travel_fee_result(route, destination, bool(is_zip_only))
+
+    def _travel_fee_result(
+        self, route: RouteDistance, destination: str, is_zip_only: bool
+    ) -> dict[str, Any]:
+        """Travel fee breakdown for a driving distance"""
+        distance_miles = route.distance_miles
+
+        # Calculate travel fee
+        free_miles = self.TRAVEL_PRICING["free_radius_miles"]
+        per_mile_rate = self.TRAVEL_PRICING["per_mile_after"]
+
+        if distance_miles <= free_miles:
+            travel_fee = Decimal("0.00")
+            billable_miles = 0.0
+        else:
+            billable_miles = distance_miles - free_miles
+            travel_fee = Decimal(str(billable_miles * per_mile_rate))
+
+        # Add polite note if only ZIP provided
+        note = None
+        if is_zip_only:
+            note = (
+                "📍 Friendly reminder: With your full street address, we can provide an exact travel fee "
+                "using real-time route calculation. The ZIP code estimate shown is close, but the actual "
+                "distance may vary slightly depending on your exact location."
+            )
+
+        return {
+            "status": "success",
+            "distance_miles": round(distance_miles, 1),
+            "distance_text": f"{round(distance_miles, 1)} miles",
+            "drive_time": route.drive_time,
+            "travel_fee": float(travel_fee),
+            "breakdown": {
+                "total_distance": round(distance_miles, 1),
+                "free_miles": free_miles,
+                "billable_miles": round(billable_miles, 1),
+                "rate_per_mile": per_mile_rate,
+            },
+            "from": self._station_address,
+            "to": destination,
+            "requires_full_address": is_zip_only,
+            "note": note if is_zip_only else f"First {free_miles} miles are complimentary!",
+        }
+
+    async def _estimate_travel_from_zip(self, zipcode: str) -> dict[str, Any]:
         """
-        Estimate travel distance from ZIP code (rough approximation)
+        Estimate travel distance from ZIP code
         Used when Google Maps API is unavailable
 
+        Uses the precomputed station -> ZIP centroid distances
+        (scripts/precompute_zip_distances.py) when available.
+
         Args:
             zipcode: Customer ZIP code
 
         Returns:
             Dict with estimated distance
         """
-        # This is a very rough approximation
-        # In production, you'd want a ZIP code database with coordinates
+        route = None
+        if self._station_address:
+            route = await get_distance_service().zip_estimate(self._station_address, zipcode)
+        if route is not None:
+            result = self._travel_fee_result(route, zipcode, is_zip_only=True)
+            result.update(
+                status="estimated",
+                is_estimate=True,
+                message="Travel fee estimated from ZIP code. For exact quote, please provide your full address.",
+            )
+            return result
+
         return {
             "status": "estimated",
             "message": "Travel fee estimated from ZIP code. For exact quote, please provide your full address.",
@@ -717,7 +729,7 @@ Your appreciation means the world to our chefs! 🙏✨
         # Fallback to configuration
         return Decimal(str(self.ADDONS.get(addon_key, 0.00)))
 
-    def calculate_party_quote(
+    async def calculate_party_quote(
         self,
         adults: int,
         children: int = 0,
@@ -809,7 +821,7 @@ Your appreciation means the world to our chefs! 🙏✨
 
         if customer_address or customer_zipcode:
             # Use Google Maps for accurate calculation
-            travel_info = self.calculate_travel_distance(customer_address, customer_zipcode)
+            travel_info = await self.calculate_travel_distance(customer_address, customer_zipcode)
             if travel_info.get("status") == "success" and travel_info.get("travel_fee") is not None:
                 travel_fee = Decimal(str(travel_info["travel_fee"]))
         elif travel_miles:
@@ -982,16 +994,20 @@ def get_pricing_service(db: Session | None = None, station_id: str | None = None
 
 # Example usage:
 if __name__ == "__main__":
+    import asyncio
+
     pricing = get_pricing_service()
 
     # Example: Debbie's quote with REAL PRICING and Google Maps travel calculation
-    quote = pricing.calculate_party_quote(
-        adults=14,
-        children=2,
-        children_under_5=0,
-        upgrades={"filet_mignon": 10},
-        addons=[],
-        customer_address="Antioch, CA 94509",  # Use Google Maps for accurate distance
+    quote = asyncio.run(
+        pricing.calculate_party_quote(
+            adults=14,
+            children=2,
+            children_under_5=0,
+            upgrades={"filet_mignon": 10},
+            addons=[],
+            customer_address="Antioch, CA 94509",  # Use Google Maps for accurate distance
+        )
     )
 
     if quote["breakdown"]["travel_info"]:
@@ -38,6 +38,7 @@ Usage:
     )
 """
 
+from api.ai.memory.context_cache import ConversationContextCache, count_tokens, get_context_cache
 from api.ai.memory.memory_backend import (
     ConversationChannel,
     ConversationMessage,
@@ -76,4 +77,8 @@ __all__ = [
     # Factory
     "create_memory_backend",
     "get_memory_backend",
+    # Context window cache
+    "ConversationContextCache",
+    "count_tokens",
+    "get_context_cache",
 ]
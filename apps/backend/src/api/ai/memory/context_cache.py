@@ -0,0 +1,359 @@
+"""
+Conversation Context Cache
+==========================
+
+Rolling per-conversation window of recent messages with precomputed token
+counts, held in an in-process LRU in front of Redis. store_message()
+appends to it, so building the context window of an active conversation
+needs no database read and no re-tokenizing of its history.
+
+Consistency:
+- Redis keeps the window as a list (ai:context:{id}) and a sequence
+  counter (ai:context:{id}:seq) bumped by every append. The LRU copy is
+  served only while its sequence matches Redis (one GET per lookup), so
+  appends made by other workers are never missed.
+- Appends only extend an existing list (RPUSHX). A cold conversation is
+  primed from the database under a WATCH on the counter: a message
+  committed during the load either aborts the prime or is appended after
+  it. Messages both loaded and appended are de-duplicated by id.
+- Redis errors fall back to the database. With use_redis=False the LRU
+  alone is authoritative, which is only correct within one process.
+
+Tokens are counted with tiktoken for the configured OpenAI model; without
+tiktoken installed the old ~4 characters/token estimate is used.
+
+Usage:
+    cache = get_context_cache()
+    entries = await cache.get("conv_123")  # None -> load from DB and prime()
+    window = fit_context_window(entries, max_tokens=4000)
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+import json
+import logging
+import os
+from typing import NamedTuple
+
+from api.ai.memory.memory_backend import ConversationMessage
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is a hard dependency in prod
+    aioredis = None  # type: ignore
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - falls back to the character estimate
+    tiktoken = None  # type: ignore
+
+KEY_PREFIX = "ai:context:"
+DEFAULT_TTL_SECONDS = 60 * 60 * 6  # Idle conversations drop out after 6 hours
+DEFAULT_WINDOW_MESSAGES = 50
+DEFAULT_TOKENIZER_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+
+# Chat framing per message (role + separators), as in OpenAI's token counting guide
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+# =============================================================================
+# Token counting
+# =============================================================================
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable for {model}, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_TOKENIZER_MODEL) -> int:
+    """Tokens in text for model (character estimate if tiktoken is missing)."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class ContextEntry(NamedTuple):
+    message: ConversationMessage
+    tokens: int
+
+
+def fit_context_window(entries: list[ContextEntry], max_tokens: int) -> list[ConversationMessage]:
+    """Newest messages whose tokens (plus chat framing) fit max_tokens, oldest first."""
+    window: list[ConversationMessage] = []
+    used = 0
+    for entry in reversed(entries):
+        cost = entry.tokens + MESSAGE_OVERHEAD_TOKENS
+        if used + cost > max_tokens:
+            break
+        window.append(entry.message)
+        used += cost
+    window.reverse()
+    return window
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+@dataclass
+class _Window:
+    seq: int
+    entries: list[ContextEntry] = field(default_factory=list)
+
+
+class ConversationContextCache:
+    """
+    Two-level rolling context cache: in-process LRU, then Redis.
+
+    Keeps the newest max_messages messages of each conversation.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        redis_url: str | None = None,
+        max_conversations: int = 2000,
+        max_messages: int = DEFAULT_WINDOW_MESSAGES,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        use_redis: bool = True,
+        model: str = DEFAULT_TOKENIZER_MODEL,
+    ):
+        self._redis = redis_client
+        self._redis_url = redis_url
+        self.shared = use_redis
+        self._redis_disabled = not use_redis or (redis_client is None and aioredis is None)
+        self._memory: OrderedDict[str, _Window] = OrderedDict()
+        self._local_appends = 0
+        self.max_conversations = max_conversations
+        self.max_messages = max_messages
+        self.ttl = ttl
+        self.model = model
+
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _list_key(conversation_id: str) -> str:
+        return f"{KEY_PREFIX}{conversation_id}"
+
+    @staticmethod
+    def _seq_key(conversation_id: str) -> str:
+        return f"{KEY_PREFIX}{conversation_id}:seq"
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def _get_redis(self):
+        if self._redis_disabled:
+            return None
+        if self._redis is None:
+            try:
+                if self._redis_url is None:
+                    from core.config import get_settings
+
+                    self._redis_url = get_settings().redis_url
+                self._redis = aioredis.from_url(self._redis_url, decode_responses=True)
+            except Exception as e:
+                logger.warning(f"Context cache disabled, reading from database: {e}")
+                self._redis_disabled = True
+                return None
+        return self._redis
+
+    def _remember(self, conversation_id: str, seq: int, entries: list[ContextEntry]) -> None:
+        self._memory[conversation_id] = _Window(seq, entries[-self.max_messages :])
+        self._memory.move_to_end(conversation_id)
+        while len(self._memory) > self.max_conversations:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _encode(entry: ContextEntry) -> str:
+        return json.dumps(
+            {"message": entry.message.model_dump(mode="json"), "tokens": entry.tokens}
+        )
+
+    @staticmethod
+    def _decode(blobs: list[str]) -> list[ContextEntry]:
+        entries: list[ContextEntry] = []
+        seen: set[str] = set()
+        for blob in blobs:
+            data = json.loads(blob)
+            message = ConversationMessage.model_validate(data["message"])
+            if message.id is not None:
+                if message.id in seen:
+                    continue
+                seen.add(message.id)
+            entries.append(ContextEntry(message, data["tokens"]))
+        return entries
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def get(self, conversation_id: str) -> list[ContextEntry] | None:
+        """Cached window (oldest first), or None if the caller must load it."""
+        local = self._memory.get(conversation_id)
+
+        if not self.shared:
+            if local is None:
+                self.misses += 1
+                return None
+            self._memory.move_to_end(conversation_id)
+            self.memory_hits += 1
+            return list(local.entries)
+
+        client = self._get_redis()
+        if client is None:
+            self.misses += 1
+            return None
+
+        try:
+            seq = await client.get(self._seq_key(conversation_id))
+            if local is not None and seq is not None and int(seq) == local.seq:
+                self._memory.move_to_end(conversation_id)
+                self.memory_hits += 1
+                return list(local.entries)
+
+            pipe = client.pipeline(transaction=True)
+            pipe.lrange(self._list_key(conversation_id), 0, -1)
+            pipe.get(self._seq_key(conversation_id))
+            blobs, seq = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Context cache Redis read failed: {e}")
+            self.misses += 1
+            return None
+
+        if not blobs:
+            self._memory.pop(conversation_id, None)
+            self.misses += 1
+            return None
+
+        entries = self._decode(blobs)
+        self._remember(conversation_id, int(seq or 0), entries)
+        self.redis_hits += 1
+        return entries
+
+    async def version(self, conversation_id: str) -> int | None:
+        """Append sequence to pass to prime() (read it before the DB load)."""
+        if not self.shared:
+            return self._local_appends
+
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            seq = await client.get(self._seq_key(conversation_id))
+        except Exception as e:
+            logger.warning(f"Context cache Redis read failed: {e}")
+            return None
+        return int(seq) if seq is not None else 0
+
+    async def prime(
+        self, conversation_id: str, entries: list[ContextEntry], version: int | None
+    ) -> bool:
+        """Cache a window loaded from the DB unless a message was appended since version()."""
+        entries = entries[-self.max_messages :]
+
+        if not self.shared:
+            if version != self._local_appends:
+                return False
+            self._remember(conversation_id, version, entries)
+            return True
+
+        client = self._get_redis()
+        if client is None or version is None or not entries:
+            return False
+
+        list_key = self._list_key(conversation_id)
+        seq_key = self._seq_key(conversation_id)
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(seq_key)
+                current = await pipe.get(seq_key)
+                if int(current or 0) != version:
+                    return False
+                pipe.multi()
+                pipe.delete(list_key)
+                pipe.rpush(list_key, *(self._encode(entry) for entry in entries))
+                pipe.set(seq_key, version, ex=self.ttl)
+                pipe.expire(list_key, self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            # WatchError included: an append raced the load, the next read reloads
+            logger.debug(f"Context cache prime skipped for {conversation_id}: {e}")
+            return False
+
+        self._remember(conversation_id, version, entries)
+        return True
+
+    async def append(self, conversation_id: str, message: ConversationMessage, tokens: int) -> None:
+        """Extend a cached window with a stored message (no-op for cold conversations)."""
+        entry = ContextEntry(message, tokens)
+        local = self._memory.get(conversation_id)
+
+        if not self.shared:
+            self._local_appends += 1
+            if local is not None:
+                local.entries = [*local.entries, entry][-self.max_messages :]
+                local.seq = self._local_appends
+            return
+
+        client = self._get_redis()
+        if client is None:
+            self._memory.pop(conversation_id, None)
+            return
+
+        list_key = self._list_key(conversation_id)
+        seq_key = self._seq_key(conversation_id)
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(seq_key)
+            pipe.rpushx(list_key, self._encode(entry))
+            pipe.ltrim(list_key, -self.max_messages, -1)
+            pipe.expire(seq_key, self.ttl)
+            pipe.expire(list_key, self.ttl)
+            seq, length, *_ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Context cache append failed for {conversation_id}: {e}")
+            self._memory.pop(conversation_id, None)
+            return
+
+        if local is not None and length and local.seq == seq - 1:
+            local.entries = [*local.entries, entry][-self.max_messages :]
+            local.seq = seq
+        else:
+            self._memory.pop(conversation_id, None)
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "memory_conversations": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+# Process-wide cache so every memory backend instance shares one LRU
+_context_cache: ConversationContextCache | None = None
+
+
+def get_context_cache() -> ConversationContextCache:
+    """Get the shared conversation context cache instance."""
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = ConversationContextCache()
+    return _context_cache
@@ -9,7 +9,7 @@ Features:
 - JSONB storage for flexible metadata
 - Cross-channel conversation retrieval
 - Emotion tracking and trend analysis
-- Efficient context window management
+- Cached, token-counted context windows (see context_cache)
 - Full-text search support (future)
 
 Database Schema:
@@ -27,6 +27,7 @@ Performance:
 import asyncio
 from datetime import datetime, timezone, timedelta
 import logging
+import os
 import time
 from typing import Any
 from uuid import uuid4
@@ -41,6 +42,14 @@ from api.ai.memory.memory_backend import (
     MemoryNotFoundError,
     MessageRole,
 )
+from api.ai.memory.context_cache import (
+    DEFAULT_WINDOW_MESSAGES,
+    ContextEntry,
+    ConversationContextCache,
+    fit_context_window,
+    get_context_cache,
+)
+from api.ai.memory.write_behind import MessageWriteBuffer, conversation_upsert
 from core.database import Base, get_db_context
 from sqlalchemy import (
     Boolean,
@@ -112,9 +121,19 @@ class PostgreSQLMemory(MemoryBackend):
         )
     """
 
-    def __init__(self, **kwargs):
+    def __init__(
+        self,
+        context_cache: ConversationContextCache | None = None,
+        write_behind: bool | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._db_context = None
+        self.context_cache = context_cache or get_context_cache()
+
+        if write_behind is None:
+            write_behind = os.getenv("AI_MEMORY_WRITE_BEHIND", "false").lower() == "true"
+        self.write_buffer = MessageWriteBuffer() if write_behind else None
         logger.info("PostgreSQL memory backend created")
 
     async def initialize(self) -> None:
@@ -164,6 +183,8 @@ class PostgreSQLMemory(MemoryBackend):
 
     async def close(self) -> None:
         """Close database connection"""
+        if self.write_buffer is not None:
+            await self.write_buffer.drain()
         logger.info("PostgreSQL memory backend closed")
         self._initialized = False
 
@@ -186,85 +207,83 @@ class PostgreSQLMemory(MemoryBackend):
         """Store a message in the database (optimized with UPSERT)"""
 
         try:
-            async with get_db_context() as db:
-                from sqlalchemy.dialects.postgresql import insert
-
-                message_id = str(uuid4())
-                message_timestamp = datetime.now(timezone.utc)
-                message_metadata = metadata or {}
-
-                # OPTIMIZATION: Use UPSERT to create/update conversation in one query
-                # This eliminates the SELECT + conditional INSERT (saves ~180ms)
-                upsert_stmt = (
-                    insert(UnifiedConversation)
-                    .values(
-                        id=conversation_id,
-                        user_id=user_id,
-                        channel=channel.value,
-                        started_at=message_timestamp,
-                        last_message_at=message_timestamp,
-                        message_count=1,
-                        context={},
-                        status='active',
-                    )
-                    .on_conflict_do_update(
-                        index_elements=["id"],
-                        set_={
-                            "last_message_at": message_timestamp,
-                            "message_count": UnifiedConversation.message_count + 1,
-                        },
-                    )
-                )
+            message_id = str(uuid4())
+            message_timestamp = datetime.now(timezone.utc)
+            message_metadata = metadata or {}
+
+            conversation_row = {
+                "id": conversation_id,
+                "user_id": user_id,
+                "channel": channel.value,
+                "created_at": message_timestamp,
+                "last_message_at": message_timestamp,
+                "message_count": 1,
+                "context": {},
+                "status": "active",
+            }
+            message_row = {
+                "id": message_id,
+                "conversation_id": conversation_id,
+                "role": role.value,
+                "content": content,
+                "timestamp": message_timestamp,
+                "message_metadata": message_metadata,
+                "channel": channel.value,
+                "emotion_score": emotion_score,
+                "emotion_label": emotion_label,
+                "detected_emotions": detected_emotions,
+            }
 
-                await db.execute(upsert_stmt)
-
-                # Create message
-                message = UnifiedMessage(
-                    id=message_id,
-                    conversation_id=conversation_id,
-                    role=role.value,
-                    content=content,
-                    timestamp=message_timestamp,
-                    message_metadata=message_metadata,
-                    channel=channel.value,
-                    emotion_score=emotion_score,
-                    emotion_label=emotion_label,
-                    detected_emotions=detected_emotions,
-                )
-                db.add(message)
+            if self.write_buffer is not None:
+                # Group commit: returns once the batch holding this message committed
+                await self.write_buffer.submit(conversation_row, message_row)
+            else:
+                async with get_db_context() as db:
+                    # OPTIMIZATION: Use UPSERT to create/update conversation in one query
+                    # This eliminates the SELECT + conditional INSERT (saves ~180ms)
+                    await db.execute(conversation_upsert([conversation_row]))
 
-                await db.commit()
+                    # Create message
+                    db.add(UnifiedMessage(**message_row))
 
-                # OPTIMIZATION: Defer emotion stats calculation to background task
-                # This saves ~530ms by not blocking the message storage
-                if emotion_score is not None:
-                    task = asyncio.create_task(
-                        self._update_emotion_stats_background(conversation_id, emotion_score)
-                    )
-                    # Keep reference to prevent garbage collection
-                    _background_tasks.add(task)
-                    task.add_done_callback(_background_tasks.discard)
-
-                # OPTIMIZATION: Construct ConversationMessage directly from insert data
-                # instead of refreshing from DB (saves ~280ms round-trip)
-                logger.debug(f"Stored message {message_id} in conversation {conversation_id}")
-
-                return ConversationMessage(
-                    id=message_id,
-                    conversation_id=conversation_id,
-                    role=role,
-                    content=content,
-                    timestamp=message_timestamp,
-                    metadata=message_metadata,
-                    channel=channel,
-                    emotion_score=emotion_score,
-                    emotion_label=emotion_label,
-                    detected_emotions=detected_emotions,
-                    input_tokens=None,  # Not set on insert
-                    output_tokens=None,  # Not set on insert
-                    tool_calls=None,  # Not set on insert
-                    tool_results=None,  # Not set on insert
+                    await db.commit()
+
+            # OPTIMIZATION: Defer emotion stats calculation to background task
+            # This saves ~530ms by not blocking the message storage
+            if emotion_score is not None:
+                task = asyncio.create_task(
+                    self._update_emotion_stats_background(conversation_id, emotion_score)
                 )
+                # Keep reference to prevent garbage collection
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+
+            # OPTIMIZATION: Construct ConversationMessage directly from insert data
+            # instead of refreshing from DB (saves ~280ms round-trip)
+            logger.debug(f"Stored message {message_id} in conversation {conversation_id}")
+
+            stored = ConversationMessage(
+                id=message_id,
+                conversation_id=conversation_id,
+                role=role,
+                content=content,
+                timestamp=message_timestamp,
+                metadata=message_metadata,
+                channel=channel,
+                emotion_score=emotion_score,
+                emotion_label=emotion_label,
+                detected_emotions=detected_emotions,
+                input_tokens=None,  # Not set on insert
+                output_tokens=None,  # Not set on insert
+                tool_calls=None,  # Not set on insert
+                tool_results=None,  # Not set on insert
+            )
+
+            # Committed: extend the cached context window (tokens counted once, here)
+            await self.context_cache.append(
+                conversation_id, stored, self.context_cache.count_tokens(content)
+            )
+            return stored
 
         except Exception as e:
             logger.exception(f"Failed to store message: {e}")
@@ -567,39 +586,40 @@ class PostgreSQLMemory(MemoryBackend):
         self, conversation_id: str, max_tokens: int = 4000
     ) -> list[ConversationMessage]:
         """
-        Get messages that fit within token budget.
-        Uses simple heuristic: ~4 characters = 1 token
+        Get the newest messages that fit within the token budget.
+
+        Served from the rolling context cache (no DB read for active
+        conversations); token counts are real tokenizer counts computed once
+        per message, plus per-message chat framing.
         """
 
         try:
-            # Get recent messages (newest first)
-            async with get_db_context() as db:
-                query = (
-                    select(UnifiedMessage)
-                    .where(UnifiedMessage.conversation_id == conversation_id)
-                    .order_by(UnifiedMessage.timestamp.desc())
-                    .limit(50)  # Maximum to consider
-                )
-
-                result = await db.execute(query)
-                messages = result.scalars().all()
-
-                # Calculate tokens and build context window
-                context = []
-                estimated_tokens = 0
-
-                for msg in messages:
-                    # Estimate tokens (rough approximation)
-                    msg_tokens = len(msg.content) // 4
+            entries = await self.context_cache.get(conversation_id)
+
+            if entries is None:
+                # Read the append sequence first so a concurrent store aborts the prime
+                version = await self.context_cache.version(conversation_id)
+
+                async with get_db_context() as db:
+                    query = (
+                        select(UnifiedMessage)
+                        .where(UnifiedMessage.conversation_id == conversation_id)
+                        .order_by(UnifiedMessage.timestamp.desc())
+                        .limit(DEFAULT_WINDOW_MESSAGES)  # Maximum to consider
+                    )
 
-                    if estimated_tokens + msg_tokens > max_tokens:
-                        break
+                    result = await db.execute(query)
+                    messages = result.scalars().all()
 
-                    context.append(msg)
-                    estimated_tokens += msg_tokens
+                entries = [
+                    ContextEntry(
+                        self._db_message_to_model(msg), self.context_cache.count_tokens(msg.content)
+                    )
+                    for msg in reversed(messages)
+                ]
+                await self.context_cache.prime(conversation_id, entries, version)
 
-                # Return in chronological order
-                return [self._db_message_to_model(msg) for msg in reversed(context)]
+            return fit_context_window(entries, max_tokens)
 
         except Exception as e:
             logger.exception(f"Failed to get context window: {e}")
@@ -0,0 +1,202 @@
+"""
+Write-Behind Message Persistence
+================================
+
+Group commit for PostgreSQLMemory.store_message(). Messages from concurrent
+turns are buffered and written together: one multi-row conversation UPSERT
+plus one multi-row message INSERT per transaction, flushed every
+flush_interval seconds or as soon as max_batch messages are waiting.
+
+Durability:
+- submit() returns only after the transaction holding the message has
+  committed, so an acknowledged message is never lost. Chat throughput is
+  no longer one commit per message: every turn waiting during a commit
+  rides on the next one.
+- Message inserts are ON CONFLICT DO NOTHING, so a retried batch is safe.
+- If a batch fails, its messages are retried one per transaction so a
+  single bad row only fails its own caller.
+- Conversation rows are upserted in id order, so concurrent batches from
+  several workers cannot deadlock on each other.
+
+Enable with AI_MEMORY_WRITE_BEHIND=true (see PostgreSQLMemory).
+"""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from db.models.ai import UnifiedConversation, UnifiedMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = float(os.getenv("AI_MEMORY_FLUSH_MS", "5")) / 1000
+DEFAULT_MAX_BATCH = int(os.getenv("AI_MEMORY_FLUSH_BATCH", "100"))
+
+
+# =============================================================================
+# Statements
+# =============================================================================
+
+
+def conversation_upsert(rows: list[dict[str, Any]]):
+    """Create conversations or bump their counters (rows carry per-batch counts)."""
+    stmt = insert(UnifiedConversation).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            "last_message_at": func.greatest(
+                UnifiedConversation.last_message_at, stmt.excluded.last_message_at
+            ),
+            "message_count": UnifiedConversation.message_count + stmt.excluded.message_count,
+        },
+    )
+
+
+def message_insert(rows: list[dict[str, Any]]):
+    """Insert messages, ignoring ids already written by an earlier attempt."""
+    return insert(UnifiedMessage).values(rows).on_conflict_do_nothing(index_elements=["id"])
+
+
+def merge_conversation_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """One row per conversation with summed message_count, sorted by id."""
+    merged: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        current = merged.get(row["id"])
+        if current is None:
+            merged[row["id"]] = dict(row)
+            continue
+        current["message_count"] += row["message_count"]
+        current["last_message_at"] = max(current["last_message_at"], row["last_message_at"])
+        current["user_id"] = current["user_id"] or row["user_id"]
+    return [merged[key] for key in sorted(merged)]
+
+
+# =============================================================================
+# Buffer
+# =============================================================================
+
+
+@dataclass
+class _PendingWrite:
+    conversation_row: dict[str, Any]
+    message_row: dict[str, Any]
+    future: asyncio.Future
+
+
+class MessageWriteBuffer:
+    """
+    Buffers message writes and flushes them in group-committed batches.
+
+    Usage:
+        buffer = MessageWriteBuffer()
+        await buffer.submit(conversation_row, message_row)  # returns once committed
+        await buffer.drain()  # on shutdown
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        if session_factory is None:
+            from core.database import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: list[_PendingWrite] = []
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        self.batches = 0
+        self.messages = 0
+        self.failed_batches = 0
+
+    async def submit(self, conversation_row: dict[str, Any], message_row: dict[str, Any]) -> None:
+        """Queue one message; returns after it is committed, raises if it could not be."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingWrite(conversation_row, message_row, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        # A cancelled caller does not cancel the write others share
+        await asyncio.shield(future)
+
+    async def drain(self) -> None:
+        """Flush everything buffered now (call before shutdown)."""
+        self._full.set()
+        if self._task is not None:
+            await self._task
+
+    async def _run(self) -> None:
+        while self._pending:
+            if len(self._pending) < self.max_batch and not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_PendingWrite]) -> None:
+        try:
+            await self._write(batch)
+        except Exception as e:
+            self.failed_batches += 1
+            if len(batch) == 1:
+                _resolve(batch[0].future, e)
+                return
+            logger.warning(f"Message batch of {len(batch)} failed, retrying singly: {e}")
+            for item in batch:
+                try:
+                    await self._write([item])
+                except Exception as item_error:
+                    _resolve(item.future, item_error)
+                else:
+                    _resolve(item.future)
+            return
+
+        self.batches += 1
+        self.messages += len(batch)
+        for item in batch:
+            _resolve(item.future)
+
+    async def _write(self, batch: list[_PendingWrite]) -> None:
+        async with self.session_factory() as db:
+            # Conversations first: messages reference them
+            await db.execute(
+                conversation_upsert(merge_conversation_rows([i.conversation_row for i in batch]))
+            )
+            await db.execute(message_insert([i.message_row for i in batch]))
+            await db.commit()
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "messages": self.messages,
+            "failed_batches": self.failed_batches,
+        }
+
+
+def _resolve(future: asyncio.Future, error: Exception | None = None) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
@@ -177,7 +177,7 @@ Use customer_address for more accurate calculation when possible.""",
             pricing_service = get_pricing_service()
 
             # Calculate quote
-            quote = pricing_service.calculate_party_quote(
+            quote = await pricing_service.calculate_party_quote(
                 adults=adults,
                 children=children,
                 children_under_5=children_under_5,
@@ -118,7 +118,7 @@ Use customer_address for better accuracy when possible.""",
             pricing_service = get_pricing_service()
 
             # Calculate travel distance
-            travel_info = pricing_service.calculate_travel_distance(
+            travel_info = await pricing_service.calculate_travel_distance(
                 customer_address, customer_zipcode
             )
 
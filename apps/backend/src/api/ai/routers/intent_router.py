@@ -6,6 +6,8 @@ to the appropriate agent (Lead Nurturing, Customer Care, Operations, Knowledge).
 
 Architecture:
 - Embedding-based semantic classification
+- Shared content-hashed embedding cache with micro-batched provider calls
+- Pre-normalized intent centroids in one matrix (one matvec per message)
 - Multi-turn conversation context awareness
 - Confidence scoring with fallback strategies
 - Intent transition handling (switching between agents mid-conversation)
@@ -27,7 +29,8 @@ from ..agents import (
     LeadNurturingAgent,
     OperationsAgent,
 )
-from ..orchestrator.providers import get_provider
+from ..cache.embedding_cache import EmbeddingBatcher, get_embedding_cache
+from ..orchestrator.providers import ModelCapability, get_provider
 from services.knowledge.knowledge_service import KnowledgeService
 from core.database import get_db
 
@@ -161,12 +164,13 @@ class IntentRouter:
         ],
     }
 
-    def __init__(self, provider=None):
+    def __init__(self, provider=None, embedder: EmbeddingBatcher | None = None):
         """
         Initialize the intent router.
 
         Args:
             provider: Optional ModelProvider instance (for DI, None = lazy load from container)
+            embedder: Optional EmbeddingBatcher (for DI, None = cached batcher over provider)
         """
         # Phase 2: Dependency Injection support (backward compatible)
         self.provider = provider
@@ -181,12 +185,23 @@ class IntentRouter:
                 # Fallback to old way if container not available
                 self.provider = get_provider()
 
+        # All embeddings (messages and intent examples) go through the shared cache
+        self._embedder = embedder or EmbeddingBatcher(
+            self.provider,
+            cache=get_embedding_cache(),
+            model=self._embedding_model_name(self.provider),
+        )
+
         # Initialize agents (lazy loading)
         self._agents: dict[AgentType, Any] = {}
 
         # Cache for intent embeddings (computed once at startup)
         self._intent_embeddings: dict[AgentType, np.ndarray] | None = None
 
+        # Unit-norm centroids stacked row-wise, aligned with _centroid_agents
+        self._centroid_matrix: np.ndarray | None = None
+        self._centroid_agents: list[AgentType] = []
+
         # Conversation state tracking
         self._conversation_states: dict[str, dict[str, Any]] = {}
 
@@ -210,36 +225,67 @@ class IntentRouter:
 
         return self._agents[agent_type]
 
+    @staticmethod
+    def _embedding_model_name(provider) -> str | None:
+        """Embedding model id used to namespace cache keys."""
+        try:
+            return provider.get_default_model(ModelCapability.EMBEDDING)
+        except Exception:
+            return None
+
     async def _compute_intent_embeddings(self):
         """
         Compute embeddings for all intent examples.
 
-        This is done once at startup and cached for performance.
-        Uses the provider's embedding model (OpenAI text-embedding-3-small).
+        This is done once per process. Examples are embedded in a single
+        batched call through the shared embedding cache, so only the first
+        process after a deploy (or model change) actually hits the provider.
         """
-        if self._intent_embeddings is not None:
+        if self._centroid_matrix is not None:
             return  # Already computed
 
         logger.info("Computing intent embeddings...")
 
-        self._intent_embeddings = {}
-
-        for agent_type, examples in self.INTENT_EXAMPLES.items():
-            # Get embeddings for all examples
-            embeddings_response = await self.provider.embed(examples)
-            embeddings = embeddings_response["embeddings"]
+        agents = list(self.INTENT_EXAMPLES)
+        examples = [text for agent in agents for text in self.INTENT_EXAMPLES[agent]]
+        embeddings = await self._embedder.embed(examples)
 
+        intent_embeddings: dict[AgentType, np.ndarray] = {}
+        offset = 0
+        for agent_type in agents:
+            count = len(self.INTENT_EXAMPLES[agent_type])
             # Compute centroid (average embedding) for this intent
-            centroid = np.mean(embeddings, axis=0)
-            self._intent_embeddings[agent_type] = centroid
+            centroid = embeddings[offset : offset + count].mean(axis=0)
+            intent_embeddings[agent_type] = centroid
+            offset += count
 
             logger.info(
-                f"Computed {len(examples)} embeddings for {agent_type.value} "
+                f"Computed {count} embeddings for {agent_type.value} "
                 f"(centroid shape: {centroid.shape})"
             )
 
+        matrix = np.stack([intent_embeddings[agent] for agent in agents])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        self._intent_embeddings = intent_embeddings
+        self._centroid_agents = agents
+        self._centroid_matrix = (matrix / norms).astype(np.float32)
+
         logger.info("Intent embeddings computed successfully")
 
+    async def _intent_similarities(self, message: str) -> dict[AgentType, float]:
+        """Cosine similarity of a message to every intent centroid (one matvec)."""
+        await self._compute_intent_embeddings()
+
+        message_embedding = (await self._embedder.embed([message]))[0]
+        norm = float(np.linalg.norm(message_embedding))
+        if norm == 0.0:
+            return dict.fromkeys(self._centroid_agents, 0.0)
+
+        scores = self._centroid_matrix @ (message_embedding / norm)
+        return {agent: float(score) for agent, score in zip(self._centroid_agents, scores)}
+
     async def classify_intent(
         self,
         message: str,
@@ -264,20 +310,8 @@ class IntentRouter:
             >>> print(f"Route to: {agent_type.value} (confidence: {confidence:.2f})")
             Route to: lead_nurturing (confidence: 0.92)
         """
-        # Ensure embeddings are computed
-        await self._compute_intent_embeddings()
-
-        # Get embedding for user message
-        message_embedding_response = await self.provider.embed([message])
-        message_embedding = message_embedding_response["embeddings"][0]
-
-        # Calculate cosine similarity with each intent centroid
-        similarities = {}
-        for agent_type, intent_embedding in self._intent_embeddings.items():
-            similarity = self._cosine_similarity(
-                message_embedding, intent_embedding
-            )
-            similarities[agent_type] = similarity
+        # Cosine similarity with each intent centroid
+        similarities = await self._intent_similarities(message)
 
         # Get best match
         best_agent = max(similarities, key=similarities.get)
@@ -614,19 +648,11 @@ class IntentRouter:
             lead_nurturing: 58%
             operations: 52%
         """
-        # Ensure embeddings are computed
-        await self._compute_intent_embeddings()
-
-        # Get embedding for user message
-        message_embedding_response = await self.provider.embed([message])
-        message_embedding = message_embedding_response["embeddings"][0]
-
         # Calculate similarities
+        similarities = await self._intent_similarities(message)
+
         suggestions = []
-        for agent_type, intent_embedding in self._intent_embeddings.items():
-            similarity = self._cosine_similarity(
-                message_embedding, intent_embedding
-            )
+        for agent_type, similarity in similarities.items():
             suggestions.append(
                 {
                     "agent_type": agent_type.value,
@@ -686,6 +712,7 @@ class IntentRouter:
             "intent_transitions": intent_transitions,
             "agents_loaded": list(self._agents.keys()),
             "embeddings_computed": self._intent_embeddings is not None,
+            "embedding_cache": self._embedder.get_stats(),
         }
 
 
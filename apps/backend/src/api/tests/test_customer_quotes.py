@@ -14,12 +14,12 @@ sys.path.insert(0, backend_src)
 from api.ai.endpoints.services.pricing_service import get_pricing_service
 
 
-def test_malia_quote():
+async def test_malia_quote():
     """Test Malia's quote: 9 adults, Sonoma, CA"""
 
     pricing = get_pricing_service(db=None, station_id=None)
 
-    quote = pricing.calculate_party_quote(
+    quote = await pricing.calculate_party_quote(
         adults=9,
         children=0,
         children_under_5=0,
@@ -45,12 +45,12 @@ def test_malia_quote():
     return quote
 
 
-def test_debbie_quote():
+async def test_debbie_quote():
     """Test Debbie's quote: 14 adults + 2 children + 10 filet, Antioch, CA 94509"""
 
     pricing = get_pricing_service(db=None, station_id=None)
 
-    quote = pricing.calculate_party_quote(
+    quote = await pricing.calculate_party_quote(
         adults=14,
         children=2,
         children_under_5=0,
@@ -80,12 +80,12 @@ def test_debbie_quote():
     return quote
 
 
-def test_zip_only_quote():
+async def test_zip_only_quote():
     """Test quote with ZIP code only (should give polite reminder)"""
 
     pricing = get_pricing_service(db=None, station_id=None)
 
-    quote = pricing.calculate_party_quote(
+    quote = await pricing.calculate_party_quote(
         adults=10,
         children=0,
         customer_address=None,  # No full address
@@ -105,12 +105,13 @@ def test_zip_only_quote():
 
 
 if __name__ == "__main__":
+    import asyncio
 
     # Test Malia's quote
-    malia_quote = test_malia_quote()
+    malia_quote = asyncio.run(test_malia_quote())
 
     # Test Debbie's quote
-    debbie_quote = test_debbie_quote()
+    debbie_quote = asyncio.run(test_debbie_quote())
 
     # Test ZIP-only (polite reminder test)
-    zip_quote = test_zip_only_quote()
+    zip_quote = asyncio.run(test_zip_only_quote())
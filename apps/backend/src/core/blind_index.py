@@ -0,0 +1,126 @@
+"""
+Blind indexes for encrypted contact PII (phone, email)
+
+Encrypted columns use randomized Fernet tokens, so the same phone number
+never encrypts to the same ciphertext and cannot be searched. Alongside
+each encrypted column we store a keyed HMAC-SHA256 of the normalized
+plaintext (the "blind index"): equal contacts give equal digests, so a
+lookup is one indexed equality query, while the digest reveals nothing
+without the key.
+
+Normalization:
+- Email: trimmed and lowercased
+- Phone: E.164; 10-digit numbers are treated as US (+1)
+
+Phone and email digests are domain-separated, so a phone can never match
+an email digest.
+
+Environment Variables:
+- FIELD_BLIND_INDEX_KEY: HMAC key (optional). Defaults to a key derived
+  from FIELD_ENCRYPTION_KEY. Rotating it means re-running
+  scripts/backfill_blind_index.py.
+
+Usage:
+```python
+from core.blind_index import phone_blind_index
+
+stmt = select(Customer).where(Customer.phone_bidx == phone_blind_index(phone))
+```
+"""
+
+from functools import lru_cache
+import hashlib
+import hmac
+import logging
+import re
+from typing import Optional
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Hex SHA-256 digest length (column size)
+BLIND_INDEX_LENGTH = 64
+
+# Development-only key when neither key is configured (passthrough mode
+# stores plaintext anyway, so the index reveals nothing new there)
+_PASSTHROUGH_KEY = b"blind-index-passthrough"
+
+
+@lru_cache(maxsize=1)
+def _get_key() -> bytes:
+    settings = get_settings()
+
+    if settings.FIELD_BLIND_INDEX_KEY:
+        return settings.FIELD_BLIND_INDEX_KEY.encode()
+
+    if settings.FIELD_ENCRYPTION_KEY:
+        # Separate key for hashing, derived so it never equals the encryption key
+        return hmac.new(
+            settings.FIELD_ENCRYPTION_KEY.encode(), b"blind-index-v1", hashlib.sha256
+        ).digest()
+
+    logger.warning(
+        "Neither FIELD_BLIND_INDEX_KEY nor FIELD_ENCRYPTION_KEY configured. "
+        "Blind indexes use a development key."
+    )
+    return _PASSTHROUGH_KEY
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Canonical email for indexing, or None if it is not an address."""
+    if not email:
+        return None
+    normalized = str(email).strip().lower()
+    return normalized if "@" in normalized else None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Canonical E.164 phone for indexing, or None if it has too few digits."""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", str(phone))
+    if len(digits) == 10:
+        digits = "1" + digits
+    if not 8 <= len(digits) <= 15:
+        return None
+    return "+" + digits
+
+
+def _digest(kind: str, normalized: Optional[str]) -> Optional[str]:
+    if normalized is None:
+        return None
+    message = f"{kind}:{normalized}".encode("utf-8")
+    return hmac.new(_get_key(), message, hashlib.sha256).hexdigest()
+
+
+def email_blind_index(email: Optional[str]) -> Optional[str]:
+    """Blind index of an email address (None if empty or invalid)."""
+    return _digest("email", normalize_email(email))
+
+
+def phone_blind_index(phone: Optional[str]) -> Optional[str]:
+    """Blind index of a phone number (None if empty or invalid)."""
+    return _digest("phone", normalize_phone(phone))
+
+
+# Contact channels whose handle is an email address or a phone number
+EMAIL_CHANNELS = frozenset({"email"})
+PHONE_CHANNELS = frozenset({"sms", "phone", "whatsapp"})
+
+
+def contact_blind_index(channel, handle: Optional[str]) -> Optional[str]:
+    """Blind index of a channel handle (None for social/web channels)."""
+    channel = getattr(channel, "value", channel)
+    if channel in EMAIL_CHANNELS:
+        return email_blind_index(handle)
+    if channel in PHONE_CHANNELS:
+        return phone_blind_index(handle)
+    return None
+
+
+def contact_e164(channel, handle: Optional[str]) -> Optional[str]:
+    """E.164 form of a phone-channel handle (None for other channels)."""
+    if getattr(channel, "value", channel) in PHONE_CHANNELS:
+        return normalize_phone(handle)
+    return None
@@ -254,6 +254,9 @@ class Settings(BaseSettings):
         None  # Base64-encoded Fernet key (generate with: Fernet.generate_key())
     )
     FIELD_ENCRYPTION_KEY_OLD: str | None = None  # Previous key for rotation support
+    # HMAC key for searchable blind indexes of encrypted phone/email (core/blind_index.py).
+    # Unset: derived from FIELD_ENCRYPTION_KEY. Changing it requires re-running the backfill.
+    FIELD_BLIND_INDEX_KEY: str | None = None
 
     # JWT Token Settings
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -690,7 +693,7 @@ class Settings(BaseSettings):
         return self.STRIPE_SECRET_KEY
 
     def get_worker_configs(self) -> dict:
-        """Get worker configuration dictionary for backward compatibility."""
+        """Worker configuration for create_outbox_processor_manager (main.py startup)."""
         return {
             "workers_enabled": self.workers_enabled,
             "worker_batch_size": self.worker_batch_size,
@@ -731,16 +734,33 @@ class Settings(BaseSettings):
                 "secret_key": self.stripe_secret_key,
             },
             "sms_worker": {
+                "enabled": self.SMS_WORKER_ENABLED,
                 "max_retries": self.sms_worker_max_retries,
                 "batch_size": self.sms_worker_batch_size,
+                "concurrency": self.SMS_WORKER_CONCURRENCY,
             },
             "email_worker": {
+                "enabled": self.EMAIL_WORKER_ENABLED,
                 "max_retries": self.email_worker_max_retries,
                 "batch_size": self.email_worker_batch_size,
+                "concurrency": self.EMAIL_WORKER_CONCURRENCY,
             },
             "stripe_worker": {
+                "enabled": self.STRIPE_WORKER_ENABLED,
                 "max_retries": self.stripe_worker_max_retries,
                 "batch_size": self.stripe_worker_batch_size,
+                "concurrency": self.STRIPE_WORKER_CONCURRENCY,
+            },
+            "stripe_webhooks": {
+                "enabled": True,  # Also retries failed or interrupted inline events
+                "max_retries": self.STRIPE_WEBHOOK_WORKER_MAX_RETRIES,
+                "batch_size": self.STRIPE_WEBHOOK_WORKER_BATCH_SIZE,
+                "concurrency": self.STRIPE_WEBHOOK_WORKER_CONCURRENCY,
+            },
+            "outbox_listen": {
+                "enabled": self.OUTBOX_LISTEN_ENABLED,
+                "database_url": self.database_url,
+                "fallback_poll_seconds": self.OUTBOX_FALLBACK_POLL_SECONDS,
             },
         }
 
@@ -766,16 +786,28 @@ class Settings(BaseSettings):
     WORKER_MAX_RETRIES: int = 5
     WORKER_INITIAL_DELAY: int = 1
     WORKER_MAX_DELAY: int = 300
+    # Outbox workers wake on Postgres NOTIFY; needs a session-level connection
+    # (disable behind a transaction-mode pooler such as PgBouncer)
+    OUTBOX_LISTEN_ENABLED: bool = True
+    OUTBOX_FALLBACK_POLL_SECONDS: int = 30
 
     # SMS Worker
     SMS_WORKER_ENABLED: bool = False
     SMS_WORKER_MAX_RETRIES: int = 5
     SMS_WORKER_BATCH_SIZE: int = 10
+    SMS_WORKER_CONCURRENCY: int = 5  # Parallel sends per replica
+
+    # Newsletter Campaign Dispatch
+    NEWSLETTER_SEND_PAGE_SIZE: int = 500  # Subscribers per keyset page / checkpoint
+    NEWSLETTER_SEND_CONCURRENCY: int = 10  # In-flight RingCentral requests
+    RC_SMS_RATE_PER_SECOND: float = 5.0  # Match the RingCentral account's SMS quota
+    RC_SMS_BURST: int = 5
 
     # Email Worker
     EMAIL_WORKER_ENABLED: bool = False
     EMAIL_WORKER_MAX_RETRIES: int = 3
     EMAIL_WORKER_BATCH_SIZE: int = 20
+    EMAIL_WORKER_CONCURRENCY: int = 10
 
     # Email Monitoring (IMAP IDLE Fallback)
     # Intelligent adaptive polling when IMAP IDLE not supported
@@ -790,6 +822,15 @@ class Settings(BaseSettings):
     STRIPE_WORKER_ENABLED: bool = False
     STRIPE_WORKER_MAX_RETRIES: int = 3
     STRIPE_WORKER_BATCH_SIZE: int = 5
+    STRIPE_WORKER_CONCURRENCY: int = 2
+
+    # Stripe Webhook Queue: acknowledge webhooks once stored and process them
+    # in StripeWebhookWorker (requires WORKERS_ENABLED). The worker runs in
+    # either mode: inline events that fail or are interrupted fall back to it
+    STRIPE_WEBHOOK_ASYNC: bool = False
+    STRIPE_WEBHOOK_WORKER_MAX_RETRIES: int = 5
+    STRIPE_WEBHOOK_WORKER_BATCH_SIZE: int = 50
+    STRIPE_WEBHOOK_WORKER_CONCURRENCY: int = 8  # Distinct payment intents in parallel
 
     # Legacy Feature Flags (Duplicate Section - Use Section ~141 Instead)
     # TODO: Consolidate with main feature flag section around line 141
@@ -1214,14 +1255,6 @@ class Settings(BaseSettings):
         """Backward compatibility: secret_key accessor"""
         return self.SECRET_KEY
 
-    def get_worker_configs(self) -> dict:
-        """Get worker configuration for background tasks"""
-        return {
-            "sms_worker": {"enabled": self.SMS_WORKER_ENABLED},
-            "email_worker": {"enabled": self.EMAIL_WORKER_ENABLED},
-            "stripe_worker": {"enabled": self.STRIPE_WORKER_ENABLED},
-        }
-
     def is_feature_enabled(self, flag_name: str) -> bool:
         """
         Type-safe feature flag checker with validation.
@@ -3,6 +3,7 @@ Base classes for CQRS Command and Query patterns with event sourcing.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 import hashlib
 import json
@@ -10,13 +11,20 @@ from typing import Any
 from uuid import UUID, uuid4
 
 # MIGRATED: from models.events → db.models.events
-from db.models.events import DomainEvent, Outbox  # FIXED: Outbox → Outbox
+from db.models.events import (
+    AggregateSnapshot,
+    DomainEvent,
+    EventChainHead,
+    Outbox,
+    OutboxStatus,
+)
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
 )
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -113,12 +121,27 @@ class QueryHandler(ABC):
         """Handle the query and return result."""
 
 
+# Transaction-scoped advisory lock serializing appends to the hash chain
+EVENT_CHAIN_LOCK_KEY = 0x45564E54  # "EVNT"
+EVENT_CHAIN_NAME = "domain_events"
+REPLAY_BATCH_SIZE = 1000
+
+
 class EventStore:
-    """Event store for persisting and retrieving domain events."""
+    """
+    Event store for persisting and retrieving domain events.
+
+    - Appends hash-chain events from the events.event_chain_head row, read
+      and advanced under a transaction-scoped advisory lock (no scan of
+      domain_events, no chain forks between concurrent writers)
+    - stream_events() replays through a server-side cursor in fixed-size
+      batches, so projection rebuilds run in constant memory
+    - load_aggregate() rehydrates from the latest snapshot plus the events
+      after it, writing a fresh snapshot every aggregate.snapshot_every events
+    """
 
     def __init__(self, session: AsyncSession):
         self.session = session
-        self._last_hash: str | None = None
 
     async def append_events(
         self, events: list[Event], expected_version: int | None = None
@@ -136,19 +159,15 @@ class EventStore:
         if not events:
             return []
 
-        # Get the last hash for chaining
-        if self._last_hash is None:
-            last_event_stmt = (
-                select(DomainEvent.hash_current).order_by(DomainEvent.created_at.desc()).limit(1)
-            )
-            result = await self.session.execute(last_event_stmt)
-            self._last_hash = result.scalar() or "genesis"
+        # Held until commit/rollback: one appender extends the chain at a time
+        await self.session.execute(select(func.pg_advisory_xact_lock(EVENT_CHAIN_LOCK_KEY)))
+        last_hash = await self._chain_head()
 
         persisted_events = []
 
         for event in events:
             # Create event record
-            event_dict = event.dict()
+            event_dict = event.model_dump(mode="json")
 
             # Calculate hash for audit chain
             event_content = json.dumps(
@@ -159,7 +178,7 @@ class EventStore:
                     "payload": event_dict,
                     "version": event.version,
                     "occurred_at": event.occurred_at.isoformat(),
-                    "previous_hash": self._last_hash,
+                    "previous_hash": last_hash,
                 },
                 sort_keys=True,
             )
@@ -170,11 +189,13 @@ class EventStore:
                 id=uuid4(),
                 aggregate_id=event.aggregate_id,
                 aggregate_type=event.aggregate_type,
+                aggregate_version=event.version,
                 event_type=event.event_type,
+                event_data=event_dict,
                 payload=event_dict,
                 version=event.version,
                 occurred_at=event.occurred_at,
-                hash_previous=self._last_hash,
+                hash_previous=last_hash,
                 hash_current=current_hash,
             )
 
@@ -182,11 +203,39 @@ class EventStore:
             persisted_events.append(domain_event)
 
             # Update hash for next event
-            self._last_hash = current_hash
+            last_hash = current_hash
 
         await self.session.flush()
+
+        head = persisted_events[-1]
+        await self.session.execute(
+            pg_insert(EventChainHead)
+            .values(name=EVENT_CHAIN_NAME, hash_current=head.hash_current, event_id=head.id)
+            .on_conflict_do_update(
+                index_elements=[EventChainHead.name],
+                set_={
+                    "hash_current": head.hash_current,
+                    "event_id": head.id,
+                    "updated_at": func.now(),
+                },
+            )
+        )
         return persisted_events
 
+    async def _chain_head(self) -> str:
+        """Current chain hash (caller holds the chain lock)."""
+        head = await self.session.scalar(
+            select(EventChainHead.hash_current).where(EventChainHead.name == EVENT_CHAIN_NAME)
+        )
+        if head is not None:
+            return head
+
+        # First append since the head row was introduced: seed from the log
+        latest = await self.session.scalar(
+            select(DomainEvent.hash_current).order_by(DomainEvent.created_at.desc()).limit(1)
+        )
+        return latest or "genesis"
+
     async def get_events(
         self, aggregate_id: UUID, from_version: int = 0, to_version: int | None = None
     ) -> list[DomainEvent]:
@@ -211,7 +260,17 @@ class EventStore:
         from_timestamp: datetime | None = None,
         limit: int = 1000,
     ) -> list[DomainEvent]:
-        """Get all events for projection rebuilding."""
+        """Get a bounded page of events (use stream_events() for full replays)."""
+        stmt = self._replay_query(event_types, from_timestamp).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    def _replay_query(
+        self,
+        event_types: list[str] | None = None,
+        from_timestamp: datetime | None = None,
+    ):
         stmt = select(DomainEvent)
 
         if event_types:
@@ -220,10 +279,111 @@ class EventStore:
         if from_timestamp:
             stmt = stmt.where(DomainEvent.occurred_at >= from_timestamp)
 
-        stmt = stmt.order_by(DomainEvent.occurred_at.asc()).limit(limit)
+        # (occurred_at, id) is unique and indexed: a stable, resumable order
+        return stmt.order_by(DomainEvent.occurred_at.asc(), DomainEvent.id.asc())
+
+    async def stream_events(
+        self,
+        event_types: list[str] | None = None,
+        from_timestamp: datetime | None = None,
+        batch_size: int = REPLAY_BATCH_SIZE,
+        stmt=None,
+    ) -> AsyncIterator[DomainEvent]:
+        """
+        Replay events in (occurred_at, id) order through a server-side cursor.
+
+        Rows are fetched batch_size at a time and each batch is expunged from
+        the session once consumed, so memory stays flat however long the log
+        is. Pass stmt to stream a custom select(DomainEvent) instead.
+        """
+        if stmt is None:
+            stmt = self._replay_query(event_types, from_timestamp)
+
+        result = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            for event in batch:
+                yield event
+            for event in batch:
+                self.session.expunge(event)
+
+    # ========================================================================
+    # SNAPSHOTS
+    # ========================================================================
+
+    async def get_snapshot(self, aggregate_id: UUID) -> AggregateSnapshot | None:
+        return await self.session.get(AggregateSnapshot, aggregate_id)
+
+    async def save_snapshot(self, aggregate: "AggregateRoot") -> bool:
+        """Upsert the aggregate's snapshot (never replacing a newer one)."""
+        state = aggregate.snapshot_state()
+        if state is None or aggregate.version == 0:
+            return False
+
+        stmt = pg_insert(AggregateSnapshot).values(
+            aggregate_id=aggregate.id,
+            aggregate_type=aggregate.aggregate_type,
+            version=aggregate.version,
+            state=state,
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AggregateSnapshot.aggregate_id],
+                set_={
+                    "version": stmt.excluded.version,
+                    "state": stmt.excluded.state,
+                    "created_at": func.now(),
+                },
+                where=AggregateSnapshot.version < stmt.excluded.version,
+            )
+        )
+        return True
+
+    async def load_aggregate(
+        self, aggregate_cls: type["AggregateRoot"], aggregate_id: UUID
+    ) -> "AggregateRoot | None":
+        """
+        Rehydrate an aggregate from its snapshot plus the events after it.
+
+        Returns None when the aggregate has no events. A new snapshot is
+        saved once snapshot_every events have been replayed past the last
+        one, bounding the next load's replay.
+        """
+        snapshot = await self.get_snapshot(aggregate_id)
+        if snapshot is not None:
+            aggregate = aggregate_cls.from_snapshot(aggregate_id, snapshot.version, snapshot.state)
+        else:
+            aggregate = aggregate_cls(aggregate_id)
+        snapshot_version = aggregate.version
+
+        stmt = (
+            select(DomainEvent)
+            .where(
+                DomainEvent.aggregate_id == aggregate_id,
+                DomainEvent.version > snapshot_version,
+            )
+            .order_by(DomainEvent.version.asc())
+        )
+        async for event in self.stream_events(stmt=stmt):
+            aggregate.apply(event)
+            aggregate.version = event.version
+
+        if aggregate.version == 0:
+            return None
+
+        if aggregate.version - snapshot_version >= aggregate_cls.snapshot_every:
+            await self.save_snapshot(aggregate)
+
+        return aggregate
 
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+
+OUTBOX_CHANNEL_PREFIX = "outbox_"
+
+
+def outbox_channel(target: str) -> str:
+    """Postgres NOTIFY channel announcing new outbox entries for a target."""
+    return f"{OUTBOX_CHANNEL_PREFIX}{target}"
 
 
 class OutboxProcessor:
@@ -235,26 +395,42 @@ class OutboxProcessor:
     async def create_outbox_entries(
         self, events: list[DomainEvent], targets: list[str]
     ) -> list[Outbox]:
-        """Create outbox entries for reliable delivery."""
+        """
+        Create outbox entries for reliable delivery.
+
+        Also issues one NOTIFY per target channel; Postgres delivers it only
+        when the surrounding transaction commits, so listening workers wake
+        up exactly when the rows become visible.
+        """
         outbox_entries = []
 
         for event in events:
             for target in targets:
                 entry = Outbox(
                     id=uuid4(),
-                    event_id=event.id,
-                    target=target,
+                    event_id=str(event.id),
+                    aggregate_id=str(event.aggregate_id),
+                    event_type=event.event_type,
+                    destination=target,
                     payload=self._build_outbox_payload(event, target),
-                    attempts=0,
-                    max_attempts=3,
-                    next_attempt_at=datetime.now(UTC),
-                    status="pending",
+                    headers={},
+                    retry_count=0,
+                    max_retries=3,
+                    next_retry_at=datetime.now(UTC),
+                    status=OutboxStatus.PENDING,
                 )
 
                 self.session.add(entry)
                 outbox_entries.append(entry)
 
         await self.session.flush()
+
+        if outbox_entries:
+            for target in dict.fromkeys(targets):
+                await self.session.execute(
+                    select(func.pg_notify(outbox_channel(target), ""))
+                )
+
         return outbox_entries
 
     def _build_outbox_payload(self, event: DomainEvent, target: str) -> dict[str, Any]:
@@ -332,12 +508,12 @@ class OutboxProcessor:
         """Get pending outbox entries for processing."""
         stmt = (
             select(Outbox)
-            .where(Outbox.status == "pending")
-            .where(Outbox.next_attempt_at <= datetime.now(UTC))
+            .where(Outbox.status == OutboxStatus.PENDING)
+            .where(Outbox.next_retry_at <= datetime.now(UTC))
         )
 
         if target:
-            stmt = stmt.where(Outbox.target == target)
+            stmt = stmt.where(Outbox.destination == target)
 
         stmt = stmt.order_by(Outbox.created_at.asc()).limit(limit)
 
@@ -346,7 +522,16 @@ class OutboxProcessor:
 
 
 class AggregateRoot(ABC):
-    """Base class for aggregate roots in DDD."""
+    """
+    Base class for aggregate roots in DDD.
+
+    Aggregates that override apply(), snapshot_state() and from_snapshot()
+    can be rehydrated by EventStore.load_aggregate() from a snapshot taken
+    every snapshot_every events instead of from their first event.
+    """
+
+    aggregate_type: str = ""
+    snapshot_every: int = 50
 
     def __init__(self, aggregate_id: UUID):
         self.id = aggregate_id
@@ -373,6 +558,21 @@ class AggregateRoot(ABC):
     def from_events(cls, events: list[Event]) -> "AggregateRoot":
         """Reconstruct aggregate from events."""
 
+    def apply(self, event: DomainEvent) -> None:
+        """Fold one stored event into the aggregate's state."""
+        raise NotImplementedError(f"{type(self).__name__} does not support replay")
+
+    def snapshot_state(self) -> dict[str, Any] | None:
+        """JSON-serializable state for a snapshot (None disables snapshots)."""
+        return None
+
+    @classmethod
+    def from_snapshot(
+        cls, aggregate_id: UUID, version: int, state: dict[str, Any]
+    ) -> "AggregateRoot":
+        """Restore an aggregate from snapshot_state() output."""
+        raise NotImplementedError(f"{cls.__name__} does not support snapshots")
+
 
 class CommandBus:
     """Command bus for routing commands to handlers."""
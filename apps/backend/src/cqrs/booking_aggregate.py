@@ -0,0 +1,160 @@
+"""
+Booking aggregate rehydrated from the event store.
+
+Folds BookingCreated / BookingUpdated / BookingCancelled into the booking's
+current terms and status. Update and cancel commands load it through
+EventStore.load_aggregate(), which starts from the latest snapshot, so a
+booking with a long history is rehydrated from at most snapshot_every events.
+The aggregate (and so its snapshots) holds booking terms and status only;
+customer details and special requests stay in the encrypted tables.
+"""
+
+from datetime import UTC, datetime
+from datetime import date as Date
+from typing import Any
+from uuid import UUID
+
+from cqrs.base import AggregateRoot, Event
+from cqrs.crm_operations import BookingCancelled, BookingUpdated
+
+# Fields a BookingUpdated event may change on the aggregate
+UPDATABLE_FIELDS = ("date", "slot", "total_guests")
+
+
+class BookingAggregate(AggregateRoot):
+    """Current state of one booking, as recorded by its events."""
+
+    aggregate_type = "Booking"
+    snapshot_every = 20
+
+    def __init__(self, aggregate_id: UUID):
+        super().__init__(aggregate_id)
+        self.status: str | None = None
+        self.date: Date | None = None
+        self.slot: str | None = None
+        self.total_guests: int | None = None
+        self.total_due_cents: int | None = None
+        self.deposit_due_cents: int | None = None
+        self.source: str | None = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.status == "cancelled"
+
+    # ========================================================================
+    # REPLAY
+    # ========================================================================
+
+    @classmethod
+    def from_events(cls, events: list[Event]) -> "BookingAggregate":
+        aggregate = cls(events[0].aggregate_id)
+        for event in events:
+            aggregate.apply(event)
+            aggregate.version = event.version
+        return aggregate
+
+    def apply(self, event) -> None:
+        payload = _payload(event)
+
+        if event.event_type == "BookingCreated":
+            self.status = "confirmed"
+            self.date = _as_date(payload.get("date"))
+            self.slot = payload.get("slot")
+            self.total_guests = payload.get("total_guests")
+            self.total_due_cents = payload.get("total_due_cents")
+            self.deposit_due_cents = payload.get("deposit_due_cents")
+            self.source = payload.get("source")
+        elif event.event_type == "BookingUpdated":
+            changes = payload.get("changes") or {}
+            for field in UPDATABLE_FIELDS:
+                if field in changes:
+                    value = changes[field]
+                    setattr(self, field, _as_date(value) if field == "date" else value)
+        elif event.event_type == "BookingCancelled":
+            self.status = "cancelled"
+
+    def snapshot_state(self) -> dict[str, Any] | None:
+        return {
+            "status": self.status,
+            "date": self.date.isoformat() if self.date else None,
+            "slot": self.slot,
+            "total_guests": self.total_guests,
+            "total_due_cents": self.total_due_cents,
+            "deposit_due_cents": self.deposit_due_cents,
+            "source": self.source,
+        }
+
+    @classmethod
+    def from_snapshot(
+        cls, aggregate_id: UUID, version: int, state: dict[str, Any]
+    ) -> "BookingAggregate":
+        aggregate = cls(aggregate_id)
+        aggregate.version = version
+        for field, value in state.items():
+            setattr(aggregate, field, _as_date(value) if field == "date" else value)
+        return aggregate
+
+    # ========================================================================
+    # COMMANDS
+    # ========================================================================
+
+    def update(self, changes: dict[str, Any], updated_by: str, update_reason: str) -> dict:
+        """
+        Record a BookingUpdated event for the fields that actually change.
+
+        Returns the effective changes (empty when nothing differs).
+        Raises ValueError for cancelled bookings.
+        """
+        if self.is_cancelled:
+            raise ValueError("Cannot update a cancelled booking")
+
+        effective = {
+            field: value
+            for field, value in changes.items()
+            if field in UPDATABLE_FIELDS and getattr(self, field) != value
+        }
+        if effective:
+            event = BookingUpdated(
+                aggregate_id=self.id,
+                changes={
+                    field: value.isoformat() if isinstance(value, Date) else value
+                    for field, value in effective.items()
+                },
+                updated_by=updated_by,
+                update_reason=update_reason,
+                occurred_at=datetime.now(UTC),
+            )
+            self.add_event(event)
+            self.apply(event)
+        return effective
+
+    def cancel(self, cancellation_reason: str, cancelled_by: str, refund_amount_cents: int):
+        """Record a BookingCancelled event. Raises ValueError if already cancelled."""
+        if self.is_cancelled:
+            raise ValueError("Booking is already cancelled")
+
+        event = BookingCancelled(
+            aggregate_id=self.id,
+            cancellation_reason=cancellation_reason,
+            cancelled_by=cancelled_by,
+            refund_amount_cents=refund_amount_cents,
+            occurred_at=datetime.now(UTC),
+        )
+        self.add_event(event)
+        self.apply(event)
+
+
+def _payload(event) -> dict[str, Any]:
+    """Event fields from a stored DomainEvent or an in-memory Event."""
+    if isinstance(event, Event):
+        return event.model_dump(mode="json")
+    return event.payload or {}
+
+
+def _as_date(value) -> Date | None:
+    if value is None or isinstance(value, Date):
+        return value
+    return Date.fromisoformat(value)
+
+
+__all__ = ["BookingAggregate"]
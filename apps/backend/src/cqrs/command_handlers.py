@@ -2,16 +2,18 @@
 Command handlers for CRM operations.
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import uuid4
 
 from cqrs.base import (  # Phase 2C: Updated from api.app.cqrs.base
     CommandHandler,
     CommandResult,
+    Event,
     EventStore,
     OutboxProcessor,
 )
+from cqrs.booking_aggregate import UPDATABLE_FIELDS, BookingAggregate
 from cqrs.crm_operations import *  # Phase 2C: Updated from api.app.cqrs.crm_operations
 
 # MIGRATED: from models.legacy_core → db.models.legacy_core
@@ -25,6 +27,7 @@ from db.models.legacy_core import (  # Phase 2C: Updated from api.app.models.cor
 
 # MIGRATED: from models.legacy_events → db.models.legacy_events
 from db.models.legacy_events import IdempotencyKey  # Phase 2C: Updated from api.app.models.events
+from services.scheduling.availability_cache import get_availability_cache
 from utils.encryption import FieldEncryption  # Phase 2C: Updated from api.app.utils.encryption
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -124,6 +127,9 @@ class CreateBookingCommandHandler(CommandHandler):
                 )
 
             await self.session.commit()
+            await get_availability_cache().invalidate(
+                command.date, station_id=getattr(booking, "station_id", None)
+            )
 
             return CommandResult(
                 success=True,
@@ -528,3 +534,198 @@ class ReceiveMessageCommandHandler(CommandHandler):
         )
 
         self.session.add(idem)
+
+
+class BookingAggregateCommandHandler(CommandHandler):
+    """
+    Base for commands on an existing booking.
+
+    The booking row is locked first, serializing commands on one booking,
+    then the BookingAggregate is rehydrated from its latest snapshot plus
+    newer events and validates the change.
+    """
+
+    command_type = ""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+        self.event_store = EventStore(session)
+        self.outbox_processor = OutboxProcessor(session)
+
+    async def _load(self, booking_id) -> tuple[CoreBooking | None, BookingAggregate | None]:
+        booking = await self.session.scalar(
+            select(CoreBooking).where(CoreBooking.id == booking_id).with_for_update()
+        )
+        if booking is None:
+            return None, None
+        return booking, await self.event_store.load_aggregate(BookingAggregate, booking_id)
+
+    async def _commit_events(
+        self, aggregate: BookingAggregate, idempotency_key: str | None, result_data: dict
+    ) -> list[Event]:
+        """Append the aggregate's new events, queue notifications and commit."""
+        events = aggregate.get_uncommitted_events()
+        domain_events = await self.event_store.append_events(
+            events, expected_version=aggregate.version
+        )
+        await self.outbox_processor.create_outbox_entries(domain_events, targets=["email"])
+        aggregate.mark_events_as_committed()
+
+        if idempotency_key:
+            self.session.add(
+                IdempotencyKey(
+                    key=idempotency_key,
+                    command_type=self.command_type,
+                    result=result_data,
+                    status="completed",
+                    completed_at=datetime.now(timezone.utc),
+                    expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+                )
+            )
+
+        await self.session.commit()
+        return events
+
+    async def _check_idempotency(self, key: str) -> CommandResult | None:
+        """Check if this command was already processed."""
+        idem = await self.session.scalar(select(IdempotencyKey).where(IdempotencyKey.key == key))
+
+        if idem:
+            if idem.status == "completed":
+                return CommandResult(success=True, data=idem.result)
+            elif idem.status == "failed":
+                return CommandResult(success=False, error="Command previously failed")
+            else:
+                return CommandResult(success=False, error="Command is still processing")
+
+        return None
+
+
+class UpdateBookingCommandHandler(BookingAggregateCommandHandler):
+    """Handle booking changes (date, slot, party size, special requests)."""
+
+    command_type = "UpdateBookingCommand"
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+        self.encryption = FieldEncryption()
+
+    async def handle(self, command: UpdateBookingCommand) -> CommandResult:
+        """Apply the changed fields to the booking and record BookingUpdated."""
+        try:
+            if command.idempotency_key:
+                existing = await self._check_idempotency(command.idempotency_key)
+                if existing:
+                    return existing
+
+            booking, aggregate = await self._load(command.booking_id)
+            if booking is None:
+                return CommandResult(success=False, error=f"Booking {command.booking_id} not found")
+            if aggregate is None:
+                return CommandResult(
+                    success=False, error=f"Booking {command.booking_id} has no event history"
+                )
+
+            changes = aggregate.update(
+                command.model_dump(include=set(UPDATABLE_FIELDS), exclude_none=True),
+                updated_by=command.updated_by,
+                update_reason=command.update_reason,
+            )
+
+            if {"date", "slot", "total_guests"} & changes.keys():
+                is_available = await self._check_slot_availability(booking.id, aggregate)
+                if not is_available:
+                    await self.session.rollback()
+                    return CommandResult(
+                        success=False,
+                        error=f"Slot {aggregate.slot} on {aggregate.date} is not available for {aggregate.total_guests} guests",
+                    )
+
+            original_date = booking.date
+            for field, value in changes.items():
+                setattr(booking, field, value)
+            if command.special_requests is not None:
+                booking.special_requests = self.encryption.encrypt(command.special_requests)
+            booking.updated_at = datetime.now(timezone.utc)
+
+            result_data = {
+                "booking_id": str(booking.id),
+                "changed_fields": sorted(changes),
+                "version": aggregate.version + len(aggregate.get_uncommitted_events()),
+            }
+            events = await self._commit_events(aggregate, command.idempotency_key, result_data)
+            if {"date", "slot", "total_guests"} & changes.keys():
+                await get_availability_cache().invalidate_dates(
+                    {original_date, booking.date}, station_id=getattr(booking, "station_id", None)
+                )
+
+            return CommandResult(success=True, data=result_data, events=events)
+
+        except Exception as e:
+            await self.session.rollback()
+            return CommandResult(success=False, error=str(e))
+
+    async def _check_slot_availability(self, booking_id, aggregate: BookingAggregate) -> bool:
+        """Check the booking's new date/slot has room for its party (excluding itself)."""
+        result = await self.session.execute(
+            select(CoreBooking.total_guests).where(
+                and_(
+                    CoreBooking.date == aggregate.date,
+                    CoreBooking.slot == aggregate.slot,
+                    CoreBooking.status.in_(["confirmed", "pending"]),
+                    CoreBooking.id != booking_id,
+                )
+            )
+        )
+        existing_guests = sum(row[0] for row in result.fetchall())
+
+        # Same 50-guest slot capacity as CreateBookingCommandHandler
+        max_capacity = 50
+        return (existing_guests + aggregate.total_guests) <= max_capacity
+
+
+class CancelBookingCommandHandler(BookingAggregateCommandHandler):
+    """Handle booking cancellation."""
+
+    command_type = "CancelBookingCommand"
+
+    async def handle(self, command: CancelBookingCommand) -> CommandResult:
+        """Cancel the booking and record BookingCancelled."""
+        try:
+            if command.idempotency_key:
+                existing = await self._check_idempotency(command.idempotency_key)
+                if existing:
+                    return existing
+
+            booking, aggregate = await self._load(command.booking_id)
+            if booking is None:
+                return CommandResult(success=False, error=f"Booking {command.booking_id} not found")
+            if aggregate is None:
+                return CommandResult(
+                    success=False, error=f"Booking {command.booking_id} has no event history"
+                )
+
+            aggregate.cancel(
+                cancellation_reason=command.cancellation_reason,
+                cancelled_by=command.cancelled_by,
+                refund_amount_cents=command.refund_amount_cents,
+            )
+
+            booking.status = "cancelled"
+            booking.updated_at = datetime.now(timezone.utc)
+
+            result_data = {
+                "booking_id": str(booking.id),
+                "status": "cancelled",
+                "refund_amount_cents": command.refund_amount_cents,
+            }
+            events = await self._commit_events(aggregate, command.idempotency_key, result_data)
+            await get_availability_cache().invalidate(
+                booking.date, station_id=getattr(booking, "station_id", None)
+            )
+
+            return CommandResult(success=True, data=result_data, events=events)
+
+        except Exception as e:
+            await self.session.rollback()
+            return CommandResult(success=False, error=str(e))
@@ -0,0 +1,536 @@
+"""
+Event-sourced read-model projections and their rebuild runner.
+
+A projection folds DomainEvent history into a table in the read schema.
+Every projection owns two physical tables, read.<name>_blue and
+read.<name>_green; the public read model read.<name> is a view over the
+active one, so query handlers never see a half-built table.
+
+Rebuild (blue/green, live reads keep hitting the active color):
+1. Recreate the inactive color's table from the projection's current
+   columns and reset that color's checkpoints
+2. Replay the projection's events partitioned by hash(partition key)
+   across a process pool. Each partition streams its events through a
+   server-side cursor (EventStore.stream_events) and commits the folded
+   rows together with its checkpoint every batch, so an interrupted
+   rebuild resumes where it stopped
+3. Catch the new color up with events appended meanwhile, then point the
+   view at it in one short transaction (the old color is kept until the
+   next rebuild, as a rollback target)
+
+Between rebuilds catch_up_projections() advances the active color from
+the same checkpoints. Events younger than SETTLE_LAG are left for the next
+pass: a slower transaction can still commit an event with an earlier
+occurred_at, and the keyset checkpoint would otherwise step over it.
+
+Usage:
+    python -m scripts.rebuild_projection booking_ledger --partitions 8
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    cast,
+    delete,
+    func,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from cqrs.base import REPLAY_BATCH_SIZE, EventStore
+from db.models.events import DomainEvent, ProjectionCheckpoint, ProjectionState
+
+logger = logging.getLogger(__name__)
+
+READ_SCHEMA = "read"
+COLORS = ("blue", "green")
+DEFAULT_PARTITIONS = 8
+SETTLE_LAG = timedelta(seconds=30)
+
+PROJECTIONS: dict[str, type["Projection"]] = {}
+
+
+def register_projection(projection_class: type["Projection"]) -> type["Projection"]:
+    """Decorator to register a projection for rebuilds and catch-up."""
+    PROJECTIONS[projection_class.name] = projection_class
+    return projection_class
+
+
+def get_projection(name: str) -> "Projection":
+    if name not in PROJECTIONS:
+        raise ValueError(f"Unknown projection: {name}")
+    return PROJECTIONS[name]()
+
+
+def other_color(color: str | None) -> str:
+    return COLORS[1] if color == COLORS[0] else COLORS[0]
+
+
+# ============================================================================
+# PROJECTION BASE
+# ============================================================================
+
+
+class Projection(ABC):
+    """
+    Base class for event-sourced read models.
+
+    Subclasses declare their columns and fold events into row dicts; the
+    base class handles per-color tables, partitioning and batched upserts.
+    """
+
+    name: str = ""
+    event_types: tuple[str, ...] = ()
+    key_column: str = "id"
+    indexes: tuple[tuple[str, ...], ...] = ()
+
+    @abstractmethod
+    def columns(self) -> list[Column]:
+        """Columns of the read table (fresh Column objects on every call)."""
+
+    @abstractmethod
+    def row_key(self, event: DomainEvent) -> Any:
+        """Primary key of the read row an event updates."""
+
+    @abstractmethod
+    def fold(self, row: dict[str, Any] | None, event: DomainEvent) -> dict[str, Any]:
+        """Return the complete row after applying event (row is None if new)."""
+
+    @property
+    def view(self) -> str:
+        return f"{READ_SCHEMA}.{self.name}"
+
+    def table(self, color: str) -> Table:
+        """The physical table for one color, with color-specific index names."""
+        table = Table(f"{self.name}_{color}", MetaData(), *self.columns(), schema=READ_SCHEMA)
+        for index_columns in self.indexes:
+            Index(
+                f"ix_{self.name}_{color}_{'_'.join(index_columns)}",
+                *(table.c[column] for column in index_columns),
+            )
+        return table
+
+    def partition_key(self):
+        """
+        Expression hashed to pick an event's partition.
+
+        Every event that touches one read row must produce the same key, so
+        a row is only ever written by one partition, in event order. Must be
+        text: aggregate_id is a uuid column in the database and there is no
+        hashtext(uuid).
+        """
+        return cast(DomainEvent.aggregate_id, Text)
+
+    def partition_filter(self, partition: int, partitions: int):
+        # Mask the sign bit rather than abs(): abs(-2^31) overflows int4
+        bucket = func.hashtext(self.partition_key()).op("&")(0x7FFFFFFF) % partitions
+        return bucket == partition
+
+    async def apply(self, session: AsyncSession, table: Table, events: list[DomainEvent]) -> int:
+        """Fold a batch into its rows: one SELECT, one multi-row upsert."""
+        keys = list(dict.fromkeys(self.row_key(event) for event in events))
+        key = table.c[self.key_column]
+
+        result = await session.execute(select(table).where(key.in_(keys)))
+        rows = {row[self.key_column]: dict(row) for row in result.mappings()}
+        for event in events:
+            row_key = self.row_key(event)
+            rows[row_key] = self.fold(rows.get(row_key), event)
+
+        stmt = pg_insert(table).values([rows[row_key] for row_key in keys])
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={
+                    column.name: stmt.excluded[column.name]
+                    for column in table.c
+                    if column.name != self.key_column
+                },
+            )
+        )
+        return len(keys)
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+
+class ProjectionRunner:
+    """Blue/green rebuilds and incremental catch-up for one projection"""
+
+    def __init__(
+        self, projection: Projection, batch_size: int = REPLAY_BATCH_SIZE, session_factory=None
+    ):
+        if session_factory is None:
+            from core.database import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+
+        self.projection = projection
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+
+    async def rebuild(
+        self, partitions: int = DEFAULT_PARTITIONS, workers: int | None = None, resume: bool = True
+    ) -> dict[str, Any]:
+        """
+        Rebuild the inactive color from the full event log and swap to it.
+
+        Args:
+            partitions: Number of aggregate partitions replayed in parallel
+            workers: Process pool size (default: min(partitions, CPU count))
+            resume: Continue an interrupted rebuild with the same partitions
+
+        Returns:
+            Summary of the rebuild
+        """
+        started = time.monotonic()
+        color = await self.prepare(partitions, resume=resume)
+        workers = workers or min(partitions, os.cpu_count() or 1)
+
+        loop = asyncio.get_running_loop()
+        # spawn: children must not inherit the parent's pooled connections
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            replayed = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        _replay_partition_process,
+                        self.projection.name,
+                        color,
+                        partition,
+                        self.batch_size,
+                    )
+                    for partition in range(partitions)
+                )
+            )
+
+        # Events appended while the pool ran
+        for partition in range(partitions):
+            replayed.append(await self.replay_partition(color, partition))
+
+        await self.swap(color)
+
+        summary = {
+            "projection": self.projection.name,
+            "color": color,
+            "partitions": partitions,
+            "events_applied": sum(replayed),
+            "seconds": round(time.monotonic() - started, 1),
+        }
+        logger.info(f"🔁 Projection rebuilt: {summary}")
+        return summary
+
+    async def catch_up(self) -> int:
+        """Apply settled events past the active color's checkpoints."""
+        async with self.session_factory() as db:
+            state = await db.get(ProjectionState, self.projection.name)
+            if state is None or state.active_color is None:
+                return 0
+            color = state.active_color
+            partitions = (
+                await db.scalars(
+                    select(ProjectionCheckpoint.partition)
+                    .where(
+                        ProjectionCheckpoint.projection == self.projection.name,
+                        ProjectionCheckpoint.color == color,
+                    )
+                    .order_by(ProjectionCheckpoint.partition)
+                )
+            ).all()
+
+        applied = 0
+        for partition in partitions:
+            applied += await self.replay_partition(color, partition)
+        return applied
+
+    # ========================================================================
+    # PHASES
+    # ========================================================================
+
+    async def prepare(self, partitions: int, resume: bool = True) -> str:
+        """Pick the color to build; recreate its table unless resuming."""
+        async with self.session_factory() as db:
+            state = await self._lock_state(db)
+
+            if (
+                resume
+                and state.building_color is not None
+                and state.building_partitions == partitions
+            ):
+                logger.info(
+                    f"🔁 Resuming {self.projection.name} rebuild into {state.building_color}"
+                )
+                return state.building_color
+
+            color = other_color(state.active_color)
+            table = self.projection.table(color)
+            await db.execute(text(f"DROP TABLE IF EXISTS {READ_SCHEMA}.{table.name}"))
+            await db.execute(CreateTable(table))
+            for index in table.indexes:
+                await db.execute(CreateIndex(index))
+
+            await db.execute(
+                delete(ProjectionCheckpoint).where(
+                    ProjectionCheckpoint.projection == self.projection.name,
+                    ProjectionCheckpoint.color == color,
+                )
+            )
+            db.add_all(
+                ProjectionCheckpoint(
+                    projection=self.projection.name,
+                    color=color,
+                    partition=partition,
+                    partitions=partitions,
+                    events_applied=0,
+                )
+                for partition in range(partitions)
+            )
+
+            state.building_color = color
+            state.building_partitions = partitions
+            await db.commit()
+            return color
+
+    async def replay_partition(self, color: str, partition: int) -> int:
+        """
+        Apply one partition's unapplied, settled events to a color's table.
+
+        Rows and checkpoint commit together every batch_size events. Returns
+        the number of events applied (0 if another runner holds the partition).
+        """
+        name = self.projection.name
+        table = self.projection.table(color)
+
+        async with self.session_factory() as reader, self.session_factory() as writer:
+            # Held by the reader's (long) transaction: one replayer per partition
+            locked = await reader.scalar(
+                select(
+                    func.pg_try_advisory_xact_lock(
+                        func.hashtext(f"projection:{name}:{color}:{partition}")
+                    )
+                )
+            )
+            if not locked:
+                return 0
+
+            checkpoint = await writer.get(ProjectionCheckpoint, (name, color, partition))
+            if checkpoint is None:
+                raise ValueError(f"No checkpoint for {name}/{color} partition {partition}")
+
+            stmt = select(DomainEvent).where(
+                DomainEvent.event_type.in_(self.projection.event_types),
+                self.projection.partition_filter(partition, checkpoint.partitions),
+                DomainEvent.occurred_at < func.now() - SETTLE_LAG,
+            )
+            if checkpoint.last_occurred_at is not None:
+                stmt = stmt.where(
+                    tuple_(DomainEvent.occurred_at, DomainEvent.id)
+                    > tuple_(checkpoint.last_occurred_at, checkpoint.last_event_id)
+                )
+            stmt = stmt.order_by(DomainEvent.occurred_at.asc(), DomainEvent.id.asc())
+
+            applied = 0
+            batch: list[DomainEvent] = []
+            async for event in EventStore(reader).stream_events(
+                stmt=stmt, batch_size=self.batch_size
+            ):
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    applied += await self._commit_batch(writer, table, checkpoint, batch)
+                    batch = []
+            if batch:
+                applied += await self._commit_batch(writer, table, checkpoint, batch)
+
+        return applied
+
+    async def swap(self, color: str) -> None:
+        """Point the read view at color; readers block only for this commit."""
+        async with self.session_factory() as db:
+            state = await self._lock_state(db)
+            table = self.projection.table(color)
+
+            await db.execute(text(f"DROP VIEW IF EXISTS {self.projection.view}"))
+            await db.execute(
+                text(
+                    f"CREATE VIEW {self.projection.view} AS SELECT * FROM {READ_SCHEMA}.{table.name}"
+                )
+            )
+
+            previous = state.active_color
+            state.active_color = color
+            state.building_color = None
+            state.building_partitions = None
+            state.swapped_at = func.now()
+            await db.commit()
+
+        logger.info(f"🔀 {self.projection.view} swapped {previous or '-'} → {color}")
+
+    # ========================================================================
+    # HELPERS
+    # ========================================================================
+
+    async def _commit_batch(
+        self,
+        writer: AsyncSession,
+        table: Table,
+        checkpoint: ProjectionCheckpoint,
+        batch: list[DomainEvent],
+    ) -> int:
+        await self.projection.apply(writer, table, batch)
+
+        last = batch[-1]
+        checkpoint.last_occurred_at = last.occurred_at
+        checkpoint.last_event_id = last.id
+        checkpoint.events_applied += len(batch)
+        await writer.commit()
+        return len(batch)
+
+    async def _lock_state(self, db: AsyncSession) -> ProjectionState:
+        await db.execute(
+            pg_insert(ProjectionState)
+            .values(projection=self.projection.name)
+            .on_conflict_do_nothing(index_elements=["projection"])
+        )
+        return (
+            await db.execute(
+                select(ProjectionState)
+                .where(ProjectionState.projection == self.projection.name)
+                .with_for_update()
+            )
+        ).scalar_one()
+
+
+def _replay_partition_process(name: str, color: str, partition: int, batch_size: int) -> int:
+    """Process-pool entry point: its own event loop and connection pool."""
+
+    async def replay() -> int:
+        from core.database import engine
+
+        try:
+            return await ProjectionRunner(get_projection(name), batch_size).replay_partition(
+                color, partition
+            )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(replay())
+
+
+async def catch_up_projections() -> dict[str, int]:
+    """Advance every registered projection's active color (for workers)"""
+    applied = {}
+    for name in PROJECTIONS:
+        applied[name] = await ProjectionRunner(get_projection(name)).catch_up()
+    return applied
+
+
+# ============================================================================
+# PROJECTIONS
+# ============================================================================
+
+
+def _as_date(value: Any) -> date | None:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+@register_projection
+class BookingLedgerProjection(Projection):
+    """
+    Per-booking ledger: booking terms, status and the payments recorded
+    against it, folded from booking and payment events.
+    """
+
+    name = "booking_ledger"
+    event_types = ("BookingCreated", "BookingUpdated", "BookingCancelled", "PaymentRecorded")
+    key_column = "booking_id"
+    indexes = (("date", "slot"), ("status",))
+
+    UPDATABLE = ("date", "slot", "total_guests", "total_due_cents", "deposit_due_cents", "status")
+
+    def columns(self) -> list[Column]:
+        return [
+            Column("booking_id", PGUUID(as_uuid=True), primary_key=True),
+            Column("date", Date, nullable=True),
+            Column("slot", String(50), nullable=True),
+            Column("total_guests", Integer, nullable=True),
+            Column("total_due_cents", Integer, nullable=True),
+            Column("deposit_due_cents", Integer, nullable=True),
+            Column("paid_cents", Integer, nullable=False),
+            Column("payment_count", Integer, nullable=False),
+            Column("status", String(50), nullable=True),
+            Column("source", String(50), nullable=True),
+            Column("created_at", DateTime(timezone=True), nullable=True),
+            Column("updated_at", DateTime(timezone=True), nullable=False),
+            Column("events_applied", Integer, nullable=False),
+        ]
+
+    def partition_key(self):
+        # Payments are their own aggregates: route them to their booking's partition
+        return func.coalesce(
+            DomainEvent.payload["booking_id"].as_string(), cast(DomainEvent.aggregate_id, Text)
+        )
+
+    def row_key(self, event: DomainEvent) -> UUID:
+        return UUID(str((event.payload or {}).get("booking_id") or event.aggregate_id))
+
+    def fold(self, row: dict[str, Any] | None, event: DomainEvent) -> dict[str, Any]:
+        payload = event.payload or {}
+        if row is None:
+            row = {column.name: None for column in self.columns()}
+            row.update(
+                booking_id=self.row_key(event), paid_cents=0, payment_count=0, events_applied=0
+            )
+
+        if event.event_type == "BookingCreated":
+            row.update(
+                date=_as_date(payload.get("date")),
+                slot=payload.get("slot"),
+                total_guests=payload.get("total_guests"),
+                total_due_cents=payload.get("total_due_cents"),
+                deposit_due_cents=payload.get("deposit_due_cents"),
+                source=payload.get("source"),
+                status="confirmed",
+                created_at=event.occurred_at,
+            )
+        elif event.event_type == "BookingUpdated":
+            changes = payload.get("changes") or {}
+            for field in self.UPDATABLE:
+                if field in changes:
+                    row[field] = _as_date(changes[field]) if field == "date" else changes[field]
+        elif event.event_type == "BookingCancelled":
+            row["status"] = "cancelled"
+        elif event.event_type == "PaymentRecorded":
+            row["paid_cents"] += payload.get("amount_cents") or 0
+            row["payment_count"] += 1
+
+        row["updated_at"] = event.occurred_at
+        row["events_applied"] += 1
+        return row
@@ -7,6 +7,7 @@ from typing import Any
 
 from cqrs.base import QueryHandler, QueryResult  # Phase 2C: Updated from api.app.cqrs.base
 from cqrs.crm_operations import *  # Phase 2C: Updated from api.app.cqrs.crm_operations
+from services.bulk_decryption import get_field_decryptor
 from utils.encryption import FieldEncryption  # Phase 2C: Updated from api.app.utils.encryption
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -112,9 +113,9 @@ class GetBookingQueryHandler(QueryHandler):
 
             # Decrypt phone numbers in message threads if included
             if query.include_messages and booking_data.get("message_threads"):
-                for thread in booking_data["message_threads"]:
-                    if thread.get("phone_number"):
-                        thread["phone_number"] = self.encryption.decrypt(thread["phone_number"])
+                await get_field_decryptor().decrypt_records(
+                    booking_data["message_threads"], {"phone_number": "phone_number"}, strict=True
+                )
 
             return QueryResult(success=True, data=booking_data)
 
@@ -207,30 +208,20 @@ class GetBookingsQueryHandler(QueryHandler):
             result = await self.session.execute(stmt, params)
             count_result = await self.session.execute(count_stmt, params)
 
-            bookings = []
-            for row in result.fetchall():
-                booking_data = dict(row._mapping)
+            bookings = [dict(row._mapping) for row in result.fetchall()]
 
-                # Decrypt sensitive fields
-                booking_data["customer_email"] = self.encryption.decrypt(
-                    booking_data["customer_email_encrypted"]
-                )
-                booking_data["customer_name"] = self.encryption.decrypt(
-                    booking_data["customer_name_encrypted"]
-                )
-                booking_data["customer_phone"] = self.encryption.decrypt(
-                    booking_data["customer_phone_encrypted"]
-                )
-
-                # Remove encrypted fields
-                for field in [
-                    "customer_email_encrypted",
-                    "customer_name_encrypted",
-                    "customer_phone_encrypted",
-                ]:
-                    booking_data.pop(field)
-
-                bookings.append(booking_data)
+            # Decrypt sensitive fields of the whole page in one batch,
+            # removing the encrypted fields
+            await get_field_decryptor().decrypt_records(
+                bookings,
+                {
+                    "customer_email_encrypted": "customer_email",
+                    "customer_name_encrypted": "customer_name",
+                    "customer_phone_encrypted": "customer_phone",
+                },
+                drop_source=True,
+                strict=True,
+            )
 
             total_count = count_result.scalar()
 
@@ -369,9 +360,9 @@ class GetCustomer360QueryHandler(QueryHandler):
 
             # Decrypt phone numbers in message threads
             if query.include_messages and customer_data.get("message_threads"):
-                for thread in customer_data["message_threads"]:
-                    if thread.get("phone_number"):
-                        thread["phone_number"] = self.encryption.decrypt(thread["phone_number"])
+                await get_field_decryptor().decrypt_records(
+                    customer_data["message_threads"], {"phone_number": "phone_number"}, strict=True
+                )
 
             return QueryResult(success=True, data=customer_data)
 
@@ -483,10 +474,12 @@ class GetMessageThreadQueryHandler(QueryHandler):
 
             # Decrypt message contents
             if thread_data.get("messages"):
-                for message in thread_data["messages"]:
-                    if message.get("content_encrypted"):
-                        message["content"] = self.encryption.decrypt(message["content_encrypted"])
-                        message.pop("content_encrypted")
+                await get_field_decryptor().decrypt_records(
+                    thread_data["messages"],
+                    {"content_encrypted": "content"},
+                    drop_source=True,
+                    strict=True,
+                )
 
             return QueryResult(success=True, data=thread_data)
 
@@ -531,20 +524,19 @@ class GetAvailabilitySlotsQueryHandler(QueryHandler):
                 stmt, {"date": query.date, "party_size": query.party_size}
             )
 
-            slots = []
-            for row in result.fetchall():
-                slot_data = dict(row._mapping)
-
-                # Decrypt customer names in reservations (for staff view)
-                if slot_data.get("current_reservations"):
-                    for reservation in slot_data["current_reservations"]:
-                        if reservation.get("customer_name_encrypted"):
-                            reservation["customer_name"] = self.encryption.decrypt(
-                                reservation["customer_name_encrypted"]
-                            )
-                            reservation.pop("customer_name_encrypted")
-
-                slots.append(slot_data)
+            slots = [dict(row._mapping) for row in result.fetchall()]
+
+            # Decrypt customer names in reservations (for staff view), all slots at once
+            await get_field_decryptor().decrypt_records(
+                [
+                    reservation
+                    for slot_data in slots
+                    for reservation in slot_data.get("current_reservations") or []
+                ],
+                {"customer_name_encrypted": "customer_name"},
+                drop_source=True,
+                strict=True,
+            )
 
             return QueryResult(
                 success=True,
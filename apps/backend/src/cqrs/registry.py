@@ -8,9 +8,11 @@ from cqrs.base import (
     register_query_handler,
 )  # Phase 2C: Updated from api.app.cqrs.base
 from cqrs.command_handlers import (  # Phase 2C: Updated from api.app.cqrs.command_handlers
+    CancelBookingCommandHandler,
     CreateBookingCommandHandler,
     ReceiveMessageCommandHandler,
     RecordPaymentCommandHandler,
+    UpdateBookingCommandHandler,
 )
 from cqrs.crm_operations import *  # Phase 2C: Updated from api.app.cqrs.crm_operations
 from cqrs.query_handlers import (  # Phase 2C: Updated from api.app.cqrs.query_handlers
@@ -29,6 +31,16 @@ class RegisteredCreateBookingCommandHandler(CreateBookingCommandHandler):
     """Registered create booking command handler."""
 
 
+@register_command_handler(UpdateBookingCommand)
+class RegisteredUpdateBookingCommandHandler(UpdateBookingCommandHandler):
+    """Registered update booking command handler."""
+
+
+@register_command_handler(CancelBookingCommand)
+class RegisteredCancelBookingCommandHandler(CancelBookingCommandHandler):
+    """Registered cancel booking command handler."""
+
+
 @register_command_handler(RecordPaymentCommand)
 class RegisteredRecordPaymentCommandHandler(RecordPaymentCommandHandler):
     """Registered record payment command handler."""
@@ -82,6 +94,7 @@ initialize_cqrs_handlers()
 
 
 __all__ = [
+    "RegisteredCancelBookingCommandHandler",
     "RegisteredCreateBookingCommandHandler",
     "RegisteredGetAvailabilitySlotsQueryHandler",
     "RegisteredGetBookingQueryHandler",
@@ -91,5 +104,6 @@ __all__ = [
     "RegisteredGetMessageThreadQueryHandler",
     "RegisteredReceiveMessageCommandHandler",
     "RegisteredRecordPaymentCommandHandler",
+    "RegisteredUpdateBookingCommandHandler",
     "initialize_cqrs_handlers",
 ]
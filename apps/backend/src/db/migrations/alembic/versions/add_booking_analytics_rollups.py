@@ -0,0 +1,100 @@
+"""Add booking analytics rollup tables
+
+Revision ID: add_booking_analytics_rollups
+Revises: add_campaign_audience_snapshot
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_booking_analytics_rollups"
+down_revision = "add_campaign_audience_snapshot"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Pre-aggregated admin dashboard tables (filled by the rollup worker;
+    the first refresh after deploy is a full rebuild).
+    """
+    op.create_table(
+        "booking_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("station_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("event_dow", sa.SmallInteger(), primary_key=True),
+        sa.Column("booking_count", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.BigInteger(), nullable=False),
+        sa.Column("guest_count", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        schema="core",
+    )
+
+    op.create_table(
+        "booking_monthly_rollups",
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("station_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("booking_count", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.BigInteger(), nullable=False),
+        sa.Column("guest_count", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        schema="core",
+    )
+
+    op.create_table(
+        "customer_value_rollups",
+        sa.Column("customer_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("booking_count", sa.Integer(), nullable=False),
+        sa.Column("total_spent_cents", sa.BigInteger(), nullable=False),
+        sa.Column("first_booking_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_booking_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        schema="core",
+    )
+    op.create_index(
+        "ix_customer_value_rollups_total_spent",
+        "customer_value_rollups",
+        ["total_spent_cents"],
+        schema="core",
+    )
+
+    op.create_table(
+        "station_customer_rollups",
+        sa.Column("station_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("customer_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("booking_count", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.BigInteger(), nullable=False),
+        schema="core",
+    )
+
+    op.create_table(
+        "analytics_rollup_state",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_full_rebuild_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        schema="core",
+    )
+
+    # Change detection (updated_at > watermark) and per-day recompute
+    op.create_index("ix_core_bookings_updated_at", "bookings", ["updated_at"], schema="core")
+    op.create_index("ix_core_bookings_created_at", "bookings", ["created_at"], schema="core")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_core_bookings_created_at", table_name="bookings", schema="core")
+    op.drop_index("ix_core_bookings_updated_at", table_name="bookings", schema="core")
+    op.drop_table("analytics_rollup_state", schema="core")
+    op.drop_table("station_customer_rollups", schema="core")
+    op.drop_index(
+        "ix_customer_value_rollups_total_spent",
+        table_name="customer_value_rollups",
+        schema="core",
+    )
+    op.drop_table("customer_value_rollups", schema="core")
+    op.drop_table("booking_monthly_rollups", schema="core")
+    op.drop_table("booking_daily_rollups", schema="core")
@@ -0,0 +1,58 @@
+"""Add materialized campaign audience snapshot
+
+Revision ID: add_campaign_audience_snapshot
+Revises: add_campaign_send_checkpoint
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_campaign_audience_snapshot"
+down_revision = "add_campaign_send_checkpoint"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    newsletter.campaign_audience holds the subscriber ids matched by a
+    campaign's segment at snapshot time; campaigns.audience_snapshot_at
+    records when it was taken (NULL = no snapshot yet).
+    """
+    op.create_table(
+        "campaign_audience",
+        sa.Column(
+            "campaign_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("newsletter.campaigns.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "subscriber_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("newsletter.subscribers.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "added_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        schema="newsletter",
+    )
+
+    op.add_column(
+        "campaigns",
+        sa.Column("audience_snapshot_at", sa.DateTime(timezone=True), nullable=True),
+        schema="newsletter",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("campaigns", "audience_snapshot_at", schema="newsletter")
+    op.drop_table("campaign_audience", schema="newsletter")
@@ -0,0 +1,29 @@
+"""Add FAILED campaign event type
+
+Revision ID: add_campaign_event_failed
+Revises: add_travel_cache_route_key
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_campaign_event_failed"
+down_revision = "add_travel_cache_route_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The campaign dispatcher records a FAILED event (instead of claiming the
+    recipient with SENT) when a subscriber's phone cannot be decrypted
+    """
+    # SQLEnum(CampaignEventType) stores member names, so labels are upper-case
+    op.execute("ALTER TYPE campaign_event_type ADD VALUE IF NOT EXISTS 'FAILED'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop a value from an enum type; 'FAILED' is left in place
+    pass
@@ -0,0 +1,65 @@
+"""Add campaign send checkpoint and one-SENT-event-per-recipient guard
+
+Revision ID: add_campaign_send_checkpoint
+Revises: add_menu_subcategory_tags
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_campaign_send_checkpoint"
+down_revision = "add_menu_subcategory_tags"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Support resumable campaign dispatch
+
+    - campaigns.send_cursor: last subscriber id (keyset order) whose page
+      was fully processed; a restarted send continues after it
+    - uq_newsletter_events_campaign_sent: at most one SENT event per
+      (campaign, subscriber); the dispatcher claims recipients by inserting
+      it with ON CONFLICT DO NOTHING, so a resumed send never re-texts anyone
+    """
+    op.add_column(
+        "campaigns",
+        sa.Column("send_cursor", postgresql.UUID(as_uuid=True), nullable=True),
+        schema="newsletter",
+    )
+
+    # Drop duplicate SENT events left by the old loop before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM newsletter.campaign_events e
+        USING newsletter.campaign_events d
+        WHERE e.type = 'SENT'
+          AND d.type = 'SENT'
+          AND e.campaign_id = d.campaign_id
+          AND e.subscriber_id = d.subscriber_id
+          AND (e.occurred_at, e.id) > (d.occurred_at, d.id)
+        """
+    )
+
+    op.create_index(
+        "uq_newsletter_events_campaign_sent",
+        "campaign_events",
+        ["campaign_id", "subscriber_id"],
+        unique=True,
+        schema="newsletter",
+        postgresql_where=sa.text("type = 'SENT'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "uq_newsletter_events_campaign_sent",
+        table_name="campaign_events",
+        schema="newsletter",
+    )
+    op.drop_column("campaigns", "send_cursor", schema="newsletter")
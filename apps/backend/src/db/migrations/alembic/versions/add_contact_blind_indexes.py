@@ -0,0 +1,42 @@
+"""Add blind-index columns for encrypted phone/email lookups
+
+Revision ID: add_contact_blind_indexes
+Revises: add_projection_checkpoints
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "add_contact_blind_indexes"
+down_revision = "add_projection_checkpoints"
+branch_labels = None
+depends_on = None
+
+# (schema, table, index name, column)
+BLIND_INDEXES = [
+    ("newsletter", "subscribers", "ix_newsletter_subscribers_email_bidx", "email_bidx"),
+    ("newsletter", "subscribers", "ix_newsletter_subscribers_phone_bidx", "phone_bidx"),
+    ("core", "customers", "ix_core_customers_email_bidx", "email_bidx"),
+    ("core", "customers", "ix_core_customers_phone_bidx", "phone_bidx"),
+    ("lead", "lead_contacts", "ix_lead_contacts_contact_bidx", "contact_bidx"),
+]
+
+
+def upgrade() -> None:
+    """
+    Keyed HMAC-SHA256 digests (hex) of the normalized contact values
+    (core/blind_index.py). Columns start NULL; populate existing rows with
+    scripts/backfill_blind_index.py.
+    """
+    for schema, table, index_name, column in BLIND_INDEXES:
+        op.add_column(table, sa.Column(column, sa.String(64), nullable=True), schema=schema)
+        op.create_index(index_name, table, [column], schema=schema)
+
+
+def downgrade() -> None:
+    for schema, table, index_name, column in reversed(BLIND_INDEXES):
+        op.drop_index(index_name, table_name=table, schema=schema)
+        op.drop_column(table, column, schema=schema)
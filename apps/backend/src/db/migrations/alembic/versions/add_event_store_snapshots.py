@@ -0,0 +1,71 @@
+"""Add event store snapshots and hash chain head
+
+Revision ID: add_event_store_snapshots
+Revises: add_outbox_claim_leases
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_event_store_snapshots"
+down_revision = "add_outbox_claim_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Aggregate snapshots, the hash chain head row (seeded from the newest
+    event) and the indexes used by snapshot rehydration and streaming replay.
+    """
+    op.create_table(
+        "aggregate_snapshots",
+        sa.Column("aggregate_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("aggregate_type", sa.String(100), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("state", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        schema="events",
+    )
+
+    op.create_table(
+        "event_chain_head",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("hash_current", sa.String(64), nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        schema="events",
+    )
+    op.execute(
+        """
+        INSERT INTO events.event_chain_head (name, hash_current, event_id)
+        SELECT 'domain_events', hash_current, id
+        FROM events.domain_events
+        ORDER BY created_at DESC
+        LIMIT 1
+        """
+    )
+
+    op.create_index(
+        "ix_domain_events_aggregate_version",
+        "domain_events",
+        ["aggregate_id", "version"],
+        schema="events",
+    )
+    op.create_index(
+        "ix_domain_events_replay",
+        "domain_events",
+        ["occurred_at", "id"],
+        schema="events",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_domain_events_replay", table_name="domain_events", schema="events")
+    op.drop_index("ix_domain_events_aggregate_version", table_name="domain_events", schema="events")
+    op.drop_table("event_chain_head", schema="events")
+    op.drop_table("aggregate_snapshots", schema="events")
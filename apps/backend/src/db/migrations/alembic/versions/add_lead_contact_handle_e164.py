@@ -0,0 +1,35 @@
+"""Add E.164 phone column for lead contact matching
+
+Revision ID: add_lead_contact_handle_e164
+Revises: add_contact_blind_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "add_lead_contact_handle_e164"
+down_revision = "add_contact_blind_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    E.164 form of sms/phone/whatsapp handles (core.blind_index.normalize_phone),
+    replacing the leading-wildcard LIKE match of inbound SMS numbers. Starts
+    NULL; populate existing rows with scripts/backfill_blind_index.py lead_contacts.
+    """
+    op.add_column(
+        "lead_contacts", sa.Column("handle_e164", sa.String(16), nullable=True), schema="lead"
+    )
+    op.create_index(
+        "ix_lead_contacts_handle_e164", "lead_contacts", ["handle_e164"], schema="lead"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lead_contacts_handle_e164", table_name="lead_contacts", schema="lead")
+    op.drop_column("lead_contacts", "handle_e164", schema="lead")
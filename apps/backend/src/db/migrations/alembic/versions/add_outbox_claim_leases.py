@@ -0,0 +1,54 @@
+"""Add outbox worker claim leases
+
+Revision ID: add_outbox_claim_leases
+Revises: add_booking_analytics_rollups
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "add_outbox_claim_leases"
+down_revision = "add_booking_analytics_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Lease columns for FOR UPDATE SKIP LOCKED claims and an index on the
+    claim scan. Workers now route on the event_type column, so live rows
+    whose type was only recorded in payload.event_type are backfilled.
+    """
+    op.add_column("outbox", sa.Column("claimed_by", sa.String(255), nullable=True), schema="events")
+    op.add_column(
+        "outbox",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        schema="events",
+    )
+
+    op.execute(
+        """
+        UPDATE events.outbox
+        SET event_type = payload->>'event_type'
+        WHERE status IN ('PENDING', 'PROCESSING')
+          AND payload ? 'event_type'
+          AND event_type IS DISTINCT FROM payload->>'event_type'
+        """
+    )
+
+    op.create_index(
+        "ix_outbox_claimable",
+        "outbox",
+        ["event_type", "created_at"],
+        schema="events",
+        postgresql_where=sa.text("status IN ('PENDING', 'PROCESSING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_claimable", table_name="outbox", schema="events")
+    op.drop_column("outbox", "lease_expires_at", schema="events")
+    op.drop_column("outbox", "claimed_by", schema="events")
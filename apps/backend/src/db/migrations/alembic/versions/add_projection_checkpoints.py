@@ -0,0 +1,57 @@
+"""Add projection state and checkpoints for read-model rebuilds
+
+Revision ID: add_projection_checkpoints
+Revises: add_event_store_snapshots
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "add_projection_checkpoints"
+down_revision = "add_event_store_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Blue/green state and per-partition replay checkpoints. The projection
+    color tables and read views themselves are created by the rebuild
+    runner (cqrs.projections) from each projection's own schema.
+    """
+    op.create_table(
+        "projection_state",
+        sa.Column("projection", sa.String(100), primary_key=True),
+        sa.Column("active_color", sa.String(10), nullable=True),
+        sa.Column("building_color", sa.String(10), nullable=True),
+        sa.Column("building_partitions", sa.Integer(), nullable=True),
+        sa.Column("swapped_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        schema="events",
+    )
+
+    op.create_table(
+        "projection_checkpoints",
+        sa.Column("projection", sa.String(100), primary_key=True),
+        sa.Column("color", sa.String(10), primary_key=True),
+        sa.Column("partition", sa.Integer(), primary_key=True),
+        sa.Column("partitions", sa.Integer(), nullable=False),
+        sa.Column("last_occurred_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_event_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("events_applied", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        schema="events",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("projection_checkpoints", schema="events")
+    op.drop_table("projection_state", schema="events")
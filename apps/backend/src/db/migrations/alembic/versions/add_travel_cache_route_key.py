@@ -0,0 +1,49 @@
+"""Add address route key to travel cache
+
+Revision ID: add_travel_cache_route_key
+Revises: add_webhook_event_queue
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "add_travel_cache_route_key"
+down_revision = "add_webhook_event_queue"
+branch_labels = None
+depends_on = None
+
+COORDINATE_COLUMNS = ["origin_lat", "origin_lng", "dest_lat", "dest_lng"]
+
+
+def upgrade() -> None:
+    """
+    public.travel_cache also stores PricingService travel distances, keyed by
+    a hash of the normalized origin/destination addresses
+    (services/scheduling/distance_service.py). Those rows have no
+    coordinates; the precomputed station -> ZIP distances
+    (scripts/precompute_zip_distances.py) are stored the same way.
+    """
+    op.add_column(
+        "travel_cache", sa.Column("route_key", sa.String(64), nullable=True), schema="public"
+    )
+    for column in COORDINATE_COLUMNS:
+        op.alter_column("travel_cache", column, nullable=True, schema="public")
+    op.create_index(
+        "uq_travel_cache_route_key",
+        "travel_cache",
+        ["route_key"],
+        unique=True,
+        schema="public",
+        postgresql_where=sa.text("route_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_travel_cache_route_key", table_name="travel_cache", schema="public")
+    op.execute("DELETE FROM public.travel_cache WHERE route_key IS NOT NULL")
+    for column in COORDINATE_COLUMNS:
+        op.alter_column("travel_cache", column, nullable=False, schema="public")
+    op.drop_column("travel_cache", "route_key", schema="public")
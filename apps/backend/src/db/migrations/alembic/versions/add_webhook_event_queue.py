@@ -0,0 +1,86 @@
+"""Add Stripe webhook event queue columns
+
+Revision ID: add_webhook_event_queue
+Revises: add_lead_contact_handle_e164
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "add_webhook_event_queue"
+down_revision = "add_lead_contact_handle_e164"
+branch_labels = None
+depends_on = None
+
+QUEUE_COLUMNS = [
+    ("ordering_key", sa.String(255)),
+    ("stripe_created", sa.DateTime(timezone=True)),
+    ("next_retry_at", sa.DateTime(timezone=True)),
+    ("claimed_by", sa.String(255)),
+    ("lease_expires_at", sa.DateTime(timezone=True)),
+]
+
+
+def upgrade() -> None:
+    """
+    core.webhook_events becomes the durable queue of ack-first Stripe
+    ingestion (workers/stripe_webhook_worker.py). Deduplication moves to a
+    named unique constraint used by INSERT ... ON CONFLICT DO NOTHING, which
+    replaces the non-unique lookup index on stripe_event_id.
+    """
+    for column, column_type in QUEUE_COLUMNS:
+        op.add_column(
+            "webhook_events", sa.Column(column, column_type, nullable=True), schema="core"
+        )
+
+    # Existing rows are ordered by their Stripe creation time too
+    op.execute(
+        """
+        UPDATE core.webhook_events
+        SET stripe_created = to_timestamp((payload->>'created')::bigint)
+        WHERE payload ? 'created'
+        """
+    )
+
+    # Keep the first copy of any event stored twice by the old select-then-insert
+    op.execute(
+        """
+        DELETE FROM core.webhook_events w
+        USING core.webhook_events kept
+        WHERE w.stripe_event_id = kept.stripe_event_id
+          AND (w.created_at, w.id) > (kept.created_at, kept.id)
+        """
+    )
+    op.execute(
+        "ALTER TABLE core.webhook_events DROP CONSTRAINT IF EXISTS webhook_events_stripe_event_id_key"
+    )
+    op.execute("DROP INDEX IF EXISTS core.ix_webhook_events_stripe_id")
+    op.create_unique_constraint(
+        "uq_webhook_events_stripe_event_id", "webhook_events", ["stripe_event_id"], schema="core"
+    )
+
+    op.create_index(
+        "ix_webhook_events_queue",
+        "webhook_events",
+        ["ordering_key", "stripe_created"],
+        schema="core",
+        postgresql_where=sa.text("status IN ('RECEIVED', 'PROCESSING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_queue", table_name="webhook_events", schema="core")
+    op.drop_constraint(
+        "uq_webhook_events_stripe_event_id", "webhook_events", type_="unique", schema="core"
+    )
+    op.create_unique_constraint(
+        "webhook_events_stripe_event_id_key", "webhook_events", ["stripe_event_id"], schema="core"
+    )
+    op.create_index(
+        "ix_webhook_events_stripe_id", "webhook_events", ["stripe_event_id"], schema="core"
+    )
+    for column, _ in reversed(QUEUE_COLUMNS):
+        op.drop_column("webhook_events", column, schema="core")
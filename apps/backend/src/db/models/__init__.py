@@ -37,8 +37,16 @@ from .crm import (
     Lead,  # Lead tracking with scoring and qualification (moved from lead.py)
 )
 
-# Events schema (3 tables)
-from .events import DomainEvent, Inbox, Outbox
+# Events schema (5 tables)
+from .events import (
+    AggregateSnapshot,
+    DomainEvent,
+    EventChainHead,
+    Inbox,
+    Outbox,
+    ProjectionCheckpoint,
+    ProjectionState,
+)
 
 # Feedback & Marketing schemas (5 tables)
 from .feedback_marketing import (
@@ -78,9 +86,10 @@ from .lead import (
     SocialIdentity,
 )
 
-# Newsletter schema (7 tables)
+# Newsletter schema (8 tables)
 from .newsletter import (
     Campaign,
+    CampaignAudienceMember,
     CampaignEvent,
     CampaignSMSLimit,
     SMSDeliveryEvent,
@@ -126,6 +135,15 @@ from .support_communications import (  # Enums for Voice AI
 # Travel Cache (1 table) - Travel time API response caching
 from .travel_cache import TravelCache
 
+# Analytics rollups (5 tables) - Pre-aggregated admin dashboard metrics
+from .analytics import (
+    AnalyticsRollupState,
+    BookingDailyRollup,
+    BookingMonthlyRollup,
+    CustomerValueRollup,
+    StationCustomerRollup,
+)
+
 # All models for easy iteration
 __all__ = [
     # Base
@@ -169,10 +187,14 @@ __all__ = [
     "QRCode",
     "QRScan",
     "ReviewEscalation",
-    # Events (3 models)
+    # Events (7 models)
+    "AggregateSnapshot",
     "DomainEvent",
+    "EventChainHead",
     "Inbox",
     "Outbox",
+    "ProjectionCheckpoint",
+    "ProjectionState",
     # Lead (7 models)
     "BusinessSocialAccount",
     "Lead",
@@ -181,8 +203,9 @@ __all__ = [
     "LeadEvent",
     "LeadSocialThread",
     "SocialIdentity",
-    # Newsletter (7 models)
+    # Newsletter (8 models)
     "Campaign",
+    "CampaignAudienceMember",
     "CampaignEvent",
     "CampaignSMSLimit",
     "SMSDeliveryEvent",
@@ -207,6 +230,12 @@ __all__ = [
     "WebhookEventStatus",
     # Travel Cache (1 model)
     "TravelCache",
+    # Analytics rollups (5 models)
+    "AnalyticsRollupState",
+    "BookingDailyRollup",
+    "BookingMonthlyRollup",
+    "CustomerValueRollup",
+    "StationCustomerRollup",
     # Slot Hold (1 model + 1 enum)
     "SlotHold",
     "SlotHoldStatus",
@@ -228,6 +257,12 @@ MODELS_BY_SCHEMA = {
         Review,
         SocialThread,
         SlotHold,  # Pre-booking slot reservation system
+        # Analytics rollups (admin dashboard)
+        AnalyticsRollupState,
+        BookingDailyRollup,
+        BookingMonthlyRollup,
+        CustomerValueRollup,
+        StationCustomerRollup,
     ],
     "ops": [
         Chef,  # Moved from core to ops
@@ -258,9 +293,13 @@ MODELS_BY_SCHEMA = {
         QRScan,
     ],
     "events": [
+        AggregateSnapshot,
         DomainEvent,
+        EventChainHead,
         Inbox,
         Outbox,
+        ProjectionCheckpoint,
+        ProjectionState,
     ],
     "lead": [
         BusinessSocialAccount,
@@ -272,6 +311,7 @@ MODELS_BY_SCHEMA = {
     ],
     "newsletter": [
         Campaign,
+        CampaignAudienceMember,
         CampaignEvent,
         CampaignSMSLimit,
         SMSDeliveryEvent,
@@ -309,5 +349,10 @@ MODELS_BY_SCHEMA = {
 # - Smart Scheduling Phase 1: Address, NegotiationIncentive (2 models)
 # - Travel Cache: TravelCache (1 model) - API response caching
 # - Slot Hold: SlotHold (1 model) - Pre-booking reservations
+# - Newsletter: CampaignAudienceMember (1 model) - Materialized campaign audience
+# - Analytics rollups: BookingDailyRollup, BookingMonthlyRollup, CustomerValueRollup,
+#   StationCustomerRollup, AnalyticsRollupState (5 models) - Admin dashboard
+# - Event store: AggregateSnapshot, EventChainHead (2 models) - Snapshots + hash chain head
+# - Projections: ProjectionState, ProjectionCheckpoint (2 models) - Blue/green read-model rebuilds
 TOTAL_MODELS = sum(len(models) for models in MODELS_BY_SCHEMA.values())
-assert TOTAL_MODELS == 57, f"Expected 57 models, found {TOTAL_MODELS}"
+assert TOTAL_MODELS == 67, f"Expected 67 models, found {TOTAL_MODELS}"
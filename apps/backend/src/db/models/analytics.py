@@ -0,0 +1,127 @@
+"""
+Booking Analytics Rollup Models
+================================
+
+Pre-aggregated booking, revenue and customer metrics for the admin
+analytics dashboard, so dashboard reads never scan core.bookings.
+
+Tables (schema: core):
+- booking_daily_rollups: per booking day x station x event weekday
+- booking_monthly_rollups: per month x station (rolled up from daily)
+- customer_value_rollups: per customer lifetime totals (CLV)
+- station_customer_rollups: per station x customer (unique customers)
+- analytics_rollup_state: refresh watermark per rollup job
+
+All aggregates exclude cancelled bookings. "Day" is the booking's
+created_at date, matching the original dashboard queries.
+
+Maintained by services/analytics_rollup_service.py (incremental refresh
+worker + nightly full rebuild).
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base_class import Base
+
+
+class BookingDailyRollup(Base):
+    """Bookings/revenue per created day, station and event day-of-week"""
+
+    __tablename__ = "booking_daily_rollups"
+    __table_args__ = ({"schema": "core"},)
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    station_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    event_dow: Mapped[int] = mapped_column(SmallInteger, primary_key=True)  # 0 = Sunday
+
+    booking_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    guest_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class BookingMonthlyRollup(Base):
+    """Bookings/revenue per calendar month and station"""
+
+    __tablename__ = "booking_monthly_rollups"
+    __table_args__ = ({"schema": "core"},)
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # First day of month
+    station_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+
+    booking_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    guest_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class CustomerValueRollup(Base):
+    """Lifetime booking totals per customer (CLV)"""
+
+    __tablename__ = "customer_value_rollups"
+    __table_args__ = (
+        Index("ix_customer_value_rollups_total_spent", "total_spent_cents"),
+        {"schema": "core"},
+    )
+
+    customer_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+
+    booking_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_spent_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    first_booking_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_booking_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class StationCustomerRollup(Base):
+    """Bookings/revenue per station and customer (row count = unique customers)"""
+
+    __tablename__ = "station_customer_rollups"
+    __table_args__ = ({"schema": "core"},)
+
+    station_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    customer_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+
+    booking_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class AnalyticsRollupState(Base):
+    """Refresh bookkeeping per rollup job"""
+
+    __tablename__ = "analytics_rollup_state"
+    __table_args__ = ({"schema": "core"},)
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    # Bookings with updated_at after this have not been folded in yet
+    watermark: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_full_rebuild_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -212,6 +212,9 @@ class Booking(Base):
         Index("ix_core_bookings_customer_id", "customer_id"),
         Index("ix_core_bookings_date_slot", "date", "slot"),
         Index("ix_core_bookings_status", "status"),
+        # Analytics rollups: change detection + per-day recompute
+        Index("ix_core_bookings_updated_at", "updated_at"),
+        Index("ix_core_bookings_created_at", "created_at"),
         {
             "schema": "core",
             "extend_existing": True,
@@ -442,6 +445,8 @@ class Customer(Base):
         ),
         Index("idx_customer_station_created", "station_id", "created_at"),
         Index("ix_core_customers_email_active", "email_encrypted", unique=True),
+        Index("ix_core_customers_email_bidx", "email_bidx"),
+        Index("ix_core_customers_phone_bidx", "phone_bidx"),
         {"schema": "core"},
     )
 
@@ -459,6 +464,10 @@ class Customer(Base):
     email_encrypted: Mapped[str] = mapped_column(Text, nullable=False)
     phone_encrypted: Mapped[str] = mapped_column(Text, nullable=False)
 
+    # Blind indexes for lookups (keyed HMAC of normalized value, core/blind_index.py)
+    email_bidx: Mapped[Optional[str]] = mapped_column(String(64))
+    phone_bidx: Mapped[Optional[str]] = mapped_column(String(64))
+
     # Consent fields (match database schema)
     consent_sms: Mapped[bool] = mapped_column(Boolean, nullable=False)
     consent_email: Mapped[bool] = mapped_column(Boolean, nullable=False)
@@ -541,9 +550,11 @@ class Customer(Base):
         Uses core/encryption.py with passthrough mode for gradual migration.
         If FIELD_ENCRYPTION_KEY not set, stores plaintext (safe for migration).
         """
+        from core.blind_index import email_blind_index
         from core.encryption import encrypt_email
 
         self.email_encrypted = encrypt_email(value)
+        self.email_bidx = email_blind_index(value)
 
     @property
     def phone(self) -> str:
@@ -563,9 +574,11 @@ class Customer(Base):
 
         Uses core/encryption.py with passthrough mode for gradual migration.
         """
+        from core.blind_index import phone_blind_index
         from core.encryption import encrypt_phone
 
         self.phone_encrypted = encrypt_phone(value)
+        self.phone_bidx = phone_blind_index(value)
 
 
 # ==================== CHEF MODEL ====================
@@ -3,7 +3,10 @@ SQLAlchemy Models - Events Schema
 ==================================
 
 Event Sourcing Pattern:
-- Domain Events (event log)
+- Domain Events (event log, hash-chained)
+- Aggregate Snapshots (latest state per aggregate, for fast rehydration)
+- Event Chain Head (last hash of the domain event chain)
+- Projection State / Checkpoints (blue/green read-model rebuilds)
 - Inbox (inbound events from external systems)
 - Outbox (outbound events to external systems)
 
@@ -19,10 +22,10 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, Text, Integer, Boolean, DateTime, Index, Enum as SQLEnum
+from sqlalchemy import JSON, String, Text, Integer, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from ..base_class import Base
 
@@ -59,6 +62,10 @@ class DomainEvent(Base):
         Index("idx_domain_events_event_type", "event_type"),
         Index("idx_domain_events_occurred_at", "occurred_at"),
         Index("idx_domain_events_aggregate_type_id", "aggregate_type", "aggregate_id"),
+        # Rehydration reads an aggregate's events after its snapshot version
+        Index("ix_domain_events_aggregate_version", "aggregate_id", "version"),
+        # Stable order for streaming replay
+        Index("ix_domain_events_replay", "occurred_at", "id"),
         {"schema": "events", "extend_existing": True},
     )
 
@@ -98,6 +105,109 @@ class DomainEvent(Base):
         DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
     )
 
+    # Event store columns (written by cqrs.base.EventStore)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    hash_previous: Mapped[str] = mapped_column(String(64), nullable=False)
+    hash_current: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class AggregateSnapshot(Base):
+    """
+    Aggregate snapshot
+
+    Latest serialized state of an event-sourced aggregate. Rehydration loads
+    the snapshot and replays only the events after its version.
+    """
+
+    __tablename__ = "aggregate_snapshots"
+    __table_args__ = ({"schema": "events", "extend_existing": True},)
+
+    aggregate_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    aggregate_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    state: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class EventChainHead(Base):
+    """
+    Event chain head
+
+    Last hash of the domain event chain. Appenders read and advance it while
+    holding a transaction-scoped advisory lock, so chaining never scans
+    domain_events and concurrent writers cannot fork the chain.
+    """
+
+    __tablename__ = "event_chain_head"
+    __table_args__ = ({"schema": "events", "extend_existing": True},)
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    hash_current: Mapped[str] = mapped_column(String(64), nullable=False)
+    event_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class ProjectionState(Base):
+    """
+    Projection state
+
+    Blue/green bookkeeping for an event-sourced read model: which color
+    table the public read view currently selects from, and which color a
+    rebuild is filling.
+    """
+
+    __tablename__ = "projection_state"
+    __table_args__ = ({"schema": "events", "extend_existing": True},)
+
+    projection: Mapped[str] = mapped_column(String(100), primary_key=True)
+    active_color: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    building_color: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    building_partitions: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    swapped_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class ProjectionCheckpoint(Base):
+    """
+    Projection checkpoint
+
+    Replay position of one aggregate partition of one projection color,
+    written in the same transaction as the read-model rows it covers.
+    """
+
+    __tablename__ = "projection_checkpoints"
+    __table_args__ = ({"schema": "events", "extend_existing": True},)
+
+    projection: Mapped[str] = mapped_column(String(100), primary_key=True)
+    color: Mapped[str] = mapped_column(String(10), primary_key=True)
+    partition: Mapped[int] = mapped_column(Integer, primary_key=True)
+    partitions: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Keyset position in the (occurred_at, id) replay order
+    last_occurred_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_event_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    events_applied: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
 
 class Inbox(Base):
     """
@@ -165,6 +275,13 @@ class Outbox(Base):
         Index("idx_outbox_destination", "destination"),
         Index("idx_outbox_scheduled_at", "scheduled_at"),
         Index("idx_outbox_created_at", "created_at"),
+        # Worker claim scan: event types in created order, live rows only
+        Index(
+            "ix_outbox_claimable",
+            "event_type",
+            "created_at",
+            postgresql_where=text("status IN ('PENDING', 'PROCESSING')"),
+        ),
         {"schema": "events", "extend_existing": True},
     )
 
@@ -212,6 +329,12 @@ class Outbox(Base):
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Worker lease (set while status is PROCESSING)
+    claimed_by: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     # Response
     response_status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     response_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -36,7 +36,7 @@ from sqlalchemy import Enum as SQLEnum
 from sqlalchemy import Float, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.sql import func
 
 # Import shared enums from enums module (SSoT)
@@ -70,6 +70,8 @@ class LeadContact(Base):
     __table_args__ = (
         Index("ix_lead_contacts_lead", "lead_id"),
         Index("ix_lead_contacts_channel", "channel", "handle_or_address"),
+        Index("ix_lead_contacts_contact_bidx", "contact_bidx"),
+        Index("ix_lead_contacts_handle_e164", "handle_e164"),
         {"schema": "lead"},
     )
 
@@ -95,6 +97,14 @@ class LeadContact(Base):
     handle_or_address: Mapped[str] = mapped_column(Text, nullable=False)
     verified: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
+    # Blind index of the normalized phone/email handle (same digest as
+    # Customer/Subscriber *_bidx, so contacts match across tables)
+    contact_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    # E.164 form of phone-channel handles ("+15551234567"), for exact
+    # indexed matching of inbound calls/texts; None for other channels
+    handle_e164: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
@@ -103,6 +113,17 @@ class LeadContact(Base):
     # Relationships
     lead: Mapped["Lead"] = relationship("Lead", back_populates="contacts")
 
+    @validates("channel", "handle_or_address")
+    def _index_contact(self, key, value):
+        """Keep contact_bidx and handle_e164 in step with channel and handle"""
+        from core.blind_index import contact_blind_index, contact_e164
+
+        channel = value if key == "channel" else self.channel
+        handle = value if key == "handle_or_address" else self.handle_or_address
+        self.contact_bidx = contact_blind_index(channel, handle)
+        self.handle_e164 = contact_e164(channel, handle)
+        return value
+
 
 class LeadContext(Base):
     """
@@ -6,6 +6,7 @@ SMS & Email campaign management system:
 - Subscriber (newsletter subscribers with consent tracking)
 - Campaign (email/SMS campaigns)
 - CampaignEvent (delivery tracking - sent, opened, clicked, etc.)
+- CampaignAudienceMember (materialized campaign audience snapshot)
 - SMSTemplate (admin + AI-suggested templates)
 - CampaignSMSLimit (RingCentral package limits tracking)
 - SMSSendQueue (retry mechanism for SMS delivery)
@@ -35,11 +36,11 @@ from uuid import UUID, uuid4
 
 from sqlalchemy import (
     Column, String, Text, Integer, Float, Boolean, DateTime, LargeBinary,
-    ForeignKey, Index, CheckConstraint, Enum as SQLEnum, ARRAY
+    ForeignKey, Index, CheckConstraint, Enum as SQLEnum
 )
-from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB, ARRAY  # ARRAY: overlap() for segments
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from ..base_class import Base
 
@@ -67,6 +68,7 @@ class CampaignStatus(str, enum.Enum):
 class CampaignEventType(str, enum.Enum):
     """Campaign event types for tracking"""
     SENT = "sent"
+    FAILED = "failed"  # Not sent (e.g. phone could not be decrypted)
     DELIVERED = "delivered"
     OPENED = "opened"
     CLICKED = "clicked"
@@ -113,6 +115,13 @@ class SMSDeliveryStatus(str, enum.Enum):
 
 # ==================== MODELS ====================
 
+def _enc_text(value) -> Optional[str]:
+    """LargeBinary ciphertext column as the encrypted string it holds"""
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    return value.decode() if isinstance(value, (bytes, bytearray)) else value
+
+
 class Subscriber(Base):
     """
     Newsletter subscriber entity
@@ -125,6 +134,8 @@ class Subscriber(Base):
         Index("ix_newsletter_subscribers_subscribed", "subscribed"),
         Index("ix_newsletter_subscribers_customer", "customer_id"),
         Index("ix_newsletter_subscribers_engagement", "engagement_score"),
+        Index("ix_newsletter_subscribers_email_bidx", "email_bidx"),
+        Index("ix_newsletter_subscribers_phone_bidx", "phone_bidx"),
         CheckConstraint("engagement_score >= 0 AND engagement_score <= 100", name="check_engagement_score_range"),
         {"schema": "newsletter"}
     )
@@ -147,6 +158,10 @@ class Subscriber(Base):
     email_enc: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     phone_enc: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
 
+    # Blind indexes for lookups (keyed HMAC of normalized value, core/blind_index.py)
+    email_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    phone_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
     # Subscription Status
     subscribed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
@@ -168,6 +183,13 @@ class Subscriber(Base):
     last_email_sent_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     last_opened_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # SMS Metrics (added by f5a8b9c2d3e4)
+    total_sms_sent: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_sms_delivered: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_sms_failed: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_sms_sent_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_sms_delivered_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -188,6 +210,42 @@ class Subscriber(Base):
         cascade="all, delete-orphan"
     )
 
+    # ==================== ENCRYPTED CONTACT HELPERS ====================
+    # email/phone decrypt on read and encrypt + blind-index on write
+    # (services/encryption_service.py, the scheme campaign_dispatcher decodes)
+
+    @property
+    def email(self) -> Optional[str]:
+        from services.encryption_service import decrypt_email
+
+        return decrypt_email(_enc_text(self.email_enc)) or None
+
+    @email.setter
+    def email(self, value: Optional[str]):
+        from core.blind_index import email_blind_index
+        from services.encryption_service import encrypt_email
+
+        # email_enc is NOT NULL: phone-only subscribers store an empty value
+        self.email_enc = (encrypt_email(value) or "").encode()
+        self.email_bidx = email_blind_index(value)
+
+    @property
+    def phone(self) -> Optional[str]:
+        from core.blind_index import normalize_phone
+        from services.encryption_service import decrypt_phone
+
+        phone = decrypt_phone(_enc_text(self.phone_enc))
+        # Stored as digits only; return E.164
+        return normalize_phone(phone) if phone and phone.isdigit() else phone or None
+
+    @phone.setter
+    def phone(self, value: Optional[str]):
+        from core.blind_index import phone_blind_index
+        from services.encryption_service import encrypt_phone
+
+        self.phone_enc = encrypt_phone(value).encode() if value else None
+        self.phone_bidx = phone_blind_index(value)
+
 
 class Campaign(Base):
     """
@@ -220,6 +278,7 @@ class Campaign(Base):
 
     # Segmentation
     segment_filter: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    audience_snapshot_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Scheduling
     scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -234,6 +293,11 @@ class Campaign(Base):
 
     # Analytics
     total_recipients: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_sent: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_failed: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    # Dispatch checkpoint: last subscriber id (keyset order) whose page was fully processed
+    send_cursor: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True), nullable=True)
 
     # Audit
     created_by: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -274,6 +338,14 @@ class CampaignEvent(Base):
     __table_args__ = (
         Index("ix_newsletter_events_campaign", "campaign_id", "type"),
         Index("ix_newsletter_events_subscriber", "subscriber_id", "occurred_at"),
+        # One SENT event per recipient: the dispatcher's claim / double-send guard
+        Index(
+            "uq_newsletter_events_campaign_sent",
+            "campaign_id",
+            "subscriber_id",
+            unique=True,
+            postgresql_where=text("type = 'SENT'"),
+        ),
         {"schema": "newsletter"}
     )
 
@@ -321,6 +393,39 @@ class CampaignEvent(Base):
     )
 
 
+class CampaignAudienceMember(Base):
+    """
+    Materialized campaign audience
+
+    One row per subscriber matched by the campaign's segment when the
+    snapshot was taken. Counted for the admin UI and streamed to the
+    dispatcher instead of re-evaluating the segment.
+    """
+    __tablename__ = "campaign_audience"
+    __table_args__ = (
+        {"schema": "newsletter"},
+    )
+
+    # Composite Primary Key (campaign_id, subscriber_id) also serves counts and keyset reads
+    campaign_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("newsletter.campaigns.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    subscriber_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("newsletter.subscribers.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Timestamp
+    added_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+
 class SMSTemplate(Base):
     """
     SMS template entity
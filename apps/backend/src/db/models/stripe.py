@@ -24,7 +24,7 @@ from uuid import UUID, uuid4
 
 from sqlalchemy import DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Index, Numeric, String, Text
+from sqlalchemy import ForeignKey, Index, Numeric, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -284,23 +284,33 @@ class Refund(Base):
 class WebhookEvent(Base):
     """
     Log of Stripe webhook events for auditing and replay.
+
+    Also the durable queue processed by StripeWebhookWorker: RECEIVED
+    rows (every event in the ack-first mode, STRIPE_WEBHOOK_ASYNC; failed
+    inline events otherwise) and PROCESSING rows whose lease expired are
+    claimed one at a time per ordering_key.
     """
 
     __tablename__ = "webhook_events"
     __table_args__ = (
-        Index("ix_webhook_events_stripe_id", "stripe_event_id"),
+        # Idempotency: redelivered events hit ON CONFLICT DO NOTHING
+        UniqueConstraint("stripe_event_id", name="uq_webhook_events_stripe_event_id"),
         Index("ix_webhook_events_type", "event_type"),
         Index("ix_webhook_events_status", "status"),
         Index("ix_webhook_events_created", "created_at"),
+        Index(
+            "ix_webhook_events_queue",
+            "ordering_key",
+            "stripe_created",
+            postgresql_where=text("status IN ('RECEIVED', 'PROCESSING')"),
+        ),
         {"schema": "core"},
     )
 
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, default=uuid4
     )
-    stripe_event_id: Mapped[str] = mapped_column(
-        String(255), unique=True, nullable=False
-    )
+    stripe_event_id: Mapped[str] = mapped_column(String(255), nullable=False)
     event_type: Mapped[str] = mapped_column(String(100), nullable=False)
     status: Mapped[WebhookEventStatus] = mapped_column(
         SQLEnum(WebhookEventStatus, name="webhook_event_status", create_type=True),
@@ -315,6 +325,20 @@ class WebhookEvent(Base):
     )
     retry_count: Mapped[int] = mapped_column(default=0, nullable=False)
 
+    # Queue: events sharing an ordering_key (payment_intent id, else the
+    # object id) are processed one at a time in Stripe creation order
+    ordering_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    stripe_created: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    next_retry_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    claimed_by: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -13,15 +13,22 @@ Coordinate Precision:
 - Rounded to 3 decimal places (~100m precision)
 - Ensures cache hits for nearby locations
 
+Address-Keyed Rows (PricingService travel fees):
+- route_key = sha256 of the normalized origin/destination addresses
+- Coordinates are NULL (Distance Matrix was queried by address)
+- source="zip_centroid" rows are the precomputed station -> ZIP distances
+
 Table: public.travel_cache
 
 Related:
 - services/scheduling/travel_cache_service.py
 - services/scheduling/travel_time_service.py
+- services/scheduling/distance_service.py
 - 20-SINGLE_SOURCE_OF_TRUTH.instructions.md
 """
 
 from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
@@ -55,10 +62,11 @@ class TravelCache(Base):
         origin_lng: Origin longitude (3 decimal precision)
         dest_lat: Destination latitude (3 decimal precision)
         dest_lng: Destination longitude (3 decimal precision)
+        route_key: Hash of normalized addresses (address-keyed rows only)
         travel_time_minutes: Calculated travel time
         distance_miles: Calculated distance
         is_rush_hour: Whether rush hour multiplier was applied
-        source: API source ("google_maps", "openroute", "estimate")
+        source: API source ("google_maps", "openroute", "estimate", "zip_centroid")
         created_at: When the cache entry was created
         expires_at: When the cache entry expires (7 days from creation)
         hit_count: Number of times this cache entry was used
@@ -66,6 +74,7 @@ class TravelCache(Base):
     Indexes:
         - idx_travel_cache_coords: Composite index on all 4 coordinates
         - idx_travel_cache_expires: Index on expires_at for cleanup jobs
+        - uq_travel_cache_route_key: Unique (partial) index on route_key
     """
 
     __tablename__ = "travel_cache"
@@ -80,6 +89,13 @@ class TravelCache(Base):
         ),
         # Index for cleanup job (delete expired entries)
         Index("idx_travel_cache_expires", "expires_at"),
+        # Address-keyed lookups and upserts (ON CONFLICT target)
+        Index(
+            "uq_travel_cache_route_key",
+            "route_key",
+            unique=True,
+            postgresql_where=text("route_key IS NOT NULL"),
+        ),
         {"schema": "public"},
     )
 
@@ -92,10 +108,14 @@ class TravelCache(Base):
     )
 
     # Coordinates (rounded to 3 decimal places = ~100m precision)
-    origin_lat: Mapped[float] = mapped_column(Float, nullable=False, index=True)
-    origin_lng: Mapped[float] = mapped_column(Float, nullable=False)
-    dest_lat: Mapped[float] = mapped_column(Float, nullable=False)
-    dest_lng: Mapped[float] = mapped_column(Float, nullable=False)
+    # NULL for address-keyed rows
+    origin_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True, index=True)
+    origin_lng: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    dest_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    dest_lng: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # sha256 of "normalized origin|normalized destination"
+    route_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     # Travel data
     travel_time_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -107,7 +127,7 @@ class TravelCache(Base):
         String(50),
         nullable=False,
         default="google_maps",
-        comment="API source: google_maps, openroute, estimate",
+        comment="API source: google_maps, openroute, estimate, zip_centroid",
     )
 
     # Timestamps
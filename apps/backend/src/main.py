@@ -3,21 +3,6 @@ FastAPI Main Application - Enhanced with Dependency Injection
 Unified API with operational and AI endpoints, enterprise architecture patterns
 """
 
-# ==============================================
-# STARTUP DEBUG LOGGING - Confirm module loaded
-# This file write happens at module import time
-# ==============================================
-import os as _os_debug
-import time as _time_debug
-
-_startup_debug_file = _os_debug.path.join(
-    _os_debug.path.dirname(__file__), "STARTUP_DEBUG.log"
-)
-with open(_startup_debug_file, "w") as _f:
-    _f.write(f"MAIN.PY LOADED AT: {_time_debug.strftime('%Y-%m-%d %H:%M:%S')}\n")
-    _f.write("This file proves the server loaded the latest main.py code\n")
-# ==============================================
-
 import asyncio
 import logging
 import os
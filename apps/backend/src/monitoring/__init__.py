@@ -7,6 +7,7 @@ Provides comprehensive monitoring, alerting, and health check capabilities:
 - NotificationChannel: Multi-channel notification delivery (email, SMS, webhook)
 - HealthMonitor: System health checks and status reporting
 - MonitoringState: Activity-based wake/sleep state machine
+- MetricsAggregator: Buffered, pipelined request metrics
 """
 
 from .alert_service import AlertService, Alert, AlertLevel, AlertCategory
@@ -22,6 +23,13 @@ from .metric_collector import (
     track_response_time,
     track_error,
 )
+from .metrics_aggregator import (
+    MetricsAggregator,
+    get_metrics_aggregator,
+    reset_metrics_aggregator,
+)
+from .quantile_sketch import QuantileSketch
+from .timeseries_store import TimeSeriesPoint, TimeSeriesStore
 from .activity_classifier import (
     SmartActivityClassifier,
     get_activity_classifier,
@@ -74,6 +82,12 @@ __all__ = [
     "push_metric_update",
     "track_response_time",
     "track_error",
+    "MetricsAggregator",
+    "get_metrics_aggregator",
+    "reset_metrics_aggregator",
+    "QuantileSketch",
+    "TimeSeriesStore",
+    "TimeSeriesPoint",
     "SmartActivityClassifier",
     "get_activity_classifier",
     "MonitoringMiddleware",
@@ -8,6 +8,8 @@ Collects metrics from:
 4. Business (bookings, revenue, conversions)
 
 Stores metrics in Redis with TTL and publishes to pub/sub channel.
+Request-path helpers (track_response_time, track_error, push_metric_update)
+buffer into the MetricsAggregator, which flushes in pipelined batches.
 """
 
 import json
@@ -23,9 +25,22 @@ from sqlalchemy.orm import Session
 
 from core.config import settings
 from core.database import SessionLocal
+from .metrics_aggregator import MetricsAggregator, get_metrics_aggregator
+from .quantile_sketch import QuantileSketch
+from .timeseries_store import TimeSeriesPoint, TimeSeriesStore
 
 logger = logging.getLogger(__name__)
 
+_redis_pool: Optional[redis.ConnectionPool] = None
+
+
+def get_redis_client() -> redis.Redis:
+    """Synchronous Redis client backed by a shared connection pool"""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool.from_url(settings.redis_url, decode_responses=True)
+    return redis.Redis(connection_pool=_redis_pool)
+
 
 class MetricCollector:
     """
@@ -45,12 +60,8 @@ class MetricCollector:
     
     def __init__(self, db: Optional[Session] = None, redis_client: Optional[redis.Redis] = None):
         self.db = db
-        self.redis = redis_client or redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
+        self.redis = redis_client or get_redis_client()
+        self.timeseries = TimeSeriesStore(self.redis)
     
     # ========================================================================
     # PUBLIC API
@@ -360,32 +371,79 @@ class MetricCollector:
         
         return metrics
     
+    def get_response_time_sketch(
+        self, route: Optional[str] = None, window_seconds: int = 60
+    ) -> QuantileSketch:
+        """
+        Merge every worker's latency sketches for a route over a time window
+        
+        Args:
+            route: Route path template (None = all routes)
+            window_seconds: Real-time window, in 10s slots (max 1 hour)
+            
+        Returns:
+            Merged QuantileSketch (empty if no traffic)
+        """
+        sketch = QuantileSketch()
+        slot_seconds = MetricsAggregator.LATENCY_SLOT_SECONDS
+        current = int(time.time() // slot_seconds)
+        slots = range(current - max(1, window_seconds // slot_seconds) + 1, current + 1)
+        
+        pipe = self.redis.pipeline(transaction=False)
+        for slot in slots:
+            pipe.hgetall(
+                MetricsAggregator.LATENCY_KEY.format(
+                    slot=slot, route=route or MetricsAggregator.ALL_ROUTES
+                )
+            )
+        for fields in pipe.execute():
+            if fields:
+                sketch.merge_fields(fields)
+        return sketch
+    
+    def get_endpoint_latency_stats(self, window_seconds: int = 60) -> Dict[str, Dict[str, float]]:
+        """
+        Per-endpoint latency breakdown
+        
+        Returns:
+            {route: {"count", "avg_ms", "p50_ms", "p95_ms", "p99_ms"}} for routes with traffic
+        """
+        stats = {}
+        try:
+            routes = self.redis.smembers(MetricsAggregator.LATENCY_ROUTES_KEY) or set()
+            for route in sorted(routes):
+                if route == MetricsAggregator.ALL_ROUTES:
+                    continue
+                sketch = self.get_response_time_sketch(route, window_seconds)
+                if sketch.count:
+                    stats[route] = {
+                        "count": float(sketch.count),
+                        "avg_ms": sketch.mean,
+                        "p50_ms": sketch.quantile(0.50),
+                        "p95_ms": sketch.quantile(0.95),
+                        "p99_ms": sketch.quantile(0.99),
+                    }
+        except Exception as e:
+            logger.error(f"Error calculating endpoint latency stats: {e}")
+        
+        return stats
+    
     def _get_response_time_stats(self) -> Dict[str, float]:
-        """Get response time statistics from Redis"""
+        """Get last-minute response time statistics from the merged sketch"""
         metrics = {}
         
         try:
-            # Get response times from last minute
-            times_key = "metrics:response_times:minute"
-            times = self.redis.lrange(times_key, 0, -1)
+            sketch = self.get_response_time_sketch(window_seconds=60)
             
-            if times:
-                times_float = [float(t) for t in times]
-                times_float.sort()
-                
-                count = len(times_float)
-                metrics["api_response_time_avg_ms"] = sum(times_float) / count
-                metrics["api_response_time_min_ms"] = times_float[0]
-                metrics["api_response_time_max_ms"] = times_float[-1]
-                
-                # Percentiles
-                p50_idx = int(count * 0.50)
-                p95_idx = int(count * 0.95)
-                p99_idx = int(count * 0.99)
+            if sketch.count:
+                metrics["api_response_time_avg_ms"] = sketch.mean
+                metrics["api_response_time_min_ms"] = sketch.min
+                metrics["api_response_time_max_ms"] = sketch.max
                 
-                metrics["api_response_time_p50_ms"] = times_float[p50_idx]
-                metrics["api_response_time_p95_ms"] = times_float[p95_idx]
-                metrics["api_response_time_p99_ms"] = times_float[p99_idx]
+                # Percentiles (within 1% relative error)
+                metrics["api_response_time_p50_ms"] = sketch.quantile(0.50)
+                metrics["api_response_time_p95_ms"] = sketch.quantile(0.95)
+                metrics["api_response_time_p99_ms"] = sketch.quantile(0.99)
             
         except Exception as e:
             logger.error(f"Error calculating response time stats: {e}")
@@ -632,39 +690,49 @@ class MetricCollector:
         """
         Update metric history for pattern analysis
         
-        Stores last 100 values in Redis sorted set
+        Recorded into the 1m/5m/1h rollups of the TimeSeriesStore
         """
         try:
-            history_key = f"metric:history:{metric_name}"
-            timestamp = time.time()
-            
-            # Add to sorted set (score = timestamp)
-            self.redis.zadd(history_key, {str(value): timestamp})
-            
-            # Keep only last 100 values
-            self.redis.zremrangebyrank(history_key, 0, -101)
-            
-            # Set TTL (24 hours)
-            self.redis.expire(history_key, 86400)
+            self.timeseries.record(metric_name, value)
             
         except Exception as e:
             logger.error(f"Error updating metric history: {e}")
     
     def get_metric_history(self, metric_name: str, limit: int = 100) -> List[tuple]:
         """
-        Get metric history
+        Get recent metric history (1-minute averages)
         
         Args:
             metric_name: Name of the metric
-            limit: Maximum number of values to return
+            limit: Maximum number of minutes to return
             
         Returns:
-            List of (value, timestamp) tuples
+            List of (value, timestamp) tuples, oldest first
+        """
+        points = self.get_metric_history_range(metric_name, time.time() - limit * 60, resolution="1m")
+        return [(point.avg, point.timestamp) for point in points[-limit:]]
+    
+    def get_metric_history_range(
+        self,
+        metric_name: str,
+        start: float,
+        end: Optional[float] = None,
+        resolution: Optional[str] = None,
+    ) -> List[TimeSeriesPoint]:
+        """
+        Get metric rollup buckets for a time range
+        
+        Args:
+            metric_name: Name of the metric
+            start: Range start (epoch seconds)
+            end: Range end (epoch seconds, default now)
+            resolution: "1m" / "5m" / "1h" (default: finest that covers the range)
+            
+        Returns:
+            List of TimeSeriesPoint, oldest first
         """
         try:
-            history_key = f"metric:history:{metric_name}"
-            data = self.redis.zrange(history_key, -limit, -1, withscores=True)
-            return [(float(value), timestamp) for value, timestamp in data]
+            return self.timeseries.query(metric_name, start, end, resolution)
             
         except Exception as e:
             logger.error(f"Error getting metric history: {e}")
@@ -698,12 +766,9 @@ class MetricCollector:
         Calculates average from last 24 hours
         """
         try:
-            history = self.get_metric_history(metric_name, limit=288)  # 24h @ 5min intervals
+            avg_value = self.timeseries.mean(metric_name, time.time() - 86400)  # 24h of 1m rollups
             
-            if history:
-                values = [value for value, _ in history]
-                avg_value = sum(values) / len(values)
-                
+            if avg_value is not None:
                 baseline_key = f"metric:baseline:{metric_name}"
                 self.redis.setex(baseline_key, 86400, str(avg_value))  # 24h TTL
                 
@@ -721,60 +786,42 @@ def push_metric_update(metric_name: str, value: float):
     """
     Helper function to push metric update from anywhere in the app
     
+    Buffered; stored and published on the aggregator's next flush.
+    
     Args:
         metric_name: Name of the metric
         value: Metric value
     """
     try:
-        collector = MetricCollector()
-        collector.push_metric(metric_name, value)
+        get_metrics_aggregator().record_metric(metric_name, value)
     except Exception as e:
         logger.error(f"Error pushing metric update: {e}")
 
 
-def track_response_time(duration_ms: float):
+def track_response_time(duration_ms: float, route: Optional[str] = None):
     """
     Track API response time
     
+    Non-blocking: counted in process memory and flushed in batches.
+    
     Args:
         duration_ms: Response time in milliseconds
+        route: Route path template for per-endpoint percentiles
     """
     try:
-        redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
-        
-        # Add to list for percentile calculation
-        redis_client.lpush("metrics:response_times:minute", str(duration_ms))
-        redis_client.expire("metrics:response_times:minute", 60)
-        redis_client.ltrim("metrics:response_times:minute", 0, 999)  # Keep last 1000
-        
-        # Increment request counter
-        redis_client.incr("metrics:requests:minute")
-        redis_client.expire("metrics:requests:minute", 60)
-        
-        # Push metric for real-time monitoring
-        push_metric_update("api_response_time_ms", duration_ms)
-        
+        get_metrics_aggregator().record_response_time(duration_ms, route)
     except Exception as e:
         logger.error(f"Error tracking response time: {e}")
 
 
-def track_error():
-    """Track API error occurrence"""
+def track_error(unhandled: bool = False):
+    """
+    Track API error occurrence
+    
+    Args:
+        unhandled: Also count towards metrics:total_errors (unhandled exceptions)
+    """
     try:
-        redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
-        
-        redis_client.incr("metrics:errors:minute")
-        redis_client.expire("metrics:errors:minute", 60)
-        
+        get_metrics_aggregator().record_error(unhandled=unhandled)
     except Exception as e:
         logger.error(f"Error tracking error: {e}")
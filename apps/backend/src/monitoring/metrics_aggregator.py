@@ -0,0 +1,263 @@
+"""
+MetricsAggregator - Buffered, pipelined request metrics
+
+Request-path metric calls (track_response_time, track_error,
+push_metric_update) used to open a new synchronous Redis client and make
+6+ blocking round-trips on every API request. The aggregator instead:
+
+1. Records observations in process memory (no I/O, no await)
+2. Flushes everything buffered to Redis every ``flush_interval_ms`` in ONE
+   pipelined round-trip, over a shared pooled async client
+3. Coalesces gauge updates: only the latest value per metric (and the mean
+   response time of the batch) is stored/published per flush
+4. Keeps response times as per-route QuantileSketches; each flush merges
+   the worker's sketches into 10-second Redis slots with HINCRBY, so every
+   worker's latencies combine into one exact-to-1% distribution
+
+Counter, gauge and pub/sub keys are unchanged, so MetricSubscriber and
+ThresholdMonitor keep working as before; MetricCollector reads latency
+percentiles from the sketch slots.
+
+Usage:
+    aggregator = get_metrics_aggregator()
+    aggregator.record_response_time(12.5, route="/api/v1/bookings")
+    await aggregator.start()                # once, at startup (optional)
+    await aggregator.stop()                 # final flush on shutdown
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from core.config import settings
+from .quantile_sketch import QuantileSketch
+from .timeseries_store import TimeSeriesStore
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsAggregator:
+    """
+    In-process metric buffer flushed to Redis in pipelined batches
+
+    Features:
+    - O(1), non-blocking record_* calls safe to use on the request path
+    - One pipeline per flush (HINCRBY/INCRBY/SETEX/PUBLISH/history batched)
+    - Shared connection pool, created lazily
+    - Constant-memory latency sketches per route
+    """
+
+    ALL_ROUTES = "_all"
+    LATENCY_KEY = "metrics:latency:{slot}:{route}"
+    LATENCY_ROUTES_KEY = "metrics:latency:routes"
+    LATENCY_SLOT_SECONDS = 10
+    LATENCY_TTL = 3600  # Longest window MetricCollector can query
+    REQUESTS_KEY = "metrics:requests:minute"
+    ERRORS_KEY = "metrics:errors:minute"
+    TOTAL_ERRORS_KEY = "metrics:total_errors"
+    WINDOW_TTL = 60
+
+    METRIC_TTL = 300  # Matches MetricCollector.METRIC_TTL
+    REDIS_CHANNEL = "metrics:updates"
+
+    def __init__(
+        self,
+        redis_client: Optional[aioredis.Redis] = None,
+        flush_interval_ms: int = 500,
+    ):
+        self._redis = redis_client
+        self.flush_interval = flush_interval_ms / 1000
+
+        self._sketches: Dict[str, QuantileSketch] = {}
+        self._requests = 0
+        self._errors = 0
+        self._unhandled_errors = 0
+        self._gauges: Dict[str, Tuple[float, float]] = {}  # name -> (value, timestamp)
+
+        self.timeseries = TimeSeriesStore()
+
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+        self.stats = {"flushes": 0, "flush_errors": 0}
+
+    # ========================================================================
+    # RECORDING (request path)
+    # ========================================================================
+
+    def record_response_time(self, duration_ms: float, route: Optional[str] = None):
+        """Record one API request and its response time (route = path template)"""
+        self._requests += 1
+        for name in (self.ALL_ROUTES, route) if route else (self.ALL_ROUTES,):
+            sketch = self._sketches.get(name)
+            if sketch is None:
+                sketch = self._sketches[name] = QuantileSketch()
+            sketch.add(duration_ms)
+        self._ensure_running()
+
+    def record_error(self, unhandled: bool = False):
+        """Record an API error (unhandled=True also bumps metrics:total_errors)"""
+        self._errors += 1
+        if unhandled:
+            self._unhandled_errors += 1
+        self._ensure_running()
+
+    def record_metric(self, metric_name: str, value: float):
+        """Record a gauge value; only the latest per flush is pushed"""
+        self._gauges[metric_name] = (value, time.time())
+        self._ensure_running()
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.Redis.from_url(
+                settings.redis_url, decode_responses=True, max_connections=10
+            )
+        return self._redis
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the background flush loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"MetricsAggregator started (flush every {self.flush_interval * 1000:.0f}ms)")
+
+    async def stop(self):
+        """Stop the flush loop and flush whatever is buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        logger.info("MetricsAggregator stopped")
+
+    def _ensure_running(self):
+        """Lazily start the flush loop from the first async caller"""
+        if self.running:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Sync caller; buffered until an async caller or stop() flushes
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    # ========================================================================
+    # FLUSH
+    # ========================================================================
+
+    def _drain(self):
+        batch = (
+            self._sketches,
+            self._requests,
+            self._errors,
+            self._unhandled_errors,
+            self._gauges,
+        )
+        self._sketches = {}
+        self._requests = 0
+        self._errors = 0
+        self._unhandled_errors = 0
+        self._gauges = {}
+        return batch
+
+    async def flush(self) -> int:
+        """
+        Write all buffered observations in one pipelined round-trip
+
+        Returns:
+            Number of observations flushed
+        """
+        async with self._flush_lock:
+            sketches, requests, errors, unhandled, gauges = self._drain()
+            overall = sketches.get(self.ALL_ROUTES)
+            if overall is not None:
+                gauges.setdefault("api_response_time_ms", (overall.mean, time.time()))
+            if not (sketches or requests or errors or gauges):
+                return 0
+
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+
+                if requests:
+                    pipe.incrby(self.REQUESTS_KEY, requests)
+                    pipe.expire(self.REQUESTS_KEY, self.WINDOW_TTL)
+                if errors:
+                    pipe.incrby(self.ERRORS_KEY, errors)
+                    pipe.expire(self.ERRORS_KEY, self.WINDOW_TTL)
+                if unhandled:
+                    pipe.incrby(self.TOTAL_ERRORS_KEY, unhandled)
+
+                slot = int(time.time() // self.LATENCY_SLOT_SECONDS)
+                for route, sketch in sketches.items():
+                    key = self.LATENCY_KEY.format(slot=slot, route=route)
+                    for field, amount in sketch.to_fields().items():
+                        if isinstance(amount, float):
+                            pipe.hincrbyfloat(key, field, amount)
+                        else:
+                            pipe.hincrby(key, field, amount)
+                    pipe.expire(key, self.LATENCY_TTL)
+                if sketches:
+                    pipe.sadd(self.LATENCY_ROUTES_KEY, *sketches)
+                    pipe.expire(self.LATENCY_ROUTES_KEY, self.LATENCY_TTL)
+
+                for metric_name, (value, timestamp) in gauges.items():
+                    pipe.setex(f"metric:{metric_name}", self.METRIC_TTL, str(value))
+                    pipe.publish(
+                        self.REDIS_CHANNEL,
+                        json.dumps({"metric_name": metric_name, "value": value, "timestamp": timestamp}),
+                    )
+                    self.timeseries.record(metric_name, value, timestamp, pipe=pipe)
+
+                results = await pipe.execute()
+                self.stats["flushes"] += 1
+
+                if unhandled:
+                    # INCRBY result for total_errors follows the request/error counters
+                    index = 2 * bool(requests) + 2 * bool(errors)
+                    self.record_metric("total_errors", float(results[index]))
+
+            except Exception as e:
+                self.stats["flush_errors"] += 1
+                logger.error(f"Error flushing metrics batch: {e}")
+
+            return requests + errors + len(gauges)
+
+
+# ============================================================================
+# SINGLETON
+# ============================================================================
+
+_aggregator: Optional[MetricsAggregator] = None
+
+
+def get_metrics_aggregator() -> MetricsAggregator:
+    """Get the process-wide MetricsAggregator"""
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = MetricsAggregator()
+    return _aggregator
+
+
+def reset_metrics_aggregator():
+    """Reset the singleton (for testing)"""
+    global _aggregator
+    _aggregator = None
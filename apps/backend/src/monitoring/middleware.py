@@ -17,7 +17,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from monitoring.activity_classifier import get_activity_classifier
-from monitoring.metric_collector import track_response_time, track_error, push_metric_update
+from monitoring.metric_collector import track_response_time, track_error
 from monitoring.monitoring_state import get_monitoring_state
 
 logger = logging.getLogger(__name__)
@@ -97,8 +97,9 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         # Calculate response time
         duration_ms = (time.time() - start_time) * 1000
         
-        # Track response time
-        track_response_time(duration_ms)
+        # Track response time (per route template, e.g. /api/v1/bookings/{booking_id})
+        route = request.scope.get("route")
+        track_response_time(duration_ms, getattr(route, "path", None))
         
         # Track errors (5xx responses)
         if error_occurred or (response and response.status_code >= 500):
@@ -145,26 +146,8 @@ async def monitoring_exception_handler(request: Request, exc: Exception):
     """
     logger.error(f"Unhandled exception on {request.url.path}: {exc}")
     
-    # Track error
-    track_error()
-    
-    # Push error count metric
-    try:
-        import redis
-        from core.config import settings
-        
-        redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
-        
-        error_count = redis_client.incr("metrics:total_errors")
-        push_metric_update("total_errors", float(error_count))
-        
-    except Exception as e:
-        logger.error(f"Error tracking exception: {e}")
+    # Track error (also bumps metrics:total_errors and publishes it)
+    track_error(unhandled=True)
     
     # Re-raise for default handling
     raise exc
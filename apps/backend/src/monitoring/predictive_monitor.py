@@ -18,6 +18,7 @@ Part of: AI-Monitoring Integration
 """
 
 import logging
+import time
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
@@ -27,9 +28,10 @@ from enum import Enum
 from sqlalchemy.orm import Session
 import redis
 
-from core.config import settings
 from core.database import SessionLocal
 from monitoring.alert_service import AlertService, Alert, AlertLevel, AlertCategory
+from monitoring.metric_collector import get_redis_client
+from monitoring.timeseries_store import TimeSeriesStore
 
 
 logger = logging.getLogger(__name__)
@@ -111,18 +113,13 @@ class PredictiveMonitor:
             min_data_points: Minimum data points needed
         """
         self.db = db or SessionLocal()
-        self.redis = redis_client or redis.Redis(
-            host=settings.redis_host,
-            port=settings.redis_port,
-            db=settings.redis_db,
-            decode_responses=True
-        )
+        self.redis = redis_client or get_redis_client()
+        self.timeseries = TimeSeriesStore(self.redis)
         
         self.lookback_minutes = lookback_minutes
         self.min_data_points = min_data_points
         
         # Redis keys
-        self.history_key_prefix = "metrics:history:"
         self.predictions_key = "monitoring:predictions"
         
         # Initialize AlertService
@@ -250,34 +247,21 @@ class PredictiveMonitor:
         lookback_minutes: int
     ) -> List[Dict[str, Any]]:
         """
-        Get metric history from Redis.
+        Get metric history from the TimeSeriesStore.
+        
+        Uses 1m buckets for up to a day of lookback, then 5m / 1h
+        rollups, so multi-day trends stay cheap.
         
         Returns:
-            List of {value, timestamp} dicts
+            List of {value, timestamp} dicts (bucket averages, oldest first)
         """
-        history_key = f"{self.history_key_prefix}{metric_name}"
-        
         try:
-            # Get from Redis sorted set (assuming stored with timestamp scores)
-            cutoff_time = datetime.utcnow() - timedelta(minutes=lookback_minutes)
-            cutoff_score = cutoff_time.timestamp()
-            
-            # Get all entries since cutoff
-            entries = self.redis.zrangebyscore(
-                history_key,
-                cutoff_score,
-                "+inf",
-                withscores=True
-            )
-            
-            history = []
-            for value_str, timestamp_score in entries:
-                history.append({
-                    "value": float(value_str),
-                    "timestamp": datetime.fromtimestamp(timestamp_score)
-                })
+            points = self.timeseries.query(metric_name, time.time() - lookback_minutes * 60)
             
-            return history
+            return [
+                {"value": point.avg, "timestamp": datetime.fromtimestamp(point.timestamp)}
+                for point in points
+            ]
             
         except Exception as e:
             logger.warning(f"Could not get metric history: {e}")
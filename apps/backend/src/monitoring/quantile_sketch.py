@@ -0,0 +1,135 @@
+"""
+QuantileSketch - Mergeable streaming percentiles (DDSketch)
+
+Values are counted in logarithmic buckets: bucket k covers
+(gamma^(k-1), gamma^k] with gamma = (1 + a) / (1 - a). Any quantile is then
+answered with relative error <= a (1% by default) from a few hundred
+integer counters, regardless of how many values were added.
+
+Because a sketch is just bucket -> count, merging two sketches is adding
+their counts. That makes it safe to aggregate per worker and merge
+centrally with Redis HINCRBY (see MetricsAggregator / MetricCollector).
+
+Usage:
+    sketch = QuantileSketch()
+    for ms in latencies:
+        sketch.add(ms)
+    p99 = sketch.quantile(0.99)
+"""
+
+import math
+from typing import Dict, Mapping, Optional
+
+ZERO_FIELD = "z"
+SUM_FIELD = "sum"
+BUCKET_PREFIX = "b:"
+
+
+class QuantileSketch:
+    """
+    DDSketch-style log-bucketed quantile sketch for non-negative values
+
+    Features:
+    - Relative-error guarantee on every quantile
+    - Constant memory (bounded by the value range, not the count)
+    - Exact merge by adding bucket counts
+    - Serializes to a flat {field: number} mapping (Redis hash)
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of (gamma^(k-1), gamma^k]
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        """Add a value (negative values are clamped to 0)"""
+        if value <= self.min_value:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+        self.sum += max(value, 0.0) * count
+
+    def merge(self, other: "QuantileSketch"):
+        """Add another sketch's counts into this one (same accuracy)"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q in [0, 1] (None if empty)"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.bins))
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    @property
+    def min(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return 0.0 if self.zero_count else self._value(min(self.bins))
+
+    @property
+    def max(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self._value(max(self.bins)) if self.bins else 0.0
+
+    # ========================================================================
+    # SERIALIZATION (Redis hash)
+    # ========================================================================
+
+    def to_fields(self) -> Dict[str, float]:
+        """Flat mapping suitable for HINCRBY / HINCRBYFLOAT"""
+        fields: Dict[str, float] = {f"{BUCKET_PREFIX}{k}": c for k, c in self.bins.items()}
+        if self.zero_count:
+            fields[ZERO_FIELD] = self.zero_count
+        if self.sum:
+            fields[SUM_FIELD] = self.sum
+        return fields
+
+    def merge_fields(self, fields: Mapping[str, str]):
+        """Merge a hash written by to_fields (e.g. an HGETALL result)"""
+        for field, raw in fields.items():
+            if field == SUM_FIELD:
+                self.sum += float(raw)
+            elif field == ZERO_FIELD:
+                self.zero_count += int(raw)
+                self.count += int(raw)
+            elif field.startswith(BUCKET_PREFIX):
+                key = int(field[len(BUCKET_PREFIX):])
+                count = int(raw)
+                self.bins[key] = self.bins.get(key, 0) + count
+                self.count += count
@@ -6,6 +6,7 @@ Initializes and starts the complete monitoring system:
 - MetricSubscriber: Real-time pub/sub listener
 - MonitoringState: State machine management
 - RuleEvaluator: Threshold checking
+- MetricsAggregator: Batched request-metric flushing
 
 Usage in FastAPI app:
 
@@ -33,9 +34,9 @@ from typing import Optional
 from fastapi import FastAPI
 
 from core.database import SessionLocal
-from core.config import settings
+from .metric_collector import get_redis_client
+from .metrics_aggregator import get_metrics_aggregator
 from .threshold_monitor import ThresholdMonitor, get_threshold_monitor
-import redis
 
 logger = logging.getLogger(__name__)
 
@@ -60,13 +61,11 @@ async def startup_monitoring() -> ThresholdMonitor:
         # Get database session
         db = SessionLocal()
         
-        # Get Redis client
-        redis_client = redis.Redis(
-            host=settings.redis_host,
-            port=settings.redis_port,
-            db=settings.redis_db,
-            decode_responses=True
-        )
+        # Get Redis client (shared pool)
+        redis_client = get_redis_client()
+        
+        # Start batched request-metric flushing
+        await get_metrics_aggregator().start()
         
         # Create monitor
         _monitor_instance = get_threshold_monitor(db, redis_client)
@@ -95,6 +94,7 @@ async def shutdown_monitoring():
             logger.info("Stopping monitoring system...")
             await _monitor_instance.stop()
             _monitor_instance = None
+            await get_metrics_aggregator().stop()
             logger.info("Monitoring system stopped successfully")
         except Exception as e:
             logger.error(f"Error stopping monitoring system: {e}", exc_info=True)
@@ -53,6 +53,7 @@ from sqlalchemy.orm import Session
 from redis import Redis
 
 from .metric_collector import MetricCollector, get_metric_collector
+from .timeseries_store import TimeSeriesPoint
 from .metric_subscriber import MetricSubscriber
 from .rule_evaluator import RuleEvaluator, RuleViolation
 from .monitoring_state import MonitoringState, MonitoringStateEnum
@@ -441,7 +442,8 @@ class ThresholdMonitor:
                         "operator": violation.operator,
                         "duration_exceeded": violation.duration_exceeded,
                         "tags": rule.tags,
-                        "rule_metadata": rule.metadata
+                        "rule_metadata": rule.metadata,
+                        "last_hour": self._summarize_history(rule.metric_name, 3600)
                     },
                     recommendations=[]  # Could be added from rule metadata
                 )
@@ -473,6 +475,37 @@ class ThresholdMonitor:
         
         return alerts_created
     
+    def get_metric_history(
+        self,
+        metric_name: str,
+        start: float,
+        end: Optional[float] = None,
+        resolution: Optional[str] = None
+    ) -> List[TimeSeriesPoint]:
+        """
+        Get rollup buckets for a metric over a time range.
+        
+        Args:
+            metric_name: Metric name
+            start: Range start (epoch seconds)
+            end: Range end (epoch seconds, default now)
+            resolution: "1m" / "5m" / "1h" (default: finest covering the range)
+        """
+        return self.metric_collector.get_metric_history_range(metric_name, start, end, resolution)
+    
+    def _summarize_history(self, metric_name: str, window_seconds: int) -> Optional[Dict]:
+        """min/avg/max of a metric over the last window (for alert context)."""
+        points = self.get_metric_history(metric_name, time.time() - window_seconds)
+        count = sum(p.count for p in points)
+        if not count:
+            return None
+        return {
+            "min": min(p.min for p in points),
+            "avg": sum(p.sum for p in points) / count,
+            "max": max(p.max for p in points),
+            "samples": count,
+        }
+    
     def get_stats(self) -> Dict:
         """Get monitoring statistics."""
         return {
@@ -0,0 +1,216 @@
+"""
+TimeSeriesStore - Compact metric history with rollups
+
+Replaces the per-metric sorted set (value string as member, last 100
+samples) that silently dropped repeated values and held too little data
+for baselines and trend prediction.
+
+Layout (per metric, per resolution):
+- One Redis hash used as a fixed-size ring buffer: field = slot % capacity
+- Each field holds one bucket aggregate: "slot count sum min max"
+- A single Lua call updates the 1m, 5m and 1h rollups atomically, so any
+  number of writers (API workers, collectors) can record concurrently
+
+Retention per resolution:
+    1m  x 1440 slots = 24 hours
+    5m  x 2016 slots = 7 days
+    1h  x  720 slots = 30 days
+
+Memory is bounded by the slot counts regardless of sample rate.
+
+Usage:
+    store = TimeSeriesStore(redis_client)
+    store.record("cpu_percent", 42.0)
+    points = store.query("cpu_percent", start=time.time() - 3 * 86400)  # 5m buckets
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """A rollup resolution and how many buckets of it are kept"""
+
+    name: str
+    seconds: int
+    capacity: int
+
+    @property
+    def retention_seconds(self) -> int:
+        return self.seconds * self.capacity
+
+
+@dataclass
+class TimeSeriesPoint:
+    """One rollup bucket"""
+
+    timestamp: float  # Bucket start (epoch seconds)
+    count: int
+    sum: float
+    min: float
+    max: float
+
+    @property
+    def avg(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+RESOLUTIONS: Sequence[Resolution] = (
+    Resolution("1m", 60, 1440),
+    Resolution("5m", 300, 2016),
+    Resolution("1h", 3600, 720),
+)
+
+# KEYS: one hash per resolution
+# ARGV: value, timestamp, then (seconds, capacity) per resolution
+_RECORD_SCRIPT = """
+local value = tonumber(ARGV[1])
+local ts = tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    local seconds = tonumber(ARGV[1 + 2 * i])
+    local capacity = tonumber(ARGV[2 + 2 * i])
+    local slot = math.floor(ts / seconds)
+    local field = tostring(slot % capacity)
+    local count, total, low, high = 1, value, value, value
+    local write = true
+    local current = redis.call('HGET', key, field)
+    if current then
+        local s, c, t, l, h = string.match(current, '^(%S+) (%S+) (%S+) (%S+) (%S+)$')
+        s = tonumber(s)
+        if s == slot then
+            count = tonumber(c) + 1
+            total = tonumber(t) + value
+            low = math.min(tonumber(l), value)
+            high = math.max(tonumber(h), value)
+        elseif s > slot then
+            write = false  -- Late sample for a bucket that has already been recycled
+        end
+    end
+    if write then
+        redis.call('HSET', key, field, string.format('%d %d %.17g %.17g %.17g', slot, count, total, low, high))
+        redis.call('EXPIRE', key, seconds * capacity)
+    end
+end
+return 1
+"""
+
+
+class TimeSeriesStore:
+    """
+    Redis ring-buffer time-series store with 1m/5m/1h rollups
+
+    Features:
+    - Every sample counted (no member collisions)
+    - Fixed memory per metric
+    - Range queries pick the finest resolution that still covers the range
+    - Works with sync and async clients/pipelines for writes (record)
+    """
+
+    KEY_PREFIX = "metrics:ts"
+
+    def __init__(self, redis_client=None, resolutions: Sequence[Resolution] = RESOLUTIONS):
+        self.redis = redis_client
+        self.resolutions = tuple(sorted(resolutions, key=lambda r: r.seconds))
+
+    def key(self, metric_name: str, resolution: Resolution) -> str:
+        return f"{self.KEY_PREFIX}:{resolution.name}:{metric_name}"
+
+    def resolution(self, name: str) -> Resolution:
+        for res in self.resolutions:
+            if res.name == name:
+                return res
+        raise ValueError(f"Unknown resolution: {name}")
+
+    # ========================================================================
+    # WRITE
+    # ========================================================================
+
+    def record(self, metric_name: str, value: float, timestamp: Optional[float] = None, pipe=None):
+        """
+        Add a sample to every rollup
+
+        Args:
+            metric_name: Metric name
+            value: Sample value
+            timestamp: Epoch seconds (default now)
+            pipe: Optional sync/async pipeline to queue the write on
+                (the caller executes it); otherwise runs immediately
+        """
+        keys = [self.key(metric_name, res) for res in self.resolutions]
+        args = [value, time.time() if timestamp is None else timestamp]
+        for res in self.resolutions:
+            args.extend((res.seconds, res.capacity))
+        return (pipe or self.redis).eval(_RECORD_SCRIPT, len(keys), *keys, *args)
+
+    # ========================================================================
+    # READ
+    # ========================================================================
+
+    def choose_resolution(self, start: float, end: Optional[float] = None) -> Resolution:
+        """Finest resolution whose retention still reaches back to start"""
+        now = time.time()
+        for res in self.resolutions:
+            if now - start <= res.retention_seconds:
+                return res
+        return self.resolutions[-1]
+
+    def query(
+        self,
+        metric_name: str,
+        start: float,
+        end: Optional[float] = None,
+        resolution: Optional[str] = None,
+    ) -> List[TimeSeriesPoint]:
+        """
+        Buckets overlapping [start, end], oldest first
+
+        Args:
+            metric_name: Metric name
+            start: Range start (epoch seconds)
+            end: Range end (epoch seconds, default now)
+            resolution: "1m" / "5m" / "1h" (default: chosen from the range)
+        """
+        end = time.time() if end is None else end
+        res = self.resolution(resolution) if resolution else self.choose_resolution(start, end)
+
+        first = int(start // res.seconds)
+        last = int(end // res.seconds)
+        first = max(first, last - res.capacity + 1)
+        if last < first:
+            return []
+
+        slots = list(range(first, last + 1))
+        try:
+            raw = self.redis.hmget(self.key(metric_name, res), [str(s % res.capacity) for s in slots])
+        except Exception as e:
+            logger.error(f"Error querying time series {metric_name}: {e}")
+            return []
+
+        points = []
+        for slot, entry in zip(slots, raw):
+            if not entry:
+                continue
+            stored_slot, count, total, low, high = entry.split()
+            if int(stored_slot) != slot:
+                continue  # Ring position holds an older/newer bucket
+            points.append(
+                TimeSeriesPoint(
+                    timestamp=float(slot * res.seconds),
+                    count=int(count),
+                    sum=float(total),
+                    min=float(low),
+                    max=float(high),
+                )
+            )
+        return points
+
+    def mean(self, metric_name: str, start: float, end: Optional[float] = None) -> Optional[float]:
+        """Sample-weighted mean over a range (None if no data)"""
+        points = self.query(metric_name, start, end)
+        count = sum(p.count for p in points)
+        return sum(p.sum for p in points) / count if count else None
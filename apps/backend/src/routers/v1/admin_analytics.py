@@ -15,58 +15,52 @@
 # =============================================================================
 """
 
-# TODO: Newsletter/Campaign models need migration to proper schema
-# Temporarily creating placeholder classes until newsletter schema is implemented
-import enum
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 from core.database import get_db
-from db.models.core import Booking, Customer
+from db.models.analytics import (
+    BookingDailyRollup,
+    BookingMonthlyRollup,
+    CustomerValueRollup,
+    StationCustomerRollup,
+)
+from db.models.core import Booking, BookingStatus, Payment, PaymentStatus
 
 # Fixed: Use unified lead schema instead of legacy models
 from db.models.crm import Lead, LeadQuality, LeadStatus
-
-
-class CampaignStatus(str, enum.Enum):
-    """Placeholder - needs migration to db.models.newsletter"""
-
-    DRAFT = "draft"
-    ACTIVE = "active"
-    COMPLETED = "completed"
-
-
-class CampaignEventType(str, enum.Enum):
-    """Placeholder - needs migration to db.models.newsletter"""
-
-    SENT = "sent"
-    OPENED = "opened"
-    CLICKED = "clicked"
-
-
-# Placeholder models (will cause runtime errors if used - need proper migration)
-class Campaign:
-    pass
-
-
-class CampaignEvent:
-    pass
-
-
-class Subscriber:
-    pass
-
-
+from db.models.lead import LeadContact
+from db.models.newsletter import (
+    Campaign,
+    CampaignEvent,
+    CampaignEventType,
+    CampaignStatus,
+    Subscriber,
+)
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy import desc, func
-from sqlalchemy.orm import Session
+from sqlalchemy import Date, Float, and_, cast, desc, exists, func, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_admin_user
 from db.models.identity import User
 
 router = APIRouter(prefix="/admin/analytics", tags=["admin", "analytics"])
 
+# Lower bounds of the 21-40 / 41-60 / 61-80 / 81-100 lead score ranges
+SCORE_BUCKET_BOUNDS = [21, 41, 61, 81]
+# Lower bounds of the Medium / Large / Extra Large party sizes
+PARTY_SIZE_BUCKET_BOUNDS = [11, 26, 51]
+PARTY_SIZE_LABELS = ["Small (1-10)", "Medium (11-25)", "Large (26-50)", "Extra Large (50+)"]
+# Booking states reached only after the deposit cleared
+DEPOSIT_PAID_STATUSES = [
+    BookingStatus.DEPOSIT_PAID,
+    BookingStatus.CONFIRMED,
+    BookingStatus.IN_PROGRESS,
+    BookingStatus.COMPLETED,
+]
+
 
 # Response models
 class LeadAnalytics(BaseModel):
@@ -113,7 +107,7 @@ class DashboardOverview(BaseModel):
 async def get_dashboard_overview(
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Get comprehensive dashboard overview."""
@@ -144,7 +138,7 @@ async def get_dashboard_overview(
 async def get_lead_analytics(
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Get detailed lead analytics."""
@@ -161,7 +155,7 @@ async def get_lead_analytics(
 async def get_newsletter_analytics(
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Get detailed newsletter analytics."""
@@ -178,7 +172,7 @@ async def get_newsletter_analytics(
 async def get_conversion_funnel(
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Get conversion funnel analytics."""
@@ -188,45 +182,34 @@ async def get_conversion_funnel(
     if not date_to:
         date_to = datetime.now(timezone.utc).date()
 
-    # Count leads at each stage
-    total_leads = (
-        db.query(Lead)
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .count()
-    )
-
-    qualified_leads = (
-        db.query(Lead)
-        .filter(
-            Lead.created_at >= date_from,
-            Lead.created_at <= date_to,
-            Lead.status.in_([LeadStatus.QUALIFIED, LeadStatus.CONVERTED]),
-        )
-        .count()
-    )
-
-    converted_leads = (
-        db.query(Lead)
-        .filter(
-            Lead.created_at >= date_from,
-            Lead.created_at <= date_to,
-            Lead.status == LeadStatus.CONVERTED,
-        )
-        .count()
-    )
+    in_range = and_(Lead.created_at >= date_from, Lead.created_at <= date_to)
 
     # Count actual bookings from converted leads
     bookings_from_leads = (
-        db.query(Booking)
+        select(func.count(Booking.id))
         .join(Lead, Lead.customer_id == Booking.customer_id)
-        .filter(
+        .where(
             Lead.status == LeadStatus.CONVERTED,
             Booking.created_at >= date_from,
             Booking.created_at <= date_to,
         )
-        .count()
+        .scalar_subquery()
     )
 
+    # Every stage in one round trip
+    total_leads, qualified_leads, converted_leads, bookings_from_leads = (
+        await db.execute(
+            select(
+                func.count(Lead.id),
+                func.count(Lead.id).filter(
+                    Lead.status.in_([LeadStatus.QUALIFIED, LeadStatus.CONVERTED])
+                ),
+                func.count(Lead.id).filter(Lead.status == LeadStatus.CONVERTED),
+                bookings_from_leads,
+            ).where(in_range)
+        )
+    ).one()
+
     return {
         "funnel_stages": [
             {
@@ -264,35 +247,37 @@ async def get_conversion_funnel(
 
 @router.get("/lead-scoring")
 async def get_lead_scoring_analysis(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Get lead scoring analysis and distribution."""
 
-    # Score distribution
-    score_ranges = [
-        ("0-20", 0, 20),
-        ("21-40", 21, 40),
-        ("41-60", 41, 60),
-        ("61-80", 61, 80),
-        ("81-100", 81, 100),
-    ]
+    # Score distribution: width_bucket maps 0-20 -> 0, 21-40 -> 1, ... 81-100 -> 4
+    score_ranges = ["0-20", "21-40", "41-60", "61-80", "81-100"]
+    bucket = func.width_bucket(Lead.score, array(SCORE_BUCKET_BOUNDS))
+    bucket_counts = dict(
+        (
+            await db.execute(
+                select(bucket, func.count(Lead.id))
+                .where(Lead.score >= 0, Lead.score <= 100)
+                .group_by(bucket)
+            )
+        ).all()
+    )
 
-    score_distribution = []
-    for range_name, min_score, max_score in score_ranges:
-        count = (
-            db.query(Lead)
-            .filter(Lead.score >= min_score, Lead.score <= max_score)
-            .count()
-        )
-        score_distribution.append({"range": range_name, "count": count})
+    score_distribution = [
+        {"range": range_name, "count": bucket_counts.get(index, 0)}
+        for index, range_name in enumerate(score_ranges)
+    ]
 
     # Quality distribution
     quality_counts = (
-        db.query(Lead.quality, func.count(Lead.id).label("count"))
-        .group_by(Lead.quality)
-        .all()
-    )
+        await db.execute(
+            select(Lead.quality, func.count(Lead.id).label("count")).group_by(
+                Lead.quality
+            )
+        )
+    ).all()
 
     quality_distribution = [
         {"quality": quality.value if quality else "unrated", "count": count}
@@ -301,17 +286,17 @@ async def get_lead_scoring_analysis(
 
     # Top performing sources by conversion
     source_performance = (
-        db.query(
-            Lead.source,
-            func.count(Lead.id).label("total_leads"),
-            func.sum(
-                func.case([(Lead.status == LeadStatus.CONVERTED, 1)], else_=0)
-            ).label("converted_leads"),
-            func.avg(Lead.score).label("avg_score"),
+        await db.execute(
+            select(
+                Lead.source,
+                func.count(Lead.id).label("total_leads"),
+                func.count(Lead.id)
+                .filter(Lead.status == LeadStatus.CONVERTED)
+                .label("converted_leads"),
+                func.avg(Lead.score).label("avg_score"),
+            ).group_by(Lead.source)
         )
-        .group_by(Lead.source)
-        .all()
-    )
+    ).all()
 
     source_analysis = []
     for source, total, converted, avg_score in source_performance:
@@ -336,7 +321,7 @@ async def get_lead_scoring_analysis(
 @router.get("/engagement-trends")
 async def get_engagement_trends(
     days: int = Query(30, le=365),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Get engagement trends over time."""
@@ -344,53 +329,47 @@ async def get_engagement_trends(
     start_date = datetime.now(timezone.utc) - timedelta(days=days)
 
     # Daily lead creation
+    lead_day = func.date(Lead.created_at)
     daily_leads = (
-        db.query(
-            func.date(Lead.created_at).label("date"),
-            func.count(Lead.id).label("count"),
+        await db.execute(
+            select(lead_day.label("date"), func.count(Lead.id).label("count"))
+            .where(Lead.created_at >= start_date)
+            .group_by(lead_day)
+            .order_by(lead_day)
         )
-        .filter(Lead.created_at >= start_date)
-        .group_by(func.date(Lead.created_at))
-        .order_by("date")
-        .all()
-    )
+    ).all()
 
     # Daily newsletter signups
+    signup_day = func.date(Subscriber.created_at)
     daily_signups = (
-        db.query(
-            func.date(Subscriber.created_at).label("date"),
-            func.count(Subscriber.id).label("count"),
+        await db.execute(
+            select(signup_day.label("date"), func.count(Subscriber.id).label("count"))
+            .where(Subscriber.created_at >= start_date)
+            .group_by(signup_day)
+            .order_by(signup_day)
         )
-        .filter(Subscriber.created_at >= start_date)
-        .group_by(func.date(Subscriber.created_at))
-        .order_by("date")
-        .all()
-    )
+    ).all()
 
-    # Campaign performance over time
+    # Campaign performance over time (opens counted once per campaign, not per row)
+    opens = _campaign_event_counts(Campaign.sent_at >= start_date)
+    sent_day = func.date(Campaign.sent_at)
     campaign_performance = (
-        db.query(
-            func.date(Campaign.sent_at).label("date"),
-            func.count(Campaign.id).label("campaigns_sent"),
-            func.avg(
-                func.cast(
-                    db.query(func.count(CampaignEvent.id))
-                    .filter(
-                        CampaignEvent.campaign_id == Campaign.id,
-                        CampaignEvent.type == CampaignEventType.OPENED,
-                    )
-                    .scalar_subquery(),
-                    func.Float,
-                )
-                / Campaign.total_recipients
-                * 100
-            ).label("avg_open_rate"),
+        await db.execute(
+            select(
+                sent_day.label("date"),
+                func.count(Campaign.id).label("campaigns_sent"),
+                func.avg(
+                    cast(func.coalesce(opens.c.opens, 0), Float)
+                    / func.nullif(Campaign.total_recipients, 0)
+                    * 100
+                ).label("avg_open_rate"),
+            )
+            .outerjoin(opens, opens.c.campaign_id == Campaign.id)
+            .where(Campaign.sent_at >= start_date, Campaign.sent_at.isnot(None))
+            .group_by(sent_day)
+            .order_by(sent_day)
         )
-        .filter(Campaign.sent_at >= start_date, Campaign.sent_at.isnot(None))
-        .group_by(func.date(Campaign.sent_at))
-        .order_by("date")
-        .all()
-    )
+    ).all()
 
     return {
         "daily_leads": [
@@ -419,47 +398,57 @@ async def get_engagement_trends(
 async def get_revenue_trends(
     days: int = Query(30, le=365),
     interval: str = Query("day", pattern="^(day|week|month)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """
     Get revenue trends over time with customizable intervals.
 
+    Reads the booking rollups (see services/analytics_rollup_service.py);
+    month buckets are whole calendar months.
+
     Returns:
         - Daily/Weekly/Monthly revenue
         - Booking counts
         - Average order value
         - Growth rates
     """
-    start_date = datetime.now(timezone.utc) - timedelta(days=days)
+    start_day = (datetime.now(timezone.utc) - timedelta(days=days)).date()
 
-    # Determine date truncation based on interval
-    if interval == "day":
-        date_trunc = func.date(Booking.created_at)
-    elif interval == "week":
-        date_trunc = func.date_trunc("week", Booking.created_at)
-    else:  # month
-        date_trunc = func.date_trunc("month", Booking.created_at)
+    # Determine bucket based on interval
+    if interval == "month":
+        rollup = BookingMonthlyRollup
+        period = BookingMonthlyRollup.month
+        window = BookingMonthlyRollup.month >= start_day.replace(day=1)
+    else:
+        rollup = BookingDailyRollup
+        period = (
+            BookingDailyRollup.day
+            if interval == "day"
+            else cast(func.date_trunc("week", BookingDailyRollup.day), Date)
+        )
+        window = BookingDailyRollup.day >= start_day
 
     # Get revenue trends
     trends = (
-        db.query(
-            date_trunc.label("period"),
-            func.sum(Booking.total_due_cents).label("revenue_cents"),
-            func.count(Booking.id).label("booking_count"),
-            func.avg(Booking.total_due_cents).label("avg_order_value_cents"),
+        await db.execute(
+            select(
+                period.label("period"),
+                func.sum(rollup.revenue_cents).label("revenue_cents"),
+                func.sum(rollup.booking_count).label("booking_count"),
+            )
+            .where(window)
+            .group_by(period)
+            .order_by(period)
         )
-        .filter(Booking.created_at >= start_date, Booking.status != "cancelled")
-        .group_by("period")
-        .order_by("period")
-        .all()
-    )
+    ).all()
 
     # Calculate growth rates
     result = []
     prev_revenue = 0
-    for period, revenue_cents, booking_count, avg_order_value_cents in trends:
+    for period_start, revenue_cents, booking_count in trends:
         revenue = float(revenue_cents or 0) / 100
+        booking_count = int(booking_count or 0)
         growth_rate = 0.0
         if prev_revenue > 0:
             growth_rate = ((revenue - prev_revenue) / prev_revenue) * 100
@@ -467,11 +456,13 @@ async def get_revenue_trends(
         result.append(
             {
                 "period": (
-                    period.isoformat() if hasattr(period, "isoformat") else str(period)
+                    period_start.isoformat()
+                    if hasattr(period_start, "isoformat")
+                    else str(period_start)
                 ),
                 "revenue": revenue,
                 "booking_count": booking_count,
-                "avg_order_value": float(avg_order_value_cents or 0) / 100,
+                "avg_order_value": revenue / booking_count if booking_count else 0.0,
                 "growth_rate": growth_rate,
             }
         )
@@ -498,36 +489,59 @@ async def get_revenue_trends(
 @router.get("/customer-lifetime-value")
 async def get_customer_lifetime_value(
     top_n: int = Query(100, le=500),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """
     Calculate Customer Lifetime Value (CLV) metrics.
 
+    Aggregated in SQL over customer_value_rollups; only the top_n
+    customers are returned to Python.
+
     Returns:
         - Average CLV
         - CLV distribution
         - Top customers by value
         - Repeat customer rates
     """
+    clv = CustomerValueRollup
+
+    # CLV distribution buckets
+    distribution_buckets = [
+        ("$0-100", 0, 10000),
+        ("$100-250", 10000, 25000),
+        ("$250-500", 25000, 50000),
+        ("$500-1000", 50000, 100000),
+        ("$1000+", 100000, None),
+    ]
 
-    # Calculate CLV for each customer
-    customer_values = (
-        db.query(
-            Customer.id,
-            func.count(Booking.id).label("booking_count"),
-            func.sum(Booking.total_due_cents).label("total_spent_cents"),
-            func.min(Booking.created_at).label("first_booking"),
-            func.max(Booking.created_at).label("last_booking"),
+    bucket_counts = [
+        func.count().filter(
+            clv.total_spent_cents >= min_cents
+            if max_cents is None
+            else and_(
+                clv.total_spent_cents >= min_cents, clv.total_spent_cents < max_cents
+            )
         )
-        .join(Booking, Customer.id == Booking.customer_id)
-        .filter(Booking.status != "cancelled")
-        .group_by(Customer.id)
-        .all()
-    )
+        for _, min_cents, max_cents in distribution_buckets
+    ]
+
+    summary = (
+        await db.execute(
+            select(
+                func.count().label("total_customers"),
+                func.avg(clv.total_spent_cents).label("avg_cents"),
+                func.percentile_cont(0.5)
+                .within_group(clv.total_spent_cents)
+                .label("median_cents"),
+                func.count().filter(clv.booking_count >= 2).label("repeat_customers"),
+                *bucket_counts,
+            )
+        )
+    ).one()
 
     # Calculate metrics
-    total_customers = len(customer_values)
+    total_customers = summary.total_customers
     if total_customers == 0:
         return {
             "average_clv": 0,
@@ -538,67 +552,42 @@ async def get_customer_lifetime_value(
             "total_customers_analyzed": 0,
         }
 
-    clv_list = [float(val.total_spent_cents or 0) / 100 for val in customer_values]
-    clv_list.sort(reverse=True)
-
-    avg_clv = sum(clv_list) / len(clv_list)
-    median_clv = clv_list[len(clv_list) // 2]
-
-    # Repeat customer rate (2+ bookings)
-    repeat_customers = sum(1 for val in customer_values if val.booking_count >= 2)
-    repeat_rate = (repeat_customers / total_customers) * 100
-
-    # CLV distribution buckets
-    distribution_buckets = [
-        ("$0-100", 0, 10000),
-        ("$100-250", 10000, 25000),
-        ("$250-500", 25000, 50000),
-        ("$500-1000", 50000, 100000),
-        ("$1000+", 100000, float("inf")),
+    distribution = [
+        {
+            "range": label,
+            "count": count,
+            "percentage": (count / total_customers) * 100,
+        }
+        for (label, _, _), count in zip(distribution_buckets, summary[4:])
     ]
 
-    distribution = []
-    for label, min_cents, max_cents in distribution_buckets:
-        count = sum(
-            1
-            for val in customer_values
-            if min_cents <= (val.total_spent_cents or 0) < max_cents
-        )
-        distribution.append(
-            {
-                "range": label,
-                "count": count,
-                "percentage": (count / total_customers) * 100,
-            }
+    # Top customers
+    top_rows = (
+        await db.execute(
+            select(clv).order_by(clv.total_spent_cents.desc()).limit(top_n)
         )
+    ).scalars()
 
-    # Top customers
     top_customers = []
-    for val in customer_values[:top_n]:
-        customer_tenure_days = 0
-        if val.first_booking and val.last_booking:
-            customer_tenure_days = (val.last_booking - val.first_booking).days
-
+    for val in top_rows:
         top_customers.append(
             {
-                "customer_id": str(val.id),
-                "total_spent": float(val.total_spent_cents or 0) / 100,
+                "customer_id": str(val.customer_id),
+                "total_spent": float(val.total_spent_cents) / 100,
                 "booking_count": val.booking_count,
-                "customer_tenure_days": customer_tenure_days,
-                "avg_order_value": float(val.total_spent_cents or 0)
+                "customer_tenure_days": (val.last_booking_at - val.first_booking_at).days,
+                "avg_order_value": float(val.total_spent_cents)
                 / 100
                 / val.booking_count,
             }
         )
 
-    top_customers.sort(key=lambda x: x["total_spent"], reverse=True)
-
     return {
-        "average_clv": avg_clv,
-        "median_clv": median_clv,
-        "top_customers": top_customers[:top_n],
+        "average_clv": float(summary.avg_cents or 0) / 100,
+        "median_clv": float(summary.median_cents or 0) / 100,
+        "top_customers": top_customers,
         "clv_distribution": distribution,
-        "repeat_customer_rate": repeat_rate,
+        "repeat_customer_rate": (summary.repeat_customers / total_customers) * 100,
         "total_customers_analyzed": total_customers,
     }
 
@@ -607,7 +596,7 @@ async def get_customer_lifetime_value(
 async def get_booking_conversion_funnel(
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """
@@ -620,74 +609,46 @@ async def get_booking_conversion_funnel(
     if not date_to:
         date_to = datetime.now(timezone.utc).date()
 
-    # Stage 1: Website Visits (proxy via leads created)
-    total_leads = (
-        db.query(Lead)
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .count()
-    )
-
-    # Stage 2: Quote Requests (leads with contact info)
-    quote_requests = (
-        db.query(Lead)
-        .filter(
-            Lead.created_at >= date_from,
-            Lead.created_at <= date_to,
-            Lead.contact_name.isnot(None),
-        )
-        .count()
-    )
-
-    # Stage 3: Qualified Leads
-    qualified = (
-        db.query(Lead)
-        .filter(
-            Lead.created_at >= date_from,
-            Lead.created_at <= date_to,
-            Lead.status.in_([LeadStatus.QUALIFIED, LeadStatus.CONVERTED]),
+    # Stages 1-3 in one pass over leads
+    has_contact = exists().where(LeadContact.lead_id == Lead.id)
+    total_leads, quote_requests, qualified = (
+        await db.execute(
+            select(
+                # Stage 1: Website Visits (proxy via leads created)
+                func.count(Lead.id),
+                # Stage 2: Quote Requests (leads with contact info)
+                func.count(Lead.id).filter(has_contact),
+                # Stage 3: Qualified Leads
+                func.count(Lead.id).filter(
+                    Lead.status.in_([LeadStatus.QUALIFIED, LeadStatus.CONVERTED])
+                ),
+            ).where(Lead.created_at >= date_from, Lead.created_at <= date_to)
         )
-        .count()
-    )
-
-    # Stage 4: Bookings Created
-    bookings_created = (
-        db.query(Booking)
-        .filter(Booking.created_at >= date_from, Booking.created_at <= date_to)
-        .count()
-    )
-
-    # Stage 5: Deposits Paid
-    deposits_paid = (
-        db.query(Booking)
-        .filter(
-            Booking.created_at >= date_from,
-            Booking.created_at <= date_to,
-            Booking.payment_status.in_(["deposit_paid", "paid"]),
+    ).one()
+
+    # Stages 4-7 in one pass over bookings
+    amount_paid = (
+        select(func.coalesce(func.sum(Payment.amount - Payment.refunded_amount), 0))
+        .where(
+            Payment.booking_id == Booking.id,
+            Payment.status == PaymentStatus.COMPLETED,
         )
-        .count()
+        .scalar_subquery()
     )
-
-    # Stage 6: Fully Paid
-    fully_paid = (
-        db.query(Booking)
-        .filter(
-            Booking.created_at >= date_from,
-            Booking.created_at <= date_to,
-            Booking.payment_status == "paid",
+    bookings_created, deposits_paid, fully_paid, completed = (
+        await db.execute(
+            select(
+                # Stage 4: Bookings Created
+                func.count(Booking.id),
+                # Stage 5: Deposits Paid
+                func.count(Booking.id).filter(Booking.status.in_(DEPOSIT_PAID_STATUSES)),
+                # Stage 6: Fully Paid
+                func.count(Booking.id).filter(amount_paid >= Booking.total_due_cents),
+                # Stage 7: Completed Events
+                func.count(Booking.id).filter(Booking.status == BookingStatus.COMPLETED),
+            ).where(Booking.created_at >= date_from, Booking.created_at <= date_to)
         )
-        .count()
-    )
-
-    # Stage 7: Completed Events
-    completed = (
-        db.query(Booking)
-        .filter(
-            Booking.created_at >= date_from,
-            Booking.created_at <= date_to,
-            Booking.status == "completed",
-        )
-        .count()
-    )
+    ).one()
 
     # Calculate conversion rates
     stages = [
@@ -776,7 +737,7 @@ async def get_booking_conversion_funnel(
 async def get_menu_item_popularity(
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """
@@ -791,35 +752,34 @@ async def get_menu_item_popularity(
         date_to = datetime.now(timezone.utc).date()
 
     # For now, analyze guest count preferences as a proxy for menu tiers
+    party_size = func.width_bucket(
+        Booking.party_adults + Booking.party_kids, array(PARTY_SIZE_BUCKET_BOUNDS)
+    )
+    booking_count = func.count(Booking.id)
     guest_count_distribution = (
-        db.query(
-            func.case(
-                [
-                    (Booking.total_guests <= 10, "Small (1-10)"),
-                    (Booking.total_guests <= 25, "Medium (11-25)"),
-                    (Booking.total_guests <= 50, "Large (26-50)"),
-                ],
-                else_="Extra Large (50+)",
-            ).label("party_size"),
-            func.count(Booking.id).label("booking_count"),
-            func.sum(Booking.total_due_cents).label("revenue_cents"),
-        )
-        .filter(
-            Booking.created_at >= date_from,
-            Booking.created_at <= date_to,
-            Booking.status != "cancelled",
+        await db.execute(
+            select(
+                party_size.label("party_size"),
+                booking_count.label("booking_count"),
+                func.sum(Booking.total_due_cents).label("revenue_cents"),
+            )
+            .where(
+                Booking.created_at >= date_from,
+                Booking.created_at <= date_to,
+                Booking.status != BookingStatus.CANCELLED,
+            )
+            .group_by(party_size)
+            .order_by(desc(booking_count))
         )
-        .group_by("party_size")
-        .all()
-    )
+    ).all()
 
     popularity_data = []
     total_bookings = sum(item.booking_count for item in guest_count_distribution)
 
-    for party_size, booking_count, revenue_cents in guest_count_distribution:
+    for bucket, booking_count, revenue_cents in guest_count_distribution:
         popularity_data.append(
             {
-                "category": party_size,
+                "category": PARTY_SIZE_LABELS[bucket],
                 "booking_count": booking_count,
                 "revenue": float(revenue_cents or 0) / 100,
                 "popularity_percentage": (
@@ -833,9 +793,6 @@ async def get_menu_item_popularity(
             }
         )
 
-    # Sort by popularity
-    popularity_data.sort(key=lambda x: x["booking_count"], reverse=True)
-
     return {
         "items": popularity_data,
         "total_bookings_analyzed": total_bookings,
@@ -849,33 +806,52 @@ async def get_menu_item_popularity(
 
 @router.get("/geographic-distribution")
 async def get_geographic_distribution(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """
     Analyze customer and booking geographic distribution.
 
-    Returns distribution by station/location.
+    Returns distribution by station/location (from the booking rollups).
     """
-    from models.legacy_identity import Station
+    from db.models.identity import Station
 
-    # Get bookings by station
-    station_distribution = (
-        db.query(
-            Station.id,
-            Station.name,
-            Station.address,
-            func.count(Booking.id).label("booking_count"),
-            func.sum(Booking.total_due_cents).label("revenue_cents"),
-            func.count(func.distinct(Booking.customer_id)).label("unique_customers"),
+    totals = (
+        select(
+            BookingDailyRollup.station_id,
+            func.sum(BookingDailyRollup.booking_count).label("booking_count"),
+            func.sum(BookingDailyRollup.revenue_cents).label("revenue_cents"),
         )
-        .join(Booking, Station.id == Booking.station_id)
-        .filter(Booking.status != "cancelled")
-        .group_by(Station.id, Station.name, Station.address)
-        .all()
+        .group_by(BookingDailyRollup.station_id)
+        .subquery()
+    )
+    customers = (
+        select(
+            StationCustomerRollup.station_id,
+            func.count().label("unique_customers"),
+        )
+        .group_by(StationCustomerRollup.station_id)
+        .subquery()
     )
 
-    total_bookings = sum(item.booking_count for item in station_distribution)
+    # Get bookings by station, sorted by revenue
+    station_distribution = (
+        await db.execute(
+            select(
+                Station.id,
+                Station.name,
+                Station.address,
+                totals.c.booking_count,
+                totals.c.revenue_cents,
+                func.coalesce(customers.c.unique_customers, 0).label("unique_customers"),
+            )
+            .join(totals, totals.c.station_id == Station.id)
+            .outerjoin(customers, customers.c.station_id == Station.id)
+            .order_by(desc(totals.c.revenue_cents))
+        )
+    ).all()
+
+    total_bookings = sum(int(item.booking_count) for item in station_distribution)
     total_revenue = sum(item.revenue_cents or 0 for item in station_distribution) / 100
 
     distribution_data = []
@@ -885,11 +861,11 @@ async def get_geographic_distribution(
                 "station_id": str(item.id),
                 "station_name": item.name,
                 "location": item.address,
-                "booking_count": item.booking_count,
+                "booking_count": int(item.booking_count),
                 "revenue": float(item.revenue_cents or 0) / 100,
                 "unique_customers": item.unique_customers,
                 "market_share_bookings": (
-                    (item.booking_count / total_bookings * 100)
+                    (int(item.booking_count) / total_bookings * 100)
                     if total_bookings > 0
                     else 0
                 ),
@@ -901,9 +877,6 @@ async def get_geographic_distribution(
             }
         )
 
-    # Sort by revenue
-    distribution_data.sort(key=lambda x: x["revenue"], reverse=True)
-
     return {
         "stations": distribution_data,
         "summary": {
@@ -920,33 +893,38 @@ async def get_geographic_distribution(
 @router.get("/seasonal-trends")
 async def get_seasonal_trends(
     years: int = Query(1, ge=1, le=5),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
     """
     Analyze seasonal booking trends and patterns.
 
+    Monthly patterns come from the monthly rollup (whole calendar months),
+    day-of-week patterns (by event date) from the daily rollup.
+
     Returns:
         - Monthly booking patterns
         - Day of week analysis
         - Seasonal revenue trends
         - Peak/off-peak identification
     """
-    start_date = datetime.now(timezone.utc) - timedelta(days=365 * years)
+    start_day = (datetime.now(timezone.utc) - timedelta(days=365 * years)).date()
 
     # Monthly trends
+    month = func.extract("month", BookingMonthlyRollup.month)
     monthly_trends = (
-        db.query(
-            func.extract("month", Booking.created_at).label("month"),
-            func.count(Booking.id).label("booking_count"),
-            func.sum(Booking.total_due_cents).label("revenue_cents"),
-            func.avg(Booking.total_guests).label("avg_party_size"),
+        await db.execute(
+            select(
+                month.label("month"),
+                func.sum(BookingMonthlyRollup.booking_count),
+                func.sum(BookingMonthlyRollup.revenue_cents),
+                func.sum(BookingMonthlyRollup.guest_count),
+            )
+            .where(BookingMonthlyRollup.month >= start_day.replace(day=1))
+            .group_by(month)
+            .order_by(month)
         )
-        .filter(Booking.created_at >= start_date, Booking.status != "cancelled")
-        .group_by("month")
-        .order_by("month")
-        .all()
-    )
+    ).all()
 
     month_names = [
         "January",
@@ -964,29 +942,33 @@ async def get_seasonal_trends(
     ]
 
     monthly_data = []
-    for month, booking_count, revenue_cents, avg_party_size in monthly_trends:
+    for month_number, booking_count, revenue_cents, guest_count in monthly_trends:
+        booking_count = int(booking_count or 0)
         monthly_data.append(
             {
-                "month": month_names[int(month) - 1],
-                "month_number": int(month),
+                "month": month_names[int(month_number) - 1],
+                "month_number": int(month_number),
                 "booking_count": booking_count,
                 "revenue": float(revenue_cents or 0) / 100,
-                "avg_party_size": float(avg_party_size or 0),
+                "avg_party_size": (
+                    float(guest_count or 0) / booking_count if booking_count else 0.0
+                ),
             }
         )
 
-    # Day of week trends
+    # Day of week trends (event date)
     day_of_week_trends = (
-        db.query(
-            func.extract("dow", Booking.date).label("day_of_week"),
-            func.count(Booking.id).label("booking_count"),
-            func.sum(Booking.total_due_cents).label("revenue_cents"),
+        await db.execute(
+            select(
+                BookingDailyRollup.event_dow,
+                func.sum(BookingDailyRollup.booking_count),
+                func.sum(BookingDailyRollup.revenue_cents),
+            )
+            .where(BookingDailyRollup.day >= start_day)
+            .group_by(BookingDailyRollup.event_dow)
+            .order_by(BookingDailyRollup.event_dow)
         )
-        .filter(Booking.created_at >= start_date, Booking.status != "cancelled")
-        .group_by("day_of_week")
-        .order_by("day_of_week")
-        .all()
-    )
+    ).all()
 
     day_names = [
         "Sunday",
@@ -1004,7 +986,7 @@ async def get_seasonal_trends(
             {
                 "day": day_names[int(day_num)],
                 "day_number": int(day_num),
-                "booking_count": booking_count,
+                "booking_count": int(booking_count or 0),
                 "revenue": float(revenue_cents or 0) / 100,
             }
         )
@@ -1036,72 +1018,98 @@ async def get_seasonal_trends(
     }
 
 
+@router.post("/rollups/refresh")
+async def refresh_analytics_rollups(
+    full: bool = Query(False, description="Rebuild every rollup from scratch"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Refresh the booking rollups behind the trend/CLV/geographic endpoints now.
+
+    The worker does this every 5 minutes (full rebuild nightly).
+    """
+    from services.analytics_rollup_service import AnalyticsRollupService
+
+    service = AnalyticsRollupService(db)
+    summary = await service.refresh(full=full)
+    state = await service.get_state()
+
+    return {
+        **summary,
+        "watermark": state.watermark if state else None,
+        "last_full_rebuild_at": state.last_full_rebuild_at if state else None,
+    }
+
+
 # Helper functions
+def _campaign_event_counts(*campaign_filter):
+    """Per-campaign open/click counts as a subquery (one GROUP BY, no per-campaign queries)"""
+    query = select(
+        CampaignEvent.campaign_id,
+        func.count(CampaignEvent.id)
+        .filter(CampaignEvent.type == CampaignEventType.OPENED)
+        .label("opens"),
+        func.count(CampaignEvent.id)
+        .filter(CampaignEvent.type == CampaignEventType.CLICKED)
+        .label("clicks"),
+    ).where(
+        CampaignEvent.type.in_([CampaignEventType.OPENED, CampaignEventType.CLICKED])
+    )
+    if campaign_filter:
+        query = query.where(
+            CampaignEvent.campaign_id.in_(select(Campaign.id).where(*campaign_filter))
+        )
+    return query.group_by(CampaignEvent.campaign_id).subquery()
+
+
 async def _get_lead_analytics(
-    date_from: date, date_to: date, db: Session
+    date_from: date, date_to: date, db: AsyncSession
 ) -> LeadAnalytics:
     """Get lead analytics for date range."""
 
-    # Total leads
-    total_leads = (
-        db.query(Lead)
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .count()
-    )
+    in_range = and_(Lead.created_at >= date_from, Lead.created_at <= date_to)
 
-    # New leads (created in period)
-    new_leads = total_leads
-
-    # Qualified leads
-    qualified_leads = (
-        db.query(Lead)
-        .filter(
-            Lead.created_at >= date_from,
-            Lead.created_at <= date_to,
-            Lead.status.in_([LeadStatus.QUALIFIED, LeadStatus.CONVERTED]),
+    # Totals, stage counts and average score in one pass
+    total_leads, qualified_leads, converted_leads, avg_score_result = (
+        await db.execute(
+            select(
+                func.count(Lead.id),
+                func.count(Lead.id).filter(
+                    Lead.status.in_([LeadStatus.QUALIFIED, LeadStatus.CONVERTED])
+                ),
+                func.count(Lead.id).filter(Lead.status == LeadStatus.CONVERTED),
+                func.avg(Lead.score),
+            ).where(in_range)
         )
-        .count()
-    )
+    ).one()
 
-    # Converted leads
-    converted_leads = (
-        db.query(Lead)
-        .filter(
-            Lead.created_at >= date_from,
-            Lead.created_at <= date_to,
-            Lead.status == LeadStatus.CONVERTED,
-        )
-        .count()
-    )
+    # New leads (created in period)
+    new_leads = total_leads
 
     # Conversion rate
     conversion_rate = (converted_leads / total_leads * 100) if total_leads > 0 else 0
-
-    # Average score
-    avg_score_result = (
-        db.query(func.avg(Lead.score))
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .scalar()
-    )
     average_score = float(avg_score_result) if avg_score_result else 0
 
     # Leads by source
     source_counts = (
-        db.query(Lead.source, func.count(Lead.id).label("count"))
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .group_by(Lead.source)
-        .all()
-    )
+        await db.execute(
+            select(Lead.source, func.count(Lead.id).label("count"))
+            .where(in_range)
+            .group_by(Lead.source)
+        )
+    ).all()
 
     leads_by_source = {source.value: count for source, count in source_counts}
 
     # Leads by quality
     quality_counts = (
-        db.query(Lead.quality, func.count(Lead.id).label("count"))
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .group_by(Lead.quality)
-        .all()
-    )
+        await db.execute(
+            select(Lead.quality, func.count(Lead.id).label("count"))
+            .where(in_range)
+            .group_by(Lead.quality)
+        )
+    ).all()
 
     leads_by_quality = {
         quality.value if quality else "unrated": count
@@ -1109,16 +1117,15 @@ async def _get_lead_analytics(
     }
 
     # Daily lead count
+    lead_day = func.date(Lead.created_at)
     daily_counts = (
-        db.query(
-            func.date(Lead.created_at).label("date"),
-            func.count(Lead.id).label("count"),
+        await db.execute(
+            select(lead_day.label("date"), func.count(Lead.id).label("count"))
+            .where(in_range)
+            .group_by(lead_day)
+            .order_by(lead_day)
         )
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .group_by(func.date(Lead.created_at))
-        .order_by("date")
-        .all()
-    )
+    ).all()
 
     daily_lead_count = [
         {"date": date.isoformat(), "count": count} for date, count in daily_counts
@@ -1138,216 +1145,169 @@ async def _get_lead_analytics(
 
 
 async def _get_newsletter_analytics(
-    date_from: date, date_to: date, db: Session
+    date_from: date, date_to: date, db: AsyncSession
 ) -> NewsletterAnalytics:
     """Get newsletter analytics for date range."""
 
-    # Total subscribers
-    total_subscribers = db.query(Subscriber).count()
-
-    # Active subscribers
-    active_subscribers = db.query(Subscriber).filter(Subscriber.subscribed).count()
-
-    # Total campaigns
-    total_campaigns = (
-        db.query(Campaign)
-        .filter(Campaign.created_at >= date_from, Campaign.created_at <= date_to)
-        .count()
-    )
-
-    # Campaigns sent
-    campaigns_sent = (
-        db.query(Campaign)
-        .filter(
-            Campaign.created_at >= date_from,
-            Campaign.created_at <= date_to,
-            Campaign.status == CampaignStatus.SENT,
+    # Total and active subscribers
+    total_subscribers, active_subscribers = (
+        await db.execute(
+            select(
+                func.count(Subscriber.id),
+                func.count(Subscriber.id).filter(Subscriber.subscribed.is_(True)),
+            )
         )
-        .count()
+    ).one()
+
+    in_range = and_(Campaign.created_at >= date_from, Campaign.created_at <= date_to)
+    is_sent = Campaign.status == CampaignStatus.SENT
+    counts = _campaign_event_counts(in_range, is_sent)
+    has_recipients = Campaign.total_recipients > 0
+    open_rate = (
+        cast(func.coalesce(counts.c.opens, 0), Float) / Campaign.total_recipients * 100
+    )
+    click_rate = (
+        cast(func.coalesce(counts.c.clicks, 0), Float) / Campaign.total_recipients * 100
     )
 
-    # Average open rate
-    avg_open_rate = 0.0
-    avg_click_rate = 0.0
-
-    if campaigns_sent > 0:
-        # Calculate average open rate across all sent campaigns
-        open_rates = []
-        click_rates = []
-
-        sent_campaigns = (
-            db.query(Campaign)
-            .filter(
-                Campaign.created_at >= date_from,
-                Campaign.created_at <= date_to,
-                Campaign.status == CampaignStatus.SENT,
+    # Campaign totals and average rates (over campaigns with recipients)
+    total_campaigns, campaigns_sent, avg_open_rate, avg_click_rate = (
+        await db.execute(
+            select(
+                func.count(Campaign.id),
+                func.count(Campaign.id).filter(is_sent),
+                func.avg(open_rate).filter(is_sent, has_recipients),
+                func.avg(click_rate).filter(is_sent, has_recipients),
             )
-            .all()
+            .outerjoin(counts, counts.c.campaign_id == Campaign.id)
+            .where(in_range)
         )
-
-        for campaign in sent_campaigns:
-            if campaign.total_recipients > 0:
-                opens = (
-                    db.query(CampaignEvent)
-                    .filter(
-                        CampaignEvent.campaign_id == campaign.id,
-                        CampaignEvent.type == CampaignEventType.OPENED,
-                    )
-                    .count()
-                )
-
-                clicks = (
-                    db.query(CampaignEvent)
-                    .filter(
-                        CampaignEvent.campaign_id == campaign.id,
-                        CampaignEvent.type == CampaignEventType.CLICKED,
-                    )
-                    .count()
-                )
-
-                open_rates.append(opens / campaign.total_recipients * 100)
-                click_rates.append(clicks / campaign.total_recipients * 100)
-
-        avg_open_rate = sum(open_rates) / len(open_rates) if open_rates else 0
-        avg_click_rate = sum(click_rates) / len(click_rates) if click_rates else 0
+    ).one()
 
     # Subscriber growth
+    signup_day = func.date(Subscriber.created_at)
     daily_signups = (
-        db.query(
-            func.date(Subscriber.created_at).label("date"),
-            func.count(Subscriber.id).label("count"),
-        )
-        .filter(
-            Subscriber.created_at >= date_from,
-            Subscriber.created_at <= date_to,
+        await db.execute(
+            select(signup_day.label("date"), func.count(Subscriber.id).label("count"))
+            .where(
+                Subscriber.created_at >= date_from,
+                Subscriber.created_at <= date_to,
+            )
+            .group_by(signup_day)
+            .order_by(signup_day)
         )
-        .group_by(func.date(Subscriber.created_at))
-        .order_by("date")
-        .all()
-    )
+    ).all()
 
     subscriber_growth = [
         {"date": date.isoformat(), "signups": count} for date, count in daily_signups
     ]
 
-    # Campaign performance
-    campaign_performance = []
-    for campaign in sent_campaigns[:10]:  # Top 10 recent campaigns
-        opens = (
-            db.query(CampaignEvent)
-            .filter(
-                CampaignEvent.campaign_id == campaign.id,
-                CampaignEvent.type == CampaignEventType.OPENED,
-            )
-            .count()
-        )
-
-        clicks = (
-            db.query(CampaignEvent)
-            .filter(
-                CampaignEvent.campaign_id == campaign.id,
-                CampaignEvent.type == CampaignEventType.CLICKED,
+    # Campaign performance: 10 most recent sent campaigns
+    recent_campaigns = (
+        await db.execute(
+            select(
+                Campaign.name,
+                Campaign.sent_at,
+                Campaign.total_recipients,
+                func.coalesce(counts.c.opens, 0),
+                func.coalesce(counts.c.clicks, 0),
             )
-            .count()
+            .outerjoin(counts, counts.c.campaign_id == Campaign.id)
+            .where(in_range, is_sent)
+            .order_by(desc(Campaign.sent_at).nulls_last())
+            .limit(10)
         )
+    ).all()
 
-        campaign_performance.append(
-            {
-                "campaign_name": campaign.name,
-                "sent_at": (campaign.sent_at.isoformat() if campaign.sent_at else None),
-                "recipients": campaign.total_recipients,
-                "opens": opens,
-                "clicks": clicks,
-                "open_rate": (
-                    (opens / campaign.total_recipients * 100)
-                    if campaign.total_recipients > 0
-                    else 0
-                ),
-                "click_rate": (
-                    (clicks / campaign.total_recipients * 100)
-                    if campaign.total_recipients > 0
-                    else 0
-                ),
-            }
-        )
+    campaign_performance = [
+        {
+            "campaign_name": name,
+            "sent_at": sent_at.isoformat() if sent_at else None,
+            "recipients": recipients,
+            "opens": opens,
+            "clicks": clicks,
+            "open_rate": (opens / recipients * 100) if recipients > 0 else 0,
+            "click_rate": (clicks / recipients * 100) if recipients > 0 else 0,
+        }
+        for name, sent_at, recipients, opens, clicks in recent_campaigns
+    ]
 
     return NewsletterAnalytics(
         total_subscribers=total_subscribers,
         active_subscribers=active_subscribers,
         total_campaigns=total_campaigns,
         campaigns_sent=campaigns_sent,
-        average_open_rate=avg_open_rate,
-        average_click_rate=avg_click_rate,
+        average_open_rate=float(avg_open_rate or 0),
+        average_click_rate=float(avg_click_rate or 0),
         subscriber_growth=subscriber_growth,
         campaign_performance=campaign_performance,
     )
 
 
 async def _get_sales_analytics(
-    date_from: date, date_to: date, db: Session
+    date_from: date, date_to: date, db: AsyncSession
 ) -> SalesAnalytics:
     """Get sales analytics for date range."""
 
-    # Get bookings in date range
-    bookings = (
-        db.query(Booking)
-        .filter(Booking.created_at >= date_from, Booking.created_at <= date_to)
-        .all()
-    )
+    in_range = and_(Booking.created_at >= date_from, Booking.created_at <= date_to)
+
+    # Bookings and revenue in date range
+    total_bookings, revenue_cents = (
+        await db.execute(
+            select(
+                func.count(Booking.id), func.coalesce(func.sum(Booking.total_due_cents), 0)
+            ).where(in_range)
+        )
+    ).one()
 
-    total_bookings = len(bookings)
-    total_revenue = sum(booking.total_cost_cents for booking in bookings) / 100
+    total_revenue = revenue_cents / 100
     average_booking_value = total_revenue / total_bookings if total_bookings > 0 else 0
 
-    # Revenue from converted leads
-    converted_leads = (
-        db.query(Lead)
-        .filter(
-            Lead.status == LeadStatus.CONVERTED,
-            Lead.conversion_date >= date_from,
-            Lead.conversion_date <= date_to,
-        )
-        .all()
+    # Revenue from converted leads: their customers' bookings since conversion
+    converted = and_(
+        Lead.status == LeadStatus.CONVERTED,
+        Lead.conversion_date >= date_from,
+        Lead.conversion_date <= date_to,
+    )
+    conversion_value_cents = (
+        select(func.coalesce(func.sum(Booking.total_due_cents), 0))
+        .join(Lead, Lead.customer_id == Booking.customer_id)
+        .where(converted, Booking.created_at >= Lead.conversion_date)
+        .scalar_subquery()
     )
 
-    # Calculate conversion value (revenue from leads that converted)
-    conversion_value = 0.0
-    for lead in converted_leads:
-        if lead.customer_id:
-            customer_bookings = (
-                db.query(Booking)
-                .filter(
-                    Booking.customer_id == lead.customer_id,
-                    Booking.created_at >= lead.conversion_date,
-                )
-                .all()
-            )
-            conversion_value += (
-                sum(booking.total_cost_cents for booking in customer_bookings) / 100
+    converted_leads, total_leads, conversion_value_cents = (
+        await db.execute(
+            select(
+                func.count(Lead.id).filter(converted),
+                func.count(Lead.id).filter(
+                    Lead.created_at >= date_from, Lead.created_at <= date_to
+                ),
+                conversion_value_cents,
             )
+        )
+    ).one()
 
-    # Lead to booking conversion rate
-    total_leads = (
-        db.query(Lead)
-        .filter(Lead.created_at >= date_from, Lead.created_at <= date_to)
-        .count()
-    )
+    conversion_value = conversion_value_cents / 100
 
+    # Lead to booking conversion rate
     lead_to_booking_conversion = (
-        (len(converted_leads) / total_leads * 100) if total_leads > 0 else 0
+        (converted_leads / total_leads * 100) if total_leads > 0 else 0
     )
 
     # Monthly revenue
+    month = func.date_trunc("month", Booking.created_at)
     monthly_revenue = (
-        db.query(
-            func.date_trunc("month", Booking.created_at).label("month"),
-            func.sum(Booking.total_cost_cents).label("revenue_cents"),
+        await db.execute(
+            select(
+                month.label("month"),
+                func.sum(Booking.total_due_cents).label("revenue_cents"),
+            )
+            .where(in_range)
+            .group_by(month)
+            .order_by(month)
         )
-        .filter(Booking.created_at >= date_from, Booking.created_at <= date_to)
-        .group_by(func.date_trunc("month", Booking.created_at))
-        .order_by("month")
-        .all()
-    )
+    ).all()
 
     revenue_by_month = [
         {
@@ -1367,13 +1327,15 @@ async def _get_sales_analytics(
     )
 
 
-async def _get_recent_activity(db: Session) -> list[dict[str, Any]]:
+async def _get_recent_activity(db: AsyncSession) -> list[dict[str, Any]]:
     """Get recent activity across the system."""
 
     activities = []
 
     # Recent leads
-    recent_leads = db.query(Lead).order_by(desc(Lead.created_at)).limit(5).all()
+    recent_leads = (
+        await db.execute(select(Lead).order_by(desc(Lead.created_at)).limit(5))
+    ).scalars()
     for lead in recent_leads:
         activities.append(
             {
@@ -1387,12 +1349,13 @@ async def _get_recent_activity(db: Session) -> list[dict[str, Any]]:
 
     # Recent conversions
     recent_conversions = (
-        db.query(Lead)
-        .filter(Lead.status == LeadStatus.CONVERTED)
-        .order_by(desc(Lead.conversion_date))
-        .limit(3)
-        .all()
-    )
+        await db.execute(
+            select(Lead)
+            .where(Lead.status == LeadStatus.CONVERTED)
+            .order_by(desc(Lead.conversion_date).nulls_last())
+            .limit(3)
+        )
+    ).scalars()
 
     for lead in recent_conversions:
         activities.append(
@@ -1411,19 +1374,23 @@ async def _get_recent_activity(db: Session) -> list[dict[str, Any]]:
 
     # Recent campaigns
     recent_campaigns = (
-        db.query(Campaign).order_by(desc(Campaign.sent_at)).limit(3).all()
-    )
+        await db.execute(
+            select(Campaign.id, Campaign.name, Campaign.total_recipients, Campaign.sent_at)
+            .where(Campaign.sent_at.isnot(None))
+            .order_by(desc(Campaign.sent_at))
+            .limit(3)
+        )
+    ).all()
     for campaign in recent_campaigns:
-        if campaign.sent_at:
-            activities.append(
-                {
-                    "type": "campaign_sent",
-                    "title": f"Campaign '{campaign.name}' sent",
-                    "description": f"Sent to {campaign.total_recipients} recipients",
-                    "timestamp": campaign.sent_at.isoformat(),
-                    "id": str(campaign.id),
-                }
-            )
+        activities.append(
+            {
+                "type": "campaign_sent",
+                "title": f"Campaign '{campaign.name}' sent",
+                "description": f"Sent to {campaign.total_recipients} recipients",
+                "timestamp": campaign.sent_at.isoformat(),
+                "id": str(campaign.id),
+            }
+        )
 
     # Sort by timestamp
     activities.sort(key=lambda x: x["timestamp"], reverse=True)
@@ -1431,20 +1398,35 @@ async def _get_recent_activity(db: Session) -> list[dict[str, Any]]:
     return activities[:10]
 
 
-async def _get_alerts(db: Session) -> list[dict[str, Any]]:
+async def _get_alerts(db: AsyncSession) -> list[dict[str, Any]]:
     """Get system alerts and notifications."""
 
     alerts = []
 
-    # Overdue follow-ups
-    overdue_followups = (
-        db.query(Lead)
-        .filter(
-            Lead.follow_up_date < datetime.now(timezone.utc),
-            Lead.status.in_([LeadStatus.NEW, LeadStatus.WORKING, LeadStatus.QUALIFIED]),
+    # All three alert counts in one round trip
+    overdue_followups, hot_leads, low_engagement = (
+        await db.execute(
+            select(
+                # Overdue follow-ups
+                select(func.count(Lead.id))
+                .where(
+                    Lead.follow_up_date < datetime.now(timezone.utc),
+                    Lead.status.in_(
+                        [LeadStatus.NEW, LeadStatus.WORKING, LeadStatus.QUALIFIED]
+                    ),
+                )
+                .scalar_subquery(),
+                # Hot leads requiring attention
+                select(func.count(Lead.id))
+                .where(Lead.quality == LeadQuality.HOT, Lead.status == LeadStatus.NEW)
+                .scalar_subquery(),
+                # Low engagement subscribers
+                select(func.count(Subscriber.id))
+                .where(Subscriber.subscribed.is_(True), Subscriber.engagement_score < 20)
+                .scalar_subquery(),
+            )
         )
-        .count()
-    )
+    ).one()
 
     if overdue_followups > 0:
         alerts.append(
@@ -1457,13 +1439,6 @@ async def _get_alerts(db: Session) -> list[dict[str, Any]]:
             }
         )
 
-    # Hot leads requiring attention
-    hot_leads = (
-        db.query(Lead)
-        .filter(Lead.quality == LeadQuality.HOT, Lead.status == LeadStatus.NEW)
-        .count()
-    )
-
     if hot_leads > 0:
         alerts.append(
             {
@@ -1475,13 +1450,6 @@ async def _get_alerts(db: Session) -> list[dict[str, Any]]:
             }
         )
 
-    # Low engagement subscribers
-    low_engagement = (
-        db.query(Subscriber)
-        .filter(Subscriber.subscribed, Subscriber.engagement_score < 20)
-        .count()
-    )
-
     if low_engagement > 0:
         alerts.append(
             {
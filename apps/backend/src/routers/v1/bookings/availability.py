@@ -27,6 +27,7 @@ from core.database import get_db
 from db.models.core import Booking
 
 # Smart Scheduling Integration
+from services.scheduling.availability_cache import get_availability_cache
 from services.scheduling.availability_engine import AvailabilityEngine
 from services.scheduling.slot_manager import DEFAULT_SLOTS, SlotManager
 from utils.auth import get_optional_user
@@ -132,7 +133,7 @@ async def check_availability(
         # Use AvailabilityEngine for dual-mode availability checking
         # - Short-term (≤ 14 days): Uses actual chef availability
         # - Long-term (> 14 days): Uses SSoT long_advance_slot_capacity
-        availability_engine = AvailabilityEngine(db)
+        availability_engine = AvailabilityEngine(db, cache=get_availability_cache())
         slots = await availability_engine.get_available_slots_for_date(
             event_date=parsed_date,
             guest_count=10,  # Default guest count for availability check
@@ -223,37 +224,26 @@ async def get_available_times(
 
         # Initialize AvailabilityEngine for dynamic chef availability
         # This replaces hardcoded max_per_slot = 1
-        availability_engine = AvailabilityEngine(db=db)
+        availability_engine = AvailabilityEngine(db=db, cache=get_availability_cache())
 
-        # Query existing bookings for this date (still needed for booking count)
-        query = select(Booking.slot).where(
-            Booking.date == parsed_date,
-            Booking.status.in_(["pending", "confirmed"]),
-            Booking.deleted_at.is_(None),
-        )
-
-        # Apply station filtering if user is authenticated
-        if current_user and current_user.get("station_id"):
-            query = query.where(Booking.station_id == UUID(current_user["station_id"]))
-
-        result = await db.execute(query)
-        booked_slots = [row.slot for row in result.all() if row.slot]
+        # Availability for every slot of the date in one matrix pass
+        # (grouped counts instead of one availability check per slot)
+        slot_availability = {
+            s.slot_number: s
+            for s in await availability_engine.get_available_slots_for_date(
+                event_date=parsed_date,
+                guest_count=10,  # Default guest count for availability check
+            )
+        }
 
         # Build response with dynamic chef-based availability
         time_slots = []
         for slot_num, slot_config in DEFAULT_SLOTS.items():
             slot_time = slot_config.standard_time
 
-            # Use AvailabilityEngine to check real chef availability
-            # This replaces hardcoded max_per_slot = 1 with actual chef count
-            availability = await availability_engine.check_slot_availability(
-                event_date=parsed_date,
-                slot_time=slot_time,
-                guest_count=10,  # Default guest count for availability check
-            )
-
-            available_chefs = availability.get("available_chefs", 0)
-            is_available = availability.get("is_available", False)
+            availability = slot_availability.get(slot_num)
+            available_chefs = availability.available_chefs if availability else 0
+            is_available = availability.is_available if availability else False
 
             # If it's today, check if the time has already passed
             if parsed_date == today:
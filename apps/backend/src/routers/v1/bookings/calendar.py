@@ -22,8 +22,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from core.database import get_db
-from core.security import decrypt_pii
 from db.models.core import Booking
+from services.bulk_decryption import get_customer_decryptor
 from utils.auth import get_current_user
 
 from .schemas import ErrorResponse
@@ -98,39 +98,33 @@ async def get_weekly_bookings(
     result = await db.execute(query)
     bookings = result.scalars().unique().all()
 
+    # Decrypt customer PII for all bookings in one batch (off the event loop)
+    customers = [booking.customer for booking in bookings]
+    plaintexts = await get_customer_decryptor().decrypt_many(
+        [c.email_encrypted if c else None for c in customers]
+        + [c.phone_encrypted if c else None for c in customers],
+        strict=True,
+    )
+    emails, phones = plaintexts[: len(customers)], plaintexts[len(customers) :]
+
     # Convert to response format
     bookings_data = []
-    for booking in bookings:
-        # Decrypt customer PII
-        customer_email = (
-            decrypt_pii(booking.customer.email_encrypted)
-            if booking.customer and booking.customer.email_encrypted
-            else ""
-        )
+    for booking, customer_email, customer_phone in zip(bookings, emails, phones):
+        customer = booking.customer
         customer_name = (
-            decrypt_pii(booking.customer.name_encrypted)
-            if booking.customer and booking.customer.name_encrypted
+            f"{customer.first_name or ''} {customer.last_name or ''}".strip()
+            if customer
             else ""
         )
-        customer_phone = (
-            decrypt_pii(booking.customer.phone_encrypted)
-            if booking.customer and booking.customer.phone_encrypted
-            else ""
-        )
-        special_requests = (
-            decrypt_pii(booking.special_requests_encrypted)
-            if booking.special_requests_encrypted
-            else None
-        )
 
         bookings_data.append(
             {
                 "booking_id": str(booking.id),
                 "customer": {
                     "customer_id": str(booking.customer_id),
-                    "email": customer_email,
+                    "email": customer_email or "",
                     "name": customer_name,
-                    "phone": customer_phone,
+                    "phone": customer_phone or "",
                 },
                 "date": booking.date.isoformat() if booking.date else None,
                 "slot": booking.slot.strftime("%H:%M") if booking.slot else None,
@@ -151,7 +145,7 @@ async def get_weekly_bookings(
                     if booking.total_due_cents and booking.deposit_due_cents
                     else 0
                 ),
-                "special_requests": special_requests,
+                "special_requests": booking.special_requests,
                 "source": booking.source,
                 "created_at": booking.created_at.isoformat()
                 if booking.created_at
@@ -33,6 +33,7 @@ from core.database import get_db
 from core.security import decrypt_pii
 from core.security.roles import role_matches
 from db.models.core import Booking, BookingStatus
+from services.scheduling.availability_cache import get_availability_cache
 from utils.auth import can_access_station, require_customer_support
 
 from .notifications import notify_cancellation
@@ -154,6 +155,7 @@ async def request_cancellation(
     booking.cancellation_reason = request_input.reason
 
     await db.commit()
+    await get_availability_cache().invalidate(booking.date, station_id=booking.station_id)
 
     # New values for audit
     new_values = {
@@ -278,6 +280,7 @@ async def approve_cancellation(
     booking.cancellation_approved_reason = approval_input.reason
 
     await db.commit()
+    await get_availability_cache().invalidate(booking.date, station_id=booking.station_id)
 
     # New values for audit
     new_values = {
@@ -443,6 +446,7 @@ async def reject_cancellation(
     booking.cancellation_requested_by = None
 
     await db.commit()
+    await get_availability_cache().invalidate(booking.date, station_id=booking.station_id)
 
     # New values for audit
     new_values = {
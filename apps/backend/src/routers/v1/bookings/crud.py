@@ -27,11 +27,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
 from api.ai.endpoints.services.pricing_service import get_pricing_service
+from core.blind_index import email_blind_index, phone_blind_index
 from core.database import get_db
 from core.security.roles import role_matches
 from db.models.core import Booking, BookingStatus, Customer
 from services.encryption_service import SecureDataHandler
 from services.google_calendar_service import create_chef_assignment_event
+from services.scheduling.availability_cache import get_availability_cache
 from services.scheduling.slot_manager import SlotManager
 from utils.auth import get_current_user
 from utils.pagination import paginate_query
@@ -378,8 +380,6 @@ async def create_booking(
         last_name = name_parts[1] if len(name_parts) > 1 else ""
 
         # Encrypt PII
-        email_encrypted = encryption_handler.encrypt_email(booking_data.customer_email)
-        phone_encrypted = encryption_handler.encrypt_phone(booking_data.customer_phone)
         address_encrypted = encryption_handler.encrypt_email(
             booking_data.location_address
         )
@@ -388,8 +388,8 @@ async def create_booking(
         customer = await _find_or_create_customer(
             db,
             encryption_handler,
-            email_encrypted,
-            phone_encrypted,
+            booking_data.customer_email,
+            booking_data.customer_phone,
             first_name,
             last_name,
             now,
@@ -444,6 +444,8 @@ async def create_booking(
                 detail="This time slot was just booked. Please select a different time.",
             )
 
+        await get_availability_cache().invalidate(booking.date, station_id=booking.station_id)
+
         # Send notification asynchronously
         asyncio.create_task(
             notify_new_booking(
@@ -554,6 +556,7 @@ async def update_booking(
 
     # Apply updates to booking
     update_data = booking_data.model_dump(exclude_none=True)
+    original_date = booking.date
 
     if "date" in update_data:
         booking.date = datetime.strptime(update_data["date"], "%Y-%m-%d").date()
@@ -643,6 +646,11 @@ async def update_booking(
             detail="Failed to update booking",
         )
 
+    # Date, slot and status all change slot occupancy
+    await get_availability_cache().invalidate_dates(
+        {original_date, booking.date}, station_id=booking.station_id
+    )
+
     # Send edit notification if there were changes
     if changes:
         customer_name = "Customer"
@@ -694,16 +702,18 @@ async def update_booking(
 async def _find_or_create_customer(
     db: AsyncSession,
     encryption_handler: SecureDataHandler,
-    email_encrypted: str,
-    phone_encrypted: str,
+    email: str,
+    phone: str,
     first_name: str,
     last_name: str,
     now: datetime,
 ) -> Customer:
-    """Find existing customer or create new one."""
+    """Find existing customer (by email blind index) or create new one."""
+    # Ciphertext is randomized, so match on the keyed hash of the normalized email
+    email_bidx = email_blind_index(email)
     result = await db.execute(
         select(Customer).where(
-            Customer.email_encrypted == email_encrypted,
+            Customer.email_bidx == email_bidx,
             Customer.deleted_at.is_(None),
         )
     )
@@ -715,8 +725,10 @@ async def _find_or_create_customer(
             station_id=UUID(DEFAULT_STATION_ID),
             first_name=first_name,
             last_name=last_name,
-            email_encrypted=email_encrypted,
-            phone_encrypted=phone_encrypted,
+            email_encrypted=encryption_handler.encrypt_email(email),
+            phone_encrypted=encryption_handler.encrypt_phone(phone),
+            email_bidx=email_bidx,
+            phone_bidx=phone_blind_index(phone),
             consent_sms=True,
             consent_email=True,
             consent_updated_at=now,
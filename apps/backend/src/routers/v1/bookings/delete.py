@@ -27,6 +27,7 @@ from core.database import get_db
 from core.security.roles import role_matches
 from services.encryption_service import SecureDataHandler
 from db.models.core import Booking, BookingStatus
+from services.scheduling.availability_cache import get_availability_cache
 from utils.auth import can_access_station, require_customer_support
 
 from .constants import RESTORE_WINDOW_DAYS
@@ -142,6 +143,7 @@ async def delete_booking(
     booking.status = BookingStatus.CANCELLED
 
     await db.commit()
+    await get_availability_cache().invalidate(booking.date, station_id=booking.station_id)
 
     # Log to audit trail
     await audit_logger.log_delete(
@@ -52,6 +52,7 @@ from schemas.chef_portal import (
     StationChefSummary,
     StationChefListResponse,
 )
+from services.scheduling.availability_cache import get_availability_cache
 from utils.auth import require_role, UserRole
 
 
@@ -264,6 +265,7 @@ async def add_availability_slot(
 
     db.add(new_slot)
     await db.commit()
+    await get_availability_cache().invalidate_all()  # Weekly pattern applies to every date
     await db.refresh(new_slot)
 
     return ChefAvailabilityResponse(
@@ -319,6 +321,7 @@ async def update_availability_slot(
         slot.is_available = slot_data.is_available
 
     await db.commit()
+    await get_availability_cache().invalidate_all()  # Weekly pattern applies to every date
     await db.refresh(slot)
 
     return ChefAvailabilityResponse(
@@ -366,6 +369,7 @@ async def delete_availability_slot(
 
     await db.delete(slot)
     await db.commit()
+    await get_availability_cache().invalidate_all()  # Weekly pattern applies to every date
 
 
 @router.put(
@@ -403,6 +407,7 @@ async def bulk_update_availability(
         new_slots.append(new_slot)
 
     await db.commit()
+    await get_availability_cache().invalidate_all()  # Weekly pattern applies to every date
 
     # Refresh and build response
     availability_by_day: dict[str, list[ChefAvailabilityResponse]] = {
@@ -537,6 +542,9 @@ async def submit_timeoff_request(
 
     db.add(new_request)
     await db.commit()
+    await get_availability_cache().invalidate_range(
+        new_request.start_date, new_request.end_date
+    )
     await db.refresh(new_request)
 
     return TimeOffRequestResponse(
@@ -598,6 +606,7 @@ async def cancel_timeoff_request(
     request.processed_at = datetime.utcnow()
 
     await db.commit()
+    await get_availability_cache().invalidate_range(request.start_date, request.end_date)
 
 
 # ============================================================================
@@ -839,6 +848,7 @@ async def process_timeoff_request(
         request.manager_notes = approval.notes
 
     await db.commit()
+    await get_availability_cache().invalidate_range(request.start_date, request.end_date)
     await db.refresh(request)
 
     # Get chef name
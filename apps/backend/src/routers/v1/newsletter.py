@@ -22,12 +22,13 @@ from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, EmailStr
-from sqlalchemy import and_, desc, func, or_
+from pydantic import BaseModel, EmailStr, ValidationError, field_validator
+from sqlalchemy import desc, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from api.deps import get_current_admin_user
+from core.blind_index import email_blind_index
 from core.database import get_db
 from db.models.identity import User
 
@@ -41,6 +42,12 @@ from db.models.newsletter import (
     Subscriber,
 )
 from services.ai_lead_management import get_social_media_ai
+from services.newsletter.segments import (
+    SegmentFilter,
+    compile_segment,
+    materialize_audience,
+    snapshot_audience,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/newsletter", tags=["newsletter"])
@@ -99,6 +106,13 @@ class SubscriberResponse(BaseModel):
         from_attributes = True
 
 
+def _validate_segment_filter(value: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Reject segment filters the segment compiler cannot compile."""
+    if value is None:
+        return None
+    return SegmentFilter.model_validate(value).model_dump(mode="json", exclude_none=True)
+
+
 class CampaignCreate(BaseModel):
     name: str
     channel: CampaignChannel
@@ -107,6 +121,8 @@ class CampaignCreate(BaseModel):
     segment_filter: dict[str, Any] | None = None
     scheduled_at: datetime | None = None
 
+    _check_segment_filter = field_validator("segment_filter")(_validate_segment_filter)
+
 
 class CampaignUpdate(BaseModel):
     name: str | None = None
@@ -116,6 +132,8 @@ class CampaignUpdate(BaseModel):
     scheduled_at: datetime | None = None
     status: CampaignStatus | None = None
 
+    _check_segment_filter = field_validator("segment_filter")(_validate_segment_filter)
+
 
 class CampaignResponse(BaseModel):
     id: UUID
@@ -172,7 +190,7 @@ async def create_subscriber(
 
     # Check if subscriber already exists
     stmt = select(Subscriber).where(
-        Subscriber.email_enc == Subscriber._encrypt_email(subscriber_data.email)
+        Subscriber.email_bidx == email_blind_index(subscriber_data.email)
     )
     result = await db.execute(stmt)
     existing = result.scalars().first()
@@ -661,9 +679,14 @@ async def update_campaign(
             detail="Cannot update sent or sending campaign",
         )
 
-    for field, value in campaign_update.dict(exclude_unset=True).items():
+    updates = campaign_update.dict(exclude_unset=True)
+    for field, value in updates.items():
         setattr(campaign, field, value)
 
+    if "segment_filter" in updates:
+        # Audience snapshot no longer matches the segment; rebuilt on send
+        campaign.audience_snapshot_at = None
+
     await db.commit()
 
     return campaign
@@ -707,6 +730,42 @@ async def send_campaign(
     return {"success": True, "message": "Campaign scheduled for sending"}
 
 
+@router.post("/campaigns/{campaign_id}/resume")
+async def resume_campaign(
+    campaign_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Resume an interrupted campaign send from its last checkpoint."""
+
+    campaign = (
+        (await db.execute(select(Campaign).where(Campaign.id == campaign_id)))
+        .scalars()
+        .first()
+    )
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found"
+        )
+
+    if campaign.status not in (CampaignStatus.SENDING, CampaignStatus.CANCELLED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only sending or cancelled campaigns can be resumed",
+        )
+
+    # Recipients already sent to are skipped (one SENT event per subscriber)
+    background_tasks.add_task(_send_campaign_async, campaign_id, True)
+
+    return {
+        "success": True,
+        "message": "Campaign send resumed",
+        "total_sent": campaign.total_sent,
+        "total_failed": campaign.total_failed,
+    }
+
+
 @router.get("/campaigns/{campaign_id}/stats", response_model=CampaignStatsResponse)
 async def get_campaign_stats(
     campaign_id: UUID,
@@ -812,230 +871,180 @@ async def preview_segment(
 ):
     """Preview subscribers matching segment criteria."""
 
-    query = select(Subscriber).where(Subscriber.subscribed)
+    try:
+        predicate = compile_segment(filter_criteria)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid segment filter: {e.errors()}",
+        )
 
-    # Apply segment filters
-    if "tags" in filter_criteria:
-        query = query.where(Subscriber.tags.overlap(filter_criteria["tags"]))
+    total_res = await db.execute(
+        select(func.count()).select_from(Subscriber).where(predicate)
+    )
+    total_count = int(total_res.scalar_one())
 
-    if "engagement_min" in filter_criteria:
-        query = query.where(
-            Subscriber.engagement_score >= filter_criteria["engagement_min"]
-        )
+    sample_res = await db.execute(select(Subscriber).where(predicate).limit(10))
+    sample = sample_res.scalars().all()
 
-    if "engagement_max" in filter_criteria:
-        query = query.where(
-            Subscriber.engagement_score <= filter_criteria["engagement_max"]
-        )
+    return {"total_count": total_count, "sample_subscribers": sample}
 
-    if "last_opened_days" in filter_criteria:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(
-            days=filter_criteria["last_opened_days"]
-        )
-        query = query.where(Subscriber.last_opened_date >= cutoff_date)
-
-    # Compute total count using COUNT() and fetch a small sample asynchronously
-    # Build where clause for count (re-use query filters)
-    # Note: SQLAlchemy select objects do not expose a public API for extracting the where-clause
-    # so we rebuild a count statement using the same filtering logic.
-    count_stmt = select(func.count()).select_from(Subscriber)
-    # Re-apply filters to count_stmt if present
-    if "tags" in filter_criteria:
-        count_stmt = count_stmt.where(Subscriber.tags.overlap(filter_criteria["tags"]))
-    if "engagement_min" in filter_criteria:
-        count_stmt = count_stmt.where(
-            Subscriber.engagement_score >= filter_criteria["engagement_min"]
-        )
-    if "engagement_max" in filter_criteria:
-        count_stmt = count_stmt.where(
-            Subscriber.engagement_score <= filter_criteria["engagement_max"]
+
+@router.post("/campaigns/{campaign_id}/audience")
+async def snapshot_campaign_audience(
+    campaign_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Materialize (or refresh) the campaign's audience snapshot."""
+
+    campaign = (
+        (await db.execute(select(Campaign).where(Campaign.id == campaign_id)))
+        .scalars()
+        .first()
+    )
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found"
         )
-    if "last_opened_days" in filter_criteria:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(
-            days=filter_criteria["last_opened_days"]
+
+    if campaign.status in [CampaignStatus.SENT, CampaignStatus.SENDING]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot refresh the audience of a sent or sending campaign",
         )
-        count_stmt = count_stmt.where(Subscriber.last_opened_date >= cutoff_date)
 
-    total_res = await db.execute(count_stmt)
-    total_count = int(total_res.scalar_one())
+    total = await materialize_audience(db, campaign)
+    await db.commit()
 
-    sample_stmt = query.limit(10)
-    sample_res = await db.execute(sample_stmt)
-    sample = sample_res.scalars().all()
+    return {
+        "campaign_id": campaign_id,
+        "total_recipients": total,
+        "snapshot_at": campaign.audience_snapshot_at,
+    }
 
-    return {"total_count": total_count, "sample_subscribers": sample}
+
+@router.get("/campaigns/{campaign_id}/audience")
+async def get_campaign_audience(
+    campaign_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Audience size from the stored snapshot (no segment re-evaluation)."""
+
+    row = (
+        await db.execute(
+            select(Campaign.total_recipients, Campaign.audience_snapshot_at).where(
+                Campaign.id == campaign_id
+            )
+        )
+    ).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found"
+        )
+
+    return {
+        "campaign_id": campaign_id,
+        "total_recipients": row.total_recipients if row.audience_snapshot_at else None,
+        "snapshot_at": row.audience_snapshot_at,
+    }
 
 
 # Background task functions
-async def _send_campaign_async(campaign_id: UUID):
-    """Send campaign in background."""
+async def _send_campaign_async(campaign_id: UUID, resume: bool = False):
+    """
+    Send campaign in background.
+
+    The segment is materialized into the campaign's audience snapshot once;
+    CampaignDispatcher then streams the snapshot (keyset pages, bounded
+    concurrency, RingCentral rate limit, batched events/stats). With
+    resume=True the send continues after the campaign's saved checkpoint.
+    """
     from core.database import get_db_context
 
     async with get_db_context() as db:
-        try:
-            campaign = (
-                (await db.execute(select(Campaign).where(Campaign.id == campaign_id)))
-                .scalars()
-                .first()
-            )
-            if not campaign:
-                return
-
-            # Get target subscribers
-            query = select(Subscriber).where(Subscriber.subscribed)
-
-            # Apply segment filters if any
-            if campaign.segment_filter:
-                # Apply segment filtering logic here
-                pass
-
-            # Get appropriate channel subscribers
-            if campaign.channel == CampaignChannel.EMAIL:
-                # Email campaigns are ONLY for admin/transactional purposes
-                # Not for marketing newsletters
-                query = query.where(Subscriber.email_consent)
-            elif campaign.channel == CampaignChannel.SMS:
-                # SMS is the PRIMARY newsletter channel (via RingCentral)
-                query = query.where(
-                    and_(
-                        Subscriber.sms_consent,
-                        Subscriber.phone_enc.isnot(None),
-                    )
-                )
-            elif campaign.channel == CampaignChannel.BOTH:
-                # Both channels: SMS for newsletter, email for admin tasks
-                query = query.where(
-                    or_(
-                        Subscriber.email_consent,
-                        and_(
-                            Subscriber.sms_consent,
-                            Subscriber.phone_enc.isnot(None),
-                        ),
-                    )
-                )
+        campaign = (
+            (await db.execute(select(Campaign).where(Campaign.id == campaign_id)))
+            .scalars()
+            .first()
+        )
+        if not campaign:
+            return
+
+        campaign.status = CampaignStatus.SENDING
+        if not resume:
+            campaign.send_cursor = None
+        if campaign.audience_snapshot_at is None:
+            # Reuse a snapshot taken from the admin UI; consent is re-checked per send
+            await materialize_audience(db, campaign)
+        await db.commit()
 
-            subscribers = (await db.execute(query)).scalars().all()
+        audience = snapshot_audience(campaign)
 
-            # Update campaign
-            campaign.status = CampaignStatus.SENDING
-            campaign.total_recipients = len(subscribers)
-            await db.commit()
+        channel = campaign.channel
+        sms_content = campaign.content.get("text", campaign.content.get("html", ""))
 
-            # Initialize services
+    try:
+        # For SMS campaigns (newsletter/marketing)
+        if channel in [CampaignChannel.SMS, CampaignChannel.BOTH]:
             from core.compliance import get_compliance_validator
             from core.config import get_settings
+            from services.newsletter.campaign_dispatcher import (
+                CampaignDispatcher,
+                get_sms_rate_limiter,
+            )
             from services.newsletter.sms_service import NewsletterSMSService
             from services.ringcentral_sms import RingCentralSMSService
 
             settings = get_settings()
-            compliance_validator = get_compliance_validator()
-
-            # For SMS campaigns (newsletter/marketing)
-            if campaign.channel in [CampaignChannel.SMS, CampaignChannel.BOTH]:
-                async with RingCentralSMSService() as ringcentral:
-                    sms_service = NewsletterSMSService(
-                        ringcentral_service=ringcentral,
-                        compliance_validator=compliance_validator,
-                        business_phone=settings.ringcentral_from_number,
-                    )
-
-                    # Send to SMS subscribers
-                    sms_content = campaign.content.get(
-                        "text", campaign.content.get("html", "")
-                    )
-
-                    for subscriber in subscribers:
-                        if not subscriber.sms_consent or not subscriber.phone_enc:
-                            continue
-
-                        try:
-                            from utils.encryption import decrypt_phone
-
-                            phone = decrypt_phone(subscriber.phone_enc)
-
-                            # Send SMS with TCPA compliance
-                            result = await sms_service.send_campaign_sms(
-                                subscriber_phone=phone,
-                                subscriber_name=subscriber.email.split("@")[
-                                    0
-                                ],  # Use email prefix as name
-                                message_content=sms_content,
-                                campaign_id=campaign.id,
-                                include_stop_instructions=True,
-                            )
-
-                            # Create sent event
-                            event = CampaignEvent(
-                                campaign_id=campaign.id,
-                                subscriber_id=subscriber.id,
-                                type=CampaignEventType.SENT,
-                            )
-                            db.add(event)
-
-                            if result.success:
-                                # Create delivered event
-                                delivery_event = CampaignEvent(
-                                    campaign_id=campaign.id,
-                                    subscriber_id=subscriber.id,
-                                    type=CampaignEventType.DELIVERED,
-                                )
-                                db.add(delivery_event)
-
-                                # Update subscriber stats
-                                subscriber.total_sms_sent = (
-                                    subscriber.total_sms_sent or 0
-                                ) + 1
-                                subscriber.last_sms_sent_date = datetime.now(
-                                    timezone.utc
-                                )
-
-                                logger.info(
-                                    f"✅ SMS campaign sent: {phone[-4:]}",
-                                    extra={
-                                        "campaign_id": str(campaign.id),
-                                        "subscriber_id": str(subscriber.id),
-                                        "message_id": result.message_id,
-                                    },
-                                )
-                            else:
-                                logger.error(
-                                    f"❌ SMS campaign failed: {phone[-4:]} - {result.error}",
-                                    extra={
-                                        "campaign_id": str(campaign.id),
-                                        "subscriber_id": str(subscriber.id),
-                                        "error": result.error,
-                                    },
-                                )
-
-                        except Exception as e:
-                            logger.exception(
-                                f"Failed to send SMS to subscriber {subscriber.id}: {e}"
-                            )
-
-                    await db.commit()
-
-            # For EMAIL campaigns (admin/transactional only - NOT newsletters)
-            if campaign.channel in [CampaignChannel.EMAIL]:
-                # Email service integration for admin/transactional emails
-                # NOT for marketing newsletters (those go via SMS)
-                logger.info(
-                    "📧 Email campaigns are for admin/transactional purposes only",
-                    extra={"campaign_id": str(campaign.id)},
+
+            async with RingCentralSMSService() as ringcentral:
+                # No db session: the dispatcher records events/stats per page
+                sms_service = NewsletterSMSService(
+                    ringcentral_service=ringcentral,
+                    compliance_validator=get_compliance_validator(),
+                    business_phone=settings.ringcentral_from_number,
+                    rate_limiter=get_sms_rate_limiter(),
+                    max_concurrency=settings.NEWSLETTER_SEND_CONCURRENCY,
                 )
-                # Email implementation would go here for transactional emails
-                # (invoices, booking confirmations, etc.)
-
-            # Mark campaign as sent
-            campaign.status = CampaignStatus.SENT
-            campaign.sent_at = datetime.now(timezone.utc)
-            await db.commit()
-
-        except Exception as e:
-            logger.exception(f"Campaign sending failed: {e}")
-            # Mark campaign as failed
-            if campaign:
-                campaign.status = CampaignStatus.CANCELLED
-                await db.commit()
+                stats = await CampaignDispatcher(sms_service).run(
+                    campaign_id, audience, sms_content
+                )
+
+            logger.info(
+                f"📱 SMS campaign dispatched: {stats.sent} sent, {stats.failed} failed",
+                extra={"campaign_id": str(campaign_id), **stats.to_dict()},
+            )
+
+        # For EMAIL campaigns (admin/transactional only - NOT newsletters)
+        if channel in [CampaignChannel.EMAIL]:
+            # Email service integration for admin/transactional emails
+            # NOT for marketing newsletters (those go via SMS)
+            logger.info(
+                "📧 Email campaigns are for admin/transactional purposes only",
+                extra={"campaign_id": str(campaign_id)},
+            )
+            # Email implementation would go here for transactional emails
+            # (invoices, booking confirmations, etc.)
+
+        # Mark campaign as sent
+        async with get_db_context() as db:
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(status=CampaignStatus.SENT, sent_at=datetime.now(timezone.utc))
+            )
+
+    except Exception as e:
+        logger.exception(f"Campaign sending failed: {e}")
+        # Mark campaign as failed; POST /campaigns/{id}/resume continues from the checkpoint
+        async with get_db_context() as db:
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(status=CampaignStatus.CANCELLED)
+            )
 
 
 # ============================================================================
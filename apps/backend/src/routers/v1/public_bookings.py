@@ -36,11 +36,13 @@ from sqlalchemy import and_, func, select, text
 from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.blind_index import email_blind_index, phone_blind_index
 from core.database import get_db
 from db.models.core import Booking, BookingStatus, Customer
 from services.business_config_service import get_business_config_sync
 from services.email_service import email_service
 from services.encryption_service import SecureDataHandler
+from services.scheduling.availability_cache import get_availability_cache
 from services.unified_notification_service import notify_new_booking
 from utils.timezone_utils import DEFAULT_TIMEZONE
 
@@ -517,6 +519,7 @@ async def create_public_booking(
 
         email_encrypted = encryption_handler.encrypt_email(booking_data.customer_email)
         phone_encrypted = encryption_handler.encrypt_phone(booking_data.customer_phone)
+        email_bidx = email_blind_index(booking_data.customer_email)
         address_encrypted = encryption_handler.encrypt_email(
             booking_data.location_address
         )
@@ -563,9 +566,9 @@ async def create_public_booking(
                     detail="This time slot is already booked. Please select a different time.",
                 )
 
-            # Look up or create customer
+            # Look up or create customer (ciphertext is randomized: match the blind index)
             customer_stmt = select(Customer).where(
-                Customer.email_encrypted == email_encrypted,
+                Customer.email_bidx == email_bidx,
                 Customer.deleted_at.is_(None),
             )
             result = await db.execute(customer_stmt)
@@ -579,6 +582,8 @@ async def create_public_booking(
                     last_name=last_name,
                     email_encrypted=email_encrypted,
                     phone_encrypted=phone_encrypted,
+                    email_bidx=email_bidx,
+                    phone_bidx=phone_blind_index(booking_data.customer_phone),
                     consent_sms=True,
                     consent_email=True,
                     consent_updated_at=now,
@@ -643,6 +648,9 @@ async def create_public_booking(
             # Commit the transaction
             await db.commit()
             logger.info(f"✅ Booking committed successfully: {booking_id}")
+            await get_availability_cache().invalidate(
+                booking_date, station_id=booking.station_id
+            )
             break  # Success! Exit retry loop
 
         except HTTPException:
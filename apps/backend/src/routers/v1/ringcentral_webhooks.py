@@ -1,12 +1,14 @@
 """RingCentral SMS webhook and integration endpoints."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import logging
 from uuid import UUID
 
-from core.database import get_db
+from core.blind_index import normalize_phone, phone_blind_index
+from core.database import get_db_context
 
 # FIXED: Import from db.models (NEW system) instead of models (OLD system)
+from db.models.core import Customer
 from db.models.crm import Lead, ContactChannel
 from db.models.lead import LeadContact
 from services.ai_lead_management import (
@@ -18,22 +20,20 @@ from services.ringcentral_sms import SMSMessage, ringcentral_sms
 from fastapi import (
     APIRouter,
     BackgroundTasks,
-    Depends,
     HTTPException,
     Request,
     status,
 )
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/webhooks/ringcentral", tags=["webhooks", "sms"])
 
 
 @router.post("/sms")
-async def handle_sms_webhook(
-    request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
-):
+async def handle_sms_webhook(request: Request, background_tasks: BackgroundTasks):
     """Handle RingCentral SMS webhook notifications."""
 
     try:
@@ -46,9 +46,9 @@ async def handle_sms_webhook(
         async with ringcentral_sms as sms_service:
             messages = await sms_service.handle_webhook_notification(payload)
 
-        # Process each message
+        # Process each message (after the response, in its own session)
         for message in messages:
-            background_tasks.add_task(_process_sms_message, message, db)
+            background_tasks.add_task(_process_sms_message, message)
 
         return {"success": True, "processed_messages": len(messages)}
 
@@ -81,21 +81,19 @@ async def handle_verification_webhook(request: Request):
 
 
 @router.post("/sync-messages")
-async def sync_recent_messages(
-    background_tasks: BackgroundTasks, hours_back: int = 24, db: Session = Depends(get_db)
-):
+async def sync_recent_messages(background_tasks: BackgroundTasks, hours_back: int = 24):
     """Manually sync recent SMS messages from RingCentral."""
 
     try:
         # Get messages from the specified time range
-        date_from = datetime.now(timezone.utc) - datetime.timedelta(hours=hours_back)
+        date_from = datetime.now(timezone.utc) - timedelta(hours=hours_back)
 
         async with ringcentral_sms as sms_service:
             messages = await sms_service.get_messages(date_from=date_from)
 
         # Process each message
         for message in messages:
-            background_tasks.add_task(_process_sms_message, message, db)
+            background_tasks.add_task(_process_sms_message, message)
 
         return {
             "success": True,
@@ -110,149 +108,158 @@ async def sync_recent_messages(
         )
 
 
-async def _process_sms_message(message: SMSMessage, db: Session):
-    """Process individual SMS message and create/update leads."""
+async def _process_sms_message(message: SMSMessage):
+    """
+    Process individual SMS message and create/update leads.
+
+    Runs as a background task after the webhook has responded, so it opens
+    its own session (committed on success, rolled back on error).
+    """
+
+    # Skip outbound messages (we sent them)
+    if message.direction == "Outbound":
+        return
 
     try:
-        # Skip outbound messages (we sent them)
-        if message.direction == "Outbound":
-            return
+        async with get_db_context() as db:
+            await _handle_inbound_sms(message, db)
+    except Exception as e:
+        logger.exception(f"Error processing SMS message: {e}")
 
-        phone_number = message.from_number
-        message_content = message.body
 
-        # Check for STOP/START commands first (newsletter opt-out system)
-        newsletter_service = NewsletterService(db)
+async def _handle_inbound_sms(message: SMSMessage, db: AsyncSession):
+    """STOP/START handling, lead matching and AI processing of an inbound SMS."""
 
-        if newsletter_service.is_stop_command(message_content):
-            success, response_msg = await newsletter_service.process_stop_command(
-                phone=phone_number, channel="sms"
-            )
+    phone_number = message.from_number
+    message_content = message.body
 
-            # Send confirmation message
-            async with ringcentral_sms as sms_service:
-                await sms_service.send_sms(to_number=phone_number, message=response_msg)
+    # Check for STOP/START commands first (newsletter opt-out system)
+    newsletter_service = NewsletterService(db)
 
-            logger.info(f"Processed STOP command from {phone_number}: {success}")
-            return  # Don't process with AI
+    if newsletter_service.is_stop_command(message_content):
+        success, response_msg = await newsletter_service.process_stop_command(
+            phone=phone_number, channel="sms"
+        )
 
-        if newsletter_service.is_start_command(message_content):
-            # Try to get name from existing lead or ask for it
-            lead = await _find_lead_by_phone(phone_number, db)
-            name = None
+        # Send confirmation message
+        async with ringcentral_sms as sms_service:
+            await sms_service.send_sms(to_number=phone_number, message=response_msg)
 
-            if lead:
-                # Get name from lead contacts
-                for contact in lead.contacts:
-                    if hasattr(contact, "name") and contact.name:
-                        name = contact.name
-                        break
+        logger.info(f"Processed STOP command from {phone_number}: {success}")
+        return  # Don't process with AI
 
-            success, response_msg = await newsletter_service.process_start_command(
-                phone=phone_number, name=name, channel="sms"
-            )
+    if newsletter_service.is_start_command(message_content):
+        # Try to get name from existing lead or ask for it
+        lead = await _find_lead_by_phone(phone_number, db)
+        name = None
 
-            # Send confirmation message
-            async with ringcentral_sms as sms_service:
-                await sms_service.send_sms(to_number=phone_number, message=response_msg)
+        if lead:
+            # Get name from lead contacts
+            for contact in lead.contacts:
+                if hasattr(contact, "name") and contact.name:
+                    name = contact.name
+                    break
+
+        success, response_msg = await newsletter_service.process_start_command(
+            phone=phone_number, name=name, channel="sms"
+        )
 
-            logger.info(f"Processed START command from {phone_number}: {success}")
-            return  # Don't process with AI
+        # Send confirmation message
+        async with ringcentral_sms as sms_service:
+            await sms_service.send_sms(to_number=phone_number, message=response_msg)
 
-        # Normal message processing - find existing lead or customer by phone number
-        lead = await _find_lead_by_phone(phone_number, db)
-        customer = await _find_customer_by_phone(phone_number, db)
+        logger.info(f"Processed START command from {phone_number}: {success}")
+        return  # Don't process with AI
 
-        # If no existing lead or customer, create new lead
-        if not lead and not customer:
-            lead = await _create_lead_from_sms(phone_number, message_content, db)
+    # Normal message processing - find existing lead or customer by phone number
+    lead = await _find_lead_by_phone(phone_number, db)
+    customer = await _find_customer_by_phone(phone_number, db)
 
-        # Update existing lead with new contact
-        if lead:
-            lead.last_contact_date = message.creation_time
+    # If no existing lead or customer, create new lead
+    if not lead and not customer:
+        lead = await _create_lead_from_sms(phone_number, message_content, db)
 
-            # Add SMS event
-            lead.add_event(
-                "sms_received",
-                {
-                    "phone_number": phone_number,
-                    "message": message_content,
-                    "message_id": message.id,
-                    "conversation_id": message.conversation_id,
-                },
-            )
+    # Update existing lead with new contact
+    if lead:
+        lead.last_contact_date = message.creation_time
 
-            # Process with AI for lead scoring and insights
-            await _process_message_with_ai(lead, message_content, db)
+        # Add SMS event
+        lead.add_event(
+            "sms_received",
+            {
+                "phone_number": phone_number,
+                "message": message_content,
+                "message_id": message.id,
+                "conversation_id": message.conversation_id,
+            },
+        )
 
-        db.commit()
-        logger.info(f"Processed SMS message from {phone_number}")
+        # Process with AI for lead scoring and insights
+        await _process_message_with_ai(lead, message_content, db)
 
-    except Exception as e:
-        logger.exception(f"Error processing SMS message: {e}")
-        db.rollback()
+    logger.info(f"Processed SMS message from {phone_number}")
 
 
-async def _find_lead_by_phone(phone_number: str, db: Session) -> Lead:
-    """Find lead by phone number."""
+async def _find_lead_by_phone(phone_number: str, db: AsyncSession) -> Lead | None:
+    """Find lead by phone number (exact match on the indexed E.164 handle)."""
 
-    # Clean phone number for comparison
-    clean_phone = _clean_phone_number(phone_number)
+    handle_e164 = normalize_phone(phone_number)
+    if not handle_e164:
+        return None
 
-    # Query lead contacts for phone number
-    lead_contact = (
-        db.query(LeadContact)
-        .filter(
-            and_(
-                LeadContact.channel == ContactChannel.SMS,
-                LeadContact.handle_or_address.like(f"%{clean_phone}%"),
-            )
+    # Contacts and events are used by the caller (no lazy loads in async)
+    result = await db.execute(
+        select(Lead)
+        .join(LeadContact, LeadContact.lead_id == Lead.id)
+        .where(
+            LeadContact.channel == ContactChannel.SMS,
+            LeadContact.handle_e164 == handle_e164,
         )
-        .first()
+        .options(selectinload(Lead.contacts), selectinload(Lead.events))
+        .limit(1)
     )
+    return result.scalars().first()
 
-    if lead_contact:
-        return db.query(Lead).filter(Lead.id == lead_contact.lead_id).first()
 
-    return None
+async def _find_customer_by_phone(phone_number: str, db: AsyncSession) -> Customer | None:
+    """Find customer by phone number (encrypted, matched on its blind index)."""
 
+    phone_bidx = phone_blind_index(phone_number)
+    if not phone_bidx:
+        return None
 
-async def _find_customer_by_phone(phone_number: str, db: Session):
-    """Find customer by phone number (encrypted)."""
-
-    # This would require decrypting phone numbers to compare
-    # For now, we'll skip customer lookup by phone
-    # TODO: Implement encrypted phone search
-    return None
+    result = await db.execute(
+        select(Customer)
+        .where(Customer.phone_bidx == phone_bidx, Customer.deleted_at.is_(None))
+        .limit(1)
+    )
+    return result.scalars().first()
 
 
-async def _create_lead_from_sms(phone_number: str, message_content: str, db: Session) -> Lead:
+async def _create_lead_from_sms(phone_number: str, message_content: str, db: AsyncSession) -> Lead:
     """Create new lead from SMS message."""
 
-    # Create lead
+    # Create lead with its phone contact and initial event (collections are
+    # populated before the flush, so later access needs no lazy load)
     lead = Lead(source="sms", status="new")
-    db.add(lead)
-    db.flush()  # Get the lead ID
-
-    # Add phone contact
-    contact = LeadContact(
-        lead_id=lead.id,
-        channel=ContactChannel.SMS,
-        handle_or_address=phone_number,
-        verified=True,  # SMS numbers are considered verified
+    lead.contacts.append(
+        LeadContact(
+            channel=ContactChannel.SMS,
+            handle_or_address=phone_number,
+            verified=True,  # SMS numbers are considered verified
+        )
     )
-    db.add(contact)
-
-    # Add initial event
     lead.add_event(
         "lead_created",
         {"source": "sms", "initial_message": message_content, "phone_number": phone_number},
     )
+    db.add(lead)
+    await db.flush()  # Get the lead ID
 
     return lead
 
 
-async def _process_message_with_ai(lead: Lead, message_content: str, db: Session):
+async def _process_message_with_ai(lead: Lead, message_content: str, db: AsyncSession):
     """Process message with AI for insights and scoring."""
 
     try:
@@ -328,19 +335,6 @@ async def _process_message_with_ai(lead: Lead, message_content: str, db: Session
         logger.exception(f"AI processing failed for lead {lead.id}: {e}")
 
 
-def _clean_phone_number(phone_number: str) -> str:
-    """Clean phone number for comparison."""
-
-    # Remove all non-digit characters
-    digits_only = "".join(filter(str.isdigit, phone_number))
-
-    # Remove leading '1' if present (US country code)
-    if digits_only.startswith("1") and len(digits_only) == 11:
-        digits_only = digits_only[1:]
-
-    return digits_only
-
-
 # SMS sending endpoints
 @router.post("/send-sms")
 async def send_sms_message(
@@ -349,7 +343,6 @@ async def send_sms_message(
     background_tasks: BackgroundTasks,
     lead_id: UUID | None = None,
     from_number: str | None = None,
-    db: Session = Depends(get_db),
 ):
     """Send SMS message via RingCentral."""
 
@@ -363,7 +356,7 @@ async def send_sms_message(
             # Update lead if provided
             if lead_id:
                 background_tasks.add_task(
-                    _record_outbound_sms, lead_id, to_number, message, response.message_id, db
+                    _record_outbound_sms, lead_id, to_number, message, response.message_id
                 )
 
             return {
@@ -384,14 +377,18 @@ async def send_sms_message(
         )
 
 
-async def _record_outbound_sms(
-    lead_id: UUID, to_number: str, message: str, message_id: str, db: Session
-):
-    """Record outbound SMS in lead events."""
+async def _record_outbound_sms(lead_id: UUID, to_number: str, message: str, message_id: str):
+    """Record outbound SMS in lead events (background task, own session)."""
 
     try:
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
-        if lead:
+        async with get_db_context() as db:
+            result = await db.execute(
+                select(Lead).where(Lead.id == lead_id).options(selectinload(Lead.events))
+            )
+            lead = result.scalars().first()
+            if not lead:
+                return
+
             lead.add_event(
                 "sms_sent",
                 {
@@ -402,8 +399,6 @@ async def _record_outbound_sms(
                 },
             )
             lead.last_contact_date = datetime.now(timezone.utc)
-            db.commit()
 
     except Exception as e:
         logger.exception(f"Failed to record outbound SMS: {e}")
-        db.rollback()
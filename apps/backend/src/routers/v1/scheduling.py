@@ -4,19 +4,23 @@ Smart Scheduling API Endpoints
 Provides:
 - Availability checking with smart suggestions
 - Travel time calculation
-- Chef assignment optimization
+- Chef assignment optimization (single booking and whole service day)
 - Booking negotiation management
 """
 
+import asyncio
 from datetime import date, datetime, time
 from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.auth.station_middleware import AuthenticatedUser, require_station_role
 from core.database import get_db
+from db.models.identity import StationRole
 from schemas.scheduling import (  # Availability; Travel; Chef Assignment; Negotiation; Config; Address
     AddressInput,
     AllSlotsConfigResponse,
@@ -29,6 +33,8 @@ from schemas.scheduling import (  # Availability; Travel; Chef Assignment; Negot
     ChefAssignmentResponse,
     ChefScoreResponse,
     CreateNegotiationRequest,
+    DayAssignmentRequest,
+    DayAssignmentResponse,
     EventDurationRequest,
     EventDurationResponse,
     GeocodedAddressResponse,
@@ -36,6 +42,7 @@ from schemas.scheduling import (  # Availability; Travel; Chef Assignment; Negot
     NegotiationResponse,
     NegotiationStatusEnum,
     PendingNegotiationsResponse,
+    PlannedAssignmentResponse,
     RespondToNegotiationRequest,
     SlotAvailabilityResponse,
     SlotConfigResponse,
@@ -44,7 +51,9 @@ from schemas.scheduling import (  # Availability; Travel; Chef Assignment; Negot
     TravelTimeResponse,
 )
 from services.scheduling import (
+    AvailabilityEngine,
     ChefOptimizerService,
+    DayAssignmentSolver,
     GeocodingService,
     NegotiationReason,
     NegotiationService,
@@ -52,11 +61,20 @@ from services.scheduling import (
     SuggestionEngine,
     TravelTimeService,
 )
+from services.google_calendar_service import create_chef_assignment_event
+from services.scheduling.availability_cache import get_availability_cache
 from services.scheduling.travel_time_service import Coordinates
 
 router = APIRouter(prefix="/scheduling", tags=["Scheduling"])
 
 
+def _slot_label(slot_time: time) -> str:
+    """Format a slot time as a short label (e.g., 12:00 -> "12PM")."""
+    period = "AM" if slot_time.hour < 12 else "PM"
+    display_hour = slot_time.hour % 12 or 12
+    return f"{display_hour}{period}"
+
+
 # ============================================================================
 # Availability Endpoints
 # ============================================================================
@@ -132,33 +150,26 @@ async def get_calendar_availability(
             detail="Date range cannot exceed 30 days",
         )
 
-    slot_manager = SlotManagerService()
-    suggestion_engine = SuggestionEngine(db, slot_manager=slot_manager)
-
-    calendar = await suggestion_engine.get_availability_calendar(
+    # One matrix pass for the whole range (grouped counts, not per-slot checks)
+    availability_engine = AvailabilityEngine(db, cache=get_availability_cache())
+    matrix = await availability_engine.build_availability_matrix(
         start_date=request.start_date,
         end_date=request.end_date,
-        guest_count=request.guest_count,
-        venue_lat=request.venue_lat,
-        venue_lng=request.venue_lng,
-        preferred_chef_id=request.preferred_chef_id,
     )
 
     days = []
-    for cal_date, slots in sorted(calendar.items()):
+    for cal_date, cells in sorted(matrix.days.items()):
+        open_cells = [c for c in cells if c.is_available]
         days.append(
             CalendarDayAvailability(
                 date=cal_date,
-                slots=[
-                    SlotAvailabilityResponse(
-                        slot_time=s.slot_time,
-                        slot_date=s.slot_date,
-                        is_available=s.is_available,
-                        conflict_reason=s.conflict_reason,
-                        score=s.score,
-                    )
-                    for s in slots
-                ],
+                has_availability=bool(open_cells),
+                available_slots=[_slot_label(c.slot_time) for c in open_cells],
+                fully_booked=bool(cells)
+                and all(
+                    c.capacity > 0 and c.booked_count + c.hold_count >= c.capacity
+                    for c in cells
+                ),
             )
         )
 
@@ -169,6 +180,26 @@ async def get_calendar_availability(
     )
 
 
+@router.get("/availability/next-dates", response_model=list[date])
+async def get_next_available_dates(
+    start_date: Optional[date] = Query(None, description="First date (default: today)"),
+    days_ahead: int = Query(default=30, ge=1, le=90),
+    limit: int = Query(default=10, ge=1, le=31),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the next dates with at least one available slot.
+
+    Built from one availability matrix over the whole window.
+    """
+    availability_engine = AvailabilityEngine(db, cache=get_availability_cache())
+    return await availability_engine.get_next_available_dates(
+        start_date=start_date,
+        days_ahead=days_ahead,
+        limit=limit,
+    )
+
+
 # ============================================================================
 # Travel Time Endpoints
 # ============================================================================
@@ -395,6 +426,66 @@ async def get_top_chef_recommendations(
     ]
 
 
+@router.post("/chef/assign-day", response_model=DayAssignmentResponse)
+async def assign_chefs_for_day(
+    request: DayAssignmentRequest,
+    db: AsyncSession = Depends(get_db),
+    auth_user: AuthenticatedUser = Depends(require_station_role(StationRole.STATION_ADMIN)),
+):
+    """
+    Plan chef assignments for every unassigned booking of a station's day.
+
+    Unlike /chef/recommend (one booking at a time), all bookings are planned
+    jointly so an early booking can't take the chef later bookings need.
+    Uses the same scoring weights and consecutive-travel constraint.
+
+    Set apply=true to write the plan to the bookings in the same request.
+
+    Requires: Station Manager role or higher
+    """
+    if not auth_user.can_access_station(request.station_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No access to this station",
+        )
+
+    solver = DayAssignmentSolver(db, time_budget_seconds=request.time_budget_seconds)
+    plan = await solver.solve(station_id=request.station_id, event_date=request.event_date)
+
+    applied_count = 0
+    if request.apply and plan.assigned_count:
+        try:
+            updated = await solver.apply_plan(plan)
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A chef was assigned to another booking in the same slot; re-run the plan",
+            )
+        applied_count = len(updated)
+
+        # Trigger Google Calendar sync for each chef (async background tasks)
+        for booking in updated:
+            asyncio.create_task(
+                create_chef_assignment_event(db=db, booking=booking, chef_id=booking.chef_id)
+            )
+
+    return DayAssignmentResponse(
+        station_id=plan.station_id,
+        event_date=plan.event_date,
+        assigned_count=plan.assigned_count,
+        unassigned_count=plan.unassigned_count,
+        total_score=plan.total_score,
+        converged=plan.converged,
+        elapsed_ms=plan.elapsed_ms,
+        applied=request.apply and applied_count > 0,
+        applied_count=applied_count,
+        assignments=[
+            PlannedAssignmentResponse(**a.model_dump()) for a in plan.assignments
+        ],
+    )
+
+
 # ============================================================================
 # Available Chefs Endpoint (for assignment dropdown)
 # ============================================================================
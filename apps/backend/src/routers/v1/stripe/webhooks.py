@@ -8,15 +8,28 @@ Handles all Stripe webhook events with proper verification and processing.
 Consolidation Notes:
 - Previous: /webhook, /v1/payments/webhook, /v1/webhooks/stripe
 - Now: Single /webhook endpoint with comprehensive handler routing
+
+Ingestion Modes:
+- Inline (default): verify, store (leased to the request), run the
+  handlers, then acknowledge; events whose handlers fail, or whose request
+  dies mid-way, are left to workers/stripe_webhook_worker.py to retry
+- Ack-first (STRIPE_WEBHOOK_ASYNC=true): verify, store and acknowledge;
+  workers/stripe_webhook_worker.py processes the stored events with
+  per-payment_intent ordering and bounded concurrency, so bursts never
+  hold Stripe's request open past its timeout
+
+Redelivered events are dropped by the unique constraint on stripe_event_id.
 """
 
-import json
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID, uuid4
 
 import stripe
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status as http_status
 
@@ -28,6 +41,7 @@ from db.models.stripe import (
     PaymentStatus,
     StripePayment,
     WebhookEvent,
+    WebhookEventStatus,
 )
 from services.stripe_service import StripeService
 
@@ -36,10 +50,18 @@ from .schemas import WebhookEventResponse
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["stripe-webhooks"])
 
+# Postgres NOTIFY channel announcing newly queued events (ack-first mode)
+WEBHOOK_QUEUE_CHANNEL = "stripe_webhook_events"
+
+# claimed_by of events being handled inline by the request that stored them;
+# StripeWebhookWorker reclaims them once the lease expires
+INLINE_CLAIMANT = "webhook-inline"
+INLINE_LEASE_SECONDS = 300
 
-def get_stripe_service():
+
+def get_stripe_service(db: AsyncSession = Depends(get_db)) -> StripeService:
     """Dependency to get Stripe service instance."""
-    return StripeService()
+    return StripeService(db)
 
 
 # ============================================================================
@@ -97,17 +119,53 @@ async def webhook_handler(
                 detail="Invalid signature",
             )
 
-        # Store webhook event for audit trail
-        webhook_event = await store_webhook_event(event, db)
+        event = event_to_dict(event)
+        ack_first = settings.STRIPE_WEBHOOK_ASYNC
 
-        # Route event to appropriate handler
-        processed = await route_event(event, stripe_service, db)
+        # Store webhook event for audit trail (and as the queue entry). Inline
+        # events are stored already leased to this request, so a crash before
+        # the outcome is recorded leaves them for StripeWebhookWorker.
+        webhook_event_id = await store_webhook_event(
+            event, db, notify=ack_first, lease_seconds=None if ack_first else INLINE_LEASE_SECONDS
+        )
 
-        # Mark as processed
-        if webhook_event:
-            webhook_event.processed = True
-            webhook_event.processed_at = datetime.now(timezone.utc)
-            await db.commit()
+        if webhook_event_id is None or ack_first:
+            # Duplicate delivery, or queued for StripeWebhookWorker
+            return WebhookEventResponse(
+                received=True,
+                event_type=event["type"],
+                event_id=event["id"],
+                processed=False,
+            )
+
+        # Route event to appropriate handler
+        try:
+            await dispatch_event(event, stripe_service, db)
+            processed = True
+            outcome = {"status": WebhookEventStatus.PROCESSED, "processed_at": func.now()}
+        except Exception as e:
+            logger.exception(f"Error handling {event['type']}: {e}")
+            await db.rollback()
+            processed = False
+            # Release the lease as a first failed attempt; the worker retries it
+            outcome = {
+                "status": WebhookEventStatus.RECEIVED,
+                "retry_count": 1,
+                "processing_error": str(e),
+            }
+
+        # Record the outcome, unless the lease expired and a worker took over
+        await db.execute(
+            update(WebhookEvent)
+            .where(
+                WebhookEvent.id == webhook_event_id,
+                WebhookEvent.claimed_by == INLINE_CLAIMANT,
+            )
+            .values(claimed_by=None, lease_expires_at=None, **outcome)
+        )
+        if not processed:
+            await db.execute(select(func.pg_notify(WEBHOOK_QUEUE_CHANNEL, "")))
+        await db.commit()
 
         return WebhookEventResponse(
             received=True,
@@ -129,97 +187,138 @@ async def webhook_handler(
         )
 
 
-async def store_webhook_event(event: dict, db: AsyncSession) -> WebhookEvent:
-    """Store webhook event for audit trail and idempotency."""
-    try:
-        # Check for duplicate event (idempotency)
-        existing = await db.execute(
-            select(WebhookEvent).where(WebhookEvent.stripe_event_id == event["id"])
-        )
-        if existing.scalar_one_or_none():
-            logger.info(f"Duplicate webhook event ignored: {event['id']}")
-            return None
+def event_to_dict(event: Any) -> dict:
+    """Plain (JSON-serializable) dict of a verified stripe.Event."""
+    if type(event) is dict:
+        return event
+    to_dict = getattr(event, "to_dict_recursive", None) or event.to_dict
+    return to_dict()
+
 
-        webhook_event = WebhookEvent(
-            type=event["type"],
+def webhook_ordering_key(event: dict) -> Optional[str]:
+    """
+    Events with the same key are processed in order, one at a time: the
+    payment_intent id for payment, charge, refund, dispute and checkout
+    events, otherwise the id of the event's object.
+    """
+    obj = event.get("data", {}).get("object", {})
+    if obj.get("object") == "payment_intent":
+        return obj.get("id")
+    return obj.get("payment_intent") or obj.get("id")
+
+
+async def store_webhook_event(
+    event: dict,
+    db: AsyncSession,
+    notify: bool = False,
+    lease_seconds: Optional[int] = None,
+) -> Optional[UUID]:
+    """
+    Store webhook event for audit trail and idempotency.
+
+    A single INSERT ... ON CONFLICT DO NOTHING on the stripe_event_id unique
+    constraint, so concurrent redeliveries cannot both be stored. Returns
+    the new row id, or None for a duplicate. With ``notify`` the queue
+    workers are woken in the same transaction. With ``lease_seconds`` the
+    row is stored PROCESSING and leased to INLINE_CLAIMANT instead of
+    RECEIVED, for the caller to handle it right away.
+    """
+    created = event.get("created")
+    if lease_seconds is None:
+        claim = {"status": WebhookEventStatus.RECEIVED}
+    else:
+        claim = {
+            "status": WebhookEventStatus.PROCESSING,
+            "claimed_by": INLINE_CLAIMANT,
+            "lease_expires_at": func.now() + timedelta(seconds=lease_seconds),
+        }
+    result = await db.execute(
+        pg_insert(WebhookEvent)
+        .values(
+            id=uuid4(),
             stripe_event_id=event["id"],
-            payload_json=json.dumps(event),
-            processed=False,
+            event_type=event["type"],
+            payload=event,
+            retry_count=0,
+            ordering_key=webhook_ordering_key(event),
+            stripe_created=(
+                datetime.fromtimestamp(created, tz=timezone.utc) if created else None
+            ),
+            **claim,
         )
-        db.add(webhook_event)
-        await db.commit()
-        logger.info(f"[WEBHOOK STORED] {event['type']} - {event['id']}")
-        return webhook_event
+        .on_conflict_do_nothing(index_elements=[WebhookEvent.stripe_event_id])
+        .returning(WebhookEvent.id)
+    )
+    webhook_event_id = result.scalar_one_or_none()
 
-    except Exception as error:
-        logger.exception(f"Error storing webhook event: {error}")
+    if webhook_event_id is None:
+        logger.info(f"Duplicate webhook event ignored: {event['id']}")
         return None
 
+    if notify:
+        await db.execute(select(func.pg_notify(WEBHOOK_QUEUE_CHANNEL, "")))
+    await db.commit()
+    logger.info(f"[WEBHOOK STORED] {event['type']} - {event['id']}")
+    return webhook_event_id
 
-async def route_event(
+
+async def dispatch_event(
     event: dict,
     stripe_service: StripeService,
     db: AsyncSession,
-) -> bool:
-    """Route webhook event to appropriate handler."""
+) -> None:
+    """Run the handler for an event; errors propagate (the queue worker retries)."""
     event_type = event["type"]
     event_data = event["data"]["object"]
 
-    try:
-        # Payment Intent events
-        if event_type == "payment_intent.succeeded":
-            await handle_payment_intent_succeeded(event_data, stripe_service, db)
-        elif event_type == "payment_intent.payment_failed":
-            await handle_payment_intent_failed(event_data, stripe_service, db)
-        elif event_type == "payment_intent.canceled":
-            await handle_payment_intent_canceled(event_data, stripe_service, db)
-        elif event_type == "payment_intent.processing":
-            await handle_payment_intent_processing(event_data, stripe_service, db)
-
-        # Customer events
-        elif event_type == "customer.created":
-            await handle_customer_created(event_data, stripe_service, db)
-        elif event_type == "customer.updated":
-            await handle_customer_updated(event_data, stripe_service, db)
-
-        # Invoice events
-        elif event_type == "invoice.created":
-            await handle_invoice_created(event_data, stripe_service, db)
-        elif event_type == "invoice.payment_succeeded":
-            await handle_invoice_payment_succeeded(event_data, stripe_service, db)
-        elif event_type == "invoice.payment_failed":
-            await handle_invoice_payment_failed(event_data, stripe_service, db)
-
-        # Checkout events
-        elif event_type == "checkout.session.completed":
-            await handle_checkout_session_completed(event_data, stripe_service, db)
-
-        # Refund and dispute events
-        elif event_type == "charge.refunded":
-            await handle_charge_refunded(event_data, stripe_service, db)
-        elif event_type == "charge.dispute.created":
-            await handle_dispute_created(event_data, stripe_service, db)
-
-        # Subscription events
-        elif event_type in [
-            "customer.subscription.created",
-            "customer.subscription.updated",
-            "customer.subscription.deleted",
-        ]:
-            await handle_subscription_event(event_data, event_type, stripe_service, db)
-
-        # Quote events
-        elif event_type == "quote.accepted":
-            await handle_quote_accepted(event_data, stripe_service, db)
-
-        else:
-            logger.info(f"Unhandled event type: {event_type}")
-
-        return True
-
-    except Exception as e:
-        logger.exception(f"Error handling {event_type}: {e}")
-        return False
+    # Payment Intent events
+    if event_type == "payment_intent.succeeded":
+        await handle_payment_intent_succeeded(event_data, stripe_service, db)
+    elif event_type == "payment_intent.payment_failed":
+        await handle_payment_intent_failed(event_data, stripe_service, db)
+    elif event_type == "payment_intent.canceled":
+        await handle_payment_intent_canceled(event_data, stripe_service, db)
+    elif event_type == "payment_intent.processing":
+        await handle_payment_intent_processing(event_data, stripe_service, db)
+
+    # Customer events
+    elif event_type == "customer.created":
+        await handle_customer_created(event_data, stripe_service, db)
+    elif event_type == "customer.updated":
+        await handle_customer_updated(event_data, stripe_service, db)
+
+    # Invoice events
+    elif event_type == "invoice.created":
+        await handle_invoice_created(event_data, stripe_service, db)
+    elif event_type == "invoice.payment_succeeded":
+        await handle_invoice_payment_succeeded(event_data, stripe_service, db)
+    elif event_type == "invoice.payment_failed":
+        await handle_invoice_payment_failed(event_data, stripe_service, db)
+
+    # Checkout events
+    elif event_type == "checkout.session.completed":
+        await handle_checkout_session_completed(event_data, stripe_service, db)
+
+    # Refund and dispute events
+    elif event_type == "charge.refunded":
+        await handle_charge_refunded(event_data, stripe_service, db)
+    elif event_type == "charge.dispute.created":
+        await handle_dispute_created(event_data, stripe_service, db)
+
+    # Subscription events
+    elif event_type in [
+        "customer.subscription.created",
+        "customer.subscription.updated",
+        "customer.subscription.deleted",
+    ]:
+        await handle_subscription_event(event_data, event_type, stripe_service, db)
+
+    # Quote events
+    elif event_type == "quote.accepted":
+        await handle_quote_accepted(event_data, stripe_service, db)
+
+    else:
+        logger.info(f"Unhandled event type: {event_type}")
 
 
 # ============================================================================
@@ -285,6 +285,45 @@ class ChefAssignmentResponse(BaseModel):
     all_scores: list[ChefScoreResponse] = []
 
 
+class DayAssignmentRequest(BaseModel):
+    """Request to plan (and optionally apply) chef assignments for a day."""
+
+    station_id: UUID
+    event_date: date
+    time_budget_seconds: float = Field(default=3.0, gt=0.0, le=30.0)
+    apply: bool = Field(
+        default=False, description="Write the plan to bookings (otherwise preview only)"
+    )
+
+
+class PlannedAssignmentResponse(BaseModel):
+    """One booking in the day plan."""
+
+    booking_id: UUID
+    event_time: time
+    guest_count: int
+    chef_id: Optional[UUID] = None
+    chef_name: Optional[str] = None
+    score: float = 0.0
+    travel_time_minutes: Optional[int] = None
+    reason: str = ""
+
+
+class DayAssignmentResponse(BaseModel):
+    """Jointly optimized chef plan for a station's service day."""
+
+    station_id: UUID
+    event_date: date
+    assigned_count: int
+    unassigned_count: int
+    total_score: float
+    converged: bool
+    elapsed_ms: float
+    applied: bool = False
+    applied_count: int = 0
+    assignments: list[PlannedAssignmentResponse] = []
+
+
 # ============================================================================
 # Negotiation Schemas
 # ============================================================================
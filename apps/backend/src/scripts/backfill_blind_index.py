@@ -0,0 +1,217 @@
+"""
+Blind Index Backfill Script - Index Existing Encrypted Contacts
+
+Populates the phone/email blind-index columns (core/blind_index.py) of rows
+written before they existed, or after FIELD_BLIND_INDEX_KEY was rotated.
+New and updated rows are indexed by the model setters.
+
+Also fills lead_contacts.handle_e164 (E.164 phone handles, migration
+add_lead_contact_handle_e164), which is computed from the same columns.
+
+Features:
+- Keyset-paginated over primary keys, one committed transaction per batch
+- Decrypts both ciphertext formats in use (core.encryption Fernet tokens and
+  services.encryption_service "v1:" values); undecryptable rows are skipped
+- Idempotent: only rows with a missing index are visited unless --reindex
+
+Usage:
+    # Index every table
+    python -m scripts.backfill_blind_index --all
+
+    # One table, larger batches
+    python -m scripts.backfill_blind_index customers --batch-size 2000
+
+    # After rotating FIELD_BLIND_INDEX_KEY: recompute every row
+    python -m scripts.backfill_blind_index --all --reindex
+
+Requirements:
+- Database migrations add_contact_blind_indexes and add_lead_contact_handle_e164
+  must be applied
+- The same encryption keys as the API (FIELD_ENCRYPTION_KEY, ENCRYPTION_KEY)
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+import sys
+from typing import Any, Callable, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import or_, select, update
+
+from core.blind_index import (
+    contact_blind_index,
+    contact_e164,
+    email_blind_index,
+    phone_blind_index,
+)
+from db.models.core import Customer
+from db.models.lead import LeadContact
+from db.models.newsletter import Subscriber
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def decrypt_contact(value: Any) -> Optional[str]:
+    """Plaintext of an encrypted contact column in either format, None if undecryptable."""
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode()
+    if not value:
+        return None
+
+    from services.encryption_service import SecureDataHandler
+
+    if value.startswith(SecureDataHandler.UNENCRYPTED_PREFIX):
+        return value[len(SecureDataHandler.UNENCRYPTED_PREFIX) :]
+    if value.startswith(SecureDataHandler.ENCRYPTED_VERSION):
+        from services.encryption_service import decrypt_email
+
+        # Same Fernet scheme for phones; failures come back unchanged
+        plain = decrypt_email(value)
+        return None if plain == value else plain
+
+    from core.encryption import EncryptionError, decrypt_field
+
+    try:
+        return decrypt_field(value)
+    except EncryptionError:
+        return None
+
+
+@dataclass(frozen=True)
+class BlindIndexTarget:
+    """Table whose bidx columns are computed from (decrypted) source columns"""
+
+    model: Any
+    # bidx column -> function of the selected row
+    indexes: dict[str, Callable[[Any], Optional[str]]]
+    sources: tuple[str, ...]
+
+
+TARGETS: dict[str, BlindIndexTarget] = {
+    "subscribers": BlindIndexTarget(
+        Subscriber,
+        {
+            "email_bidx": lambda row: email_blind_index(decrypt_contact(row.email_enc)),
+            "phone_bidx": lambda row: phone_blind_index(decrypt_contact(row.phone_enc)),
+        },
+        ("email_enc", "phone_enc"),
+    ),
+    "customers": BlindIndexTarget(
+        Customer,
+        {
+            "email_bidx": lambda row: email_blind_index(decrypt_contact(row.email_encrypted)),
+            "phone_bidx": lambda row: phone_blind_index(decrypt_contact(row.phone_encrypted)),
+        },
+        ("email_encrypted", "phone_encrypted"),
+    ),
+    "lead_contacts": BlindIndexTarget(
+        LeadContact,
+        {
+            "contact_bidx": lambda row: contact_blind_index(row.channel, row.handle_or_address),
+            "handle_e164": lambda row: contact_e164(row.channel, row.handle_or_address),
+        },
+        ("channel", "handle_or_address"),
+    ),
+}
+
+
+def compute_updates(target: BlindIndexTarget, rows) -> list[dict[str, Any]]:
+    """Bulk-UPDATE parameter sets (by primary key) for rows with any computable index."""
+    updates = []
+    for row in rows:
+        values = {column: index(row) for column, index in target.indexes.items()}
+        values = {column: digest for column, digest in values.items() if digest}
+        if values:
+            updates.append({"id": row.id, **values})
+    return updates
+
+
+async def backfill(
+    name: str, batch_size: int = DEFAULT_BATCH_SIZE, reindex: bool = False, session_factory=None
+) -> dict[str, int]:
+    """Index one table; returns rows scanned and rows updated."""
+    if session_factory is None:
+        from core.database import AsyncSessionLocal
+
+        session_factory = AsyncSessionLocal
+
+    target = TARGETS[name]
+    model = target.model
+    columns = [getattr(model, column) for column in target.sources]
+    missing = or_(*(getattr(model, column).is_(None) for column in target.indexes))
+
+    stats = {"scanned": 0, "updated": 0}
+    last_id = None
+    while True:
+        query = select(model.id, *columns).order_by(model.id).limit(batch_size)
+        if not reindex:
+            query = query.where(missing)
+        if last_id is not None:
+            query = query.where(model.id > last_id)
+
+        async with session_factory() as db:
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+
+            updates = compute_updates(target, rows)
+            if updates:
+                await db.execute(update(model), updates)
+            await db.commit()
+
+        last_id = rows[-1].id
+        stats["scanned"] += len(rows)
+        stats["updated"] += len(updates)
+        logger.info(f"   {name}: {stats['scanned']} scanned, {stats['updated']} indexed")
+
+    return stats
+
+
+async def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Backfill encrypted-contact blind indexes")
+    parser.add_argument("table", nargs="?", choices=sorted(TARGETS), help="Table to index")
+    parser.add_argument("--all", action="store_true", help="Index every table")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per committed batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--reindex", action="store_true", help="Recompute rows that already have an index"
+    )
+
+    args = parser.parse_args()
+    if not args.all and not args.table:
+        parser.error("give a table name or --all")
+
+    names = sorted(TARGETS) if args.all else [args.table]
+
+    from core.database import engine
+
+    try:
+        for name in names:
+            stats = await backfill(name, batch_size=args.batch_size, reindex=args.reindex)
+            logger.info(f"✅ {name}: {stats['updated']}/{stats['scanned']} rows indexed")
+    except Exception as e:
+        logger.exception(f"❌ Backfill failed: {e}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
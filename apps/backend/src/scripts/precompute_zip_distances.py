@@ -0,0 +1,124 @@
+"""
+ZIP Distance Precompute Script - Station -> ZIP Centroid Driving Distances
+
+Fills the ZIP centroid table used for instant travel-fee estimates: the
+driving distance from the station to each ZIP code of the service area,
+stored in public.travel_cache as source="zip_centroid" rows under the same
+route keys as live lookups (services/scheduling/distance_service.py).
+ZIP-only quotes are then answered without a Distance Matrix call.
+
+Features:
+- Google resolves a bare ZIP to its centroid, so no coordinate data set is
+  needed
+- 25 destinations per Distance Matrix request, one upsert per request
+- Idempotent: re-running refreshes distances and extends the expiry
+
+Usage:
+    # ZIPs as arguments
+    python -m scripts.precompute_zip_distances --origin "47481 Towhee St, Fremont, CA 94539" \\
+        94509 95476 95814
+
+    # One ZIP per line (first column of a CSV works too)
+    python -m scripts.precompute_zip_distances --origin "Fremont, CA, 94539" --file zips.csv
+
+Requirements:
+- Database migration add_travel_cache_route_key must be applied
+- GOOGLE_MAPS_API_KEY
+- --origin must be the station address PricingService uses (the stored
+  stations row, or BUSINESS_ADDRESS/BUSINESS_CITY/BUSINESS_STATE/BUSINESS_ZIP);
+  keys are normalized, so punctuation and case may differ
+"""
+
+import argparse
+import asyncio
+from dataclasses import replace
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.scheduling.distance_service import (
+    MAX_DESTINATIONS_PER_REQUEST,
+    ZIP_TABLE_TTL_DAYS,
+    DistanceService,
+    extract_zip,
+    route_key,
+    store_routes,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def read_zips(values: list[str], path: str | None = None) -> list[str]:
+    """Distinct 5-digit ZIPs from arguments and/or a file, in input order."""
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            values = values + [line.split(",")[0] for line in handle]
+    zips = (extract_zip(value.strip()) for value in values)
+    return list(dict.fromkeys(zip_code for zip_code in zips if zip_code))
+
+
+async def precompute(
+    origin: str,
+    zip_codes: list[str],
+    service: DistanceService | None = None,
+    ttl_days: int = ZIP_TABLE_TTL_DAYS,
+) -> dict[str, int]:
+    """Store station -> ZIP distances; returns ZIPs stored and skipped."""
+    service = service or DistanceService()
+    stats = {"stored": 0, "skipped": 0}
+
+    try:
+        for start in range(0, len(zip_codes), MAX_DESTINATIONS_PER_REQUEST):
+            chunk = zip_codes[start : start + MAX_DESTINATIONS_PER_REQUEST]
+            results = await service.fetch_matrix(origin, chunk)
+
+            routes = {}
+            for zip_code, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"   {zip_code}: no route ({result.status})")
+                    stats["skipped"] += 1
+                    continue
+                routes[route_key(origin, zip_code)] = replace(result, source="zip_centroid")
+
+            async with service.session_factory() as db:
+                await store_routes(db, routes, ttl_days)
+
+            stats["stored"] += len(routes)
+            logger.info(f"   {stats['stored']} stored, {stats['skipped']} skipped")
+    finally:
+        await service.close()
+
+    return stats
+
+
+async def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Precompute station -> ZIP driving distances")
+    parser.add_argument("zips", nargs="*", help="ZIP codes")
+    parser.add_argument("--origin", required=True, help="Station address")
+    parser.add_argument("--file", help="File with one ZIP per line (or CSV, first column)")
+    parser.add_argument(
+        "--ttl-days",
+        type=int,
+        default=ZIP_TABLE_TTL_DAYS,
+        help=f"Days until the rows expire (default: {ZIP_TABLE_TTL_DAYS})",
+    )
+
+    args = parser.parse_args()
+    zip_codes = read_zips(args.zips, args.file)
+    if not zip_codes:
+        parser.error("give ZIP codes or --file")
+
+    logger.info(f"📍 Precomputing {len(zip_codes)} ZIP distances from {args.origin}")
+    stats = await precompute(args.origin, zip_codes, ttl_days=args.ttl_days)
+    logger.info(f"✅ Done: {stats['stored']} stored, {stats['skipped']} skipped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
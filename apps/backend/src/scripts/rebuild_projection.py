@@ -0,0 +1,94 @@
+"""
+Projection Rebuild Script - Blue/Green Read-Model Rebuild
+
+Replays DomainEvent history into the inactive color of a projection's read
+table across a process pool, then swaps the read view to it. Live reads keep
+using the active color until the swap commits.
+
+Usage:
+    # Rebuild the booking ledger with 8 partitions
+    python -m scripts.rebuild_projection booking_ledger
+
+    # More partitions / explicit pool size
+    python -m scripts.rebuild_projection booking_ledger --partitions 16 --workers 8
+
+    # Discard the progress of an interrupted rebuild and start over
+    python -m scripts.rebuild_projection booking_ledger --restart
+
+    # Rebuild every registered projection
+    python -m scripts.rebuild_projection --all
+
+Requirements:
+- Database migration add_projection_checkpoints must be applied
+- Run from a shell, not a Celery worker (daemon processes cannot fork a pool)
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cqrs.base import REPLAY_BATCH_SIZE
+from cqrs.projections import DEFAULT_PARTITIONS, PROJECTIONS, ProjectionRunner, get_projection
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Rebuild event-sourced read models")
+    parser.add_argument("projection", nargs="?", choices=sorted(PROJECTIONS), help="Projection name")
+    parser.add_argument("--all", action="store_true", help="Rebuild every registered projection")
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=DEFAULT_PARTITIONS,
+        help=f"Aggregate partitions replayed in parallel (default: {DEFAULT_PARTITIONS})",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Process pool size (default: CPU count)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=REPLAY_BATCH_SIZE,
+        help=f"Events per committed batch (default: {REPLAY_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore checkpoints of an interrupted rebuild"
+    )
+
+    args = parser.parse_args()
+    if not args.all and not args.projection:
+        parser.error("give a projection name or --all")
+
+    names = sorted(PROJECTIONS) if args.all else [args.projection]
+
+    from core.database import engine
+
+    try:
+        for name in names:
+            runner = ProjectionRunner(get_projection(name), batch_size=args.batch_size)
+            summary = await runner.rebuild(
+                partitions=args.partitions, workers=args.workers, resume=not args.restart
+            )
+            logger.info(
+                f"✅ {name}: {summary['events_applied']} events → {summary['color']} "
+                f"in {summary['seconds']}s"
+            )
+    except Exception as e:
+        logger.exception(f"❌ Rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
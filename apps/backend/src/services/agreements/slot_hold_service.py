@@ -50,6 +50,8 @@ from uuid import UUID
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from services.scheduling.availability_cache import get_availability_cache
+
 logger = logging.getLogger(__name__)
 
 # Default hold duration
@@ -137,6 +139,7 @@ class SlotHoldService:
 
         row = result.fetchone()
         await self.db.commit()
+        await get_availability_cache().invalidate(event_date, station_id=station_id)
 
         logger.info(
             f"Created slot hold: station={station_id}, "
@@ -319,7 +322,7 @@ class SlotHoldService:
                 WHERE id = :hold_id
                 AND status IN ('pending', 'signed')
                 AND expires_at > NOW()
-                RETURNING id
+                RETURNING id, station_id, event_date
             """
             ),
             {"hold_id": str(hold_id), "booking_id": str(booking_id)},
@@ -329,6 +332,9 @@ class SlotHoldService:
         await self.db.commit()
 
         if row:
+            await get_availability_cache().invalidate(
+                row.event_date, station_id=row.station_id
+            )
             logger.info(f"Converted slot hold {hold_id} to booking {booking_id}")
             return True
 
@@ -353,7 +359,7 @@ class SlotHoldService:
                 SET status = :reason
                 WHERE id = :hold_id
                 AND status = 'pending'
-                RETURNING id
+                RETURNING id, station_id, event_date
             """
             ),
             {"hold_id": str(hold_id), "reason": reason},
@@ -363,6 +369,9 @@ class SlotHoldService:
         await self.db.commit()
 
         if row:
+            await get_availability_cache().invalidate(
+                row.event_date, station_id=row.station_id
+            )
             logger.info(f"Released slot hold {hold_id}: {reason}")
             return True
 
@@ -384,7 +393,7 @@ class SlotHoldService:
                 SET status = 'expired'
                 WHERE status = 'pending'
                 AND expires_at <= NOW()
-                RETURNING id
+                RETURNING id, station_id, event_date
             """
             )
         )
@@ -392,6 +401,10 @@ class SlotHoldService:
         rows = result.fetchall()
         await self.db.commit()
 
+        cache = get_availability_cache()
+        for row in rows:
+            await cache.invalidate(row.event_date, station_id=row.station_id)
+
         count = len(rows)
         if count > 0:
             logger.info(f"Cleaned up {count} expired slot holds")
@@ -0,0 +1,270 @@
+"""
+Analytics Rollup Service
+Keeps the admin dashboard's pre-aggregated booking tables current.
+
+Refresh strategy (incremental, idempotent):
+1. Lock the job's row in core.analytics_rollup_state (one refresher at a time)
+2. Find bookings with updated_at > watermark (index ix_core_bookings_updated_at)
+   and collect the days and customers they touch
+3. Recompute exactly those daily rows, their months and those customers'
+   rows from core.bookings (DELETE + INSERT ... SELECT, server-side)
+4. Advance the watermark to (refresh start - WATERMARK_LAG); the lag
+   re-scans a short overlap so rows committed by slower transactions with
+   earlier timestamps are never missed. Recomputing is idempotent.
+
+A nightly full rebuild repairs anything the watermark cannot see (e.g. a
+booking moved to another customer). The first refresh is always full.
+
+Usage:
+    async with AsyncSessionLocal() as db:
+        result = await AnalyticsRollupService(db).refresh()
+"""
+
+from datetime import date, datetime, timedelta, timezone
+import logging
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import cast, delete, extract, func, select, SmallInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.analytics import (
+    AnalyticsRollupState,
+    BookingDailyRollup,
+    BookingMonthlyRollup,
+    CustomerValueRollup,
+    StationCustomerRollup,
+)
+from db.models.core import Booking, BookingStatus
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "booking_rollups"
+WATERMARK_LAG = timedelta(minutes=2)
+CUSTOMER_CHUNK = 1000
+
+
+def _counted_bookings():
+    """Bookings that count toward analytics (matches the dashboard's old filter)"""
+    return Booking.status != BookingStatus.CANCELLED
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class AnalyticsRollupService:
+    """Incremental + full refresh of the booking analytics rollups"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ========================================================================
+    # PUBLIC API
+    # ========================================================================
+
+    async def refresh(self, full: bool = False) -> dict[str, Any]:
+        """
+        Fold booking changes since the last run into the rollups and commit.
+
+        Args:
+            full: Rebuild every rollup from scratch
+
+        Returns:
+            Summary of what was recomputed
+        """
+        started = await self.db.scalar(select(func.now()))
+        state = await self._lock_state()
+
+        if full or state.watermark is None:
+            await self._rebuild_all()
+            state.last_full_rebuild_at = started
+            summary: dict[str, Any] = {"mode": "full"}
+        else:
+            days, customers = await self._changed_since(state.watermark)
+            await self._refresh_days(days)
+            await self._refresh_months({day.replace(day=1) for day in days})
+            await self._refresh_customers(customers)
+            summary = {"mode": "incremental", "days": len(days), "customers": len(customers)}
+
+        state.watermark = started - WATERMARK_LAG
+        await self.db.commit()
+
+        logger.info(f"📊 Analytics rollups refreshed: {summary}")
+        return summary
+
+    async def get_state(self) -> Optional[AnalyticsRollupState]:
+        return await self.db.get(AnalyticsRollupState, JOB_NAME)
+
+    # ========================================================================
+    # CHANGE DETECTION
+    # ========================================================================
+
+    async def _lock_state(self) -> AnalyticsRollupState:
+        await self.db.execute(
+            pg_insert(AnalyticsRollupState)
+            .values(name=JOB_NAME)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        return (
+            await self.db.execute(
+                select(AnalyticsRollupState)
+                .where(AnalyticsRollupState.name == JOB_NAME)
+                .with_for_update()
+            )
+        ).scalar_one()
+
+    async def _changed_since(self, watermark: datetime) -> tuple[set[date], set[UUID]]:
+        rows = (
+            await self.db.execute(
+                select(func.date(Booking.created_at), Booking.customer_id)
+                .where(Booking.updated_at > watermark)
+                .distinct()
+            )
+        ).all()
+        return {day for day, _ in rows}, {customer_id for _, customer_id in rows}
+
+    # ========================================================================
+    # RECOMPUTE
+    # ========================================================================
+
+    def _daily_select(self, days: Optional[set[date]] = None):
+        day = func.date(Booking.created_at)
+        query = select(
+            day.label("day"),
+            Booking.station_id,
+            cast(extract("dow", Booking.date), SmallInteger).label("event_dow"),
+            func.count(Booking.id),
+            func.coalesce(func.sum(Booking.total_due_cents), 0),
+            func.coalesce(func.sum(Booking.party_adults + Booking.party_kids), 0),
+        ).where(_counted_bookings())
+        if days:
+            # Range first so an index on created_at narrows the scan; padded a
+            # day each side since date() uses the session time zone
+            start = datetime.combine(min(days) - timedelta(days=1), datetime.min.time(), timezone.utc)
+            end = datetime.combine(max(days) + timedelta(days=2), datetime.min.time(), timezone.utc)
+            query = query.where(
+                Booking.created_at >= start,
+                Booking.created_at < end,
+                day.in_(days),
+            )
+        return query.group_by(day, Booking.station_id, "event_dow")
+
+    def _monthly_select(self, months: Optional[set[date]] = None):
+        month = cast(func.date_trunc("month", BookingDailyRollup.day), BookingMonthlyRollup.month.type)
+        query = select(
+            month.label("month"),
+            BookingDailyRollup.station_id,
+            func.sum(BookingDailyRollup.booking_count),
+            func.sum(BookingDailyRollup.revenue_cents),
+            func.sum(BookingDailyRollup.guest_count),
+        )
+        if months:
+            end = max(months)
+            end = date(end.year + end.month // 12, end.month % 12 + 1, 1)
+            query = query.where(
+                BookingDailyRollup.day >= min(months),
+                BookingDailyRollup.day < end,
+                month.in_(months),
+            )
+        return query.group_by(month, BookingDailyRollup.station_id)
+
+    def _customer_select(self, customers: Optional[list[UUID]] = None):
+        query = select(
+            Booking.customer_id,
+            func.count(Booking.id),
+            func.sum(Booking.total_due_cents),
+            func.min(Booking.created_at),
+            func.max(Booking.created_at),
+        ).where(_counted_bookings())
+        if customers is not None:
+            query = query.where(Booking.customer_id.in_(customers))
+        return query.group_by(Booking.customer_id)
+
+    def _station_customer_select(self, customers: Optional[list[UUID]] = None):
+        query = select(
+            Booking.station_id,
+            Booking.customer_id,
+            func.count(Booking.id),
+            func.sum(Booking.total_due_cents),
+        ).where(_counted_bookings())
+        if customers is not None:
+            query = query.where(Booking.customer_id.in_(customers))
+        return query.group_by(Booking.station_id, Booking.customer_id)
+
+    async def _replace(self, model, where, columns: list[str], query) -> None:
+        table = model.__table__
+        await self.db.execute(delete(table).where(where) if where is not None else delete(table))
+        await self.db.execute(table.insert().from_select(columns, query))
+
+    async def _refresh_days(self, days: set[date]) -> None:
+        if not days:
+            return
+        await self._replace(
+            BookingDailyRollup,
+            BookingDailyRollup.day.in_(days),
+            ["day", "station_id", "event_dow", "booking_count", "revenue_cents", "guest_count"],
+            self._daily_select(days),
+        )
+
+    async def _refresh_months(self, months: set[date]) -> None:
+        if not months:
+            return
+        await self._replace(
+            BookingMonthlyRollup,
+            BookingMonthlyRollup.month.in_(months),
+            ["month", "station_id", "booking_count", "revenue_cents", "guest_count"],
+            self._monthly_select(months),
+        )
+
+    async def _refresh_customers(self, customers: set[UUID]) -> None:
+        for chunk in _chunks(sorted(customers), CUSTOMER_CHUNK):
+            await self._replace(
+                CustomerValueRollup,
+                CustomerValueRollup.customer_id.in_(chunk),
+                ["customer_id", "booking_count", "total_spent_cents", "first_booking_at", "last_booking_at"],
+                self._customer_select(chunk),
+            )
+            await self._replace(
+                StationCustomerRollup,
+                StationCustomerRollup.customer_id.in_(chunk),
+                ["station_id", "customer_id", "booking_count", "revenue_cents"],
+                self._station_customer_select(chunk),
+            )
+
+    async def _rebuild_all(self) -> None:
+        await self._replace(
+            BookingDailyRollup,
+            None,
+            ["day", "station_id", "event_dow", "booking_count", "revenue_cents", "guest_count"],
+            self._daily_select(),
+        )
+        # Monthly is rolled up from the freshly rebuilt daily rows
+        await self._replace(
+            BookingMonthlyRollup,
+            None,
+            ["month", "station_id", "booking_count", "revenue_cents", "guest_count"],
+            self._monthly_select(),
+        )
+        await self._replace(
+            CustomerValueRollup,
+            None,
+            ["customer_id", "booking_count", "total_spent_cents", "first_booking_at", "last_booking_at"],
+            self._customer_select(),
+        )
+        await self._replace(
+            StationCustomerRollup,
+            None,
+            ["station_id", "customer_id", "booking_count", "revenue_cents"],
+            self._station_customer_select(),
+        )
+
+
+async def refresh_booking_rollups(full: bool = False) -> dict[str, Any]:
+    """Run one refresh in its own session (for workers / startup)"""
+    from core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return await AnalyticsRollupService(db).refresh(full=full)
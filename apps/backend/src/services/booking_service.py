@@ -23,6 +23,7 @@ from repositories.booking_repository import BookingRepository
 from schemas.booking import BookingCreate
 from services.audit_service import AuditService
 from services.business_config_service import get_business_config_sync
+from services.scheduling.availability_cache import get_availability_cache
 from services.terms_acknowledgment_service import send_terms_for_phone_booking
 from sqlalchemy.exc import IntegrityError
 
@@ -381,6 +382,10 @@ class BookingService:
                 conflicting_resource="time_slot",
             ) from e
 
+        await get_availability_cache().invalidate(
+            booking_data.event_date, station_id=getattr(booking, "station_id", None)
+        )
+
         # Audit log: Track booking creation
         if self.audit_service:
             try:
@@ -561,6 +566,10 @@ class BookingService:
 
         updated_booking = self.repository.update(booking)
 
+        await get_availability_cache().invalidate(
+            booking.date, station_id=getattr(booking, "station_id", None)
+        )
+
         # Audit log: Track booking cancellation
         if self.audit_service:
             try:
@@ -0,0 +1,349 @@
+"""
+Bulk PII Decryption Service
+
+Decrypts a whole column of ciphertexts at once instead of one row at a time
+on the event loop. Used by campaign sends, calendar exports, the CQRS query
+handlers and the review worker.
+
+Per batch:
+1. Empty values are skipped and duplicates decrypted once
+2. Hot values come from an optional short-TTL, size-bounded plaintext cache
+3. The misses are split into chunks and decrypted on a shared thread pool
+   (``run_in_executor``), so the loop keeps serving requests meanwhile
+4. Failures are collected and logged once per batch - no per-value
+   try/except logging as in SecureDataHandler
+
+One decryptor per ciphertext scheme in use:
+- ``get_secure_data_decryptor()``: services.encryption_service ("v1:" /
+  "UNENCRYPTED:" values - subscribers, customers via SecureDataHandler)
+- ``get_customer_decryptor()``: core.encryption field tokens (Customer
+  email/phone, passthrough values returned as-is)
+- ``get_field_decryptor()``: utils.encryption.FieldEncryption envelopes
+
+Environment Variables:
+- PII_DECRYPT_CACHE_TTL: Seconds to keep plaintexts (default: 0 = cache off)
+- PII_DECRYPT_CACHE_SIZE: Max cached plaintexts per scheme (default: 10000)
+- PII_DECRYPT_WORKERS: Decryption threads shared by all schemes (default: 4)
+- PII_DECRYPT_CHUNK: Values per thread-pool task (default: 256)
+
+Usage:
+```python
+from services.bulk_decryption import get_secure_data_decryptor
+
+phones = await get_secure_data_decryptor().decrypt_many(row.phone_enc for row in rows)
+```
+"""
+
+import asyncio
+import base64
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_WORKERS = 4
+
+# Batches with at most this many misses are decrypted inline - a thread-pool
+# hop costs more than a handful of Fernet decrypts
+INLINE_THRESHOLD = 8
+
+_MISSING = object()
+
+
+# ============================================================================
+# PLAINTEXT CACHE
+# ============================================================================
+
+
+class PlaintextCache:
+    """
+    TTL + LRU cache of ciphertext -> plaintext.
+
+    Keyed by the ciphertext itself, so an entry can never be served for a
+    different record. Bounded by ``max_entries`` and ``ttl_seconds`` to
+    limit how much decrypted PII lives in process memory.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Cached plaintext, or ``_MISSING``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, plaintext = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return plaintext
+
+    def put(self, key: str, plaintext: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, plaintext)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ============================================================================
+# BULK DECRYPTOR
+# ============================================================================
+
+
+class BulkDecryptor:
+    """
+    Batch decryption for one ciphertext scheme.
+
+    ``decrypt_fn`` decrypts a single (non-empty, str) ciphertext and raises
+    on failure. Results come back in input order; empty inputs and failed
+    values are None (or, with ``strict=True``, the first failure is raised).
+    """
+
+    def __init__(
+        self,
+        decrypt_fn: Callable[[str], str],
+        name: str = "pii",
+        chunk_size: Optional[int] = None,
+        cache: Optional[PlaintextCache] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.decrypt_fn = decrypt_fn
+        self.name = name
+        self.chunk_size = chunk_size or int(os.getenv("PII_DECRYPT_CHUNK", DEFAULT_CHUNK_SIZE))
+        self.cache = cache
+        self._executor = executor
+        self._stats = {"values": 0, "decrypted": 0, "cache_hits": 0, "failures": 0}
+
+    async def decrypt_many(
+        self, values: Iterable[Any], strict: bool = False
+    ) -> list[Optional[str]]:
+        """Decrypt a column of ciphertexts off the event loop."""
+        keys, pending = self._lookup(values)
+        misses = _misses(pending)
+
+        if len(misses) <= INLINE_THRESHOLD:
+            outcome = self._decrypt_chunk(misses, strict)
+        else:
+            loop = asyncio.get_running_loop()
+            executor = self._executor or _get_executor()
+            chunks = [
+                misses[i : i + self.chunk_size] for i in range(0, len(misses), self.chunk_size)
+            ]
+            outcome = {}
+            for part in await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, self._decrypt_chunk, chunk, strict)
+                    for chunk in chunks
+                )
+            ):
+                outcome.update(part)
+
+        return self._finish(keys, pending, outcome)
+
+    def decrypt_many_sync(self, values: Iterable[Any], strict: bool = False) -> list[Optional[str]]:
+        """Same as decrypt_many() for synchronous callers (scripts, Celery)."""
+        keys, pending = self._lookup(values)
+        return self._finish(keys, pending, self._decrypt_chunk(_misses(pending), strict))
+
+    async def decrypt_records(
+        self,
+        records: list[dict[str, Any]],
+        fields: dict[str, str],
+        drop_source: bool = False,
+        strict: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Decrypt ``fields`` (source key -> plaintext key) of every record in
+        one batch, writing the plaintexts back into the dicts in place.
+        """
+        pairs = [(record, src, dest) for record in records for src, dest in fields.items()]
+        plaintexts = await self.decrypt_many(
+            (record.get(src) for record, src, _ in pairs), strict=strict
+        )
+        for (record, src, dest), plaintext in zip(pairs, plaintexts):
+            if src not in record:
+                continue
+            if drop_source:
+                record.pop(src)
+            record[dest] = plaintext
+        return records
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self._stats, "cached": len(self.cache) if self.cache is not None else 0}
+
+    # ------------------------------------------------------------------
+
+    def _lookup(self, values: Iterable[Any]) -> tuple[list[Optional[str]], dict[str, Any]]:
+        """Normalized ciphertext per input, and each distinct one's cached plaintext."""
+        keys = [_as_text(value) for value in values]
+        pending: dict[str, Any] = {}
+        for key in keys:
+            if key is None or key in pending:
+                continue
+            cached = self.cache.get(key) if self.cache is not None else _MISSING
+            pending[key] = cached
+        hits = sum(1 for value in pending.values() if value is not _MISSING)
+        self._stats["cache_hits"] += hits
+        self._stats["values"] += len(keys)
+        return keys, pending
+
+    def _decrypt_chunk(self, ciphertexts: list[str], strict: bool) -> dict[str, Any]:
+        """Runs in a worker thread: plaintext or the exception, per ciphertext."""
+        outcome: dict[str, Any] = {}
+        for ciphertext in ciphertexts:
+            try:
+                outcome[ciphertext] = self.decrypt_fn(ciphertext)
+            except Exception as e:
+                if strict:
+                    raise
+                outcome[ciphertext] = e
+        return outcome
+
+    def _finish(
+        self, keys: list[Optional[str]], pending: dict[str, Any], outcome: dict[str, Any]
+    ) -> list[Optional[str]]:
+        resolved: dict[str, Optional[str]] = {}
+        failures: list[Exception] = []
+        for key, cached in pending.items():
+            if cached is not _MISSING:
+                resolved[key] = cached
+                continue
+            plaintext = outcome.get(key)
+            if isinstance(plaintext, Exception):
+                failures.append(plaintext)
+                resolved[key] = None
+                continue
+            resolved[key] = plaintext
+            self._stats["decrypted"] += 1
+            if self.cache is not None and plaintext is not None:
+                self.cache.put(key, plaintext)
+
+        if failures:
+            self._stats["failures"] += len(failures)
+            logger.warning(
+                f"⚠️ {self.name}: {len(failures)} of {len(pending)} values failed to decrypt "
+                f"(first: {type(failures[0]).__name__}: {failures[0]})"
+            )
+
+        return [resolved.get(key) if key is not None else None for key in keys]
+
+
+def _misses(pending: dict[str, Any]) -> list[str]:
+    return [key for key, cached in pending.items() if cached is _MISSING]
+
+
+def _as_text(value: Any) -> Optional[str]:
+    """Ciphertext as str (columns may be LargeBinary), None if empty."""
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode()
+    if not value:
+        return None
+    return str(value).strip() or None
+
+
+# ============================================================================
+# SCHEMES
+# ============================================================================
+
+
+def decrypt_secure_data(ciphertext: str) -> str:
+    """
+    SecureDataHandler.decrypt_phone/decrypt_email without the per-call
+    logging; raises DecryptionError instead of returning the ciphertext.
+    """
+    from services.encryption_service import DecryptionError, SecureDataHandler, get_secure_handler
+
+    if ciphertext.startswith(SecureDataHandler.UNENCRYPTED_PREFIX):
+        return ciphertext[len(SecureDataHandler.UNENCRYPTED_PREFIX) :]
+    if ciphertext.startswith(SecureDataHandler.ENCRYPTED_VERSION):
+        ciphertext = ciphertext[len(SecureDataHandler.ENCRYPTED_VERSION) :]
+
+    try:
+        token = base64.urlsafe_b64decode(ciphertext.encode("utf-8"))
+        return get_secure_handler().cipher.decrypt(token).decode("utf-8")
+    except Exception as e:
+        raise DecryptionError(f"{type(e).__name__}: {e}") from e
+
+
+def _decrypt_customer_field(ciphertext: str) -> str:
+    from core.encryption import decrypt_field
+
+    return decrypt_field(ciphertext)
+
+
+def _decrypt_field(ciphertext: str) -> str:
+    from utils.encryption import get_field_encryption
+
+    return get_field_encryption().decrypt(ciphertext)
+
+
+# ============================================================================
+# SINGLETONS
+# ============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_decryptors: dict[str, BulkDecryptor] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every decryptor."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("PII_DECRYPT_WORKERS", DEFAULT_WORKERS)),
+                thread_name_prefix="pii-decrypt",
+            )
+        return _executor
+
+
+def _make_cache() -> Optional[PlaintextCache]:
+    ttl = float(os.getenv("PII_DECRYPT_CACHE_TTL", "0"))
+    if ttl <= 0:
+        return None
+    return PlaintextCache(ttl, int(os.getenv("PII_DECRYPT_CACHE_SIZE", DEFAULT_CACHE_SIZE)))
+
+
+def _get_decryptor(name: str, decrypt_fn: Callable[[str], str]) -> BulkDecryptor:
+    decryptor = _decryptors.get(name)
+    if decryptor is None:
+        decryptor = _decryptors[name] = BulkDecryptor(decrypt_fn, name=name, cache=_make_cache())
+    return decryptor
+
+
+def get_secure_data_decryptor() -> BulkDecryptor:
+    """Decryptor for services.encryption_service (SecureDataHandler) values"""
+    return _get_decryptor("secure_data", decrypt_secure_data)
+
+
+def get_customer_decryptor() -> BulkDecryptor:
+    """Decryptor for core.encryption values (Customer.email_encrypted/phone_encrypted)"""
+    return _get_decryptor("customer", _decrypt_customer_field)
+
+
+def get_field_decryptor() -> BulkDecryptor:
+    """Decryptor for utils.encryption.FieldEncryption envelopes"""
+    return _get_decryptor("field", _decrypt_field)
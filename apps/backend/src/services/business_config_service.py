@@ -508,8 +508,12 @@ async def invalidate_business_config_cache(cache: "CacheService") -> bool:
     Returns:
         True if invalidated, False on error
     """
+    from services.scheduling.availability_cache import get_availability_cache
+
     try:
         await cache.delete(BUSINESS_CONFIG_CACHE_KEY)
+        # Slot capacity rules live in the config
+        await get_availability_cache().invalidate_all()
         logger.info("🗑️ Business config cache invalidated")
         return True
     except Exception as e:
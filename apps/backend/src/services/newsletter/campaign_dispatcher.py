@@ -0,0 +1,327 @@
+"""
+Campaign Dispatcher
+Streams an SMS campaign to its audience in resumable, bounded pages.
+
+Replaces the load-everything loop that held every Subscriber in memory,
+sent one SMS at a time and wrote events/stats row by row in one long
+transaction. Per page of ``page_size`` subscribers:
+
+1. Keyset read: ``WHERE audience AND id > cursor ORDER BY id LIMIT n``
+   (short session, ids + encrypted phones only), then bulk phone decryption
+2. Claim: one multi-row INSERT of SENT events with ON CONFLICT DO NOTHING
+   on uq_newsletter_events_campaign_sent, committed BEFORE sending.
+   RETURNING gives the recipients this run owns; anyone claimed by an
+   earlier (crashed) run is skipped. Subscribers whose phone cannot be
+   decrypted are never claimed
+3. Send: NewsletterSMSService.send_campaign_batch with bounded concurrency,
+   paced by the shared RingCentral token bucket
+4. Record: bulk DELIVERED events, FAILED events for undecryptable phones,
+   two set-based subscriber stat UPDATEs and the campaign checkpoint
+   (send_cursor, totals) in one commit
+
+Delivery is at-most-once: a crash between claim and record can lose sends
+for that page, but can never text anyone twice. Restarting resumes after
+``campaigns.send_cursor``.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncContextManager, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models.newsletter import (
+    Campaign,
+    CampaignEvent,
+    CampaignEventType,
+    Subscriber,
+)
+from services.newsletter.sms_service import NewsletterSMSService
+from services.newsletter.token_bucket import AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+@dataclass
+class DispatchStats:
+    """Outcome of one dispatcher run"""
+
+    pages: int = 0
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0  # Already claimed by an earlier run
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "pages": self.pages,
+            "claimed": self.claimed,
+            "sent": self.sent,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+
+async def decode_subscriber_phones(phones_enc: list[Optional[bytes]]) -> list[Optional[str]]:
+    """
+    Decrypt a page of Subscriber.phone_enc values (LargeBinary holding the
+    encrypted string) in one batch, off the event loop. None for empty or
+    undecryptable values.
+    """
+    from services.bulk_decryption import get_secure_data_decryptor
+
+    return await get_secure_data_decryptor().decrypt_many(phones_enc)
+
+
+class CampaignDispatcher:
+    """
+    Keyset-paginated, checkpointed SMS campaign sender.
+
+    The audience is any SQLAlchemy predicate over Subscriber; the dispatcher
+    adds the keyset condition and owns claiming, stats and checkpoints.
+    """
+
+    def __init__(
+        self,
+        sms_service: NewsletterSMSService,
+        session_factory: Optional[SessionFactory] = None,
+        page_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            sms_service: Configured without a db session (stats are batched here)
+                and with the desired concurrency / rate limiter
+            session_factory: Async context manager yielding a session
+                (default: core.database.get_db_context)
+            page_size: Subscribers per page/checkpoint
+                (default: settings.NEWSLETTER_SEND_PAGE_SIZE)
+        """
+        if session_factory is None:
+            from core.database import get_db_context
+
+            session_factory = get_db_context
+        self.sms_service = sms_service
+        self.session_factory = session_factory
+        self.page_size = page_size or settings.NEWSLETTER_SEND_PAGE_SIZE
+
+    async def run(
+        self,
+        campaign_id: UUID,
+        audience: Any,
+        message_content: str,
+        include_stop_instructions: bool = True,
+    ) -> DispatchStats:
+        """
+        Send ``message_content`` to every subscriber matching ``audience``,
+        starting after the campaign's saved send_cursor.
+
+        Returns:
+            DispatchStats for this run (totals are also persisted on the campaign)
+        """
+        stats = DispatchStats()
+
+        cursor = await self._load_cursor(campaign_id)
+        if cursor:
+            logger.info(f"📱 Resuming campaign {campaign_id} after subscriber {cursor}")
+
+        while True:
+            page = await self._fetch_page(audience, cursor)
+            if not page:
+                break
+            stats.pages += 1
+            cursor = page[-1][0]
+
+            phones = await decode_subscriber_phones([phone_enc for _, phone_enc in page])
+            sendable = {
+                subscriber_id: phone for (subscriber_id, _), phone in zip(page, phones) if phone
+            }
+            undeliverable = [
+                subscriber_id for subscriber_id, _ in page if subscriber_id not in sendable
+            ]
+
+            claimed = await self._claim(campaign_id, list(sendable)) if sendable else set()
+            stats.claimed += len(claimed)
+            stats.skipped += len(sendable) - len(claimed)
+
+            recipients = [
+                {"phone": phone, "subscriber_id": subscriber_id}
+                for subscriber_id, phone in sendable.items()
+                if subscriber_id in claimed
+            ]
+
+            results = []
+            if recipients:
+                results = await self.sms_service.send_campaign_batch(
+                    recipients,
+                    message_content,
+                    campaign_id=campaign_id,
+                    include_stop_instructions=include_stop_instructions,
+                )
+
+            delivered = [
+                (recipient["subscriber_id"], result.message_id)
+                for recipient, result in zip(recipients, results)
+                if result.success
+            ]
+            failed = [
+                recipient["subscriber_id"]
+                for recipient, result in zip(recipients, results)
+                if not result.success
+            ]
+
+            await self._record(campaign_id, cursor, delivered, failed, undeliverable)
+            stats.sent += len(delivered)
+            stats.failed += len(failed) + len(undeliverable)
+
+            logger.info(
+                f"📱 Campaign {campaign_id} page {stats.pages}: "
+                f"{len(delivered)} sent, {len(failed)} failed, "
+                f"{len(undeliverable)} undecryptable, "
+                f"{len(sendable) - len(claimed)} already sent"
+            )
+
+        return stats
+
+    # ========================================================================
+    # PAGE STEPS
+    # ========================================================================
+
+    async def _load_cursor(self, campaign_id: UUID) -> Optional[UUID]:
+        async with self.session_factory() as db:
+            return await db.scalar(
+                select(Campaign.send_cursor).where(Campaign.id == campaign_id)
+            )
+
+    async def _fetch_page(self, audience: Any, cursor: Optional[UUID]) -> list[tuple]:
+        query = select(Subscriber.id, Subscriber.phone_enc).where(audience)
+        if cursor is not None:
+            query = query.where(Subscriber.id > cursor)
+        query = query.order_by(Subscriber.id).limit(self.page_size)
+
+        async with self.session_factory() as db:
+            return [tuple(row) for row in (await db.execute(query)).all()]
+
+    async def _claim(self, campaign_id: UUID, subscriber_ids: list[UUID]) -> set[UUID]:
+        """Insert SENT events; returns the subscriber ids this run now owns"""
+        stmt = (
+            pg_insert(CampaignEvent)
+            .values(
+                [
+                    {
+                        "campaign_id": campaign_id,
+                        "subscriber_id": subscriber_id,
+                        "type": CampaignEventType.SENT,
+                    }
+                    for subscriber_id in subscriber_ids
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=["campaign_id", "subscriber_id"],
+                index_where=text("type = 'SENT'"),
+            )
+            .returning(CampaignEvent.subscriber_id)
+        )
+        async with self.session_factory() as db:
+            claimed = set((await db.execute(stmt)).scalars().all())
+            await db.commit()
+        return claimed
+
+    async def _record(
+        self,
+        campaign_id: UUID,
+        cursor: UUID,
+        delivered: list[tuple[UUID, Optional[str]]],
+        failed: list[UUID],
+        undeliverable: list[UUID],
+    ) -> None:
+        """
+        Persist one page's results and checkpoint in a single transaction
+
+        ``failed`` are claimed recipients whose send failed; ``undeliverable``
+        were never claimed (phone could not be decrypted) and get a FAILED
+        event here. Both count towards the failure totals.
+        """
+        now = datetime.now(timezone.utc)
+        all_failed = failed + undeliverable
+
+        async with self.session_factory() as db:
+            if delivered:
+                await db.execute(
+                    pg_insert(CampaignEvent).values(
+                        [
+                            {
+                                "campaign_id": campaign_id,
+                                "subscriber_id": subscriber_id,
+                                "type": CampaignEventType.DELIVERED,
+                                "payload": {"message_id": message_id} if message_id else None,
+                            }
+                            for subscriber_id, message_id in delivered
+                        ]
+                    )
+                )
+                await db.execute(
+                    update(Subscriber)
+                    .where(Subscriber.id.in_([subscriber_id for subscriber_id, _ in delivered]))
+                    .values(
+                        total_sms_sent=Subscriber.total_sms_sent + 1,
+                        last_sms_sent_date=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            if undeliverable:
+                await db.execute(
+                    pg_insert(CampaignEvent).values(
+                        [
+                            {
+                                "campaign_id": campaign_id,
+                                "subscriber_id": subscriber_id,
+                                "type": CampaignEventType.FAILED,
+                                "payload": {"reason": "phone_undecryptable"},
+                            }
+                            for subscriber_id in undeliverable
+                        ]
+                    )
+                )
+            if all_failed:
+                await db.execute(
+                    update(Subscriber)
+                    .where(Subscriber.id.in_(all_failed))
+                    .values(total_sms_failed=Subscriber.total_sms_failed + 1)
+                    .execution_options(synchronize_session=False)
+                )
+
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(
+                    send_cursor=cursor,
+                    total_sent=Campaign.total_sent + len(delivered),
+                    total_failed=Campaign.total_failed + len(all_failed),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+
+# ============================================================================
+# SHARED RATE LIMITER
+# ============================================================================
+
+_sms_rate_limiter: Optional[AsyncTokenBucket] = None
+
+
+def get_sms_rate_limiter() -> AsyncTokenBucket:
+    """Process-wide token bucket for the RingCentral SMS quota"""
+    global _sms_rate_limiter
+    if _sms_rate_limiter is None:
+        _sms_rate_limiter = AsyncTokenBucket(
+            rate=settings.RC_SMS_RATE_PER_SECOND, burst=settings.RC_SMS_BURST
+        )
+    return _sms_rate_limiter
@@ -0,0 +1,167 @@
+"""
+Newsletter Segment Engine
+Compiles a segment filter spec into one SQLAlchemy predicate and
+materializes campaign audiences.
+
+Filter spec (Campaign.segment_filter / preview body), all keys optional:
+    {
+        "tags": ["vip", "bay-area"],     # any tag matches (array overlap)
+        "engagement_min": 40,             # engagement_score >= 40
+        "engagement_max": 100,            # engagement_score <= 100
+        "last_opened_days": 90,           # opened within the last 90 days
+        "channel": "sms"                  # consent: "sms" | "email" | "both"
+    }
+
+The same predicate drives preview (COUNT + sample) and sending. For sends,
+the audience is materialized once into newsletter.campaign_audience; the
+admin UI reads the stored count and the dispatcher streams the snapshot
+(consent is re-checked at send time, so opt-outs after the snapshot are
+never texted).
+"""
+
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sqlalchemy import and_, delete, exists, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.newsletter import (
+    Campaign,
+    CampaignAudienceMember,
+    CampaignChannel,
+    Subscriber,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentFilter(BaseModel):
+    """Validated segment filter spec"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    tags: Optional[list[str]] = None
+    engagement_min: Optional[int] = Field(None, ge=0, le=100)
+    engagement_max: Optional[int] = Field(None, ge=0, le=100)
+    last_opened_days: Optional[int] = Field(None, gt=0)
+    channel: Optional[CampaignChannel] = None
+
+    @model_validator(mode="after")
+    def check_engagement_range(self) -> "SegmentFilter":
+        if (
+            self.engagement_min is not None
+            and self.engagement_max is not None
+            and self.engagement_min > self.engagement_max
+        ):
+            raise ValueError("engagement_min must be <= engagement_max")
+        return self
+
+
+def consent_predicate(channel: Optional[CampaignChannel]):
+    """Channel consent (SMS also requires a phone on file)"""
+    sms = and_(Subscriber.sms_consent, Subscriber.phone_enc.isnot(None))
+    if channel == CampaignChannel.SMS:
+        return sms
+    if channel == CampaignChannel.EMAIL:
+        return Subscriber.email_consent
+    if channel == CampaignChannel.BOTH:
+        return or_(Subscriber.email_consent, sms)
+    return true()
+
+
+def compile_segment(
+    spec: SegmentFilter | dict[str, Any] | None,
+    channel: Optional[CampaignChannel] = None,
+    now: Optional[datetime] = None,
+):
+    """
+    Compile a filter spec into a single predicate over Subscriber.
+
+    Args:
+        spec: SegmentFilter or raw dict (validated; raises pydantic.ValidationError)
+        channel: Consent channel; overrides spec.channel when given
+        now: Reference time for last_opened_days (default: now, UTC)
+
+    Returns:
+        SQLAlchemy boolean clause (always includes subscribed)
+    """
+    if not isinstance(spec, SegmentFilter):
+        spec = SegmentFilter.model_validate(spec or {})
+
+    clauses = [Subscriber.subscribed]
+    if spec.tags:
+        clauses.append(Subscriber.tags.overlap(spec.tags))
+    if spec.engagement_min is not None:
+        clauses.append(Subscriber.engagement_score >= spec.engagement_min)
+    if spec.engagement_max is not None:
+        clauses.append(Subscriber.engagement_score <= spec.engagement_max)
+    if spec.last_opened_days is not None:
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=spec.last_opened_days)
+        clauses.append(Subscriber.last_opened_date >= cutoff)
+
+    consent_channel = channel or spec.channel
+    if consent_channel is not None:
+        clauses.append(consent_predicate(consent_channel))
+    return and_(*clauses)
+
+
+def delivery_channel(campaign: Campaign) -> CampaignChannel:
+    """Channel a campaign is actually delivered on (SMS carries BOTH newsletters)"""
+    if campaign.channel == CampaignChannel.EMAIL:
+        return CampaignChannel.EMAIL
+    return CampaignChannel.SMS
+
+
+def campaign_audience(campaign: Campaign):
+    """Live predicate: campaign segment + consent for its delivery channel"""
+    return compile_segment(campaign.segment_filter, channel=delivery_channel(campaign))
+
+
+# ============================================================================
+# AUDIENCE SNAPSHOT
+# ============================================================================
+
+
+def snapshot_audience(campaign: Campaign):
+    """Predicate selecting the campaign's materialized audience (consent re-checked)"""
+    return and_(
+        exists().where(
+            CampaignAudienceMember.campaign_id == campaign.id,
+            CampaignAudienceMember.subscriber_id == Subscriber.id,
+        ),
+        Subscriber.subscribed,
+        consent_predicate(delivery_channel(campaign)),
+    )
+
+
+async def materialize_audience(db: AsyncSession, campaign: Campaign) -> int:
+    """
+    Replace the campaign's audience snapshot with the current segment.
+
+    One INSERT ... SELECT server-side; also stores the count on
+    campaign.total_recipients. The caller commits.
+
+    Returns:
+        Number of subscribers in the snapshot
+    """
+    await db.execute(
+        delete(CampaignAudienceMember).where(CampaignAudienceMember.campaign_id == campaign.id)
+    )
+    result = await db.execute(
+        CampaignAudienceMember.__table__.insert().from_select(
+            ["campaign_id", "subscriber_id"],
+            select(
+                literal(campaign.id, type_=PGUUID(as_uuid=True)),
+                Subscriber.id,
+            ).where(campaign_audience(campaign)),
+        )
+    )
+
+    count = max(result.rowcount or 0, 0)
+    campaign.total_recipients = count
+    campaign.audience_snapshot_at = datetime.now(timezone.utc)
+    logger.info(f"📋 Materialized audience for campaign {campaign.id}: {count} subscribers")
+    return count
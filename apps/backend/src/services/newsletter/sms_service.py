@@ -4,6 +4,8 @@ High-level service for sending SMS newsletter campaigns with TCPA compliance.
 Uses RingCentral for SMS delivery with full tracking and metrics.
 """
 
+import asyncio
+from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
 import logging
 from typing import Optional, Protocol
@@ -17,6 +19,7 @@ from db.models.newsletter import Subscriber, SMSDeliveryEvent, SMSDeliveryStatus
 from services.email.base import (
     EmailResult,
 )  # We'll reuse this structure for consistency
+from services.newsletter.token_bucket import AsyncTokenBucket
 
 
 logger = logging.getLogger(__name__)
@@ -57,6 +60,7 @@ class NewsletterSMSService:
     - Frequency limits enforcement
     - Opt-out tracking
     - Event tracking integration
+    - Bounded-concurrency batch sends paced by a token bucket
     """
 
     def __init__(
@@ -66,6 +70,8 @@ class NewsletterSMSService:
         db: Optional[AsyncSession] = None,
         business_phone: str = "+19167408768",
         business_name: str = "My Hibachi Chef",
+        rate_limiter: Optional[AsyncTokenBucket] = None,
+        max_concurrency: int = 1,
     ):
         """
         Initialize newsletter SMS service.
@@ -76,12 +82,17 @@ class NewsletterSMSService:
             db: Database session for tracking metrics (optional)
             business_phone: Business phone number (from number)
             business_name: Business name for identification
+            rate_limiter: Token bucket shared by all sends (RingCentral quota)
+            max_concurrency: In-flight sends per batch (forced to 1 when db is
+                set, since one AsyncSession cannot be used concurrently)
         """
         self.ringcentral = ringcentral_service
         self.compliance_validator = compliance_validator
         self.db = db
         self.business_phone = business_phone
         self.business_name = business_name
+        self.rate_limiter = rate_limiter
+        self.max_concurrency = 1 if db is not None else max(1, max_concurrency)
 
     async def send_campaign_sms(
         self,
@@ -127,10 +138,14 @@ class NewsletterSMSService:
                 message_content = message_content[:1580] + "... (truncated)"
 
             # Send SMS via RingCentral
-            result = await self.ringcentral.send_sms(
-                to_number=subscriber_phone,
-                message=message_content,
-                from_number=self.business_phone,
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            result = self._normalize_send_result(
+                await self.ringcentral.send_sms(
+                    to_number=subscriber_phone,
+                    message=message_content,
+                    from_number=self.business_phone,
+                )
             )
 
             # Check if send was successful
@@ -223,7 +238,7 @@ class NewsletterSMSService:
 
     async def send_campaign_batch(
         self,
-        recipients: list[dict],  # [{"phone": "...", "name": "..."}]
+        recipients: list[dict],  # [{"phone": "...", "name": "...", "subscriber_id": ...}]
         message_content: str,
         campaign_id: UUID | None = None,
         include_stop_instructions: bool = True,
@@ -231,28 +246,34 @@ class NewsletterSMSService:
         """
         Send campaign SMS messages to multiple recipients in batch.
 
-        Each recipient gets the same message with STOP instructions.
+        Each recipient gets the same message with STOP instructions. Up to
+        ``max_concurrency`` sends are in flight at once, each gated by the
+        shared rate limiter.
 
         Args:
-            recipients: List of recipient dicts with 'phone' and optional 'name'
+            recipients: List of recipient dicts with 'phone' and optional
+                'name' / 'subscriber_id'
             message_content: SMS message content
             campaign_id: Campaign UUID for tracking
             include_stop_instructions: Add STOP instructions (default: True)
 
         Returns:
-            List of EmailResult for each recipient
+            List of EmailResult for each recipient (same order as recipients)
         """
-        results = []
-
-        for recipient in recipients:
-            result = await self.send_campaign_sms(
-                subscriber_phone=recipient["phone"],
-                subscriber_name=recipient.get("name"),
-                message_content=message_content,
-                campaign_id=campaign_id,
-                include_stop_instructions=include_stop_instructions,
-            )
-            results.append(result)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send_one(recipient: dict) -> EmailResult:
+            async with semaphore:
+                return await self.send_campaign_sms(
+                    subscriber_phone=recipient["phone"],
+                    subscriber_name=recipient.get("name"),
+                    message_content=message_content,
+                    campaign_id=campaign_id,
+                    subscriber_id=recipient.get("subscriber_id"),
+                    include_stop_instructions=include_stop_instructions,
+                )
+
+        results = list(await asyncio.gather(*(send_one(r) for r in recipients)))
 
         # Log batch summary
         successful = sum(1 for r in results if r.success)
@@ -270,6 +291,22 @@ class NewsletterSMSService:
 
         return results
 
+    @staticmethod
+    def _normalize_send_result(result) -> dict:
+        """Map RingCentralSMSService's SMSResponse onto the RingCentral API dict shape"""
+        if isinstance(result, dict):
+            return result
+        success = bool(getattr(result, "success", False))
+        normalized = {
+            "id": getattr(result, "message_id", None) if success else None,
+            "messageStatus": "Sent" if success else "SendingFailed",
+        }
+        if not success:
+            normalized["errorMessage"] = getattr(result, "error", None) or "Unknown error"
+        if is_dataclass(result):
+            normalized["response"] = asdict(result)
+        return normalized
+
     def _add_tcpa_footer(self, message: str) -> str:
         """Add TCPA-compliant footer to message"""
         # Check if message already has STOP instructions
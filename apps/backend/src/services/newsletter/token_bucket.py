@@ -0,0 +1,45 @@
+"""
+Async Token Bucket
+Paces outbound provider calls (RingCentral SMS) to a per-second quota.
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio callers.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``.
+    ``acquire()`` waits until a token is available; waiters are served in
+    arrival order, so concurrent senders share the quota fairly.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        """
+        Args:
+            rate: Sustained tokens per second (must be > 0)
+            burst: Bucket capacity (default: one second's worth, min 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and take them."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
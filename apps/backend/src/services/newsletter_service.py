@@ -13,9 +13,10 @@ from db.models.newsletter import Subscriber
 # MIGRATED: Enum imports moved from models.enums to NEW db.models system
 from db.models.crm import LeadSource
 from core.base_service import BaseService, EventTrackingMixin
+from core.blind_index import email_blind_index, phone_blind_index
 from core.compliance import ComplianceValidator
 from services.event_service import EventService
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.validators import validate_email, validate_phone, ValidationError
 
@@ -361,64 +362,34 @@ class SubscriberService(BaseService, EventTrackingMixin):
         """
         Find Subscriber subscription by phone or email.
 
-        NOTE: Since phone and email are encrypted, we need to fetch all subscribers
-        and decrypt them in Python to compare. This is a performance trade-off for PII security.
+        Phone and email are encrypted, so the lookup uses their blind indexes
+        (keyed HMAC of the normalized value): one indexed equality query.
+        Rows not yet indexed are covered by scripts/backfill_blind_index.py.
         """
 
-        if not phone and not email:
-            return None
-
-        # Normalize inputs for comparison
-        # Phone: Keep as-is in E.164 format (+15551234567)
-        # Email: Lowercase and trim
-        normalized_phone = phone if phone else None
-        normalized_email = email.lower().strip() if email else None
-
-        logger.debug(f"Finding subscriber: phone={normalized_phone}, email={normalized_email}")
-
-        # Expire all cached objects to ensure we get fresh data from DB
-        self.db.expire_all()
-
-        # Fetch ALL subscribers (we need to decrypt to compare)
-        # TODO: Add pagination if subscriber count grows large (>10k)
-        result = await self.db.execute(select(Subscriber))
-        all_subscribers = list(result.scalars().all())
-
-        logger.debug(f"Total subscribers to check: {len(all_subscribers)}")
+        conditions = []
+        phone_bidx = phone_blind_index(phone)
+        email_bidx = email_blind_index(email)
+        if phone_bidx:
+            conditions.append(Subscriber.phone_bidx == phone_bidx)
+        if email_bidx:
+            conditions.append(Subscriber.email_bidx == email_bidx)
 
-        # Decrypt and compare in Python
-        for subscriber in all_subscribers:
-            try:
-                # Decrypt phone and email for this subscriber
-                sub_phone = subscriber.phone  # Property decrypts
-                sub_email = subscriber.email  # Property decrypts
-
-                logger.debug(
-                    f"Checking subscriber {subscriber.id}: phone={sub_phone}, email={sub_email}"
-                )
+        if not conditions:
+            return None
 
-                # Check phone match
-                if normalized_phone and sub_phone:
-                    if sub_phone == normalized_phone:
-                        logger.debug(f"Found match by phone: {subscriber.id}")
-                        return subscriber
-
-                # Check email match
-                if normalized_email and sub_email:
-                    if sub_email == normalized_email:
-                        logger.debug(f"Found match by email: {subscriber.id}")
-                        return subscriber
-            except Exception as e:
-                # If decryption fails for this subscriber, skip it
-                # (could be old data with different encryption key)
-                logger.warning(
-                    f"Failed to decrypt subscriber {subscriber.id}: {str(e)}",
-                    extra={"subscriber_id": str(subscriber.id)},
-                )
-                continue
+        result = await self.db.execute(
+            select(Subscriber)
+            .where(or_(*conditions))
+            .limit(1)
+            # Refresh identity-mapped rows: STOP/START may have changed them
+            .execution_options(populate_existing=True)
+        )
+        subscriber = result.scalars().first()
 
-        logger.debug("No matching subscriber found")
-        return None
+        if subscriber is None:
+            logger.debug("No matching subscriber found")
+        return subscriber
 
     async def get_active_subscriptions(
         self, limit: int = 1000, offset: int = 0
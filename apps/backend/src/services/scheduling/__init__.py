@@ -4,8 +4,9 @@ Smart Scheduling System - Service Layer
 This package contains all scheduling-related services for:
 - Travel time calculation
 - Slot management
-- Availability checking
+- Availability checking (with versioned Redis cache)
 - Chef optimization
+- Day-level joint chef assignment
 - Booking negotiations
 - Address geocoding (with caching)
 """
@@ -22,19 +23,33 @@ try:
 except ImportError:
     AvailabilityEngine = None  # type: ignore
 
+try:
+    from .availability_cache import AvailabilityCache, get_availability_cache
+except ImportError:
+    AvailabilityCache = None  # type: ignore
+    get_availability_cache = None  # type: ignore
+
 try:
     from .chef_optimizer import ChefOptimizer, ChefOptimizerService
 except ImportError:
     ChefOptimizer = None  # type: ignore
     ChefOptimizerService = None  # type: ignore
 
+try:
+    from .day_assignment_solver import DayAssignmentSolver
+except ImportError:
+    DayAssignmentSolver = None  # type: ignore
+
 __all__ = [
     "TravelTimeService",
     "SlotManager",
     "SlotManagerService",
     "AvailabilityEngine",
+    "AvailabilityCache",
+    "get_availability_cache",
     "ChefOptimizer",
     "ChefOptimizerService",
+    "DayAssignmentSolver",
     "SuggestionEngine",
     "NegotiationService",
     "NegotiationReason",
@@ -0,0 +1,299 @@
+"""
+Availability Cache - Versioned Redis cache for slot availability
+
+Caches AvailabilityEngine matrix rows (one row = every active slot of one
+date) so public availability endpoints don't rebuild them from grouped
+booking / hold / chef queries on every request.
+
+Correctness model (a slot must never look free after it was taken):
+- Every (scope, date) has a version counter; a global epoch covers
+  config-wide changes (business config, chef weekly availability).
+- Value keys embed the epoch and version, so invalidation is a single
+  INCR and old values are simply never read again (they expire by TTL).
+- Readers fetch the versions BEFORE querying the database and store the
+  result under those versions. A writer that commits and bumps the version
+  while a reader is mid-query makes the reader's write land on a dead key.
+- Writers MUST invalidate after their transaction commits.
+
+Invalidation sources:
+- Booking create / cancel / delete / date-slot-status changes (REST routes
+  and the CQRS booking command handlers)
+- SlotHold create / convert / release / extend / expiry (incl. Celery)
+- Chef time-off create / cancel / approve / deny (date range)
+
+If Redis is unavailable, reads fall through to the database and writes
+are skipped; the short TTL bounds staleness if an invalidation is lost.
+"""
+
+import json
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is a hard dependency in prod
+    aioredis = None  # type: ignore
+
+
+# ============================================================
+# Configuration
+# ============================================================
+
+KEY_PREFIX = "myhibachi:avail"
+ALL_STATIONS = "all"
+VALUE_TTL_SECONDS = 300
+VERSION_TTL_SECONDS = 60 * 60 * 24 * 400  # Outlives the 1-year booking window
+
+
+def _scope(station_id) -> str:
+    return str(station_id) if station_id else ALL_STATIONS
+
+
+def _epoch_key() -> str:
+    return f"{KEY_PREFIX}:epoch"
+
+
+def _version_key(scope: str, day: date) -> str:
+    return f"{KEY_PREFIX}:ver:{scope}:{day.isoformat()}"
+
+
+def _value_key(scope: str, day: date, epoch: int, version: int, today: date) -> str:
+    # `today` is part of the key because capacity mode depends on
+    # days-until-event, which changes at midnight without any write.
+    return (
+        f"{KEY_PREFIX}:val:{scope}:{day.isoformat()}:"
+        f"{epoch}.{version}:{today.isoformat()}"
+    )
+
+
+def _date_range(start_date: date, end_date: date) -> List[date]:
+    return [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+
+
+def _invalidation_keys(
+    dates: Iterable[date], station_id=None
+) -> List[str]:
+    """Version keys to bump: the station scope plus the cross-station scope."""
+    scopes = {ALL_STATIONS, _scope(station_id)}
+    return [_version_key(scope, day) for day in set(dates) for scope in scopes]
+
+
+# ============================================================
+# Async cache (request path)
+# ============================================================
+
+
+class AvailabilityCache:
+    """
+    Versioned availability cache backed by redis.asyncio.
+
+    Usage:
+        cache = get_availability_cache()
+        versions = await cache.get_versions(dates)      # before DB reads
+        rows = await cache.get_rows(dates, versions)
+        ...build missing rows from DB...
+        await cache.set_rows(rows, versions)
+
+        # After commit of a booking/hold/time-off write:
+        await cache.invalidate(event_date, station_id=booking.station_id)
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = VALUE_TTL_SECONDS):
+        self._redis_url = redis_url
+        self._client = None
+        self._disabled = aioredis is None
+        self.ttl = ttl
+
+    async def _get_client(self):
+        if self._disabled:
+            return None
+        if self._client is None:
+            try:
+                if self._redis_url is None:
+                    from core.config import get_settings
+
+                    self._redis_url = get_settings().redis_url
+                self._client = aioredis.from_url(
+                    self._redis_url, encoding="utf-8", decode_responses=True
+                )
+            except Exception as e:
+                logger.warning(f"Availability cache disabled: {e}")
+                self._disabled = True
+                return None
+        return self._client
+
+    async def get_versions(
+        self, dates: List[date], station_id=None
+    ) -> Optional[Dict[date, str]]:
+        """
+        Read the current version tag for each date in one MGET.
+
+        Returns None when Redis is unavailable (caller should skip caching).
+        """
+        client = await self._get_client()
+        if client is None or not dates:
+            return None
+
+        scope = _scope(station_id)
+        try:
+            raw = await client.mget(
+                [_epoch_key()] + [_version_key(scope, day) for day in dates]
+            )
+        except Exception as e:
+            logger.warning(f"Availability cache version read failed: {e}")
+            return None
+
+        epoch = int(raw[0] or 0)
+        return {day: f"{epoch}.{int(v or 0)}" for day, v in zip(dates, raw[1:])}
+
+    async def get_rows(
+        self,
+        versions: Dict[date, str],
+        today: date,
+        station_id=None,
+    ) -> Dict[date, list]:
+        """Fetch cached matrix rows for the given versions (misses omitted)."""
+        client = await self._get_client()
+        if client is None or not versions:
+            return {}
+
+        scope = _scope(station_id)
+        dates = list(versions)
+        keys = [self._row_key(scope, day, versions[day], today) for day in dates]
+        try:
+            raw = await client.mget(keys)
+        except Exception as e:
+            logger.warning(f"Availability cache read failed: {e}")
+            return {}
+
+        return {day: json.loads(value) for day, value in zip(dates, raw) if value}
+
+    async def set_rows(
+        self,
+        rows: Dict[date, list],
+        versions: Dict[date, str],
+        today: date,
+        station_id=None,
+    ) -> None:
+        """Store matrix rows under the versions read BEFORE they were built."""
+        client = await self._get_client()
+        if client is None or not rows:
+            return
+
+        scope = _scope(station_id)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for day, row in rows.items():
+                if day not in versions:
+                    continue
+                pipe.set(
+                    self._row_key(scope, day, versions[day], today),
+                    json.dumps(row, default=str),
+                    ex=self.ttl,
+                )
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Availability cache write failed: {e}")
+
+    async def invalidate(self, event_date: Optional[date], station_id=None) -> None:
+        """Invalidate one date (call after the write has committed)."""
+        if event_date is None:
+            return
+        await self.invalidate_dates([event_date], station_id=station_id)
+
+    async def invalidate_range(
+        self, start_date: date, end_date: date, station_id=None
+    ) -> None:
+        """Invalidate every date in [start_date, end_date] (e.g. chef time off)."""
+        if start_date is None or end_date is None or end_date < start_date:
+            return
+        await self.invalidate_dates(_date_range(start_date, end_date), station_id)
+
+    async def invalidate_dates(self, dates: Iterable[date], station_id=None) -> None:
+        client = await self._get_client()
+        keys = _invalidation_keys(dates, station_id)
+        if client is None or not keys:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(key)
+                pipe.expire(key, VERSION_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Availability cache invalidation failed: {e}")
+
+    async def invalidate_all(self) -> None:
+        """Bump the global epoch (config or weekly chef availability changed)."""
+        client = await self._get_client()
+        if client is None:
+            return
+        try:
+            await client.incr(_epoch_key())
+        except Exception as e:
+            logger.warning(f"Availability cache epoch bump failed: {e}")
+
+    @staticmethod
+    def _row_key(scope: str, day: date, version_tag: str, today: date) -> str:
+        epoch, version = (int(part) for part in version_tag.split("."))
+        return _value_key(scope, day, epoch, version, today)
+
+
+# ============================================================
+# Sync invalidation (Celery workers)
+# ============================================================
+
+
+def invalidate_availability_sync(
+    dates: Iterable[date], station_id=None, redis_url: Optional[str] = None
+) -> None:
+    """
+    Invalidate availability for dates from synchronous code (Celery tasks).
+
+    Call after the task's transaction has committed.
+    """
+    keys = _invalidation_keys([d for d in dates if d is not None], station_id)
+    if not keys:
+        return
+
+    try:
+        import redis
+
+        if redis_url is None:
+            from core.config import get_settings
+
+            redis_url = get_settings().redis_url
+
+        client = redis.Redis.from_url(redis_url)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(key)
+                pipe.expire(key, VERSION_TTL_SECONDS)
+            pipe.execute()
+        finally:
+            client.close()
+    except Exception as e:
+        logger.warning(f"Availability cache invalidation failed: {e}")
+
+
+# ============================================================
+# Singleton
+# ============================================================
+
+_availability_cache: Optional[AvailabilityCache] = None
+
+
+def get_availability_cache() -> AvailabilityCache:
+    """Get the process-wide availability cache."""
+    global _availability_cache
+    if _availability_cache is None:
+        _availability_cache = AvailabilityCache()
+    return _availability_cache
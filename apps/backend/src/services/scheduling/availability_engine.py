@@ -7,16 +7,25 @@ Checks if slots are available considering:
 - Chef time-off (from ops.chef_timeoff table)
 - Travel time constraints
 - Setup/cleanup buffers
+
+Availability Matrix:
+- build_availability_matrix() answers slot × date capacity, booked count
+  and hold count for a whole date range in a constant number of queries
+  (grouped COUNTs + one chef availability/time-off read), so calendars and
+  "next available dates" no longer run one check per slot per day
 """
 
 import logging
-from datetime import date, time
-from typing import List, Optional
+from datetime import date, time, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel
 from sqlalchemy import and_, func, not_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+if TYPE_CHECKING:
+    from .availability_cache import AvailabilityCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +61,34 @@ class SlotAvailabilityResult(BaseModel):
     message: str = ""
 
 
+class AvailabilityMatrixCell(BaseModel):
+    """Capacity and occupancy of one slot on one date."""
+
+    event_date: date
+    slot_number: int
+    slot_name: str
+    slot_time: time
+    capacity: int = 0
+    booked_count: int = 0
+    hold_count: int = 0
+    available_chefs: int = 0
+    is_available: bool = False
+    conflict_reason: Optional[str] = None
+    capacity_mode: str = ""
+
+
+class AvailabilityMatrix(BaseModel):
+    """Slot × date availability for a date range."""
+
+    start_date: date
+    end_date: date
+    days: Dict[date, List[AvailabilityMatrixCell]] = {}
+
+    def available_dates(self) -> List[date]:
+        """Dates with at least one available slot, in order."""
+        return [d for d, cells in sorted(self.days.items()) if any(c.is_available for c in cells)]
+
+
 class AvailabilityCheckResult(BaseModel):
     """Result of checking a specific slot."""
 
@@ -78,8 +115,15 @@ class AvailabilityEngine:
     - Travel time conflict detection
     """
 
-    def __init__(self, db: Optional[AsyncSession] = None):
+    def __init__(
+        self,
+        db: Optional[AsyncSession] = None,
+        cache: Optional["AvailabilityCache"] = None,
+    ):
         self.db = db
+        # Optional versioned Redis cache for matrix rows (read paths only;
+        # booking decisions should keep using uncached checks)
+        self.cache = cache
         # Note: Capacity is now determined dynamically via SSoT (BusinessConfig)
         # See check_slot_availability() for dual-mode logic:
         #   - Short-term (≤ chef_availability_window_days): Use actual chef availability
@@ -138,7 +182,43 @@ class AvailabilityEngine:
             event_date, slot_time, slot_number
         )
 
-        # DUAL-MODE CAPACITY LOGIC (SSoT Compliant)
+        # SHORT-TERM bookings need the real chef count; long-term use SSoT
+        available_chefs = 0
+        if days_until_event <= config.chef_availability_window_days:
+            available_chefs = await self._get_available_chef_count(
+                event_date, slot_time
+            )
+
+        return self._evaluate_capacity(
+            config=config,
+            days_until_event=days_until_event,
+            booking_count=booking_count,
+            available_chefs=available_chefs,
+        )
+
+    @staticmethod
+    def _evaluate_capacity(
+        config,
+        days_until_event: int,
+        booking_count: int,
+        available_chefs: int,
+    ) -> dict:
+        """
+        Apply DUAL-MODE CAPACITY LOGIC (SSoT Compliant) to known counts.
+
+        Shared by check_slot_availability (one slot) and
+        build_availability_matrix (whole date range) so both always agree.
+
+        Args:
+            config: BusinessConfig from get_business_config
+            days_until_event: Days between today and the event
+            booking_count: Bookings + active holds occupying the slot
+            available_chefs: Chefs available for the slot (short-term only)
+
+        Returns:
+            dict with is_available, available_chefs, conflict_reason,
+            booking_count, capacity, capacity_mode, days_until_event
+        """
         if days_until_event > config.chef_availability_window_days:
             # LONG-TERM BOOKING: Use SSoT capacity (chefs haven't set availability yet)
             capacity_mode = "long_term_ssot"
@@ -151,6 +231,7 @@ class AvailabilityEngine:
                     "available_chefs": 0,
                     "conflict_reason": f"Bookings more than {config.chef_availability_window_days} days ahead are not currently available",
                     "booking_count": booking_count,
+                    "capacity": 0,
                     "capacity_mode": capacity_mode,
                     "days_until_event": days_until_event,
                 }
@@ -165,11 +246,6 @@ class AvailabilityEngine:
             # SHORT-TERM BOOKING: Use actual chef availability from database
             capacity_mode = "short_term_chef_availability"
 
-            # Get real available chef count from ChefAvailability table
-            available_chefs = await self._get_available_chef_count(
-                event_date, slot_time
-            )
-
             # Capacity = number of available chefs (1 chef = 1 booking per slot)
             max_capacity = available_chefs
 
@@ -187,6 +263,7 @@ class AvailabilityEngine:
             "available_chefs": available_chefs,
             "conflict_reason": conflict_reason,
             "booking_count": booking_count,
+            "capacity": max_capacity,
             "capacity_mode": capacity_mode,
             "days_until_event": days_until_event,
         }
@@ -378,35 +455,359 @@ class AvailabilityEngine:
     ) -> List[AvailableSlot]:
         """
         Get all available slots for a date.
+
+        Backed by build_availability_matrix, so all slots of the date are
+        answered with one config read and a handful of grouped queries.
+        """
+        matrix = await self.build_availability_matrix(event_date, event_date)
+
+        return [
+            AvailableSlot(
+                slot_number=cell.slot_number,
+                slot_name=cell.slot_name,
+                slot_time=cell.slot_time,
+                standard_time=cell.slot_time,
+                is_available=cell.is_available,
+                available_chefs=cell.available_chefs,
+                conflict_reason=cell.conflict_reason,
+                booking_count=cell.booked_count + cell.hold_count,
+            )
+            for cell in matrix.days.get(event_date, [])
+        ]
+
+    async def build_availability_matrix(
+        self,
+        start_date: date,
+        end_date: date,
+    ) -> AvailabilityMatrix:
         """
+        Build slot × date availability for a date range in a single pass.
+
+        Queries (independent of the number of days and slots):
+        1. get_business_config (once)
+        2. Booking counts GROUP BY (date, slot)
+        3. Active SlotHold counts GROUP BY (event_date, slot_time)
+        4. Chef weekly availability + approved time-off (only if any date
+           falls inside chef_availability_window_days)
+
+        Each cell uses the same dual-mode capacity rules as
+        check_slot_availability.
+
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+
+        When a cache is attached, rows are served per date from the
+        versioned availability cache and only missing dates are rebuilt.
+
+        Returns:
+            AvailabilityMatrix with one cell per active slot per date
+        """
+        if self.cache is None or end_date < start_date:
+            return await self._compute_availability_matrix(start_date, end_date)
+
+        today = date.today()
+        dates = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+
+        # Versions are read BEFORE the DB so a concurrent write can't be
+        # cached under the post-write version
+        versions = await self.cache.get_versions(dates)
+        if versions is None:
+            return await self._compute_availability_matrix(start_date, end_date)
+
+        cached = await self.cache.get_rows(versions, today)
+        matrix = AvailabilityMatrix(start_date=start_date, end_date=end_date)
+        for event_date, row in cached.items():
+            matrix.days[event_date] = [
+                AvailabilityMatrixCell.model_validate(cell) for cell in row
+            ]
+
+        missing = [d for d in dates if d not in cached]
+        if missing:
+            fresh = await self._compute_availability_matrix(min(missing), max(missing))
+            for event_date in missing:
+                matrix.days[event_date] = fresh.days.get(event_date, [])
+            await self.cache.set_rows(
+                {
+                    event_date: [
+                        cell.model_dump(mode="json") for cell in matrix.days[event_date]
+                    ]
+                    for event_date in missing
+                },
+                versions,
+                today,
+            )
+
+        matrix.days = dict(sorted(matrix.days.items()))
+        return matrix
+
+    async def _compute_availability_matrix(
+        self,
+        start_date: date,
+        end_date: date,
+    ) -> AvailabilityMatrix:
+        """Build the matrix from the database (see build_availability_matrix)."""
+        from services.business_config_service import get_business_config
+
         from .slot_manager import DEFAULT_SLOTS
 
-        slots = []
+        matrix = AvailabilityMatrix(start_date=start_date, end_date=end_date)
+        if end_date < start_date:
+            return matrix
 
-        for slot_num, slot_config in DEFAULT_SLOTS.items():
-            if not slot_config.is_active:
-                continue
+        config = await get_business_config(self.db)
+        today = date.today()
+
+        dates = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+        active_slots = [
+            (slot_num, slot_config)
+            for slot_num, slot_config in DEFAULT_SLOTS.items()
+            if slot_config.is_active
+        ]
+        slot_times = [slot_config.standard_time for _, slot_config in active_slots]
+
+        booking_counts = await self._get_grouped_booking_counts(start_date, end_date)
+        hold_counts = await self._get_grouped_hold_counts(start_date, end_date)
+
+        # Chef counts only matter for short-term dates
+        short_term_dates = [
+            d for d in dates if (d - today).days <= config.chef_availability_window_days
+        ]
+        chef_counts: Dict[Tuple[date, time], int] = {}
+        if short_term_dates:
+            chef_counts = await self._get_chef_counts_by_date_slot(
+                short_term_dates, slot_times
+            )
+
+        for event_date in dates:
+            days_until_event = (event_date - today).days
+            cells: List[AvailabilityMatrixCell] = []
+
+            for slot_num, slot_config in active_slots:
+                key = (event_date, slot_config.standard_time)
+                booked = booking_counts.get(key, 0)
+                held = hold_counts.get(key, 0)
+
+                result = self._evaluate_capacity(
+                    config=config,
+                    days_until_event=days_until_event,
+                    booking_count=booked + held,
+                    available_chefs=chef_counts.get(key, 0),
+                )
+
+                cells.append(
+                    AvailabilityMatrixCell(
+                        event_date=event_date,
+                        slot_number=slot_num,
+                        slot_name=slot_config.slot_name,
+                        slot_time=slot_config.standard_time,
+                        capacity=result["capacity"],
+                        booked_count=booked,
+                        hold_count=held,
+                        available_chefs=result["available_chefs"],
+                        is_available=result["is_available"],
+                        conflict_reason=result["conflict_reason"],
+                        capacity_mode=result["capacity_mode"],
+                    )
+                )
+
+            matrix.days[event_date] = cells
+
+        return matrix
+
+    async def get_next_available_dates(
+        self,
+        start_date: Optional[date] = None,
+        days_ahead: int = 30,
+        limit: int = 10,
+    ) -> List[date]:
+        """
+        Get the next dates that have at least one available slot.
+
+        Args:
+            start_date: First date to consider (default: today)
+            days_ahead: How many days to look ahead
+            limit: Maximum number of dates to return
+
+        Returns:
+            Sorted list of available dates
+        """
+        start_date = start_date or date.today()
+        matrix = await self.build_availability_matrix(
+            start_date, start_date + timedelta(days=days_ahead)
+        )
+        return matrix.available_dates()[:limit]
+
+    async def _get_grouped_booking_counts(
+        self,
+        start_date: date,
+        end_date: date,
+    ) -> Dict[Tuple[date, time], int]:
+        """
+        Count slot-occupying bookings per (date, slot) with one GROUP BY.
+
+        Same filters as _get_booking_count_for_slot.
+        """
+        if not self.db:
+            return {}
+
+        try:
+            from db.models.core import Booking
 
-            result = await self.check_slot_availability(
-                event_date=event_date,
-                slot_time=slot_config.standard_time,
-                guest_count=guest_count,
+            query = (
+                select(Booking.date, Booking.slot, func.count(Booking.id))
+                .where(
+                    and_(
+                        Booking.date >= start_date,
+                        Booking.date <= end_date,
+                        Booking.status.in_(["pending", "confirmed", "deposit_paid"]),
+                        Booking.deleted_at.is_(None),
+                    )
+                )
+                .group_by(Booking.date, Booking.slot)
             )
 
-            slots.append(
-                AvailableSlot(
-                    slot_number=slot_num,
-                    slot_name=slot_config.slot_name,
-                    slot_time=slot_config.standard_time,
-                    standard_time=slot_config.standard_time,
-                    is_available=result["is_available"],
-                    available_chefs=result["available_chefs"],
-                    conflict_reason=result.get("conflict_reason"),
-                    booking_count=result.get("booking_count", 0),
+            result = await self.db.execute(query)
+            return {(row[0], row[1]): row[2] for row in result.all()}
+
+        except Exception as e:
+            logger.warning(f"Error counting bookings for availability matrix: {e}")
+            return {}
+
+    async def _get_grouped_hold_counts(
+        self,
+        start_date: date,
+        end_date: date,
+    ) -> Dict[Tuple[date, time], int]:
+        """
+        Count active SlotHolds per (event_date, slot_time) with one GROUP BY.
+
+        Same filters as _get_booking_count_for_slot (PENDING/SIGNED, not expired).
+        """
+        if not self.db:
+            return {}
+
+        try:
+            from db.models.slot_hold import SlotHold, SlotHoldStatus
+
+            query = (
+                select(SlotHold.event_date, SlotHold.slot_time, func.count(SlotHold.id))
+                .where(
+                    and_(
+                        SlotHold.event_date >= start_date,
+                        SlotHold.event_date <= end_date,
+                        SlotHold.status.in_(
+                            [
+                                SlotHoldStatus.PENDING.value,
+                                SlotHoldStatus.SIGNED.value,
+                            ]
+                        ),
+                        SlotHold.expires_at > func.now(),  # Not expired
+                    )
                 )
+                .group_by(SlotHold.event_date, SlotHold.slot_time)
             )
 
-        return slots
+            result = await self.db.execute(query)
+            return {(row[0], row[1]): row[2] for row in result.all()}
+
+        except Exception as e:
+            logger.warning(f"Error counting slot holds for availability matrix: {e}")
+            return {}
+
+    async def _get_chef_counts_by_date_slot(
+        self,
+        dates: List[date],
+        slot_times: List[time],
+    ) -> Dict[Tuple[date, time], int]:
+        """
+        Count available chefs per (date, slot) for many dates at once.
+
+        Reads active chefs' weekly availability and the approved time-off
+        overlapping the dates once, then applies the same rules as
+        _get_available_chef_count in memory.
+        """
+        if not self.db:
+            logger.warning("No database connection, returning default chef count")
+            return {(d, t): 3 for d in dates for t in slot_times}
+
+        try:
+            from db.models.ops import (
+                Chef,
+                ChefAvailability,
+                ChefStatus,
+                ChefTimeOff,
+                DayOfWeek,
+                TimeOffStatus,
+            )
+
+            day_names = {
+                0: DayOfWeek.MONDAY,
+                1: DayOfWeek.TUESDAY,
+                2: DayOfWeek.WEDNESDAY,
+                3: DayOfWeek.THURSDAY,
+                4: DayOfWeek.FRIDAY,
+                5: DayOfWeek.SATURDAY,
+                6: DayOfWeek.SUNDAY,
+            }
+
+            availability_query = (
+                select(
+                    ChefAvailability.chef_id,
+                    ChefAvailability.day_of_week,
+                    ChefAvailability.start_time,
+                    ChefAvailability.end_time,
+                )
+                .join(Chef, Chef.id == ChefAvailability.chef_id)
+                .where(
+                    and_(
+                        Chef.status == ChefStatus.ACTIVE,
+                        Chef.is_active == True,
+                        ChefAvailability.is_available == True,
+                    )
+                )
+            )
+            availability_rows = (await self.db.execute(availability_query)).all()
+
+            timeoff_query = select(
+                ChefTimeOff.chef_id, ChefTimeOff.start_date, ChefTimeOff.end_date
+            ).where(
+                and_(
+                    ChefTimeOff.status == TimeOffStatus.APPROVED,
+                    ChefTimeOff.start_date <= max(dates),
+                    ChefTimeOff.end_date >= min(dates),
+                )
+            )
+            timeoff_rows = (await self.db.execute(timeoff_query)).all()
+
+            counts: Dict[Tuple[date, time], int] = {}
+            for event_date in dates:
+                event_day = day_names[event_date.weekday()]
+                on_timeoff = {
+                    row[0] for row in timeoff_rows if row[1] <= event_date <= row[2]
+                }
+                for slot_time in slot_times:
+                    chefs = {
+                        row[0]
+                        for row in availability_rows
+                        if row[1] == event_day
+                        and row[2] <= slot_time <= row[3]
+                        and row[0] not in on_timeoff
+                    }
+                    counts[(event_date, slot_time)] = len(chefs)
+
+            return counts
+
+        except Exception as e:
+            logger.warning(f"Error checking chef availability: {e}")
+            # Fallback to a safe default on error
+            return {(d, t): 3 for d in dates for t in slot_times}
 
     async def get_available_slots(
         self,
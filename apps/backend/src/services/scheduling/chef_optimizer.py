@@ -15,6 +15,13 @@ Travel Time Strategy (Updated 2025-01-27):
 - For 1-5 chefs: Always use Google Maps for accuracy
 - For 5+ chefs: Use Haversine for quick scoring (scheduling decision only)
 
+Batch Scoring Mode:
+- Loads every candidate chef's same-day bookings + venues in ONE query
+- Derives daily workloads from that same result (no separate COUNT query)
+- Checks consecutive-travel feasibility for all chefs in one vectorized pass
+- Scores all feasible chefs in one vectorized pass (NumPy Haversine)
+- An assignment costs a constant number of queries regardless of chef count
+
 Full implementation completed: 2025-12-21
 Updated with TravelTimeService integration: 2025-01-27
 """
@@ -23,9 +30,10 @@ import logging
 from datetime import date, datetime, time
 from decimal import Decimal
 from math import atan2, cos, radians, sin, sqrt
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
 from pydantic import BaseModel, Field
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -184,10 +192,14 @@ class ChefOptimizer:
     - Preference Score (10%): +50 bonus if customer requested
 
     Total possible score: 100 (weighted) + 50 (preference bonus) = 150
+
+    Batch scoring (default) loads schedules for all chefs in one query and
+    scores them together. Set batch_scoring=False to use the per-chef path.
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, batch_scoring: bool = True):
         self.db = db
+        self.batch_scoring = batch_scoring
         self._travel_service = None  # Lazy-loaded TravelTimeService
 
     def _get_travel_service(self):
@@ -251,6 +263,84 @@ class ChefOptimizer:
                     is_optimal=False,
                 )
 
+        # 3-5. Validate consecutive travel and score every feasible chef
+        if self.batch_scoring:
+            scored_chefs = await self._score_chefs_batch(
+                chefs=available_chefs,
+                venue_lat=venue_lat,
+                venue_lng=venue_lng,
+                guest_count=guest_count,
+                event_date=event_date,
+                event_time=event_time,
+                preferred_chef_id=preferred_chef_id,
+            )
+        else:
+            scored_chefs = await self._score_chefs_sequential(
+                chefs=available_chefs,
+                venue_lat=venue_lat,
+                venue_lng=venue_lng,
+                guest_count=guest_count,
+                event_date=event_date,
+                event_time=event_time,
+                preferred_chef_id=preferred_chef_id,
+                customer_id=customer_id,
+            )
+
+        # If no chefs have feasible travel, return early
+        if scored_chefs is None:
+            return OptimalAssignment(
+                booking_id=booking_id,
+                confidence_score=0,
+                reason="No chefs available with feasible travel between consecutive bookings",
+                is_optimal=False,
+            )
+
+        # 6. Sort by total score (highest first)
+        scored_chefs.sort(key=lambda x: x.total_score, reverse=True)
+
+        # 7. Build response
+        if not scored_chefs:
+            return OptimalAssignment(
+                booking_id=booking_id,
+                confidence_score=0,
+                reason="Could not score any available chefs",
+                is_optimal=False,
+            )
+
+        best_chef = scored_chefs[0]
+        confidence = min(100, best_chef.total_score)
+
+        # Determine reason based on scoring
+        reason = self._build_recommendation_reason(best_chef, preferred_chef_id)
+
+        return OptimalAssignment(
+            booking_id=booking_id,
+            recommended_chef_id=best_chef.chef_id,
+            recommended_chef_name=best_chef.chef_name,
+            confidence_score=confidence,
+            reason=reason,
+            is_optimal=best_chef.total_score >= 70,  # 70+ is optimal
+            all_scores=scored_chefs,
+        )
+
+    async def _score_chefs_sequential(
+        self,
+        chefs: List[ChefForAssignment],
+        venue_lat: Decimal,
+        venue_lng: Decimal,
+        guest_count: int,
+        event_date: date,
+        event_time: time,
+        preferred_chef_id: Optional[UUID],
+        customer_id: Optional[UUID],
+    ) -> Optional[List[ChefScore]]:
+        """
+        Per-chef scoring path (one feasibility + travel lookup per chef).
+
+        Returns None if no chef has feasible consecutive travel.
+        """
+        available_chefs = chefs
+
         # 3. Get daily workload for each chef
         workloads = await self._get_chef_workloads(
             [c.chef_id for c in available_chefs], event_date
@@ -270,16 +360,11 @@ class ChefOptimizer:
             if is_feasible:
                 feasible_chefs.append(chef)
             else:
-                logger.info(f"Chef {chef.name} excluded: {reason}")
+                logger.info(f"Chef {chef.chef_name} excluded: {reason}")
 
         # If no chefs have feasible travel, return early
         if not feasible_chefs and available_chefs:
-            return OptimalAssignment(
-                booking_id=booking_id,
-                confidence_score=0,
-                reason="No chefs available with feasible travel between consecutive bookings",
-                is_optimal=False,
-            )
+            return None
 
         # 5. Score all feasible chefs
         # Pass chef_count to enable smart travel time strategy:
@@ -302,33 +387,7 @@ class ChefOptimizer:
             )
             scored_chefs.append(score)
 
-        # 6. Sort by total score (highest first)
-        scored_chefs.sort(key=lambda x: x.total_score, reverse=True)
-
-        # 7. Build response
-        if not scored_chefs:
-            return OptimalAssignment(
-                booking_id=booking_id,
-                confidence_score=0,
-                reason="Could not score any available chefs",
-                is_optimal=False,
-            )
-
-        best_chef = scored_chefs[0]
-        confidence = min(100, best_chef.total_score)
-
-        # Determine reason based on scoring
-        reason = self._build_recommendation_reason(best_chef, preferred_chef_id)
-
-        return OptimalAssignment(
-            booking_id=booking_id,
-            recommended_chef_id=best_chef.chef_id,
-            recommended_chef_name=best_chef.chef_name,
-            confidence_score=confidence,
-            reason=reason,
-            is_optimal=best_chef.total_score >= 70,  # 70+ is optimal
-            all_scores=scored_chefs,
-        )
+        return scored_chefs
 
     async def get_top_recommendations(
         self,
@@ -572,6 +631,319 @@ class ChefOptimizer:
 
         return True, "All consecutive travel feasible"
 
+    async def _get_bookings_with_venues_for_chefs(
+        self,
+        chef_ids: List[UUID],
+        event_date: date,
+    ) -> Dict[UUID, List[dict]]:
+        """
+        Get same-day bookings WITH venue coordinates for many chefs at once.
+
+        Batch counterpart of _get_chef_bookings_with_venues: one query for
+        all chefs instead of one per chef.
+
+        Returns dict of chef_id -> bookings ordered by slot time
+        (chefs without bookings map to an empty list).
+        """
+        schedules: Dict[UUID, List[dict]] = {chef_id: [] for chef_id in chef_ids}
+        if not chef_ids:
+            return schedules
+
+        query = (
+            select(
+                Booking.chef_id,
+                Booking.id,
+                Booking.slot,
+                Address.lat,
+                Address.lng,
+            )
+            .join(Address, Booking.venue_address_id == Address.id, isouter=True)
+            .where(
+                and_(
+                    Booking.chef_id.in_(chef_ids),
+                    Booking.date == event_date,
+                    Booking.status.notin_(["cancelled", "rejected"]),
+                )
+            )
+            .order_by(Booking.chef_id, Booking.slot)
+        )
+
+        result = await self.db.execute(query)
+
+        for row in result.all():
+            schedules.setdefault(row[0], []).append(
+                {
+                    "booking_id": row[1],
+                    "slot": row[2],
+                    "lat": float(row[3]) if row[3] else None,
+                    "lng": float(row[4]) if row[4] else None,
+                }
+            )
+
+        return schedules
+
+    def _validate_consecutive_travel_batch(
+        self,
+        schedules: Dict[UUID, List[dict]],
+        event_date: date,
+        event_time: time,
+        venue_lat: Decimal,
+        venue_lng: Decimal,
+    ) -> Dict[UUID, Tuple[bool, str]]:
+        """
+        Validate consecutive travel feasibility for many chefs in one pass.
+
+        Same rules as _validate_consecutive_travel, but every venue-to-venue
+        leg across all chefs is estimated in a single vectorized Haversine
+        call. The first failing leg (chronologically) is reported per chef.
+
+        Args:
+            schedules: chef_id -> existing bookings (from
+                _get_bookings_with_venues_for_chefs)
+            event_date: Date of proposed booking
+            event_time: Time of proposed booking (slot time)
+            venue_lat: Venue latitude of proposed booking
+            venue_lng: Venue longitude of proposed booking
+
+        Returns:
+            dict of chef_id -> (is_feasible, reason)
+        """
+        proposed = {
+            "booking_id": None,
+            "slot": event_time,
+            "lat": float(venue_lat) if venue_lat else None,
+            "lng": float(venue_lng) if venue_lng else None,
+        }
+
+        results: Dict[UUID, Tuple[bool, str]] = {
+            chef_id: (True, "All consecutive travel feasible") for chef_id in schedules
+        }
+
+        # Flatten every consecutive leg of every chef's day into parallel lists
+        leg_chefs: List[UUID] = []
+        origin_lats: List[float] = []
+        origin_lngs: List[float] = []
+        dest_lats: List[float] = []
+        dest_lngs: List[float] = []
+        dest_slots: List[time] = []
+        gaps: List[float] = []
+
+        for chef_id, existing_bookings in schedules.items():
+            all_bookings = sorted(existing_bookings + [proposed], key=lambda b: b["slot"])
+
+            for current, next_booking in zip(all_bookings, all_bookings[1:]):
+                # Skip if either booking has no coordinates
+                if not current["lat"] or not current["lng"]:
+                    continue
+                if not next_booking["lat"] or not next_booking["lng"]:
+                    continue
+
+                current_dt = datetime.combine(event_date, current["slot"])
+                next_dt = datetime.combine(event_date, next_booking["slot"])
+
+                leg_chefs.append(chef_id)
+                origin_lats.append(current["lat"])
+                origin_lngs.append(current["lng"])
+                dest_lats.append(next_booking["lat"])
+                dest_lngs.append(next_booking["lng"])
+                dest_slots.append(next_booking["slot"])
+                gaps.append((next_dt - current_dt).total_seconds() / 60)
+
+        if not leg_chefs:
+            return results
+
+        travel_minutes, travel_miles = self._calculate_travel_haversine_batch(
+            origin_lats=np.asarray(origin_lats, dtype=float),
+            origin_lngs=np.asarray(origin_lngs, dtype=float),
+            dest_lats=np.asarray(dest_lats, dtype=float),
+            dest_lngs=np.asarray(dest_lngs, dtype=float),
+            event_date=event_date,
+            event_times=dest_slots,
+        )
+
+        # Dynamic buffer: base buffer (30 min for setup/break) + travel time
+        required_minutes = travel_minutes + BASE_BUFFER_MINUTES
+        infeasible = np.asarray(gaps) < required_minutes
+
+        for idx in np.flatnonzero(infeasible):
+            chef_id = leg_chefs[idx]
+            if not results[chef_id][0]:
+                continue  # Already failed on an earlier leg
+
+            reason = (
+                f"Insufficient travel time: {gaps[idx]:.0f} min gap, "
+                f"but need {travel_minutes[idx]:.0f} min travel + {BASE_BUFFER_MINUTES} min buffer "
+                f"({travel_miles[idx]:.1f} miles between venues)"
+            )
+            logger.debug(f"Chef {chef_id} failed consecutive travel: {reason}")
+            results[chef_id] = (False, reason)
+
+        return results
+
+    async def _score_chefs_batch(
+        self,
+        chefs: List[ChefForAssignment],
+        venue_lat: Decimal,
+        venue_lng: Decimal,
+        guest_count: int,
+        event_date: date,
+        event_time: time,
+        preferred_chef_id: Optional[UUID],
+    ) -> Optional[List[ChefScore]]:
+        """
+        Batch scoring path: constant number of queries for any chef count.
+
+        1. One query loads every chef's same-day bookings + venues
+           (workloads are derived from it, no separate COUNT query)
+        2. Feasibility for all chefs is checked in one vectorized pass
+        3. All feasible chefs are scored in one vectorized pass
+
+        Travel follows the same strategy as _score_chef: at or below
+        USE_GOOGLE_MAPS_THRESHOLD feasible chefs, TravelTimeService is used
+        per chef (bounded by the threshold); above it, vectorized Haversine.
+
+        Returns None if no chef has feasible consecutive travel.
+        """
+        schedules = await self._get_bookings_with_venues_for_chefs(
+            [c.chef_id for c in chefs], event_date
+        )
+
+        feasibility = self._validate_consecutive_travel_batch(
+            schedules=schedules,
+            event_date=event_date,
+            event_time=event_time,
+            venue_lat=venue_lat,
+            venue_lng=venue_lng,
+        )
+
+        feasible_chefs: List[ChefForAssignment] = []
+        for chef in chefs:
+            is_feasible, reason = feasibility.get(
+                chef.chef_id, (True, "All consecutive travel feasible")
+            )
+            if is_feasible:
+                feasible_chefs.append(chef)
+            else:
+                logger.info(f"Chef {chef.chef_name} excluded: {reason}")
+
+        if not feasible_chefs:
+            return None
+
+        chef_count = len(feasible_chefs)
+
+        # 1. Travel (40% weight)
+        if chef_count <= USE_GOOGLE_MAPS_THRESHOLD:
+            travel_results = [
+                await self._calculate_travel(
+                    float(chef.home_lat),
+                    float(chef.home_lng),
+                    float(venue_lat),
+                    float(venue_lng),
+                    event_date,
+                    event_time,
+                    chef_count=chef_count,
+                )
+                for chef in feasible_chefs
+            ]
+            travel_minutes = np.array([r[0] for r in travel_results], dtype=np.int64)
+            travel_miles = np.array([r[1] for r in travel_results], dtype=float)
+        else:
+            travel_minutes, travel_miles = self._calculate_travel_haversine_batch(
+                origin_lats=np.array([float(c.home_lat) for c in feasible_chefs]),
+                origin_lngs=np.array([float(c.home_lng) for c in feasible_chefs]),
+                dest_lats=np.full(chef_count, float(venue_lat)),
+                dest_lngs=np.full(chef_count, float(venue_lng)),
+                event_date=event_date,
+                event_times=[event_time] * chef_count,
+            )
+
+        travel_scores = np.where(
+            travel_minutes <= IDEAL_TRAVEL_MINUTES,
+            100.0,
+            np.where(
+                travel_minutes >= MAX_TRAVEL_MINUTES,
+                0.0,
+                100.0
+                * (
+                    1
+                    - (travel_minutes - IDEAL_TRAVEL_MINUTES)
+                    / (MAX_TRAVEL_MINUTES - IDEAL_TRAVEL_MINUTES)
+                ),
+            ),
+        )
+
+        # 2. Skill match (20% weight) - depends only on specialty
+        skill_by_specialty: Dict[str, float] = {}
+        for chef in feasible_chefs:
+            if chef.specialty not in skill_by_specialty:
+                skill_by_specialty[chef.specialty] = self._score_skill_match(
+                    chef.specialty, guest_count
+                )
+        skill_scores = np.array([skill_by_specialty[c.specialty] for c in feasible_chefs])
+
+        # 3. Workload balance (15% weight)
+        daily_bookings = np.array(
+            [len(schedules.get(c.chef_id, [])) for c in feasible_chefs], dtype=float
+        )
+        workload_scores = np.where(
+            daily_bookings >= MAX_DAILY_BOOKINGS,
+            0.0,
+            100.0 * (1 - (daily_bookings / MAX_DAILY_BOOKINGS)),
+        )
+
+        # 4. Rating (15% weight)
+        rating_scores = np.minimum(
+            100.0, np.array([c.rating for c in feasible_chefs]) / 5.0 * 100
+        )
+
+        # 5. Preference (10% weight + bonus)
+        is_preferred = np.array(
+            [bool(preferred_chef_id and c.chef_id == preferred_chef_id) for c in feasible_chefs]
+        )
+        preference_scores = np.where(is_preferred, 100.0, 0.0)
+
+        weighted_totals = (
+            (travel_scores * WEIGHT_TRAVEL / 100)
+            + (skill_scores * WEIGHT_SKILL / 100)
+            + (workload_scores * WEIGHT_WORKLOAD / 100)
+            + (rating_scores * WEIGHT_RATING / 100)
+            + (preference_scores * WEIGHT_PREFERENCE / 100)
+            + np.where(is_preferred, PREFERRED_CHEF_BONUS, 0.0)
+        )
+
+        scored_chefs: List[ChefScore] = []
+        for i, chef in enumerate(feasible_chefs):
+            chef_travel_minutes = int(travel_minutes[i])
+            chef_daily_bookings = int(daily_bookings[i])
+            chef_is_preferred = bool(is_preferred[i])
+
+            scored_chefs.append(
+                ChefScore(
+                    chef_id=chef.chef_id,
+                    chef_name=chef.chef_name,
+                    total_score=float(weighted_totals[i]),
+                    travel_score=float(travel_scores[i]),
+                    skill_score=float(skill_scores[i]),
+                    workload_score=float(workload_scores[i]),
+                    rating_score=float(rating_scores[i]),
+                    history_score=0.0,  # Future: customer history with this chef
+                    preference_score=float(preference_scores[i]),
+                    travel_time_minutes=chef_travel_minutes,
+                    travel_distance_miles=float(travel_miles[i]),
+                    is_preferred=chef_is_preferred,
+                    is_available=True,
+                    notes=self._build_score_notes(
+                        chef_travel_minutes,
+                        float(skill_scores[i]),
+                        float(workload_scores[i]),
+                        chef_daily_bookings,
+                        chef_is_preferred,
+                    ),
+                )
+            )
+
+        return scored_chefs
+
     async def _score_chef(
         self,
         chef: ChefForAssignment,
@@ -794,6 +1166,68 @@ class ChefOptimizer:
 
         return travel_minutes, round(distance_miles, 1)
 
+    def _calculate_travel_haversine_batch(
+        self,
+        origin_lats: np.ndarray,
+        origin_lngs: np.ndarray,
+        dest_lats: np.ndarray,
+        dest_lngs: np.ndarray,
+        event_date: date,
+        event_times: List[time],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized _calculate_travel_haversine over arrays of legs.
+
+        Applies the same rush hour and congested area multipliers (with the
+        same integer truncation) so results match the scalar version.
+
+        Returns:
+            Tuple of (travel_time_minutes int array, distance_miles array)
+        """
+        R = 3959  # Earth's radius in miles
+
+        lat1, lon1 = np.radians(origin_lats), np.radians(origin_lngs)
+        lat2, lon2 = np.radians(dest_lats), np.radians(dest_lngs)
+
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+        distance_miles = R * c
+        travel_minutes = ((distance_miles / AVERAGE_SPEED_MPH) * 60).astype(np.int64)
+
+        # Rush hour is evaluated per leg using the EVENT datetime (not now!)
+        is_rush_hour = np.array(
+            [self._is_rush_hour(datetime.combine(event_date, t)) for t in event_times],
+            dtype=bool,
+        )
+        travel_minutes = np.where(
+            is_rush_hour,
+            (travel_minutes * RUSH_HOUR_MULTIPLIER).astype(np.int64),
+            travel_minutes,
+        )
+
+        # Congested area multiplier (stacks with rush hour)
+        is_congested = self._congested_area_mask(
+            origin_lats, origin_lngs
+        ) | self._congested_area_mask(dest_lats, dest_lngs)
+        travel_minutes = np.where(
+            is_congested,
+            (travel_minutes * CONGESTED_AREA_MULTIPLIER).astype(np.int64),
+            travel_minutes,
+        )
+
+        return travel_minutes, np.round(distance_miles, 1)
+
+    def _congested_area_mask(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Vectorized _is_congested_area: True where coordinates are congested."""
+        mask = np.zeros(lats.shape, dtype=bool)
+        for min_lat, max_lat, min_lng, max_lng, _area_name in CONGESTED_AREAS:
+            mask |= (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+        return mask
+
     def _is_rush_hour(self, dt: datetime) -> bool:
         """Check if datetime is during rush hour (Mon-Fri 2:30-7:30 PM)."""
         if dt.weekday() >= 5:  # Weekend
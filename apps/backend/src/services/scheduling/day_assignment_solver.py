@@ -0,0 +1,645 @@
+"""
+Day Assignment Solver - Joint Chef Assignment for a Whole Service Day
+
+Calling ChefOptimizer.get_optimal_assignment once per booking is greedy:
+the first booking can take the chef who would have suited three later
+bookings better. This solver plans every unassigned booking of a station
+and date together and returns one chef-to-booking plan.
+
+Scoring (same weights as ChefOptimizer):
+- Travel (WEIGHT_TRAVEL), Skill (WEIGHT_SKILL), Rating (WEIGHT_RATING),
+  Preference (WEIGHT_PREFERENCE + PREFERRED_CHEF_BONUS)
+- Workload (WEIGHT_WORKLOAD) is scored from each chef's FINAL daily count,
+  so stacking bookings on one chef is penalized for every booking involved
+
+Hard constraints:
+- Consecutive travel feasibility (Haversine travel + BASE_BUFFER_MINUTES)
+- A chef cannot work two events in the same slot
+- A chef never exceeds MAX_DAILY_BOOKINGS (existing + planned)
+
+Search:
+1. Constant number of queries: unassigned bookings, chefs, chef schedules
+2. Booking×chef score matrix and stop×stop travel matrix (vectorized)
+3. Regret construction: always place the booking that loses the most if
+   it doesn't get its best feasible chef
+4. Local search (relocate + swap moves) until no move improves the plan
+   or the time budget runs out
+
+Travel uses Haversine only (100 bookings × 40 chefs would be thousands of
+Google Maps calls) - this is a scheduling decision, not a travel fee.
+"""
+
+import logging
+import time as time_module
+from datetime import date, time
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.address import Address
+from db.models.core import Booking, BookingStatus
+
+from .chef_optimizer import (
+    BASE_BUFFER_MINUTES,
+    MAX_DAILY_BOOKINGS,
+    PREFERRED_CHEF_BONUS,
+    WEIGHT_PREFERENCE,
+    WEIGHT_RATING,
+    WEIGHT_SKILL,
+    WEIGHT_TRAVEL,
+    WEIGHT_WORKLOAD,
+    BookingForAssignment,
+    ChefForAssignment,
+    ChefOptimizer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+# Default wall-clock budget for the search (seconds)
+DEFAULT_TIME_BUDGET_SECONDS = 3.0
+
+# Reward per assigned booking - larger than any achievable score difference,
+# so the solver always prefers assigning one more booking over a better score
+ASSIGNMENT_REWARD = 1000.0
+
+# Statuses that no longer need a chef
+INACTIVE_BOOKING_STATUSES = [
+    BookingStatus.CANCELLED,
+    BookingStatus.NO_SHOW,
+    BookingStatus.COMPLETED,
+]
+
+
+# ============================================================================
+# Data Models
+# ============================================================================
+
+
+class PlannedAssignment(BaseModel):
+    """One booking's slot in the day plan."""
+
+    booking_id: UUID
+    event_time: time
+    guest_count: int
+    chef_id: Optional[UUID] = None
+    chef_name: Optional[str] = None
+    score: float = 0.0
+    travel_time_minutes: Optional[int] = None
+    reason: str = ""
+
+
+class DayAssignmentPlan(BaseModel):
+    """Result of the day-level assignment solver."""
+
+    station_id: UUID
+    event_date: date
+    assignments: List[PlannedAssignment] = []
+    assigned_count: int = 0
+    unassigned_count: int = 0
+    total_score: float = 0.0
+    converged: bool = True  # False if the time budget cut the search short
+    iterations: int = 0
+    elapsed_ms: float = 0.0
+
+
+# ============================================================================
+# Day Assignment Solver
+# ============================================================================
+
+
+class DayAssignmentSolver:
+    """
+    Jointly assigns chefs to every unassigned booking of a station/date.
+
+    Usage:
+        solver = DayAssignmentSolver(db)
+        plan = await solver.solve(station_id, event_date)
+        if plan.assigned_count:
+            await solver.apply_plan(plan)
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+    ):
+        self.db = db
+        self.time_budget_seconds = time_budget_seconds
+        self._optimizer = ChefOptimizer(db)
+
+    async def solve(self, station_id: UUID, event_date: date) -> DayAssignmentPlan:
+        """
+        Build the day plan for a station.
+
+        Args:
+            station_id: Station whose unassigned bookings are planned
+            event_date: Service day
+
+        Returns:
+            DayAssignmentPlan (bookings that cannot be placed are returned
+            with chef_id=None and a reason)
+        """
+        bookings = await self._get_unassigned_bookings(station_id, event_date)
+        if not bookings:
+            return DayAssignmentPlan(station_id=station_id, event_date=event_date)
+
+        chefs = await self._optimizer._get_available_chefs(event_date, time(0, 0))
+        schedules = await self._optimizer._get_bookings_with_venues_for_chefs(
+            [c.chef_id for c in chefs], event_date
+        )
+
+        plan = self.solve_for(bookings, chefs, schedules, event_date)
+        plan.station_id = station_id
+        return plan
+
+    def solve_for(
+        self,
+        bookings: List[BookingForAssignment],
+        chefs: List[ChefForAssignment],
+        schedules: Dict[UUID, List[dict]],
+        event_date: date,
+    ) -> DayAssignmentPlan:
+        """
+        Solve an already-loaded problem (no database access).
+
+        Args:
+            bookings: Bookings to place
+            chefs: Candidate chefs
+            schedules: chef_id -> existing bookings with venues
+                (from ChefOptimizer._get_bookings_with_venues_for_chefs)
+            event_date: Service day
+
+        Returns:
+            DayAssignmentPlan (station_id is set to a nil UUID; solve()
+            fills in the real one)
+        """
+        started = time_module.monotonic()
+        deadline = started + self.time_budget_seconds
+
+        problem = _DayProblem(self._optimizer, bookings, chefs, schedules, event_date)
+        state = _PlanState(problem)
+
+        state.construct_by_regret()
+        converged, iterations = state.improve(deadline)
+
+        elapsed_ms = (time_module.monotonic() - started) * 1000
+        plan = state.to_plan(event_date)
+        plan.converged = converged
+        plan.iterations = iterations
+        plan.elapsed_ms = round(elapsed_ms, 1)
+
+        logger.info(
+            f"DayAssignmentSolver: {plan.assigned_count}/{len(bookings)} bookings "
+            f"assigned across {len(chefs)} chefs in {plan.elapsed_ms} ms "
+            f"({iterations} improvement passes, converged={converged})"
+        )
+        return plan
+
+    async def apply_plan(self, plan: DayAssignmentPlan) -> List[Booking]:
+        """
+        Write the plan's chef assignments to the bookings table.
+
+        Only bookings that are still unassigned are updated, so a manual
+        assignment made after the plan was computed is never overwritten.
+        Caller handles IntegrityError (ix_core_bookings_chef_slot_unique).
+
+        Returns:
+            List of updated Booking rows
+        """
+        chef_by_booking = {
+            a.booking_id: a.chef_id for a in plan.assignments if a.chef_id is not None
+        }
+        if not chef_by_booking:
+            return []
+
+        result = await self.db.execute(
+            select(Booking).where(
+                and_(
+                    Booking.id.in_(list(chef_by_booking)),
+                    Booking.chef_id.is_(None),
+                )
+            )
+        )
+        bookings = list(result.scalars().all())
+
+        for booking in bookings:
+            booking.chef_id = chef_by_booking[booking.id]
+
+        await self.db.commit()
+
+        skipped = len(chef_by_booking) - len(bookings)
+        if skipped:
+            logger.warning(
+                f"DayAssignmentSolver: {skipped} bookings were assigned elsewhere "
+                "before the plan was applied - left unchanged"
+            )
+
+        return bookings
+
+    async def _get_unassigned_bookings(
+        self,
+        station_id: UUID,
+        event_date: date,
+    ) -> List[BookingForAssignment]:
+        """Load every active booking of the station/date without a chef."""
+        query = (
+            select(
+                Booking.id,
+                Booking.slot,
+                Booking.party_adults,
+                Booking.party_kids,
+                Address.lat,
+                Address.lng,
+            )
+            .join(Address, Booking.venue_address_id == Address.id, isouter=True)
+            .where(
+                and_(
+                    Booking.station_id == station_id,
+                    Booking.date == event_date,
+                    Booking.chef_id.is_(None),
+                    Booking.deleted_at.is_(None),
+                    Booking.status.notin_(INACTIVE_BOOKING_STATUSES),
+                )
+            )
+            .order_by(Booking.slot)
+        )
+
+        result = await self.db.execute(query)
+
+        return [
+            BookingForAssignment(
+                booking_id=row[0],
+                event_date=event_date,
+                event_time=row[1],
+                guest_count=(row[2] or 0) + (row[3] or 0),
+                venue_lat=Decimal(str(row[4])) if row[4] else None,
+                venue_lng=Decimal(str(row[5])) if row[5] else None,
+            )
+            for row in result.all()
+        ]
+
+
+# ============================================================================
+# Internal Search Structures
+# ============================================================================
+
+
+class _DayProblem:
+    """
+    Precomputed matrices for one solve.
+
+    Stops are every event the plan has to reason about: planned bookings
+    first (indices 0..B-1), then the chefs' existing bookings.
+    """
+
+    def __init__(
+        self,
+        optimizer: ChefOptimizer,
+        bookings: List[BookingForAssignment],
+        chefs: List[ChefForAssignment],
+        schedules: Dict[UUID, List[dict]],
+        event_date: date,
+    ):
+        self.bookings = bookings
+        self.chefs = chefs
+        num_bookings = len(bookings)
+        num_chefs = len(chefs)
+
+        # --- Stops (planned bookings + existing bookings) ---
+        stop_slots: List[time] = [b.event_time for b in bookings]
+        stop_lats: List[Optional[float]] = [
+            float(b.venue_lat) if b.venue_lat else None for b in bookings
+        ]
+        stop_lngs: List[Optional[float]] = [
+            float(b.venue_lng) if b.venue_lng else None for b in bookings
+        ]
+
+        # Existing stops per chef (indices into the stop arrays)
+        self.existing_stops: List[List[int]] = []
+        for chef in chefs:
+            indices = []
+            for existing in schedules.get(chef.chef_id, []):
+                indices.append(len(stop_slots))
+                stop_slots.append(existing["slot"])
+                stop_lats.append(existing["lat"])
+                stop_lngs.append(existing["lng"])
+            self.existing_stops.append(indices)
+
+        self.stop_minutes = [t.hour * 60 + t.minute for t in stop_slots]
+        has_coords = np.array([bool(lat) and bool(lng) for lat, lng in zip(stop_lats, stop_lngs)])
+        lats = np.array([lat if lat else 0.0 for lat in stop_lats], dtype=float)
+        lngs = np.array([lng if lng else 0.0 for lng in stop_lngs], dtype=float)
+
+        # --- Stop-to-stop travel minutes (rush hour keyed on destination slot) ---
+        num_stops = len(stop_slots)
+        origin_idx, dest_idx = np.meshgrid(
+            np.arange(num_stops), np.arange(num_stops), indexing="ij"
+        )
+        origin_idx, dest_idx = origin_idx.ravel(), dest_idx.ravel()
+        leg_minutes, _ = optimizer._calculate_travel_haversine_batch(
+            origin_lats=lats[origin_idx],
+            origin_lngs=lngs[origin_idx],
+            dest_lats=lats[dest_idx],
+            dest_lngs=lngs[dest_idx],
+            event_date=event_date,
+            event_times=[stop_slots[j] for j in dest_idx],
+        )
+        leg_minutes = leg_minutes.reshape(num_stops, num_stops)
+        # Legs with a missing venue are skipped, like ChefOptimizer does
+        known = np.outer(has_coords, has_coords)
+        self.required_gap = np.where(known, leg_minutes + BASE_BUFFER_MINUTES, 0).tolist()
+
+        # --- Chef home -> booking venue travel (bookings × chefs) ---
+        home_lats = np.array([float(c.home_lat) for c in chefs])
+        home_lngs = np.array([float(c.home_lng) for c in chefs])
+        b_idx, c_idx = np.meshgrid(np.arange(num_bookings), np.arange(num_chefs), indexing="ij")
+        b_idx, c_idx = b_idx.ravel(), c_idx.ravel()
+        home_minutes, _ = optimizer._calculate_travel_haversine_batch(
+            origin_lats=home_lats[c_idx],
+            origin_lngs=home_lngs[c_idx],
+            dest_lats=lats[b_idx],
+            dest_lngs=lngs[b_idx],
+            event_date=event_date,
+            event_times=[bookings[i].event_time for i in b_idx],
+        )
+        home_minutes = home_minutes.reshape(num_bookings, num_chefs)
+        booking_has_coords = has_coords[:num_bookings]
+        self.home_travel_minutes = home_minutes
+
+        # --- Static score matrix (everything except workload) ---
+        travel_scores = np.array(
+            [[optimizer._score_travel(int(m)) for m in row] for row in home_minutes]
+        ).reshape(num_bookings, num_chefs)
+        # No venue coordinates -> travel can't discriminate between chefs
+        travel_scores[~booking_has_coords, :] = 0.0
+
+        skill_scores = np.array(
+            [
+                [optimizer._score_skill_match(c.specialty, b.guest_count) for c in chefs]
+                for b in bookings
+            ]
+        ).reshape(num_bookings, num_chefs)
+        rating_scores = np.tile(
+            np.array([optimizer._score_rating(c.rating) for c in chefs]), (num_bookings, 1)
+        )
+        is_preferred = np.array(
+            [
+                [bool(b.preferred_chef_id and b.preferred_chef_id == c.chef_id) for c in chefs]
+                for b in bookings
+            ]
+        ).reshape(num_bookings, num_chefs)
+
+        static = (
+            travel_scores * WEIGHT_TRAVEL / 100
+            + skill_scores * WEIGHT_SKILL / 100
+            + rating_scores * WEIGHT_RATING / 100
+            + np.where(is_preferred, 100.0, 0.0) * WEIGHT_PREFERENCE / 100
+            + np.where(is_preferred, PREFERRED_CHEF_BONUS, 0.0)
+        )
+        self.static_scores = static.tolist()
+
+        # Workload contribution per booking, indexed by chef's OTHER bookings
+        self.workload_value = [
+            optimizer._score_workload(n) * WEIGHT_WORKLOAD / 100
+            for n in range(MAX_DAILY_BOOKINGS + 1)
+        ]
+
+    def is_feasible(self, chef_idx: int, planned: List[int]) -> bool:
+        """Check capacity, slot conflicts and consecutive travel for a chef day."""
+        stops = self.existing_stops[chef_idx] + planned
+        if len(stops) > MAX_DAILY_BOOKINGS:
+            return False
+
+        stops = sorted(stops, key=lambda s: self.stop_minutes[s])
+        for current, following in zip(stops, stops[1:]):
+            gap = self.stop_minutes[following] - self.stop_minutes[current]
+            if gap <= 0:
+                return False  # Same slot twice
+            if gap < self.required_gap[current][following]:
+                return False
+        return True
+
+    def chef_value(self, chef_idx: int, planned: List[int]) -> float:
+        """Objective contribution of one chef's planned bookings."""
+        if not planned:
+            return 0.0
+        others = len(self.existing_stops[chef_idx]) + len(planned) - 1
+        workload = self.workload_value[min(others, MAX_DAILY_BOOKINGS)]
+        return sum(self.static_scores[b][chef_idx] for b in planned) + len(planned) * (
+            ASSIGNMENT_REWARD + workload
+        )
+
+
+class _PlanState:
+    """Mutable assignment state with construction and local search moves."""
+
+    def __init__(self, problem: _DayProblem):
+        self.problem = problem
+        self.num_bookings = len(problem.bookings)
+        self.num_chefs = len(problem.chefs)
+        self.chef_of: List[Optional[int]] = [None] * self.num_bookings
+        self.planned: List[List[int]] = [[] for _ in range(self.num_chefs)]
+        self.values: List[float] = [0.0] * self.num_chefs
+
+    def _insertion_gain(self, booking_idx: int, chef_idx: int) -> Optional[float]:
+        """Objective gain of adding a booking to a chef, or None if infeasible."""
+        candidate = self.planned[chef_idx] + [booking_idx]
+        if not self.problem.is_feasible(chef_idx, candidate):
+            return None
+        return self.problem.chef_value(chef_idx, candidate) - self.values[chef_idx]
+
+    def _assign(self, booking_idx: int, chef_idx: int) -> None:
+        self.planned[chef_idx].append(booking_idx)
+        self.chef_of[booking_idx] = chef_idx
+        self.values[chef_idx] = self.problem.chef_value(chef_idx, self.planned[chef_idx])
+
+    def _unassign(self, booking_idx: int) -> None:
+        chef_idx = self.chef_of[booking_idx]
+        if chef_idx is None:
+            return
+        self.planned[chef_idx].remove(booking_idx)
+        self.chef_of[booking_idx] = None
+        self.values[chef_idx] = self.problem.chef_value(chef_idx, self.planned[chef_idx])
+
+    def construct_by_regret(self) -> None:
+        """
+        Regret insertion: place the booking with the largest gap between its
+        best and second-best feasible chef first. Bookings with a single
+        feasible chef have infinite regret and are placed immediately.
+        """
+        gains = [
+            [self._insertion_gain(b, c) for c in range(self.num_chefs)]
+            for b in range(self.num_bookings)
+        ]
+        remaining = set(range(self.num_bookings))
+
+        while remaining:
+            best_booking: Optional[int] = None
+            best_chef: Optional[int] = None
+            best_regret = -1.0
+
+            for b in remaining:
+                feasible = [(g, c) for c, g in enumerate(gains[b]) if g is not None]
+                if not feasible:
+                    continue
+                feasible.sort(reverse=True)
+                regret = (
+                    float("inf") if len(feasible) == 1 else feasible[0][0] - feasible[1][0]
+                )
+                if regret > best_regret:
+                    best_regret = regret
+                    best_booking, best_chef = b, feasible[0][1]
+
+            if best_booking is None:
+                break  # Nothing left can be placed
+
+            self._assign(best_booking, best_chef)
+            remaining.discard(best_booking)
+
+            # Only the chosen chef's column changed
+            for b in remaining:
+                gains[b][best_chef] = self._insertion_gain(b, best_chef)
+
+    def improve(self, deadline: float) -> Tuple[bool, int]:
+        """
+        Local search with relocate and swap moves (first improvement).
+
+        Returns:
+            (converged, passes) - converged is False if the deadline hit
+        """
+        passes = 0
+        while True:
+            passes += 1
+            improved = False
+
+            for b in range(self.num_bookings):
+                if time_module.monotonic() > deadline:
+                    return False, passes
+                if self._try_relocate(b):
+                    improved = True
+
+            for b1 in range(self.num_bookings):
+                if time_module.monotonic() > deadline:
+                    return False, passes
+                for b2 in range(b1 + 1, self.num_bookings):
+                    if self._try_swap(b1, b2):
+                        improved = True
+
+            if not improved:
+                return True, passes
+
+    def _try_relocate(self, booking_idx: int) -> bool:
+        """Move a booking to the chef where it adds the most (if it improves)."""
+        source = self.chef_of[booking_idx]
+        removal_delta = 0.0
+        source_without: List[int] = []
+        if source is not None:
+            source_without = [b for b in self.planned[source] if b != booking_idx]
+            removal_delta = (
+                self.problem.chef_value(source, source_without) - self.values[source]
+            )
+
+        best_delta, best_target = 1e-9, None
+        for target in range(self.num_chefs):
+            if target == source:
+                continue
+            gain = self._insertion_gain(booking_idx, target)
+            if gain is not None and removal_delta + gain > best_delta:
+                best_delta, best_target = removal_delta + gain, target
+
+        if best_target is None:
+            return False
+
+        self._unassign(booking_idx)
+        self._assign(booking_idx, best_target)
+        return True
+
+    def _try_swap(self, b1: int, b2: int) -> bool:
+        """Exchange the chefs of two bookings if that improves the plan."""
+        c1, c2 = self.chef_of[b1], self.chef_of[b2]
+        if c1 == c2:
+            return False
+
+        new_c1 = [b for b in self.planned[c1] if b != b1] + [b2] if c1 is not None else None
+        new_c2 = [b for b in self.planned[c2] if b != b2] + [b1] if c2 is not None else None
+
+        delta = 0.0
+        if c1 is not None:
+            if not self.problem.is_feasible(c1, new_c1):
+                return False
+            delta += self.problem.chef_value(c1, new_c1) - self.values[c1]
+        if c2 is not None:
+            if not self.problem.is_feasible(c2, new_c2):
+                return False
+            delta += self.problem.chef_value(c2, new_c2) - self.values[c2]
+
+        if delta <= 1e-9:
+            return False
+
+        self._unassign(b1)
+        self._unassign(b2)
+        if c1 is not None:
+            self._assign(b2, c1)
+        if c2 is not None:
+            self._assign(b1, c2)
+        return True
+
+    def to_plan(self, event_date: date) -> DayAssignmentPlan:
+        """Convert the state into a DayAssignmentPlan."""
+        problem = self.problem
+        assignments: List[PlannedAssignment] = []
+        total_score = 0.0
+
+        for b, booking in enumerate(problem.bookings):
+            chef_idx = self.chef_of[b]
+            if chef_idx is None:
+                assignments.append(
+                    PlannedAssignment(
+                        booking_id=booking.booking_id,
+                        event_time=booking.event_time,
+                        guest_count=booking.guest_count,
+                        reason="No chef with capacity and feasible travel for this slot",
+                    )
+                )
+                continue
+
+            chef = problem.chefs[chef_idx]
+            others = len(problem.existing_stops[chef_idx]) + len(self.planned[chef_idx]) - 1
+            score = (
+                problem.static_scores[b][chef_idx]
+                + problem.workload_value[min(others, MAX_DAILY_BOOKINGS)]
+            )
+            total_score += score
+
+            assignments.append(
+                PlannedAssignment(
+                    booking_id=booking.booking_id,
+                    event_time=booking.event_time,
+                    guest_count=booking.guest_count,
+                    chef_id=chef.chef_id,
+                    chef_name=chef.chef_name,
+                    score=round(score, 2),
+                    travel_time_minutes=int(problem.home_travel_minutes[b][chef_idx]),
+                    reason=f"{others + 1} booking(s) for this chef today",
+                )
+            )
+
+        assigned = sum(1 for c in self.chef_of if c is not None)
+        return DayAssignmentPlan(
+            station_id=UUID(int=0),
+            event_date=event_date,
+            assignments=assignments,
+            assigned_count=assigned,
+            unassigned_count=self.num_bookings - assigned,
+            total_score=round(total_score, 2),
+        )
@@ -0,0 +1,413 @@
+"""
+Distance Service - Cached, Non-Blocking Travel Distances
+========================================================
+
+Driving distances for PricingService travel fees (customer address -> station)
+without blocking the event loop:
+
+1. In-memory LRU (per process, 1000 routes)
+2. public.travel_cache rows keyed by the normalized origin/destination
+   (route_key, 30-day TTL) - shared by every replica, survives restarts
+3. Google Maps Distance Matrix over one pooled httpx.AsyncClient (keep-alive
+   connections instead of a new TLS handshake per quote)
+
+Concurrent lookups of the same route share a single load (single flight), so
+a burst of quotes for one venue costs at most one API request.
+
+Addresses are normalized before keying (case, punctuation, whitespace,
+ZIP+4, common street-suffix spellings, trailing "USA"), so
+"123 Main Street, Sacramento, CA 95814" and "123 main st sacramento ca
+95814-1234" share an entry. A destination that is only a ZIP code
+normalizes to the 5-digit ZIP.
+
+ZIP Centroid Table:
+    scripts/precompute_zip_distances.py stores the driving distance from the
+    station to every ZIP of the service area (Google resolves a bare ZIP to
+    its centroid) as source="zip_centroid" rows under the same route keys.
+    ZIP-only quotes are then answered without an API call, and
+    zip_estimate() gives instant estimates when the API is unavailable.
+
+Usage:
+    from services.scheduling.distance_service import get_distance_service
+
+    route = await get_distance_service().get_distance(station_address, customer_address)
+    print(route.distance_miles, route.drive_time)
+
+See: db/models/travel_cache.py
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Any, Callable, Optional, Union
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.travel_cache import TravelCache
+
+logger = logging.getLogger(__name__)
+
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+METERS_PER_MILE = 1609.34
+
+# Configuration
+LRU_CACHE_MAX_SIZE = 1000  # Routes kept in process memory
+LRU_CACHE_TTL_SECONDS = 60 * 60  # Re-read the shared cache hourly
+CACHE_TTL_DAYS = 30  # Address routes (roads rarely change)
+ZIP_TABLE_TTL_DAYS = 365  # Precomputed ZIP centroid rows
+REQUEST_TIMEOUT_SECONDS = 10
+MAX_CONNECTIONS = 20
+MAX_DESTINATIONS_PER_REQUEST = 25  # Distance Matrix limit per origin
+
+
+# ============================================================================
+# RESULTS & ERRORS
+# ============================================================================
+
+
+@dataclass
+class RouteDistance:
+    """Driving distance from the origin to one destination."""
+
+    distance_miles: float
+    travel_time_minutes: int
+    source: str  # "google_maps", "zip_centroid"
+    cached: bool = False
+
+    @property
+    def drive_time(self) -> str:
+        """Duration in Distance Matrix style ("1 hour 5 mins")."""
+        return format_drive_time(self.travel_time_minutes)
+
+
+class DistanceServiceError(Exception):
+    """Distance Matrix request failed (status other than OK)."""
+
+    def __init__(self, status: Optional[str], message: Optional[str] = None):
+        self.status = status
+        self.message = message
+        super().__init__(f"{status} - {message or 'Unknown error'}")
+
+
+class RouteNotFoundError(DistanceServiceError):
+    """No driving route to the destination (NOT_FOUND, ZERO_RESULTS)."""
+
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_COUNTRY_SUFFIXES = (" united states of america", " united states", " usa", " us")
+_ABBREVIATIONS = {
+    "street": "st",
+    "avenue": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "parkway": "pkwy",
+    "highway": "hwy",
+    "circle": "cir",
+    "terrace": "ter",
+    "suite": "ste",
+    "apartment": "apt",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "california": "ca",
+}
+
+
+def normalize_address(address: str) -> str:
+    """Canonical form of an address for cache keys."""
+    text = _ZIP_RE.sub(r"\1", address.lower())
+    words = [_ABBREVIATIONS.get(word, word) for word in re.findall(r"[a-z0-9]+", text)]
+    normalized = " ".join(words)
+    for suffix in _COUNTRY_SUFFIXES:
+        if normalized.endswith(suffix):
+            normalized = normalized[: -len(suffix)]
+            break
+    return normalized
+
+
+def extract_zip(address: str) -> Optional[str]:
+    """Last 5-digit ZIP code in an address, if any."""
+    matches = _ZIP_RE.findall(address or "")
+    return matches[-1] if matches else None
+
+
+def route_key(origin: str, destination: str) -> str:
+    """travel_cache.route_key of an origin/destination pair."""
+    pair = f"{normalize_address(origin)}|{normalize_address(destination)}"
+    return hashlib.sha256(pair.encode("utf-8")).hexdigest()
+
+
+def format_drive_time(minutes: int) -> str:
+    hours, mins = divmod(max(int(minutes), 1), 60)
+    parts = []
+    if hours:
+        parts.append(f"{hours} hour{'s' if hours > 1 else ''}")
+    if mins or not hours:
+        parts.append(f"{mins} min{'s' if mins != 1 else ''}")
+    return " ".join(parts)
+
+
+async def store_routes(
+    db: AsyncSession, routes: dict[str, RouteDistance], ttl_days: int = CACHE_TTL_DAYS
+) -> None:
+    """Upsert routes into travel_cache by route_key (one statement)."""
+    if not routes:
+        return
+    expires_at = datetime.now(timezone.utc) + timedelta(days=ttl_days)
+    statement = pg_insert(TravelCache).values(
+        [
+            {
+                "id": uuid4(),
+                "route_key": key,
+                "distance_miles": route.distance_miles,
+                "travel_time_minutes": route.travel_time_minutes,
+                "is_rush_hour": False,
+                "source": route.source,
+                "expires_at": expires_at,
+                "hit_count": 0,
+            }
+            for key, route in routes.items()
+        ]
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TravelCache.route_key],
+            index_where=TravelCache.route_key.isnot(None),
+            set_={
+                column: statement.excluded[column]
+                for column in ("distance_miles", "travel_time_minutes", "source", "expires_at")
+            },
+        )
+    )
+
+
+# ============================================================================
+# DISTANCE SERVICE
+# ============================================================================
+
+
+class DistanceService:
+    """
+    Cached Distance Matrix client.
+
+    Flow per route:
+    1. LRU → return
+    2. In-flight load of the same route → await it
+    3. travel_cache by route_key → populate LRU
+    4. Distance Matrix API → store in travel_cache and LRU
+
+    Cache failures are logged and never fail a lookup; API failures raise
+    DistanceServiceError / RouteNotFoundError / httpx.TimeoutException.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache_ttl_days: int = CACHE_TTL_DAYS,
+    ):
+        """
+        Args:
+            api_key: Google Maps API key (default: GOOGLE_MAPS_API_KEY)
+            session_factory: Async context manager yielding a session that
+                commits on exit (default: core.database.get_db_context)
+            http_client: Shared client (default: a pooled client created lazily)
+            cache_ttl_days: Lifetime of address routes in travel_cache
+        """
+        self.api_key = api_key or os.getenv("GOOGLE_MAPS_API_KEY")
+        if session_factory is None:
+            from core.database import get_db_context
+
+            session_factory = get_db_context
+        self.session_factory = session_factory
+        self.cache_ttl_days = cache_ttl_days
+        self._http_client = http_client
+        self._lru: OrderedDict[str, tuple[float, RouteDistance]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = {"lru_hits": 0, "db_hits": 0, "coalesced": 0, "api_calls": 0}
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS // 2,
+                ),
+            )
+        return self._http_client
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def get_distance(self, origin: str, destination: str) -> RouteDistance:
+        """Driving distance from origin to destination (cached, coalesced)."""
+        key = route_key(origin, destination)
+        cached = self._lru_get(key)
+        if cached is not None:
+            return cached
+
+        load = self._inflight.get(key)
+        if load is None:
+            load = asyncio.ensure_future(self._load(key, origin, destination))
+            self._inflight[key] = load
+            load.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._stats["coalesced"] += 1
+        # Shielded: a cancelled caller must not cancel the others' lookup
+        return await asyncio.shield(load)
+
+    async def zip_estimate(self, origin: str, zip_code: str) -> Optional[RouteDistance]:
+        """Cached distance to a ZIP centroid, without calling the API."""
+        key = route_key(origin, zip_code)
+        route = self._lru_get(key)
+        if route is None:
+            route = await self._db_get(key)
+            if route is not None:
+                self._lru_set(key, route)
+        return route
+
+    async def fetch_matrix(
+        self, origin: str, destinations: list[str]
+    ) -> list[Union[RouteDistance, RouteNotFoundError]]:
+        """
+        One Distance Matrix request for up to 25 destinations (uncached).
+
+        Destinations without a route come back as RouteNotFoundError
+        instances; a failed request raises.
+        """
+        if not self.api_key:
+            raise DistanceServiceError("REQUEST_DENIED", "Google Maps API key not configured")
+
+        self._stats["api_calls"] += 1
+        response = await self._get_http_client().get(
+            DISTANCE_MATRIX_URL,
+            params={
+                "origins": origin,
+                "destinations": "|".join(destinations),
+                "key": self.api_key,
+                "units": "imperial",
+            },
+        )
+        data = response.json()
+        if data.get("status") != "OK":
+            raise DistanceServiceError(data.get("status"), data.get("error_message"))
+
+        results: list[Union[RouteDistance, RouteNotFoundError]] = []
+        for destination, element in zip(destinations, data["rows"][0]["elements"]):
+            if element.get("status") != "OK":
+                results.append(RouteNotFoundError(element.get("status"), destination))
+                continue
+            results.append(
+                RouteDistance(
+                    distance_miles=element["distance"]["value"] / METERS_PER_MILE,
+                    travel_time_minutes=element["duration"]["value"] // 60,
+                    source="google_maps",
+                )
+            )
+        return results
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self._stats, "lru_size": len(self._lru), "in_flight": len(self._inflight)}
+
+    # ------------------------------------------------------------------
+
+    async def _load(self, key: str, origin: str, destination: str) -> RouteDistance:
+        route = await self._db_get(key)
+        if route is None:
+            (route,) = await self.fetch_matrix(origin, [destination])
+            if isinstance(route, RouteNotFoundError):
+                raise route
+            try:
+                async with self.session_factory() as db:
+                    await store_routes(db, {key: route}, self.cache_ttl_days)
+            except Exception as e:
+                logger.warning(f"⚠️ Travel distance cache save failed (non-blocking): {e}")
+        self._lru_set(key, route)
+        return route
+
+    def _forget(self, key: str, load: asyncio.Future) -> None:
+        if self._inflight.get(key) is load:
+            del self._inflight[key]
+        # Failures are re-raised to every waiter; mark retrieved for the case
+        # where all of them were cancelled
+        if not load.cancelled():
+            load.exception()
+
+    async def _db_get(self, key: str) -> Optional[RouteDistance]:
+        try:
+            async with self.session_factory() as db:
+                row = (
+                    await db.execute(
+                        select(
+                            TravelCache.distance_miles,
+                            TravelCache.travel_time_minutes,
+                            TravelCache.source,
+                        ).where(TravelCache.route_key == key, TravelCache.expires_at > func.now())
+                    )
+                ).first()
+        except Exception as e:
+            logger.warning(f"⚠️ Travel distance cache lookup error: {e}")
+            return None
+
+        if row is None:
+            return None
+        self._stats["db_hits"] += 1
+        return RouteDistance(
+            distance_miles=row.distance_miles,
+            travel_time_minutes=row.travel_time_minutes,
+            source=row.source,
+            cached=True,
+        )
+
+    def _lru_get(self, key: str) -> Optional[RouteDistance]:
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        expires_at, route = entry
+        if expires_at <= time.monotonic():
+            del self._lru[key]
+            return None
+        self._lru.move_to_end(key)
+        self._stats["lru_hits"] += 1
+        return route
+
+    def _lru_set(self, key: str, route: RouteDistance) -> None:
+        cached = RouteDistance(route.distance_miles, route.travel_time_minutes, route.source, True)
+        self._lru[key] = (time.monotonic() + LRU_CACHE_TTL_SECONDS, cached)
+        self._lru.move_to_end(key)
+        while len(self._lru) > LRU_CACHE_MAX_SIZE:
+            self._lru.popitem(last=False)
+
+
+_distance_service: Optional[DistanceService] = None
+
+
+def get_distance_service() -> DistanceService:
+    """Process-wide DistanceService (shares the connection pool and caches)."""
+    global _distance_service
+    if _distance_service is None:
+        _distance_service = DistanceService()
+    return _distance_service
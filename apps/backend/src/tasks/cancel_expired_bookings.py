@@ -45,6 +45,7 @@ from db.models.core import Booking, BookingStatus
 from db.models.core import Payment
 from core.database import get_db
 from services.business_config_service import get_business_config_sync
+from services.scheduling.availability_cache import invalidate_availability_sync
 
 logger = logging.getLogger(__name__)
 
@@ -226,6 +227,9 @@ async def auto_cancel_after_24_hours():
                 db.commit()
                 cancelled_count += 1
 
+                # Cancelling frees the slot
+                invalidate_availability_sync([booking.date], station_id=booking.station_id)
+
                 logger.warning(
                     f"Auto-cancelled booking {booking.id} - "
                     f"deposit deadline expired, only ${total_paid} paid (need $100)"
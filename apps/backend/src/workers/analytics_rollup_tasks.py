@@ -0,0 +1,53 @@
+"""
+Analytics Rollup Worker
+Periodic tasks keeping the admin dashboard's booking rollups current
+"""
+
+import asyncio
+import logging
+
+from workers.celery_config import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _refresh(full: bool) -> dict:
+    from core.database import engine
+    from services.analytics_rollup_service import refresh_booking_rollups
+
+    try:
+        return await refresh_booking_rollups(full=full)
+    finally:
+        # Pooled connections are bound to this task's event loop
+        await engine.dispose()
+
+
+@celery_app.task(name="workers.analytics_rollup_tasks.refresh_booking_rollups")
+def refresh_booking_rollups():
+    """
+    Fold booking changes since the last run into the analytics rollups
+
+    Runs every 5 minutes; only the days/customers touched by changed
+    bookings are recomputed.
+    """
+    try:
+        summary = asyncio.run(_refresh(full=False))
+        return {"status": "success", **summary}
+    except Exception as e:
+        logger.exception(f"Analytics rollup refresh failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(name="workers.analytics_rollup_tasks.rebuild_booking_rollups")
+def rebuild_booking_rollups():
+    """
+    Rebuild every analytics rollup from core.bookings
+
+    Runs nightly to repair changes the incremental watermark cannot see.
+    """
+    try:
+        summary = asyncio.run(_refresh(full=True))
+        return {"status": "success", **summary}
+    except Exception as e:
+        logger.exception(f"Analytics rollup rebuild failed: {e}")
+        return {"status": "error", "message": str(e)}
@@ -26,6 +26,8 @@ celery_app = Celery(
         "workers.outbox_processors",
         "workers.monitoring_tasks",  # Added monitoring tasks
         "workers.campaign_metrics_tasks",  # Added campaign metrics tasks
+        "workers.analytics_rollup_tasks",  # Admin dashboard analytics rollups
+        "workers.projection_tasks",  # CQRS read-model projection catch-up
         "workers.slot_hold_tasks",  # Slot hold auto-cancel tasks (Batch 1)
         "workers.chef_assignment_alert_tasks",  # Chef assignment alerts (Batch 1)
         "workers.email_monitoring_tasks",  # Email monitoring (Gmail + IONOS) (Batch 1)
@@ -44,6 +46,9 @@ celery_app.conf.update(
         "workers.campaign_metrics_tasks.*": {
             "queue": "campaigns"
         },  # Added campaign metrics queue
+        "workers.analytics_rollup_tasks.*": {
+            "queue": "analytics"
+        },  # Admin dashboard analytics rollups
         "workers.slot_hold_tasks.*": {
             "queue": "holds"
         },  # Slot hold auto-cancel (Batch 1)
@@ -67,6 +72,7 @@ celery_app.conf.update(
         Queue("outbox", routing_key="outbox"),
         Queue("monitoring", routing_key="monitoring"),  # Added monitoring queue
         Queue("campaigns", routing_key="campaigns"),  # Added campaigns queue
+        Queue("analytics", routing_key="analytics"),  # Analytics rollups queue
         Queue("holds", routing_key="holds"),  # Slot hold auto-cancel queue (Batch 1)
         Queue("alerts", routing_key="alerts"),  # Chef assignment alerts queue (Batch 1)
         Queue(
@@ -145,6 +151,20 @@ celery_app.conf.beat_schedule = {
         "task": "workers.campaign_metrics_tasks.cleanup_completed_campaign_metrics",
         "schedule": 3600.0,  # Every hour
     },
+    # Admin dashboard analytics rollups
+    "refresh-booking-rollups": {
+        "task": "workers.analytics_rollup_tasks.refresh_booking_rollups",
+        "schedule": 300.0,  # Every 5 minutes (incremental)
+    },
+    "rebuild-booking-rollups": {
+        "task": "workers.analytics_rollup_tasks.rebuild_booking_rollups",
+        "schedule": crontab(hour=3, minute=30),  # Nightly full rebuild
+    },
+    # CQRS read-model projections (rebuilds run from scripts/rebuild_projection.py)
+    "catch-up-projections": {
+        "task": "workers.projection_tasks.catch_up_projections",
+        "schedule": 60.0,  # Every minute
+    },
     # ============================================================
     # Slot Hold Auto-Cancel System (Batch 1 - Legal Protection)
     # 2 hours to sign agreement, 4 hours to pay deposit after signing
@@ -6,17 +6,19 @@ Handles SMS, email, and payment processing with retry logic.
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-import json
 import logging
+import os
+import socket
 from typing import Any
+from uuid import uuid4
 
 import aiohttp
 from core.database import get_db_context
 
 # MIGRATED: Using new Outbox model from db.models.events
-from db.models.events import Outbox
+from db.models.events import Outbox, OutboxStatus
 from utils.encryption import decrypt_field, get_field_encryption
-from sqlalchemy import and_, select, update
+from sqlalchemy import and_, bindparam, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 import stripe
 
@@ -33,25 +35,162 @@ class WorkerConfig:
     batch_size: int = 10
     poll_interval_seconds: int = 5
     worker_timeout_seconds: int = 3600
+    concurrency: int = 4  # Events processed in parallel per worker
+    lease_seconds: int = 300  # Claimed events return to the pool after this
+    fallback_poll_seconds: int = 30  # Safety-net poll while listening for NOTIFY
+
+
+class OutboxWakeup:
+    """
+    One LISTEN connection shared by every outbox worker in the process.
+
+    OutboxProcessor.create_outbox_entries issues NOTIFY outbox_<target> in
+    the writing transaction; each notification sets the asyncio.Event of
+    the workers subscribed to that channel. The connection is dedicated
+    (not from the pool, since LISTEN needs a session-level connection) and
+    is re-opened by a supervisor task; while it is down workers fall back
+    to polling.
+    """
+
+    def __init__(self, database_url: str, reconnect_seconds: int = 5):
+        from sqlalchemy.engine import make_url
+
+        # asyncpg wants a plain postgresql:// DSN
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.reconnect_seconds = reconnect_seconds
+        self._subscribers: dict[str, list[asyncio.Event]] = {}
+        self._connection = None
+        self._supervisor: asyncio.Task | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def subscribe(self, channels: list[str]) -> asyncio.Event:
+        """Event set whenever any of the channels is notified."""
+        event = asyncio.Event()
+        for channel in channels:
+            self._subscribers.setdefault(channel, []).append(event)
+        return event
+
+    def _on_notify(self, connection, pid, channel, payload):
+        for event in self._subscribers.get(channel, []):
+            event.set()
+
+    async def _connect(self):
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        for channel in self._subscribers:
+            await connection.add_listener(channel, self._on_notify)
+        self._connection = connection
+        # Rows written while disconnected sent no notification we saw
+        for events in self._subscribers.values():
+            for event in events:
+                event.set()
+        logger.info(f"📡 Outbox LISTEN on {', '.join(self._subscribers)}")
+
+    async def _supervise(self):
+        while True:
+            if not self.connected:
+                try:
+                    await self._connect()
+                except Exception as e:
+                    logger.warning(f"⚠️ Outbox LISTEN connection failed, polling instead: {e}")
+            await asyncio.sleep(self.reconnect_seconds)
+
+    async def start(self):
+        """Open the LISTEN connection (retried in the background on failure)."""
+        if not self._subscribers or self._supervisor:
+            return
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self):
+        if self._supervisor:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        if self.connected:
+            await self._connection.close()
+        self._connection = None
 
 
 class OutboxWorkerBase:
-    """Base class for outbox event processors."""
+    """
+    Base class for outbox event processors.
+
+    Claim protocol (safe with any number of replicas):
+    1. Claim up to batch_size due rows of this worker's event types in one
+       UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED), setting
+       status=PROCESSING, claimed_by and a lease; commit immediately
+    2. Process the claimed events concurrently (bounded by config.concurrency)
+    3. Record all outcomes in one transaction; updates are fenced on
+       claimed_by so a worker whose lease expired cannot overwrite the
+       replica that re-claimed its rows
+
+    Rows stuck in PROCESSING (crashed worker) are re-claimed once their
+    lease expires.
+
+    Between batches the worker waits for a NOTIFY on its targets' channels
+    (see OutboxWakeup) with config.fallback_poll_seconds as a safety net;
+    without a wakeup it polls every poll_interval_seconds.
+    """
+
+    # Outbox destinations (OutboxProcessor targets) this worker consumes
+    notify_targets: tuple[str, ...] = ()
 
     def __init__(self, config: WorkerConfig = None):
         self.config = config or WorkerConfig()
         self.running = False
+        self.worker_id = (
+            f"{socket.gethostname()}:{os.getpid()}:{self.__class__.__name__}:{uuid4().hex[:8]}"
+        )
+        self.wakeup: OutboxWakeup | None = None
+        self._woken: asyncio.Event | None = None
+        self._next_retry_in: float | None = None
+
+    def attach_wakeup(self, wakeup: OutboxWakeup):
+        """Wake on NOTIFY for this worker's targets instead of fixed polling."""
+        from cqrs.base import outbox_channel
+
+        self.wakeup = wakeup
+        self._woken = wakeup.subscribe([outbox_channel(t) for t in self.notify_targets])
+
+    async def _wait_for_work(self):
+        """Sleep until notified, the next scheduled retry, or the fallback poll."""
+        if self._woken is None or self.wakeup is None or not self.wakeup.connected:
+            timeout = self.config.poll_interval_seconds
+        else:
+            timeout = self.config.fallback_poll_seconds
+        if self._next_retry_in is not None:
+            timeout = min(timeout, self._next_retry_in)
+
+        if self._woken is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(self._woken.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
     async def start(self):
         """Start the worker."""
         self.running = True
-        logger.info(f"Starting {self.__class__.__name__}")
+        logger.info(f"Starting {self.__class__.__name__} ({self.worker_id})")
 
         try:
             while self.running:
                 try:
-                    await self._process_batch()
-                    await asyncio.sleep(self.config.poll_interval_seconds)
+                    # Cleared before claiming so a NOTIFY during the batch
+                    # triggers another pass right away
+                    if self._woken is not None:
+                        self._woken.clear()
+                    claimed = await self._process_batch()
+                    # Drain a backlog without waiting; wait when caught up
+                    if claimed < self.config.batch_size:
+                        await self._wait_for_work()
                 except Exception as e:
                     logger.exception(f"Worker error in {self.__class__.__name__}: {e}")
                     await asyncio.sleep(self.config.poll_interval_seconds)
@@ -69,96 +208,164 @@ class OutboxWorkerBase:
         self.running = False
         logger.info(f"Stopping {self.__class__.__name__}")
 
-    async def _process_batch(self):
-        """Process a batch of outbox events."""
+    async def _process_batch(self) -> int:
+        """Claim, process and record a batch of outbox events; returns the number claimed."""
         # use get_db_context() which is an asynccontextmanager for non-FastAPI usage
         async with get_db_context() as db:
-            # Get pending events for this worker
-            events = await self._get_pending_events(db)
+            events = await self._claim_events(db)
+            await db.commit()
 
-            for event in events:
-                try:
-                    await self._process_event(event, db)
-                    await self._mark_event_processed(event.id, db)
-                    await db.commit()
+        if not events:
+            return 0
+
+        semaphore = asyncio.Semaphore(max(1, self.config.concurrency))
 
+        async def run(event: Outbox) -> str | None:
+            async with semaphore:
+                try:
+                    # Own session per in-flight event: AsyncSession is not
+                    # safe for concurrent use
+                    async with get_db_context() as event_db:
+                        await self._process_event(event, event_db)
+                        await event_db.commit()
+                    return None
                 except Exception as e:
                     logger.exception(f"Error processing event {event.id}: {e}")
-                    await self._handle_event_error(event, str(e), db)
-                    await db.commit()
-
-    async def _get_pending_events(self, db: AsyncSession) -> list[Outbox]:
-        """Get pending events for this worker type."""
-        # First, fetch candidate pending entries (no JSON extraction in SQL)
-        query = (
-            select(Outbox)
-            .where(
-                and_(
-                    Outbox.status == "pending",
-                    Outbox.retry_count < self.config.max_retries,
-                    Outbox.next_retry_at <= datetime.now(timezone.utc),
-                )
-            )
-            .order_by(Outbox.created_at)
-            .limit(self.config.batch_size * 4)  # fetch some extra to filter in-Python
-        )
+                    return str(e)
+
+        errors = await asyncio.gather(*(run(event) for event in events))
 
-        result = await db.execute(query)
-        candidates = result.scalars().all()
+        async with get_db_context() as db:
+            await self._record_results(
+                db,
+                succeeded=[event.id for event, error in zip(events, errors) if error is None],
+                failed=[(event, error) for event, error in zip(events, errors) if error is not None],
+            )
+            await db.commit()
 
-        # Filter by payload.event_type in Python to support multiple DB backends
-        supported = set(self.get_supported_event_types())
-        selected = [e for e in candidates if (e.payload or {}).get("event_type") in supported]
+        return len(events)
 
-        # Respect batch_size
-        return selected[: self.config.batch_size]
+    def _claimable(self):
+        """Due pending rows plus rows whose lease has expired"""
+        now = func.now()
+        return and_(
+            Outbox.event_type.in_(self.get_supported_event_types()),
+            or_(
+                and_(
+                    Outbox.status == OutboxStatus.PENDING,
+                    Outbox.retry_count < self.config.max_retries,
+                    or_(Outbox.next_retry_at.is_(None), Outbox.next_retry_at <= now),
+                ),
+                and_(
+                    Outbox.status == OutboxStatus.PROCESSING,
+                    Outbox.lease_expires_at < now,
+                ),
+            ),
+        )
 
-    async def _mark_event_processed(self, event_id: str, db: AsyncSession):
-        """Mark event as processed."""
-        await db.execute(
+    async def _claim_events(self, db: AsyncSession) -> list[Outbox]:
+        """Lease up to batch_size events for this worker (skipping rows other workers hold)."""
+        candidates = (
+            select(Outbox.id)
+            .where(self._claimable())
+            .order_by(Outbox.created_at)
+            .limit(self.config.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
             update(Outbox)
-            .where(Outbox.id == event_id)
-            .values(processed_at=datetime.now(timezone.utc), status="completed")
+            .where(Outbox.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=OutboxStatus.PROCESSING,
+                claimed_by=self.worker_id,
+                lease_expires_at=func.now() + timedelta(seconds=self.config.lease_seconds),
+            )
+            .returning(Outbox)
+            .execution_options(synchronize_session=False)
         )
+        return list(result.scalars().all())
 
-    async def _handle_event_error(self, event: Outbox, error_message: str, db: AsyncSession):
-        """Handle event processing error with exponential backoff."""
+    def _retry_values(self, event: Outbox, error_message: str) -> dict[str, Any]:
+        """Next state for a failed event (exponential backoff, then FAILED)."""
         retry_count = (getattr(event, "retry_count", None) or 0) + 1
+        now = datetime.now(timezone.utc)
+
+        if retry_count >= self.config.max_retries:
+            logger.error(f"Event {event.id} failed after {retry_count} retries: {error_message}")
+            return {
+                "b_id": event.id,
+                "status": OutboxStatus.FAILED,
+                "retry_count": retry_count,
+                "error_message": error_message,
+                "next_retry_at": None,
+                "processed_at": now,
+            }
 
-        # Calculate next retry time with exponential backoff
         delay_seconds = min(
             self.config.initial_delay_seconds * (2**retry_count), self.config.max_delay_seconds
         )
-        next_retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+        next_retry_at = now + timedelta(seconds=delay_seconds)
+        logger.warning(
+            f"Event {event.id} retry {retry_count} scheduled for {next_retry_at}: {error_message}"
+        )
+        return {
+            "b_id": event.id,
+            "status": OutboxStatus.PENDING,
+            "retry_count": retry_count,
+            "error_message": error_message,
+            "next_retry_at": next_retry_at,
+            "processed_at": None,
+        }
 
-        if retry_count >= self.config.max_retries:
-            # Mark as failed after max retries
+    async def _record_results(
+        self,
+        db: AsyncSession,
+        succeeded: list,
+        failed: list[tuple[Outbox, str]],
+    ):
+        """Write every outcome of a batch: one UPDATE for successes, one executemany for failures."""
+        table = Outbox.__table__
+        owned = table.c.claimed_by == self.worker_id
+
+        if succeeded:
             await db.execute(
-                update(Outbox)
-                .where(Outbox.id == event.id)
+                update(table)
+                .where(table.c.id.in_(succeeded), owned)
                 .values(
-                    status="failed",
-                    error_message=error_message,
-                    processed_at=datetime.now(timezone.utc),
-                    retry_count=retry_count,
+                    status=OutboxStatus.SENT,
+                    processed_at=func.now(),
+                    claimed_by=None,
+                    lease_expires_at=None,
                 )
             )
-            logger.error(f"Event {event.id} failed after {retry_count} retries: {error_message}")
-        else:
-            # Schedule for retry
+
+        retries = [self._retry_values(event, error) for event, error in failed]
+        due = [row["next_retry_at"] for row in retries if row["next_retry_at"] is not None]
+        self._next_retry_in = (
+            max(0.0, (min(due) - datetime.now(timezone.utc)).total_seconds()) if due else None
+        )
+
+        if retries:
             await db.execute(
-                update(Outbox)
-                .where(Outbox.id == event.id)
+                update(table)
+                .where(table.c.id == bindparam("b_id"), owned)
                 .values(
-                    retry_count=retry_count,
-                    error_message=error_message,
-                    next_retry_at=next_retry_at,
-                )
-            )
-            logger.warning(
-                f"Event {event.id} retry {retry_count} scheduled for {next_retry_at}: {error_message}"
+                    status=bindparam("status"),
+                    retry_count=bindparam("retry_count"),
+                    error_message=bindparam("error_message"),
+                    next_retry_at=bindparam("next_retry_at"),
+                    processed_at=bindparam("processed_at"),
+                    claimed_by=None,
+                    lease_expires_at=None,
+                ),
+                retries,
             )
 
+    @staticmethod
+    def _event_data(event: Outbox) -> dict[str, Any]:
+        """Event fields for the processor (stored in the JSONB payload)."""
+        return dict(event.payload or {})
+
     def get_supported_event_types(self) -> list[str]:
         """Get list of event types this worker handles."""
         raise NotImplementedError
@@ -171,6 +378,8 @@ class OutboxWorkerBase:
 class SMSWorker(OutboxWorkerBase):
     """Worker for sending SMS messages via RingCentral."""
 
+    notify_targets = ("ringcentral", "sms")
+
     def __init__(self, config: WorkerConfig = None, rc_config: dict[str, str] | None = None):
         super().__init__(config)
         self.rc_config = rc_config or {}
@@ -182,7 +391,7 @@ class SMSWorker(OutboxWorkerBase):
 
     async def _process_event(self, event: Outbox, db: AsyncSession):
         """Process SMS event."""
-        event_data = json.loads(event.event_data)
+        event_data = self._event_data(event)
 
         # Decrypt phone number if encrypted
         phone_number = event_data.get("phone_number")
@@ -280,6 +489,8 @@ class SMSWorker(OutboxWorkerBase):
 class EmailWorker(OutboxWorkerBase):
     """Worker for sending emails."""
 
+    notify_targets = ("email",)
+
     def __init__(self, config: WorkerConfig = None, email_config: dict[str, str] | None = None):
         super().__init__(config)
         self.email_config = email_config or {}
@@ -289,7 +500,7 @@ class EmailWorker(OutboxWorkerBase):
 
     async def _process_event(self, event: Outbox, db: AsyncSession):
         """Process email event."""
-        event_data = json.loads(event.event_data)
+        event_data = self._event_data(event)
 
         # Decrypt email if encrypted
         email_address = event_data.get("email")
@@ -486,6 +697,8 @@ class EmailWorker(OutboxWorkerBase):
 class StripeWorker(OutboxWorkerBase):
     """Worker for Stripe payment processing."""
 
+    notify_targets = ("stripe",)
+
     def __init__(self, config: WorkerConfig = None, stripe_config: dict[str, str] | None = None):
         super().__init__(config)
         self.stripe_config = stripe_config or {}
@@ -498,7 +711,7 @@ class StripeWorker(OutboxWorkerBase):
 
     async def _process_event(self, event: Outbox, db: AsyncSession):
         """Process Stripe event."""
-        event_data = json.loads(event.event_data)
+        event_data = self._event_data(event)
         event_type = event.event_type
 
         if event_type == "stripe_payment_intent":
@@ -600,14 +813,21 @@ class StripeWorker(OutboxWorkerBase):
 class OutboxProcessorManager:
     """Manages all outbox processor workers."""
 
-    def __init__(self, worker_configs: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        worker_configs: dict[str, Any] | None = None,
+        wakeup: OutboxWakeup | None = None,
+    ):
         self.worker_configs = worker_configs or {}
         self.workers: list[OutboxWorkerBase] = []
         self.worker_tasks: list[asyncio.Task] = []
         self.running = False
+        self.wakeup = wakeup
 
     def add_worker(self, worker: OutboxWorkerBase):
         """Add a worker to the manager."""
+        if self.wakeup and worker.notify_targets:
+            worker.attach_wakeup(self.wakeup)
         self.workers.append(worker)
 
     async def start_all(self):
@@ -620,6 +840,9 @@ class OutboxProcessorManager:
             return
 
         try:
+            if self.wakeup:
+                await self.wakeup.start()
+
             # Start each worker as a background task
             for worker in self.workers:
                 task = asyncio.create_task(self._run_worker_safely(worker))
@@ -661,6 +884,9 @@ class OutboxProcessorManager:
             await asyncio.gather(*self.worker_tasks, return_exceptions=True)
 
         self.worker_tasks.clear()
+
+        if self.wakeup:
+            await self.wakeup.stop()
         logger.info("All outbox workers stopped")
 
 
@@ -668,10 +894,17 @@ class OutboxProcessorManager:
 def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcessorManager:
     """Create and configure the outbox processor manager."""
 
-    manager = OutboxProcessorManager()
+    listen_config = app_config.get("outbox_listen", {})
+    wakeup = None
+    if listen_config.get("enabled", False) and listen_config.get("database_url"):
+        wakeup = OutboxWakeup(listen_config["database_url"])
+
+    manager = OutboxProcessorManager(wakeup=wakeup)
 
     # Configure SMS worker
-    if app_config.get("ringcentral", {}).get("enabled", False):
+    if app_config.get("sms_worker", {}).get("enabled", True) and app_config.get(
+        "ringcentral", {}
+    ).get("enabled", False):
         rc_config = app_config.get("ringcentral", {})
         # Validate RingCentral configuration
         required_rc_keys = [
@@ -687,6 +920,8 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
                 config=WorkerConfig(
                     max_retries=app_config.get("sms_worker", {}).get("max_retries", 5),
                     batch_size=app_config.get("sms_worker", {}).get("batch_size", 10),
+                    concurrency=app_config.get("sms_worker", {}).get("concurrency", 5),
+                    fallback_poll_seconds=listen_config.get("fallback_poll_seconds", 30),
                 ),
                 rc_config=rc_config,
             )
@@ -696,7 +931,9 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
             logger.warning("⚠️ SMS Worker disabled - incomplete RingCentral configuration")
 
     # Configure email worker
-    if app_config.get("email", {}).get("enabled", False):
+    if app_config.get("email_worker", {}).get("enabled", True) and app_config.get(
+        "email", {}
+    ).get("enabled", False):
         email_config = app_config.get("email", {})
         # Validate email configuration based on provider
         provider = email_config.get("provider", "smtp")
@@ -720,6 +957,8 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
                 config=WorkerConfig(
                     max_retries=app_config.get("email_worker", {}).get("max_retries", 3),
                     batch_size=app_config.get("email_worker", {}).get("batch_size", 20),
+                    concurrency=app_config.get("email_worker", {}).get("concurrency", 10),
+                    fallback_poll_seconds=listen_config.get("fallback_poll_seconds", 30),
                 ),
                 email_config=email_config,
             )
@@ -729,7 +968,9 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
             logger.warning(f"⚠️ Email Worker disabled - incomplete {provider} configuration")
 
     # Configure Stripe worker
-    if app_config.get("stripe", {}).get("enabled", False):
+    if app_config.get("stripe_worker", {}).get("enabled", True) and app_config.get(
+        "stripe", {}
+    ).get("enabled", False):
         stripe_config = app_config.get("stripe", {})
         # Validate Stripe configuration
         if stripe_config.get("secret_key") and stripe_config["secret_key"].startswith(
@@ -739,6 +980,8 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
                 config=WorkerConfig(
                     max_retries=app_config.get("stripe_worker", {}).get("max_retries", 3),
                     batch_size=app_config.get("stripe_worker", {}).get("batch_size", 5),
+                    concurrency=app_config.get("stripe_worker", {}).get("concurrency", 2),
+                    fallback_poll_seconds=listen_config.get("fallback_poll_seconds", 30),
                 ),
                 stripe_config=stripe_config,
             )
@@ -747,6 +990,23 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
         else:
             logger.warning("⚠️ Stripe Worker disabled - invalid or missing secret key")
 
+    # Configure Stripe webhook queue worker (ack-first webhook ingestion)
+    webhook_config = app_config.get("stripe_webhooks", {})
+    if webhook_config.get("enabled", False):
+        from workers.stripe_webhook_worker import StripeWebhookWorker
+
+        manager.add_worker(
+            StripeWebhookWorker(
+                config=WorkerConfig(
+                    max_retries=webhook_config.get("max_retries", 5),
+                    batch_size=webhook_config.get("batch_size", 50),
+                    concurrency=webhook_config.get("concurrency", 8),
+                    fallback_poll_seconds=listen_config.get("fallback_poll_seconds", 30),
+                ),
+            )
+        )
+        logger.info("✅ Stripe Webhook Worker configured")
+
     logger.info(f"Worker Manager created with {len(manager.workers)} workers")
     return manager
 
@@ -754,6 +1014,7 @@ def create_outbox_processor_manager(app_config: dict[str, Any]) -> OutboxProcess
 __all__ = [
     "EmailWorker",
     "OutboxProcessorManager",
+    "OutboxWakeup",
     "OutboxWorkerBase",
     "SMSWorker",
     "StripeWorker",
@@ -0,0 +1,41 @@
+"""
+Projection Worker
+Periodic catch-up of event-sourced read models (cqrs.projections)
+
+Full rebuilds fan out over a process pool and run from
+scripts/rebuild_projection.py instead: Celery's daemonic workers cannot
+start child processes.
+"""
+
+import asyncio
+import logging
+
+from workers.celery_config import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _catch_up() -> dict:
+    from core.database import engine
+    from cqrs.projections import catch_up_projections
+
+    try:
+        return await catch_up_projections()
+    finally:
+        # Pooled connections are bound to this task's event loop
+        await engine.dispose()
+
+
+@celery_app.task(name="workers.projection_tasks.catch_up_projections")
+def catch_up_projections():
+    """
+    Apply newly settled domain events to every projection's active table
+
+    Runs every minute; each partition resumes from its checkpoint.
+    """
+    try:
+        applied = asyncio.run(_catch_up())
+        return {"status": "success", "applied": applied}
+    except Exception as e:
+        logger.exception(f"Projection catch-up failed: {e}")
+        return {"status": "error", "message": str(e)}
@@ -6,6 +6,7 @@ Runs daily to send review SMS 1 day after booking completion.
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -77,9 +78,15 @@ class ReviewRequestWorker:
                     f"Found {len(bookings)} bookings eligible for review requests"
                 )
 
+                contacts = await self._load_contacts(
+                    db, [b.customer_id for b in bookings]
+                )
+
                 sent_count = 0
                 for booking in bookings:
-                    success = await self._send_review_request(db, booking)
+                    success = await self._send_review_request(
+                        db, booking, contacts.get(booking.customer_id)
+                    )
                     if success:
                         sent_count += 1
 
@@ -90,34 +97,46 @@ class ReviewRequestWorker:
                 logger.error(f"Error processing completed bookings: {e}", exc_info=True)
                 return 0
 
-    async def _send_review_request(self, db: AsyncSession, booking: Booking) -> bool:
+    async def _load_contacts(
+        self, db: AsyncSession, customer_ids: list
+    ) -> dict[Any, tuple[Customer, str]]:
+        """
+        Load customers in one query and decrypt their phones in one batch.
+        Returns customer_id -> (customer, phone); customers whose phone
+        cannot be decrypted are left out.
+        """
+        if not customer_ids:
+            return {}
+
+        from services.bulk_decryption import get_customer_decryptor
+
+        result = await db.execute(
+            select(Customer).where(Customer.id.in_(set(customer_ids)))
+        )
+        customers = result.scalars().all()
+        phones = await get_customer_decryptor().decrypt_many(
+            c.phone_encrypted for c in customers
+        )
+
+        return {
+            customer.id: (customer, phone)
+            for customer, phone in zip(customers, phones)
+            if phone
+        }
+
+    async def _send_review_request(
+        self,
+        db: AsyncSession,
+        booking: Booking,
+        contact: Optional[tuple[Customer, str]],
+    ) -> bool:
         """Send review request for a single booking."""
         try:
-            # Get customer details
-            customer_result = await db.execute(
-                select(Customer).where(Customer.id == booking.customer_id)
-            )
-            customer = customer_result.scalar_one_or_none()
-
-            if not customer:
-                logger.warning(f"Customer not found for booking {booking.id}")
+            if not contact:
+                logger.warning(f"No reachable customer for booking {booking.id}")
                 return False
 
-            # Decrypt customer data (assuming you have encryption)
-            from utils.encryption import decrypt_field, get_field_encryption
-
-            field_encryption = get_field_encryption()
-
-            try:
-                customer_phone = decrypt_field(
-                    customer.phone_encrypted, field_encryption.key
-                )
-                customer_name = decrypt_field(
-                    customer.name_encrypted, field_encryption.key
-                )
-            except Exception as e:
-                logger.exception(f"Error decrypting customer data: {e}")
-                return False
+            customer, customer_phone = contact
 
             # Create review service (lazy loaded)
             from services.review_service import ReviewService
@@ -139,7 +158,7 @@ class ReviewRequestWorker:
             success = await review_service.send_review_sms(
                 review_id=review.id,
                 customer_phone=customer_phone,
-                customer_name=customer_name.split()[0],  # First name only
+                customer_name=customer.first_name,  # First name only
                 base_url=self.base_url,
             )
 
@@ -182,9 +201,15 @@ class ReviewRequestWorker:
 
                 logger.info(f"Found {len(reviews)} reviews needing reminders")
 
+                contacts = await self._load_contacts(
+                    db, [r.customer_id for r in reviews]
+                )
+
                 sent_count = 0
                 for review in reviews:
-                    success = await self._send_review_reminder(db, review)
+                    success = await self._send_review_reminder(
+                        db, review, contacts.get(review.customer_id)
+                    )
                     if success:
                         sent_count += 1
 
@@ -196,34 +221,23 @@ class ReviewRequestWorker:
                 return 0
 
     async def _send_review_reminder(
-        self, db: AsyncSession, review: CustomerReview
+        self,
+        db: AsyncSession,
+        review: CustomerReview,
+        contact: Optional[tuple[Customer, str]],
     ) -> bool:
         """Send reminder SMS for pending review."""
         try:
-            # Get customer details
-            customer_result = await db.execute(
-                select(Customer).where(Customer.id == review.customer_id)
-            )
-            customer = customer_result.scalar_one_or_none()
-
-            if not customer:
+            if not contact:
                 return False
 
-            # Decrypt customer data
-            from utils.encryption import decrypt_field, get_field_encryption
-
-            field_encryption = get_field_encryption()
-
-            customer_phone = decrypt_field(
-                customer.phone_encrypted, field_encryption.key
-            )
-            customer_name = decrypt_field(customer.name_encrypted, field_encryption.key)
+            customer, customer_phone = contact
 
             # Send reminder SMS
             from services.ringcentral_sms import ringcentral_sms
 
             message = (
-                f"Hi {customer_name.split()[0]}! 👋\n\n"
+                f"Hi {customer.first_name}! 👋\n\n"
                 f"We'd still love to hear about your hibachi experience!\n\n"
                 f"Share your feedback: {review.review_link}\n\n"
                 f"Thank you! 🍱"
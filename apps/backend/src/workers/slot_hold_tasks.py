@@ -34,6 +34,7 @@ from sqlalchemy import and_, select
 
 from core.database import SessionLocal
 from db.models.slot_hold import SlotHold
+from services.scheduling.availability_cache import invalidate_availability_sync
 
 
 @contextmanager
@@ -272,6 +273,7 @@ def expire_unsigned_holds(self) -> dict:
                 hold.status = "expired"
                 hold.cancellation_reason = "signing_timeout"
                 db.commit()
+                invalidate_availability_sync([hold.event_date], station_id=hold.station_id)
 
                 # Send expiration notification
                 send_hold_expired_notification.delay(
@@ -345,6 +347,7 @@ def expire_unpaid_holds(self) -> dict:
                 hold.status = "expired"
                 hold.cancellation_reason = "payment_timeout"
                 db.commit()
+                invalidate_availability_sync([hold.event_date], station_id=hold.station_id)
 
                 # Send expiration notification
                 send_hold_expired_notification.delay(
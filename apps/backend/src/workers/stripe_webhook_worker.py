@@ -0,0 +1,169 @@
+"""
+Stripe webhook queue worker.
+
+Processes the events stored by the webhook endpoint
+(routers/v1/stripe/webhooks.py) in core.webhook_events: every event in the
+ack-first mode (STRIPE_WEBHOOK_ASYNC), and in the inline mode the events
+whose handlers failed or whose request died before recording an outcome
+(their inline lease expires). Uses the outbox claim protocol of
+OutboxWorkerBase: SKIP LOCKED claims with a lease, bounded concurrency,
+fenced result writes and exponential-backoff retries.
+
+Ordering: events sharing an ordering_key (the payment_intent id, else the
+object id) are processed one at a time in Stripe creation order. A row is
+only claimable while no earlier unfinished row with the same key exists and
+no other row with that key is being processed; different keys run in
+parallel. A row that exhausts its retries is marked FAILED and stops
+blocking its key.
+"""
+
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import Any
+
+from sqlalchemy import and_, bindparam, exists, func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from db.models.stripe import WebhookEvent, WebhookEventStatus
+from workers.outbox_processors import OutboxWakeup, OutboxWorkerBase
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED = (WebhookEventStatus.RECEIVED, WebhookEventStatus.PROCESSING)
+
+
+def _position(event) -> tuple:
+    """Sort key of a row within its ordering_key"""
+    return tuple_(func.coalesce(event.stripe_created, event.created_at), event.created_at, event.id)
+
+
+class StripeWebhookWorker(OutboxWorkerBase):
+    """Worker for queued Stripe webhook events."""
+
+    notify_targets = ("stripe_webhooks",)
+
+    def attach_wakeup(self, wakeup: OutboxWakeup):
+        """Wake on the NOTIFY issued by store_webhook_event."""
+        from routers.v1.stripe.webhooks import WEBHOOK_QUEUE_CHANNEL
+
+        self.wakeup = wakeup
+        self._woken = wakeup.subscribe([WEBHOOK_QUEUE_CHANNEL])
+
+    def _claimable(self):
+        """Due received rows plus rows whose lease has expired, not blocked by their key"""
+        now = func.now()
+        other = aliased(WebhookEvent)
+        blocked = exists().where(
+            other.ordering_key == WebhookEvent.ordering_key,
+            other.id != WebhookEvent.id,
+            or_(
+                and_(
+                    other.status == WebhookEventStatus.PROCESSING,
+                    other.lease_expires_at >= now,
+                ),
+                and_(other.status.in_(UNFINISHED), _position(other) < _position(WebhookEvent)),
+            ),
+        )
+        return and_(
+            or_(
+                and_(
+                    WebhookEvent.status == WebhookEventStatus.RECEIVED,
+                    or_(WebhookEvent.next_retry_at.is_(None), WebhookEvent.next_retry_at <= now),
+                ),
+                and_(
+                    WebhookEvent.status == WebhookEventStatus.PROCESSING,
+                    WebhookEvent.lease_expires_at < now,
+                ),
+            ),
+            ~blocked,
+        )
+
+    async def _claim_events(self, db: AsyncSession) -> list[WebhookEvent]:
+        """Lease up to batch_size events (at most one per ordering_key)."""
+        candidates = (
+            select(WebhookEvent.id)
+            .where(self._claimable())
+            .order_by(WebhookEvent.stripe_created, WebhookEvent.created_at)
+            .limit(self.config.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=WebhookEventStatus.PROCESSING,
+                claimed_by=self.worker_id,
+                lease_expires_at=func.now() + timedelta(seconds=self.config.lease_seconds),
+            )
+            .returning(WebhookEvent)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    def _retry_values(self, event: WebhookEvent, error_message: str) -> dict[str, Any]:
+        """Outbox backoff schedule mapped onto webhook_events columns."""
+        values = super()._retry_values(event, error_message)
+        values["status"] = (
+            WebhookEventStatus.RECEIVED
+            if values["next_retry_at"] is not None
+            else WebhookEventStatus.FAILED
+        )
+        values["processing_error"] = values.pop("error_message")
+        return values
+
+    async def _record_results(
+        self,
+        db: AsyncSession,
+        succeeded: list,
+        failed: list[tuple[WebhookEvent, str]],
+    ):
+        """Write every outcome of a batch (fenced on claimed_by)."""
+        table = WebhookEvent.__table__
+        owned = table.c.claimed_by == self.worker_id
+
+        if succeeded:
+            await db.execute(
+                update(table)
+                .where(table.c.id.in_(succeeded), owned)
+                .values(
+                    status=WebhookEventStatus.PROCESSED,
+                    processed_at=func.now(),
+                    processing_error=None,
+                    claimed_by=None,
+                    lease_expires_at=None,
+                )
+            )
+
+        retries = [self._retry_values(event, error) for event, error in failed]
+        due = [row["next_retry_at"] for row in retries if row["next_retry_at"] is not None]
+        self._next_retry_in = (
+            max(0.0, (min(due) - datetime.now(timezone.utc)).total_seconds()) if due else None
+        )
+
+        if retries:
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"), owned)
+                .values(
+                    status=bindparam("status"),
+                    retry_count=bindparam("retry_count"),
+                    processing_error=bindparam("processing_error"),
+                    next_retry_at=bindparam("next_retry_at"),
+                    processed_at=bindparam("processed_at"),
+                    claimed_by=None,
+                    lease_expires_at=None,
+                ),
+                retries,
+            )
+
+    async def _process_event(self, event: WebhookEvent, db: AsyncSession):
+        """Run the webhook handler for a stored event."""
+        from routers.v1.stripe.webhooks import dispatch_event
+        from services.stripe_service import StripeService
+
+        await dispatch_event(event.payload, StripeService(db), db)
+        logger.info(f"Stripe webhook {event.event_type} processed ({event.stripe_event_id})")
+
+
+__all__ = ["StripeWebhookWorker"]
@@ -0,0 +1,53 @@
+"""
+Shared helpers for unit tests that inspect the SQL a service builds
+
+sql() renders a statement for the Postgres dialect; FakeSession returns
+queued rows in order and records every executed statement.
+"""
+
+from sqlalchemy.dialects import postgresql
+
+
+def sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class Row(tuple):
+    """Minimal Row stand-in: tuple with named leading fields."""
+
+    def __new__(cls, names, values):
+        row = super().__new__(cls, values)
+        row._names = names
+        return row
+
+    def __getattr__(self, name):
+        try:
+            return self[self._names.index(name)]
+        except ValueError:
+            raise AttributeError(name)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def one(self):
+        return self.rows[0]
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    """Returns queued results in order and records executed statements."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.results.pop(0))
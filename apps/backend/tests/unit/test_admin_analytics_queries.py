@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Admin Analytics Queries
+
+Verifies the dashboard endpoints run on AsyncSession and push counting,
+bucketing (width_bucket) and ordering/limits into Postgres so only
+aggregate rows come back.
+
+Run with: pytest tests/unit/test_admin_analytics_queries.py -v
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from db.models.crm import LeadQuality, LeadSource
+from sql_fakes import FakeSession, Row, sql
+
+DATE_FROM = date(2026, 9, 1)
+DATE_TO = date(2026, 9, 30)
+
+
+class TestFunnels:
+    """Funnel stages are counted in single statements"""
+
+    @pytest.mark.asyncio
+    async def test_conversion_funnel_is_one_query(self):
+        from routers.v1.admin_analytics import get_conversion_funnel
+
+        db = FakeSession([(40, 20, 10, 8)])
+
+        result = await get_conversion_funnel(
+            date_from=DATE_FROM, date_to=DATE_TO, db=db, current_user=None
+        )
+
+        assert len(db.statements) == 1
+        query = sql(db.statements[0])
+        assert "count(crm.leads.id) FILTER (WHERE" in query
+        assert "JOIN crm.leads" in query
+        assert [s["count"] for s in result["funnel_stages"]] == [40, 20, 10, 8]
+        assert result["overall_conversion_rate"] == 20.0
+
+    @pytest.mark.asyncio
+    async def test_booking_funnel_two_passes(self):
+        from routers.v1.admin_analytics import get_booking_conversion_funnel
+
+        db = FakeSession([(100, 60, 30)], [(25, 20, 12, 10)])
+
+        result = await get_booking_conversion_funnel(
+            date_from=DATE_FROM, date_to=DATE_TO, db=db, current_user=None
+        )
+
+        leads_sql, bookings_sql = (sql(s) for s in db.statements)
+        assert "EXISTS (SELECT" in leads_sql and "lead.lead_contacts" in leads_sql
+        assert "FROM core.bookings" in bookings_sql and "core.payments" in bookings_sql
+        assert [s["count"] for s in result["funnel_stages"]] == [100, 60, 30, 25, 20, 12, 10]
+        assert result["drop_offs"][0]["drop_off_count"] == 40
+
+
+class TestBuckets:
+    """Histograms are bucketed by width_bucket in SQL"""
+
+    @pytest.mark.asyncio
+    async def test_lead_score_buckets(self):
+        from routers.v1.admin_analytics import get_lead_scoring_analysis
+
+        db = FakeSession(
+            [(0, 5), (2, 3), (4, 1)],
+            [(LeadQuality.HOT, 2), (None, 7)],
+            [(LeadSource.WEBSITE, 10, 4, Decimal("55.5"))],
+        )
+
+        result = await get_lead_scoring_analysis(db=db, current_user=None)
+
+        bucket_sql, _, source_sql = (sql(s) for s in db.statements)
+        assert "width_bucket(crm.leads.score, ARRAY[" in bucket_sql
+        assert "FILTER (WHERE crm.leads.status" in source_sql
+        assert [b["count"] for b in result["score_distribution"]] == [5, 0, 3, 0, 1]
+        assert result["quality_distribution"][1]["quality"] == "unrated"
+        assert result["source_performance"][0]["conversion_rate"] == 40.0
+
+    @pytest.mark.asyncio
+    async def test_menu_popularity_buckets_ordered_in_sql(self):
+        from routers.v1.admin_analytics import get_menu_item_popularity
+
+        names = ("party_size", "booking_count", "revenue_cents")
+        db = FakeSession([Row(names, (1, 6, 300000)), Row(names, (0, 4, 80000))])
+
+        result = await get_menu_item_popularity(
+            date_from=DATE_FROM, date_to=DATE_TO, db=db, current_user=None
+        )
+
+        query = sql(db.statements[0])
+        assert "width_bucket(core.bookings.party_adults + core.bookings.party_kids" in query
+        assert "ORDER BY count(core.bookings.id) DESC" in query
+        assert [i["category"] for i in result["items"]] == ["Medium (11-25)", "Small (1-10)"]
+        assert result["items"][0]["avg_order_value"] == 500.0
+        assert result["total_bookings_analyzed"] == 10
+
+
+class TestOverviewHelpers:
+    """Overview helpers aggregate without per-row queries"""
+
+    @pytest.mark.asyncio
+    async def test_newsletter_rates_and_top_campaigns_in_sql(self):
+        from routers.v1.admin_analytics import _get_newsletter_analytics
+
+        sent_at = datetime(2026, 9, 10, tzinfo=timezone.utc)
+        db = FakeSession(
+            [(120, 100)],
+            [(3, 2, 25.0, 5.0)],
+            [(date(2026, 9, 2), 4)],
+            [("Fall promo", sent_at, 200, 50, 10)],
+        )
+
+        result = await _get_newsletter_analytics(DATE_FROM, DATE_TO, db)
+
+        summary_sql, _, recent_sql = (sql(db.statements[i]) for i in (1, 2, 3))
+        assert "GROUP BY newsletter.campaign_events.campaign_id" in summary_sql
+        assert "avg(" in summary_sql
+        assert "ORDER BY newsletter.campaigns.sent_at DESC NULLS LAST" in recent_sql
+        assert "LIMIT" in recent_sql
+        assert result.average_open_rate == 25.0
+        assert result.campaign_performance[0]["open_rate"] == 25.0
+
+    @pytest.mark.asyncio
+    async def test_alerts_single_round_trip(self):
+        from routers.v1.admin_analytics import _get_alerts
+
+        db = FakeSession([(2, 0, 5)])
+
+        alerts = await _get_alerts(db)
+
+        assert len(db.statements) == 1
+        assert [a["count"] for a in alerts] == [2, 5]
@@ -0,0 +1,89 @@
+"""
+Unit Tests for the Booking Analytics Rollups
+
+Verifies the rollup recompute SQL and that dashboard endpoints read the
+rollups (aggregation, ordering and limits in SQL) through AsyncSession.
+
+Run with: pytest tests/unit/test_analytics_rollups.py -v
+"""
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from services.analytics_rollup_service import AnalyticsRollupService
+from sql_fakes import FakeSession, Row, sql
+
+
+class TestRollupRecompute:
+    """Recompute statements"""
+
+    def test_daily_recompute_is_bounded_to_changed_days(self):
+        query = sql(AnalyticsRollupService(None)._daily_select({date(2026, 3, 14)}))
+
+        assert "FROM core.bookings" in query
+        assert "core.bookings.created_at >=" in query and "core.bookings.created_at <" in query
+        assert "date(core.bookings.created_at) IN" in query
+        assert "GROUP BY date(core.bookings.created_at), core.bookings.station_id, event_dow" in query
+
+    def test_monthly_rolls_up_from_daily_not_bookings(self):
+        query = sql(AnalyticsRollupService(None)._monthly_select({date(2026, 12, 1)}))
+
+        assert "FROM core.booking_daily_rollups" in query
+        assert "core.bookings" not in query
+
+    def test_full_rebuild_has_no_filters(self):
+        query = sql(AnalyticsRollupService(None)._customer_select())
+        assert "IN (" not in query
+
+
+class TestDashboardReadsRollups:
+    """Endpoints query rollups, not bookings"""
+
+    @pytest.mark.asyncio
+    async def test_clv_summary_and_top_customers_in_sql(self):
+        from routers.v1.admin_analytics import get_customer_lifetime_value
+
+        first = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        top = SimpleNamespace(
+            customer_id=uuid4(),
+            total_spent_cents=150000,
+            booking_count=3,
+            first_booking_at=first,
+            last_booking_at=datetime(2025, 3, 2, tzinfo=timezone.utc),
+        )
+        row = Row(
+            ("total_customers", "avg_cents", "median_cents", "repeat_customers"),
+            (4, 50000.0, 30000.0, 1, 1, 1, 1, 0, 1),
+        )
+        db = FakeSession([row], [top])
+
+        result = await get_customer_lifetime_value(top_n=1, db=db, current_user=None)
+
+        summary_sql, top_sql = (sql(s) for s in db.statements)
+        assert "percentile_cont" in summary_sql and "core.customer_value_rollups" in summary_sql
+        assert "core.bookings" not in summary_sql + top_sql
+        assert "ORDER BY core.customer_value_rollups.total_spent_cents DESC" in top_sql
+        assert "LIMIT" in top_sql
+
+        assert result["average_clv"] == 500.0
+        assert result["median_clv"] == 300.0
+        assert result["repeat_customer_rate"] == 25.0
+        assert [d["count"] for d in result["clv_distribution"]] == [1, 1, 1, 0, 1]
+        assert result["top_customers"][0]["total_spent"] == 1500.0
+        assert result["top_customers"][0]["customer_tenure_days"] == 60
+
+    @pytest.mark.asyncio
+    async def test_revenue_trends_month_reads_monthly_rollup(self):
+        from routers.v1.admin_analytics import get_revenue_trends
+
+        db = FakeSession([(date(2026, 1, 1), 200000, 4), (date(2026, 2, 1), 300000, 5)])
+
+        result = await get_revenue_trends(days=90, interval="month", db=db, current_user=None)
+
+        assert "FROM core.booking_monthly_rollups" in sql(db.statements[0])
+        assert [t["revenue"] for t in result["trends"]] == [2000.0, 3000.0]
+        assert result["trends"][1]["growth_rate"] == pytest.approx(50.0)
+        assert result["summary"]["total_bookings"] == 9
@@ -0,0 +1,159 @@
+"""
+Unit Tests for the Versioned Availability Cache
+
+Verifies cached matrix rows are served until a write invalidates their
+date, and that a row built concurrently with a write is never served.
+
+Run with: pytest tests/unit/test_availability_cache.py -v
+"""
+
+from datetime import date, time, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from services.business_config_service import BusinessConfig
+from services.scheduling.availability_cache import ALL_STATIONS, AvailabilityCache, _version_key
+from services.scheduling.availability_engine import AvailabilityEngine
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await getattr(self._redis, name)(*a, **kw) for name, a, kw in self._ops]
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for the cache."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    async def expire(self, key, seconds):
+        return True
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+
+def _cache():
+    cache = AvailabilityCache(redis_url="redis://unused")
+    cache._client = _FakeRedis()
+    return cache
+
+
+def _result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+class TestAvailabilityCache:
+    """Versioning and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_row_built_during_write_is_never_served(self):
+        cache = _cache()
+        day, today = date(2026, 12, 5), date(2026, 11, 1)
+
+        # Reader takes versions, then a booking commits and invalidates
+        versions = await cache.get_versions([day])
+        await cache.invalidate(day)
+        await cache.set_rows({day: [{"is_available": True}]}, versions, today)
+
+        fresh_versions = await cache.get_versions([day])
+        assert await cache.get_rows(fresh_versions, today) == {}
+
+    @pytest.mark.asyncio
+    async def test_station_write_invalidates_cross_station_scope(self):
+        cache = _cache()
+        day, station_id = date(2026, 12, 5), uuid4()
+
+        await cache.invalidate(day, station_id=station_id)
+
+        assert cache._client.store[_version_key(ALL_STATIONS, day)] == "1"
+        assert cache._client.store[_version_key(str(station_id), day)] == "1"
+
+    @pytest.mark.asyncio
+    async def test_time_off_range_and_epoch(self):
+        cache = _cache()
+        start = date(2026, 12, 1)
+        today = date(2026, 11, 1)
+        versions = await cache.get_versions([start])
+        await cache.set_rows({start: []}, versions, today)
+
+        await cache.invalidate_range(start, start + timedelta(days=2))
+        assert all(
+            cache._client.store[_version_key(ALL_STATIONS, start + timedelta(days=i))] == "1"
+            for i in range(3)
+        )
+
+        await cache.invalidate_all()
+        assert (await cache.get_versions([start]))[start] == "1.1"
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_falls_through(self):
+        cache = AvailabilityCache(redis_url="redis://unused")
+        cache._disabled = True
+
+        assert await cache.get_versions([date(2026, 12, 5)]) is None
+        await cache.invalidate(date(2026, 12, 5))  # No error
+
+
+class TestEngineReadThrough:
+    """AvailabilityEngine.build_availability_matrix with a cache attached"""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self):
+        start = date.today() + timedelta(days=60)
+        end = start + timedelta(days=6)
+        six_pm = time(18, 0)
+        config = BusinessConfig(chef_availability_window_days=14, long_advance_slot_capacity=1)
+
+        db = AsyncMock()
+        db.execute.side_effect = [
+            _result([]),  # Bookings (cold)
+            _result([]),  # Holds (cold)
+            _result([(start, six_pm, 1)]),  # Bookings after a new booking
+            _result([]),  # Holds
+        ]
+        engine = AvailabilityEngine(db=db, cache=_cache())
+
+        with patch(
+            "services.business_config_service.get_business_config",
+            AsyncMock(return_value=config),
+        ):
+            cold = await engine.build_availability_matrix(start, end)
+            warm = await engine.build_availability_matrix(start, end)
+            assert db.execute.await_count == 2
+            assert warm.model_dump() == cold.model_dump()
+
+            await engine.cache.invalidate(start)
+            after = await engine.build_availability_matrix(start, end)
+
+        # Only the invalidated date was rebuilt, and the taken slot is not free
+        assert db.execute.await_count == 4
+        assert list(after.days) == list(cold.days)
+        taken = next(c for c in after.days[start] if c.slot_time == six_pm)
+        assert taken.is_available is False
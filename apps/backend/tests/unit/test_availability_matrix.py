@@ -0,0 +1,116 @@
+"""
+Unit Tests for AvailabilityEngine Availability Matrix
+
+Verifies the single-pass slot × date matrix (grouped counts) applies the
+same dual-mode capacity rules as check_slot_availability.
+
+Run with: pytest tests/unit/test_availability_matrix.py -v
+"""
+
+from datetime import date, time, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.business_config_service import BusinessConfig
+from services.scheduling.availability_engine import AvailabilityEngine
+from services.scheduling.slot_manager import DEFAULT_SLOTS
+
+
+def _result(rows):
+    """Mock SQLAlchemy result returning rows from .all()."""
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+@pytest.fixture
+def config():
+    return BusinessConfig(chef_availability_window_days=14, long_advance_slot_capacity=2)
+
+
+class TestAvailabilityMatrix:
+    """build_availability_matrix behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_long_term_dates_use_ssot_capacity(self, config):
+        start = date.today() + timedelta(days=60)
+        end = start + timedelta(days=29)
+        six_pm = time(18, 0)
+
+        db = AsyncMock()
+        db.execute.side_effect = [
+            _result([(start, six_pm, 1)]),  # Bookings GROUP BY
+            _result([(start, six_pm, 1)]),  # Holds GROUP BY
+        ]
+        engine = AvailabilityEngine(db=db)
+
+        with patch(
+            "services.business_config_service.get_business_config",
+            AsyncMock(return_value=config),
+        ):
+            matrix = await engine.build_availability_matrix(start, end)
+
+        # A month of availability in two queries (no chef queries needed)
+        assert db.execute.await_count == 2
+        assert len(matrix.days) == 30
+        assert all(len(cells) == len(DEFAULT_SLOTS) for cells in matrix.days.values())
+
+        full = next(c for c in matrix.days[start] if c.slot_time == six_pm)
+        assert (full.booked_count, full.hold_count, full.capacity) == (1, 1, 2)
+        assert full.is_available is False
+        assert full.capacity_mode == "long_term_ssot"
+
+        open_cell = next(c for c in matrix.days[start] if c.slot_time != six_pm)
+        assert open_cell.is_available is True
+        assert open_cell.available_chefs == 2
+
+    @pytest.mark.asyncio
+    async def test_short_term_dates_use_chef_availability(self, config):
+        from db.models.ops import DayOfWeek
+
+        event_date = date.today() + timedelta(days=3)
+        day_of_week = list(DayOfWeek)[event_date.weekday()]
+        chef_a, chef_b = "chef-a", "chef-b"
+
+        db = AsyncMock()
+        db.execute.side_effect = [
+            _result([]),  # Bookings
+            _result([]),  # Holds
+            _result(  # Weekly availability
+                [
+                    (chef_a, day_of_week, time(11, 0), time(22, 0)),
+                    (chef_b, day_of_week, time(11, 0), time(16, 0)),
+                ]
+            ),
+            _result([(chef_b, event_date, event_date)]),  # chef_b on time-off
+        ]
+        engine = AvailabilityEngine(db=db)
+
+        with patch(
+            "services.business_config_service.get_business_config",
+            AsyncMock(return_value=config),
+        ):
+            slots = await engine.get_available_slots_for_date(event_date)
+
+        assert db.execute.await_count == 4
+        assert all(s.available_chefs == 1 for s in slots)
+        assert all(s.is_available for s in slots)
+
+    @pytest.mark.asyncio
+    async def test_next_available_dates_skips_full_days(self, config):
+        start = date.today() + timedelta(days=60)
+        config.long_advance_slot_capacity = 1
+        full_day_rows = [(start, s.standard_time, 1) for s in DEFAULT_SLOTS.values()]
+
+        db = AsyncMock()
+        db.execute.side_effect = [_result(full_day_rows), _result([])]
+        engine = AvailabilityEngine(db=db)
+
+        with patch(
+            "services.business_config_service.get_business_config",
+            AsyncMock(return_value=config),
+        ):
+            dates = await engine.get_next_available_dates(start, days_ahead=5, limit=3)
+
+        assert dates == [start + timedelta(days=i) for i in (1, 2, 3)]
@@ -0,0 +1,159 @@
+"""
+Unit Tests for Encrypted-Contact Blind Indexes
+
+Verifies normalization and keying of the HMAC digests, that model setters
+keep the index columns in step, that subscriber lookup is a single indexed
+query, and the backfill's per-row update computation.
+
+Run with: pytest tests/unit/test_blind_index.py -v
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+import core.blind_index as blind_index
+from core.blind_index import (
+    contact_blind_index,
+    email_blind_index,
+    normalize_phone,
+    phone_blind_index,
+)
+from db.models.core import Customer
+from db.models.crm import ContactChannel
+from db.models.lead import LeadContact
+from scripts.backfill_blind_index import TARGETS, compute_updates
+from services.newsletter_service import SubscriberService
+from sql_fakes import sql
+
+
+@pytest.fixture
+def index_key(monkeypatch):
+    def use(key):
+        settings = SimpleNamespace(FIELD_BLIND_INDEX_KEY=key, FIELD_ENCRYPTION_KEY=None)
+        monkeypatch.setattr(blind_index, "get_settings", lambda: settings)
+        blind_index._get_key.cache_clear()
+
+    use("test-blind-index-key")
+    yield use
+    blind_index._get_key.cache_clear()
+
+
+class TestDigests:
+    """Normalization and keying"""
+
+    def test_phone_formats_share_one_digest(self, index_key):
+        digests = {
+            phone_blind_index(p)
+            for p in ("+1 (555) 123-4567", "555-123-4567", "15551234567", "+15551234567")
+        }
+
+        assert len(digests) == 1
+        assert len(digests.pop()) == blind_index.BLIND_INDEX_LENGTH
+        assert normalize_phone("555-1234") is None
+
+    def test_email_is_case_and_space_insensitive(self, index_key):
+        assert email_blind_index(" John@Example.COM ") == email_blind_index("john@example.com")
+        assert email_blind_index("not-an-email") is None
+
+    def test_digest_depends_on_key(self, index_key):
+        before = phone_blind_index("+15551234567")
+
+        index_key("rotated-key")
+
+        assert phone_blind_index("+15551234567") != before
+
+    def test_only_phone_and_email_channels_are_indexed(self, index_key):
+        assert contact_blind_index(ContactChannel.SMS, "5551234567") == phone_blind_index(
+            "+15551234567"
+        )
+        assert contact_blind_index("email", "A@B.co") == email_blind_index("a@b.co")
+        assert contact_blind_index(ContactChannel.INSTAGRAM, "@hibachi555123") is None
+
+
+class TestModelSetters:
+    """Index columns follow the contact values"""
+
+    def test_lead_contact_indexed_on_assignment(self, index_key):
+        contact = LeadContact(channel=ContactChannel.SMS, handle_or_address="(555) 123-4567")
+        assert contact.contact_bidx == phone_blind_index("+15551234567")
+        assert contact.handle_e164 == "+15551234567"
+
+        contact.channel = ContactChannel.FACEBOOK
+        assert contact.contact_bidx is None
+        assert contact.handle_e164 is None
+
+    def test_customer_setters_index_contacts(self, index_key):
+        customer = Customer()
+        customer.email = "Jane@Example.com"
+        customer.phone = "555.123.4567"
+
+        assert customer.email_bidx == email_blind_index("jane@example.com")
+        assert customer.phone_bidx == phone_blind_index("+15551234567")
+
+
+class TestSubscriberLookup:
+    """find_by_contact is one indexed equality query"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_by_phone_or_email(self, index_key):
+        statements = []
+        match = SimpleNamespace(id=uuid4())
+
+        class FakeSession:
+            async def execute(self, statement):
+                statements.append(statement)
+                return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: match))
+
+        service = SubscriberService(FakeSession(), compliance_validator=None, event_service=None)
+
+        found = await service.find_by_contact(phone="+15551234567", email="John@example.com")
+
+        assert found is match
+        assert len(statements) == 1
+        query = sql(statements[0])
+        assert "newsletter.subscribers.phone_bidx = " in query
+        assert " OR newsletter.subscribers.email_bidx = " in query
+        params = statements[0].compile().params
+        assert phone_blind_index("+15551234567") in params.values()
+        assert email_blind_index("john@example.com") in params.values()
+
+    @pytest.mark.asyncio
+    async def test_unindexable_input_skips_query(self, index_key):
+        service = SubscriberService(None, compliance_validator=None, event_service=None)
+
+        assert await service.find_by_contact(phone="123") is None
+
+
+class TestBackfill:
+    """Per-row update computation"""
+
+    def test_lead_contacts_only_update_indexable_rows(self, index_key):
+        rows = [
+            SimpleNamespace(id=1, channel="sms", handle_or_address="+1 555 123 4567"),
+            SimpleNamespace(id=2, channel="instagram", handle_or_address="@hibachi"),
+        ]
+
+        assert compute_updates(TARGETS["lead_contacts"], rows) == [
+            {
+                "id": 1,
+                "contact_bidx": phone_blind_index("+15551234567"),
+                "handle_e164": "+15551234567",
+            }
+        ]
+
+    def test_customers_decrypt_before_indexing(self, index_key):
+        row = SimpleNamespace(
+            id=1,
+            email_encrypted="UNENCRYPTED:jane@example.com",
+            phone_encrypted="+15551234567",  # passthrough mode plaintext
+        )
+
+        assert compute_updates(TARGETS["customers"], [row]) == [
+            {
+                "id": 1,
+                "email_bidx": email_blind_index("jane@example.com"),
+                "phone_bidx": phone_blind_index("+15551234567"),
+            }
+        ]
@@ -0,0 +1,151 @@
+"""
+Unit Tests for Bulk PII Decryption
+
+Verifies batch decryption order/deduplication, thread-pool offloading,
+per-batch failure handling, the TTL/size-bounded plaintext cache, and the
+SecureDataHandler fast path.
+
+Run with: pytest tests/unit/test_bulk_decryption.py -v
+"""
+
+import base64
+import logging
+import threading
+
+from cryptography.fernet import Fernet
+import pytest
+
+import services.bulk_decryption as bulk_decryption
+from services.bulk_decryption import BulkDecryptor, PlaintextCache, decrypt_secure_data
+import services.encryption_service as encryption_service
+from services.encryption_service import DecryptionError, SecureDataHandler
+
+
+class CountingDecrypt:
+    """Reverses the string; records calls and the threads they ran on"""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def __call__(self, ciphertext):
+        if ciphertext == "bad":
+            raise ValueError("invalid token")
+        self.calls.append(ciphertext)
+        self.threads.add(threading.current_thread().name)
+        return ciphertext[::-1]
+
+
+class TestBatches:
+    """Ordering, deduplication and offloading"""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order_with_duplicates_decrypted_once(self):
+        decrypt = CountingDecrypt()
+        decryptor = BulkDecryptor(decrypt)
+
+        result = await decryptor.decrypt_many(["abc", None, b"xyz", "", "abc", memoryview(b"abc")])
+
+        assert result == ["cba", None, "zyx", None, "cba", "cba"]
+        assert sorted(decrypt.calls) == ["abc", "xyz"]
+
+    @pytest.mark.asyncio
+    async def test_large_batch_runs_on_thread_pool_in_chunks(self):
+        decrypt = CountingDecrypt()
+        decryptor = BulkDecryptor(decrypt, chunk_size=10)
+
+        values = [f"v{i:03d}" for i in range(100)]
+        result = await decryptor.decrypt_many(values)
+
+        assert result == [v[::-1] for v in values]
+        assert threading.current_thread().name not in decrypt.threads
+        assert all(name.startswith("pii-decrypt") for name in decrypt.threads)
+
+    @pytest.mark.asyncio
+    async def test_failures_become_none_with_one_log_line(self, caplog):
+        decryptor = BulkDecryptor(CountingDecrypt(), name="test")
+
+        with caplog.at_level(logging.WARNING, logger="services.bulk_decryption"):
+            result = await decryptor.decrypt_many(["ok", "bad", "bad"])
+
+        assert result == ["ko", None, None]
+        assert len(caplog.records) == 1
+        assert "1 of 2 values failed" in caplog.records[0].getMessage()
+        assert decryptor.get_stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_strict_raises(self):
+        decryptor = BulkDecryptor(CountingDecrypt())
+
+        with pytest.raises(ValueError):
+            await decryptor.decrypt_many(["ok", "bad"], strict=True)
+
+    @pytest.mark.asyncio
+    async def test_records_decrypted_in_place(self):
+        decryptor = BulkDecryptor(CountingDecrypt())
+        records = [{"name_enc": "ana", "id": 1}, {"name_enc": None, "id": 2}, {"id": 3}]
+
+        await decryptor.decrypt_records(records, {"name_enc": "name"}, drop_source=True)
+
+        assert records == [{"id": 1, "name": "ana"}, {"id": 2, "name": None}, {"id": 3}]
+
+
+class TestPlaintextCache:
+    """Short-TTL, size-bounded cache"""
+
+    @pytest.mark.asyncio
+    async def test_hits_skip_decryption(self):
+        decrypt = CountingDecrypt()
+        decryptor = BulkDecryptor(decrypt, cache=PlaintextCache(ttl_seconds=60))
+
+        await decryptor.decrypt_many(["abc", "bad"])
+        assert await decryptor.decrypt_many(["abc", "bad"]) == ["cba", None]
+
+        assert decrypt.calls == ["abc"]
+        assert decryptor.get_stats()["cache_hits"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(bulk_decryption.time, "monotonic", lambda: now[0])
+        cache = PlaintextCache(ttl_seconds=30)
+
+        cache.put("c", "p")
+        assert cache.get("c") == "p"
+
+        now[0] += 31
+        assert cache.get("c") is bulk_decryption._MISSING
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self):
+        cache = PlaintextCache(ttl_seconds=60, max_entries=2)
+
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("b") is bulk_decryption._MISSING
+        assert cache.get("a") == "1"
+        assert len(cache) == 2
+
+
+class TestSecureDataScheme:
+    """SecureDataHandler-compatible fast path"""
+
+    @pytest.fixture
+    def handler(self, monkeypatch):
+        handler = SecureDataHandler(Fernet.generate_key().decode())
+        monkeypatch.setattr(encryption_service, "_handler", handler)
+        return handler
+
+    def test_reads_handler_ciphertexts(self, handler):
+        assert decrypt_secure_data(handler.encrypt_phone("(916) 555-0101")) == "9165550101"
+        assert decrypt_secure_data(handler.encrypt_email("a@b.co")) == "a@b.co"
+        assert decrypt_secure_data("UNENCRYPTED:9165550101") == "9165550101"
+
+    def test_wrong_key_raises(self, handler):
+        other = Fernet(Fernet.generate_key()).encrypt(b"9165550101")
+        ciphertext = "v1:" + base64.urlsafe_b64encode(other).decode()
+
+        with pytest.raises(DecryptionError):
+            decrypt_secure_data(ciphertext)
@@ -0,0 +1,241 @@
+"""
+Unit Tests for the Streaming Newsletter Campaign Dispatcher
+
+Verifies token-bucket pacing, bounded-concurrency batch sends (order
+preserved, SMSResponse normalized) and that the dispatcher only sends to
+recipients it claimed while checkpointing every page, recording
+undecryptable phones as failures without claiming them.
+
+Run with: pytest tests/unit/test_campaign_dispatcher.py -v
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from db.models.newsletter import CampaignEvent, CampaignEventType
+from services.newsletter.campaign_dispatcher import CampaignDispatcher
+from services.newsletter.sms_service import NewsletterSMSService
+from services.newsletter.token_bucket import AsyncTokenBucket
+from sql_fakes import sql
+
+
+@dataclass
+class FakeSMSResponse:
+    success: bool
+    message_id: str | None = None
+    error: str | None = None
+
+
+class FakeRingCentral:
+    """Records sends and peak concurrency; numbers ending in 0 fail."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def send_sms(self, to_number, message, from_number=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.sent.append(to_number)
+        if to_number.endswith("0"):
+            return FakeSMSResponse(success=False, error="carrier rejected")
+        return FakeSMSResponse(success=True, message_id=f"msg-{to_number}")
+
+
+def make_service(ringcentral, **kwargs) -> NewsletterSMSService:
+    return NewsletterSMSService(
+        ringcentral_service=ringcentral, compliance_validator=None, **kwargs
+    )
+
+
+class TestAsyncTokenBucket:
+    """Rate limiting"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_sustained_rate(self):
+        bucket = AsyncTokenBucket(rate=50, burst=5)
+        start = time.monotonic()
+        for _ in range(10):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 5 immediate tokens, then 5 more at 50/s = ~0.1s
+        assert 0.08 <= elapsed < 0.5
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            AsyncTokenBucket(rate=0)
+
+
+class TestSendCampaignBatch:
+    """Bounded-concurrency batch sends"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_and_order_preserved(self):
+        ringcentral = FakeRingCentral()
+        service = make_service(ringcentral, max_concurrency=4)
+        phones = [f"+1916555{i:04d}" for i in range(1, 13)]
+
+        results = await service.send_campaign_batch([{"phone": p} for p in phones], "Hi")
+
+        assert ringcentral.peak == 4
+        assert [r.message_id for r in results] == [
+            None if p.endswith("0") else f"msg-{p}" for p in phones
+        ]
+        assert results[9].success is False and results[9].error == "carrier rejected"
+
+    @pytest.mark.asyncio
+    async def test_db_session_forces_sequential_sends(self):
+        service = make_service(FakeRingCentral(), db=object(), max_concurrency=8)
+        assert service.max_concurrency == 1
+
+
+class TestCampaignDispatcher:
+    """Claiming, sending and checkpointing per page"""
+
+    @pytest.mark.asyncio
+    async def test_sends_only_claimed_recipients_and_checkpoints(self, monkeypatch):
+        ids = sorted(uuid4() for _ in range(5))
+        already_sent = {ids[1]}
+        phones = {sid: f"+1916555000{i + 1}" for i, sid in enumerate(ids)}
+        ringcentral = FakeRingCentral(delay=0)
+        dispatcher = CampaignDispatcher(
+            make_service(ringcentral, max_concurrency=2),
+            session_factory=lambda: None,
+            page_size=2,
+        )
+
+        async def cursor(campaign_id):
+            return None
+
+        async def fetch_page(audience, after):
+            remaining = [sid for sid in ids if after is None or sid > after]
+            return [(sid, phones[sid].encode()) for sid in remaining[: dispatcher.page_size]]
+
+        async def claim(campaign_id, subscriber_ids):
+            return {sid for sid in subscriber_ids if sid not in already_sent}
+
+        recorded = []
+
+        async def record(campaign_id, page_cursor, delivered, failed, undeliverable):
+            recorded.append((page_cursor, [sid for sid, _ in delivered], failed))
+
+        async def decode_phones(raws):
+            return [raw.decode() for raw in raws]
+
+        monkeypatch.setattr(
+            "services.newsletter.campaign_dispatcher.decode_subscriber_phones", decode_phones
+        )
+        monkeypatch.setattr(dispatcher, "_load_cursor", cursor)
+        monkeypatch.setattr(dispatcher, "_fetch_page", fetch_page)
+        monkeypatch.setattr(dispatcher, "_claim", claim)
+        monkeypatch.setattr(dispatcher, "_record", record)
+
+        stats = await dispatcher.run(uuid4(), audience=None, message_content="Hi")
+
+        assert sorted(ringcentral.sent) == sorted(phones[sid] for sid in ids if sid not in already_sent)
+        assert [page_cursor for page_cursor, _, _ in recorded] == [ids[1], ids[3], ids[4]]
+        assert stats.to_dict() == {"pages": 3, "claimed": 4, "sent": 4, "failed": 0, "skipped": 1}
+        assert all(isinstance(sid, UUID) for _, delivered, _ in recorded for sid in delivered)
+
+    @pytest.mark.asyncio
+    async def test_undecryptable_phone_is_failed_not_claimed(self, monkeypatch):
+        ids = sorted(uuid4() for _ in range(3))
+        phones = {ids[0]: b"+19165550001", ids[1]: b"garbled", ids[2]: b"+19165550003"}
+        ringcentral = FakeRingCentral(delay=0)
+        dispatcher = CampaignDispatcher(
+            make_service(ringcentral), session_factory=lambda: None, page_size=10
+        )
+
+        async def cursor(campaign_id):
+            return None
+
+        async def fetch_page(audience, after):
+            return [] if after else [(sid, phones[sid]) for sid in ids]
+
+        claims = []
+
+        async def claim(campaign_id, subscriber_ids):
+            claims.append(subscriber_ids)
+            return set(subscriber_ids)
+
+        recorded = []
+
+        async def record(campaign_id, page_cursor, delivered, failed, undeliverable):
+            recorded.append(([sid for sid, _ in delivered], failed, undeliverable))
+
+        async def decode_phones(raws):
+            return [None if raw == b"garbled" else raw.decode() for raw in raws]
+
+        monkeypatch.setattr(
+            "services.newsletter.campaign_dispatcher.decode_subscriber_phones", decode_phones
+        )
+        monkeypatch.setattr(dispatcher, "_load_cursor", cursor)
+        monkeypatch.setattr(dispatcher, "_fetch_page", fetch_page)
+        monkeypatch.setattr(dispatcher, "_claim", claim)
+        monkeypatch.setattr(dispatcher, "_record", record)
+
+        stats = await dispatcher.run(uuid4(), audience=None, message_content="Hi")
+
+        assert claims == [[ids[0], ids[2]]]
+        assert recorded == [([ids[0], ids[2]], [], [ids[1]])]
+        assert stats.to_dict() == {"pages": 1, "claimed": 2, "sent": 2, "failed": 1, "skipped": 0}
+
+
+class ClaimSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+    async def commit(self):
+        pass
+
+
+class TestEventTypeLabels:
+    """SQL literals must match the labels SQLEnum stores (member names)"""
+
+    @pytest.mark.asyncio
+    async def test_claim_conflict_target_matches_stored_sent_label(self):
+        session = ClaimSession()
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        dispatcher = CampaignDispatcher(make_service(FakeRingCentral()), session_factory)
+        await dispatcher._claim(uuid4(), [uuid4()])
+
+        claim = sql(session.statements[0])
+        assert "ON CONFLICT (campaign_id, subscriber_id) WHERE type = 'SENT' DO NOTHING" in claim
+        index = next(
+            index
+            for index in CampaignEvent.__table__.indexes
+            if index.name == "uq_newsletter_events_campaign_sent"
+        )
+        assert str(index.dialect_options["postgresql"]["where"]) == "type = 'SENT'"
+
+    def test_failed_event_binds_upper_case_label(self):
+        column_type = CampaignEvent.__table__.c.type.type
+        bind = column_type.bind_processor(postgresql.dialect())
+
+        assert bind(CampaignEventType.FAILED) == "FAILED"
+        assert bind(CampaignEventType.SENT) == "SENT"
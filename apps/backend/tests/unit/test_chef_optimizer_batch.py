@@ -0,0 +1,168 @@
+"""
+Unit Tests for ChefOptimizer Batch Scoring
+
+Verifies the batch scoring path (one schedule query + vectorized
+feasibility and scoring) produces the same results as the per-chef path.
+
+Run with: pytest tests/unit/test_chef_optimizer_batch.py -v
+"""
+
+from datetime import date, time
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from services.scheduling.chef_optimizer import (
+    BASE_BUFFER_MINUTES,
+    ChefForAssignment,
+    ChefOptimizer,
+)
+
+EVENT_DATE = date(2026, 10, 14)  # Wednesday (weekday, rush hour applies)
+
+
+def _make_chefs(count: int) -> list:
+    """Build a deterministic spread of chefs around the Bay Area."""
+    specialties = ["hibachi", "sushi", "teppanyaki", "fusion"]
+    return [
+        ChefForAssignment(
+            chef_id=uuid4(),
+            chef_name=f"Chef {i}",
+            home_lat=Decimal(str(round(37.30 + 0.05 * i, 4))),
+            home_lng=Decimal(str(round(-122.40 + 0.03 * i, 4))),
+            rating=3.0 + (i % 5) * 0.5,
+            specialty=specialties[i % len(specialties)],
+        )
+        for i in range(count)
+    ]
+
+
+def _make_schedules(chefs: list) -> dict:
+    """Give every other chef an existing booking at 12:00 and some a 6 PM."""
+    schedules = {}
+    for i, chef in enumerate(chefs):
+        bookings = []
+        if i % 2 == 0:
+            bookings.append(
+                {"booking_id": uuid4(), "slot": time(12, 0), "lat": 37.80, "lng": -122.27}
+            )
+        if i % 3 == 0:
+            bookings.append(
+                {"booking_id": uuid4(), "slot": time(18, 0), "lat": 37.33, "lng": -121.89}
+            )
+        schedules[chef.chef_id] = bookings
+    return schedules
+
+
+def _optimizer(chefs: list, schedules: dict, batch_scoring: bool) -> ChefOptimizer:
+    """ChefOptimizer with DB-backed lookups replaced by in-memory fixtures."""
+    optimizer = ChefOptimizer(db=AsyncMock(), batch_scoring=batch_scoring)
+    optimizer._get_available_chefs = AsyncMock(return_value=chefs)
+    optimizer._get_chef_workloads = AsyncMock(
+        return_value={cid: len(b) for cid, b in schedules.items() if b}
+    )
+    optimizer._get_chef_bookings_with_venues = AsyncMock(
+        side_effect=lambda chef_id, event_date: schedules[chef_id]
+    )
+    optimizer._get_bookings_with_venues_for_chefs = AsyncMock(
+        side_effect=lambda chef_ids, event_date: {cid: schedules[cid] for cid in chef_ids}
+    )
+    return optimizer
+
+
+class TestHaversineBatch:
+    """Vectorized Haversine must match the scalar estimator exactly"""
+
+    @pytest.mark.parametrize("event_time", [time(11, 0), time(16, 0), time(19, 30)])
+    def test_matches_scalar(self, event_time):
+        optimizer = ChefOptimizer(db=AsyncMock())
+        origins = [(37.30, -122.40), (37.78, -122.41), (37.33, -121.89), (37.50, -121.93)]
+        dests = [(37.80, -122.27), (37.34, -121.88), (37.87, -122.26), (37.30, -122.40)]
+
+        minutes, miles = optimizer._calculate_travel_haversine_batch(
+            origin_lats=np.array([o[0] for o in origins]),
+            origin_lngs=np.array([o[1] for o in origins]),
+            dest_lats=np.array([d[0] for d in dests]),
+            dest_lngs=np.array([d[1] for d in dests]),
+            event_date=EVENT_DATE,
+            event_times=[event_time] * len(origins),
+        )
+
+        for i, (origin, dest) in enumerate(zip(origins, dests)):
+            expected = optimizer._calculate_travel_haversine(
+                origin[0], origin[1], dest[0], dest[1], EVENT_DATE, event_time
+            )
+            assert (int(minutes[i]), float(miles[i])) == expected
+
+
+class TestConsecutiveTravelBatch:
+    """Batch feasibility check"""
+
+    def test_infeasible_gap_is_reported(self):
+        optimizer = ChefOptimizer(db=AsyncMock())
+        tight, free = uuid4(), uuid4()
+        schedules = {
+            # San Jose booking 30 min before a San Francisco event: infeasible
+            tight: [{"booking_id": uuid4(), "slot": time(16, 0), "lat": 37.33, "lng": -121.89}],
+            free: [],
+        }
+
+        results = optimizer._validate_consecutive_travel_batch(
+            schedules=schedules,
+            event_date=EVENT_DATE,
+            event_time=time(16, 30),
+            venue_lat=Decimal("37.78"),
+            venue_lng=Decimal("-122.41"),
+        )
+
+        assert results[free] == (True, "All consecutive travel feasible")
+        assert results[tight][0] is False
+        assert f"{BASE_BUFFER_MINUTES} min buffer" in results[tight][1]
+
+
+class TestBatchScoring:
+    """Batch path must produce the same assignment as the per-chef path"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("event_time", [time(13, 0), time(16, 30)])
+    async def test_batch_matches_sequential(self, event_time):
+        chefs = _make_chefs(12)  # Above USE_GOOGLE_MAPS_THRESHOLD -> Haversine
+        schedules = _make_schedules(chefs)
+        kwargs = dict(
+            booking_id=None,
+            event_date=EVENT_DATE,
+            event_time=event_time,
+            venue_lat=Decimal("37.78"),
+            venue_lng=Decimal("-122.41"),
+            guest_count=20,
+            preferred_chef_id=chefs[4].chef_id,
+        )
+
+        batch = await _optimizer(chefs, schedules, True).get_optimal_assignment(**kwargs)
+        sequential = await _optimizer(chefs, schedules, False).get_optimal_assignment(**kwargs)
+
+        assert batch.recommended_chef_id == sequential.recommended_chef_id
+        assert [s.model_dump() for s in batch.all_scores] == [
+            s.model_dump() for s in sequential.all_scores
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_single_schedule_query(self):
+        chefs = _make_chefs(30)
+        optimizer = _optimizer(chefs, _make_schedules(chefs), True)
+
+        await optimizer.get_optimal_assignment(
+            booking_id=None,
+            event_date=EVENT_DATE,
+            event_time=time(13, 0),
+            venue_lat=Decimal("37.78"),
+            venue_lng=Decimal("-122.41"),
+            guest_count=20,
+        )
+
+        optimizer._get_bookings_with_venues_for_chefs.assert_awaited_once()
+        optimizer._get_chef_bookings_with_venues.assert_not_awaited()
+        optimizer._get_chef_workloads.assert_not_awaited()
@@ -0,0 +1,271 @@
+"""
+Unit Tests for the Conversation Context Cache
+
+Verifies token-budget fitting, the LRU/Redis sequence protocol (appends
+from other workers, races between a DB load and an append) and that
+PostgreSQLMemory serves hot conversations without database reads.
+
+Run with: pytest tests/unit/test_context_cache.py -v
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import api.ai.memory.context_cache as context_cache
+import api.ai.memory.postgresql_memory as postgresql_memory
+from api.ai.memory.context_cache import (
+    MESSAGE_OVERHEAD_TOKENS,
+    ContextEntry,
+    ConversationContextCache,
+    fit_context_window,
+)
+from api.ai.memory.memory_backend import ConversationMessage, MessageRole
+from api.ai.memory.postgresql_memory import PostgreSQLMemory
+
+T0 = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _message(i, conversation_id="conv_1"):
+    return ConversationMessage(
+        id=f"m{i}",
+        conversation_id=conversation_id,
+        role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+        content=f"message {i}",
+        timestamp=T0 + timedelta(seconds=i),
+    )
+
+
+def _entries(*ids):
+    return [ContextEntry(_message(i), 10) for i in ids]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+        self.watched = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def watch(self, key):
+        self.watched = (key, self.redis.data.get(key))
+
+    def multi(self):
+        pass
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def get(self, key):
+        if self.watched is not None and not self.ops:
+            return self.redis.get(key)  # immediate mode after WATCH
+        self.ops.append(("get", (key,), {}))
+        return self
+
+    async def execute(self):
+        if self.watched is not None and self.redis.data.get(self.watched[0]) != self.watched[1]:
+            raise RuntimeError("WatchError")
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class FakeRedis:
+    """The handful of commands the cache uses, with string values."""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        self.commands.append("get")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = str(value)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+        return len(self.data[key])
+
+    async def rpushx(self, key, value):
+        if key not in self.data:
+            return 0
+        return await self.rpush(key, value)
+
+    async def ltrim(self, key, start, end):
+        if key in self.data:
+            self.data[key] = self.data[key][start:]
+
+    async def lrange(self, key, start, end):
+        self.commands.append("lrange")
+        return list(self.data.get(key, []))
+
+    async def expire(self, key, ttl):
+        return key in self.data
+
+
+class TestWindowFitting:
+    """Token budget fitting"""
+
+    def test_newest_messages_within_budget_oldest_first(self):
+        entries = _entries(1, 2, 3, 4)
+        budget = 3 * (10 + MESSAGE_OVERHEAD_TOKENS)
+
+        window = fit_context_window(entries, budget)
+
+        assert [m.id for m in window] == ["m2", "m3", "m4"]
+        assert fit_context_window(entries, budget - 1)[0].id == "m3"
+
+    def test_estimate_without_tiktoken(self, monkeypatch):
+        monkeypatch.setattr(context_cache, "tiktoken", None)
+        context_cache._encoding.cache_clear()
+
+        assert context_cache.count_tokens("x" * 40) == 10
+        context_cache._encoding.cache_clear()
+
+
+class TestSharedCache:
+    """LRU validated against the Redis sequence"""
+
+    @pytest.mark.asyncio
+    async def test_primed_window_served_from_memory(self):
+        redis = FakeRedis()
+        cache = ConversationContextCache(redis_client=redis)
+
+        version = await cache.version("conv_1")
+        assert await cache.prime("conv_1", _entries(1, 2), version)
+        redis.commands.clear()
+
+        entries = await cache.get("conv_1")
+
+        assert [e.message.id for e in entries] == ["m1", "m2"]
+        assert redis.commands == ["get"]
+        assert cache.memory_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_append_from_other_worker_is_seen(self):
+        redis = FakeRedis()
+        worker_a = ConversationContextCache(redis_client=redis)
+        worker_b = ConversationContextCache(redis_client=redis)
+        await worker_a.prime("conv_1", _entries(1, 2), await worker_a.version("conv_1"))
+
+        await worker_b.append("conv_1", _message(3), 7)
+        entries = await worker_a.get("conv_1")
+
+        assert [e.message.id for e in entries] == ["m1", "m2", "m3"]
+        assert entries[-1].tokens == 7
+        assert worker_a.redis_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_append_to_cold_conversation_creates_nothing(self):
+        redis = FakeRedis()
+        cache = ConversationContextCache(redis_client=redis)
+
+        await cache.append("conv_1", _message(1), 5)
+
+        assert await cache.get("conv_1") is None
+        assert "ai:context:conv_1" not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_prime_aborts_after_concurrent_append(self):
+        redis = FakeRedis()
+        cache = ConversationContextCache(redis_client=redis)
+
+        version = await cache.version("conv_1")
+        await cache.append("conv_1", _message(3), 5)  # committed during the DB load
+
+        assert not await cache.prime("conv_1", _entries(1, 2), version)
+        assert await cache.get("conv_1") is None
+
+    @pytest.mark.asyncio
+    async def test_window_is_trimmed_and_deduplicated(self):
+        redis = FakeRedis()
+        cache = ConversationContextCache(redis_client=redis, max_messages=3)
+        await cache.prime("conv_1", _entries(1, 2, 3), await cache.version("conv_1"))
+
+        await cache.append("conv_1", _message(3), 10)  # loaded and appended
+        await cache.append("conv_1", _message(4), 10)
+        cache._memory.clear()
+
+        assert [e.message.id for e in await cache.get("conv_1")] == ["m3", "m4"]
+
+
+class FakeSession:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+
+    async def execute(self, statement):
+        self.log.append(statement)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.rows))
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        pass
+
+
+class TestPostgreSQLMemoryWindow:
+    """Context windows for hot conversations skip the database"""
+
+    @pytest.mark.asyncio
+    async def test_second_turn_reads_no_rows(self, monkeypatch):
+        log = []
+        rows = [
+            SimpleNamespace(
+                id=f"m{i}",
+                conversation_id="conv_1",
+                role="user",
+                content="hello there " * 5,
+                timestamp=T0 - timedelta(seconds=i),
+                message_metadata={},
+                channel="web",
+                emotion_score=None,
+                emotion_label=None,
+                detected_emotions=None,
+                input_tokens=None,
+                output_tokens=None,
+                tool_calls=None,
+                tool_results=None,
+            )
+            for i in range(3)
+        ]
+
+        @asynccontextmanager
+        async def fake_context():
+            yield FakeSession(log, rows)
+
+        monkeypatch.setattr(postgresql_memory, "get_db_context", fake_context)
+        memory = PostgreSQLMemory(context_cache=ConversationContextCache(use_redis=False))
+
+        first = await memory.get_context_window("conv_1")
+        assert [m.id for m in first] == ["m2", "m1", "m0"]
+        reads = len(log)
+
+        stored = await memory.store_message("conv_1", MessageRole.ASSISTANT, "Sure!")
+        writes = len(log) - reads
+        second = await memory.get_context_window("conv_1")
+
+        assert len(log) == reads + writes
+        assert [m.id for m in second] == ["m2", "m1", "m0", stored.id]
@@ -0,0 +1,135 @@
+"""
+Unit Tests for Day Assignment Solver
+
+Tests joint chef-to-booking planning for a whole service day.
+
+Run with: pytest tests/unit/test_day_assignment_solver.py -v
+"""
+
+from datetime import date, time
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from services.scheduling.chef_optimizer import (
+    MAX_DAILY_BOOKINGS,
+    BookingForAssignment,
+    ChefForAssignment,
+)
+from services.scheduling.day_assignment_solver import DayAssignmentSolver
+
+EVENT_DATE = date(2026, 10, 17)  # Saturday (no rush hour)
+
+
+def _chef(name: str, lat: str, lng: str) -> ChefForAssignment:
+    return ChefForAssignment(
+        chef_id=uuid4(),
+        chef_name=name,
+        home_lat=Decimal(lat),
+        home_lng=Decimal(lng),
+    )
+
+
+def _booking(slot: time, lat: str, lng: str, guests: int = 20) -> BookingForAssignment:
+    return BookingForAssignment(
+        booking_id=uuid4(),
+        event_date=EVENT_DATE,
+        event_time=slot,
+        guest_count=guests,
+        venue_lat=Decimal(lat),
+        venue_lng=Decimal(lng),
+    )
+
+
+def _existing(slot: time) -> dict:
+    """Existing booking without coordinates (only slot/capacity matter)."""
+    return {"booking_id": uuid4(), "slot": slot, "lat": None, "lng": None}
+
+
+@pytest.fixture
+def solver():
+    return DayAssignmentSolver(db=AsyncMock(), time_budget_seconds=2.0)
+
+
+class TestDayAssignmentSolver:
+    """Joint assignment behaviour"""
+
+    def test_joint_plan_beats_greedy_order(self, solver):
+        """
+        The first booking prefers the nearby chef, but that chef is the only
+        one who can take the second booking. A greedy pass would leave the
+        second booking unassigned; the joint plan assigns both.
+        """
+        near = _chef("Near Chef", "37.780", "-122.410")
+        far = _chef("Far Chef", "37.330", "-121.890")
+        first = _booking(time(12, 0), "37.781", "-122.411")
+        second = _booking(time(18, 0), "37.500", "-122.200")
+
+        schedules = {
+            # Near chef has room for exactly one more booking
+            near.chef_id: [_existing(time(9, 0)), _existing(time(21, 0))],
+            # Far chef is already working the 6 PM slot
+            far.chef_id: [_existing(time(18, 0))],
+        }
+        assert len(schedules[near.chef_id]) == MAX_DAILY_BOOKINGS - 1
+
+        plan = solver.solve_for([first, second], [near, far], schedules, EVENT_DATE)
+
+        chef_by_booking = {a.booking_id: a.chef_id for a in plan.assignments}
+        assert plan.assigned_count == 2
+        assert chef_by_booking[first.booking_id] == far.chef_id
+        assert chef_by_booking[second.booking_id] == near.chef_id
+
+    def test_same_slot_never_shares_a_chef(self, solver):
+        chef = _chef("Only Chef", "37.780", "-122.410")
+        bookings = [_booking(time(15, 0), "37.781", "-122.411") for _ in range(2)]
+
+        plan = solver.solve_for(bookings, [chef], {chef.chef_id: []}, EVENT_DATE)
+
+        assert plan.assigned_count == 1
+        assert plan.unassigned_count == 1
+        unassigned = [a for a in plan.assignments if a.chef_id is None]
+        assert unassigned[0].reason
+
+    def test_infeasible_travel_is_respected(self, solver):
+        """San Francisco at noon then San Jose at 1 PM is too tight for one chef."""
+        chef = _chef("Only Chef", "37.780", "-122.410")
+        sf = _booking(time(12, 0), "37.781", "-122.411")
+        sj = _booking(time(13, 0), "37.330", "-121.890")
+
+        plan = solver.solve_for([sf, sj], [chef], {chef.chef_id: []}, EVENT_DATE)
+
+        assert plan.assigned_count == 1
+
+    def test_large_day_finishes_within_budget(self, solver):
+        slots = [time(12, 0), time(15, 0), time(18, 0), time(21, 0)]
+        chefs = [
+            _chef(f"Chef {i}", f"{37.3 + 0.02 * i:.3f}", f"{-122.4 + 0.015 * i:.3f}")
+            for i in range(40)
+        ]
+        bookings = [
+            _booking(
+                slots[i % len(slots)],
+                f"{37.3 + 0.007 * i:.3f}",
+                f"{-122.4 + 0.005 * i:.3f}",
+                guests=10 + i % 40,
+            )
+            for i in range(100)
+        ]
+
+        plan = solver.solve_for(
+            bookings, chefs, {c.chef_id: [] for c in chefs}, EVENT_DATE
+        )
+
+        assert plan.assigned_count + plan.unassigned_count == 100
+        assert plan.elapsed_ms < 2000 + 500
+        per_chef = {}
+        for a in plan.assignments:
+            if a.chef_id:
+                per_chef.setdefault(a.chef_id, set()).add(a.event_time)
+        # No chef over capacity or double-booked in a slot
+        for booked_slots in per_chef.values():
+            assert len(booked_slots) <= MAX_DAILY_BOOKINGS
+        assert sum(len(s) for s in per_chef.values()) == plan.assigned_count
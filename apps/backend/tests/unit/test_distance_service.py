@@ -0,0 +1,215 @@
+"""
+Unit Tests for Distance Service
+
+Verifies address normalization, the travel_cache route-key upsert, request
+coalescing over the pooled HTTP client, error mapping, and the async
+PricingService travel-fee path including ZIP centroid estimates.
+
+Run with: pytest tests/unit/test_distance_service.py -v
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import api.ai.endpoints.services.pricing_service as pricing_module
+from api.ai.endpoints.services.pricing_service import PricingService
+from services.scheduling.distance_service import (
+    DistanceService,
+    DistanceServiceError,
+    RouteDistance,
+    RouteNotFoundError,
+    extract_zip,
+    format_drive_time,
+    normalize_address,
+    route_key,
+)
+from sql_fakes import sql
+
+STATION = "47481 Towhee St, Fremont, CA 94539"
+
+
+def matrix_response(*elements, status="OK"):
+    return {"status": status, "rows": [{"elements": list(elements)}]}
+
+
+def element(meters=72420, seconds=3000):
+    return {
+        "status": "OK",
+        "distance": {"value": meters, "text": "45.0 mi"},
+        "duration": {"value": seconds, "text": "50 mins"},
+    }
+
+
+class FakeDB:
+    """travel_cache stand-in: returns ``row`` for lookups, records writes"""
+
+    def __init__(self, row=None):
+        self.row = row
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return SimpleNamespace(first=lambda: self.row)
+
+
+def make_service(handler, row=None):
+    db = FakeDB(row)
+    requests = []
+
+    async def transport(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=handler(request))
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    service = DistanceService(
+        api_key="test-key",
+        session_factory=session_factory,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(transport)),
+    )
+    return service, db, requests
+
+
+class TestNormalization:
+    """Equivalent spellings share a cache key"""
+
+    def test_address_variants_share_route_key(self):
+        a = "123 Main Street, Sacramento, California 95814-1234, USA"
+        b = "123  main st. sacramento ca 95814"
+
+        assert normalize_address(a) == normalize_address(b) == "123 main st sacramento ca 95814"
+        assert route_key(STATION, a) == route_key(STATION.upper(), b)
+
+    def test_zip_helpers(self):
+        assert normalize_address(" 94509-0001 ") == "94509"
+        assert extract_zip("Antioch, CA 94509") == "94509"
+        assert extract_zip("Sonoma, CA") is None
+
+    def test_drive_time_format(self):
+        assert format_drive_time(50) == "50 mins"
+        assert format_drive_time(61) == "1 hour 1 min"
+        assert format_drive_time(120) == "2 hours"
+
+
+class TestDistanceService:
+    """Cache layers, coalescing and errors"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_request(self):
+        service, db, requests = make_service(lambda request: matrix_response(element()))
+
+        routes = await asyncio.gather(
+            *(service.get_distance(STATION, "Antioch, CA 94509") for _ in range(10))
+        )
+
+        assert len(requests) == 1
+        assert requests[0].url.params["destinations"] == "Antioch, CA 94509"
+        assert {round(route.distance_miles, 1) for route in routes} == {45.0}
+        assert service.get_stats()["coalesced"] == 9
+
+        upsert = sql(db.statements[-1])
+        assert "ON CONFLICT (route_key) WHERE route_key IS NOT NULL DO UPDATE" in upsert
+
+        # Now served from process memory
+        assert (await service.get_distance(STATION, "antioch ca 94509")).cached is True
+        assert len(requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_persistent_cache_hit_skips_api(self):
+        row = SimpleNamespace(distance_miles=12.5, travel_time_minutes=20, source="zip_centroid")
+        service, db, requests = make_service(lambda request: pytest.fail("API called"), row=row)
+
+        route = await service.get_distance(STATION, "94539")
+
+        assert route == RouteDistance(12.5, 20, "zip_centroid", cached=True)
+        assert requests == []
+        assert "travel_cache.route_key = " in sql(db.statements[0])
+
+    @pytest.mark.asyncio
+    async def test_errors_are_raised_and_not_cached(self):
+        service, _, requests = make_service(
+            lambda request: matrix_response({"status": "NOT_FOUND"})
+        )
+
+        for _ in range(2):
+            with pytest.raises(RouteNotFoundError):
+                await service.get_distance(STATION, "Nowhere")
+        assert len(requests) == 2
+
+        service, _, _ = make_service(lambda request: {"status": "OVER_QUERY_LIMIT"})
+        with pytest.raises(DistanceServiceError) as error:
+            await service.get_distance(STATION, "Antioch, CA")
+        assert error.value.status == "OVER_QUERY_LIMIT"
+
+
+class FakeDistanceService:
+    def __init__(self, route=None, error=None):
+        self.route = route
+        self.error = error
+        self.calls = []
+
+    async def get_distance(self, origin, destination):
+        self.calls.append(destination)
+        if self.error:
+            raise self.error
+        return self.route
+
+    async def zip_estimate(self, origin, zip_code):
+        return self.route
+
+
+class TestPricingTravelFee:
+    """PricingService.calculate_travel_distance on the async service"""
+
+    @pytest.fixture
+    def pricing(self, monkeypatch):
+        alerts = SimpleNamespace(alert_api_error=lambda **kwargs: None)
+        monkeypatch.setattr(pricing_module, "get_admin_alert_service", lambda: alerts)
+        service = PricingService()
+        service._station_address = STATION
+        service._google_maps_api_key = "test-key"
+        return service
+
+    @pytest.mark.asyncio
+    async def test_fee_from_route(self, pricing, monkeypatch):
+        distances = FakeDistanceService(RouteDistance(45.0, 50, "google_maps"))
+        monkeypatch.setattr(pricing_module, "get_distance_service", lambda: distances)
+
+        result = await pricing.calculate_travel_distance("Antioch, CA 94509")
+
+        free_miles = pricing.TRAVEL_PRICING["free_radius_miles"]
+        per_mile = pricing.TRAVEL_PRICING["per_mile_after"]
+        assert result["status"] == "success"
+        assert result["drive_time"] == "50 mins"
+        assert result["travel_fee"] == pytest.approx((45.0 - free_miles) * per_mile)
+        assert distances.calls == ["Antioch, CA 94509"]
+
+    @pytest.mark.asyncio
+    async def test_route_not_found(self, pricing, monkeypatch):
+        distances = FakeDistanceService(error=RouteNotFoundError("NOT_FOUND", "x"))
+        monkeypatch.setattr(pricing_module, "get_distance_service", lambda: distances)
+
+        result = await pricing.calculate_travel_distance("Nowhere")
+
+        assert result["status"] == "routing_error"
+
+    @pytest.mark.asyncio
+    async def test_zip_centroid_estimate_without_api_key(self, pricing, monkeypatch):
+        distances = FakeDistanceService(RouteDistance(20.0, 30, "zip_centroid", cached=True))
+        monkeypatch.setattr(pricing_module, "get_distance_service", lambda: distances)
+        pricing._google_maps_api_key = None
+
+        result = await pricing.calculate_travel_distance(None, "94509")
+
+        assert result["status"] == "estimated"
+        assert result["is_estimate"] is True
+        assert result["distance_miles"] == 20.0
+        assert result["travel_fee"] == 0.0
+        assert distances.calls == []
@@ -0,0 +1,133 @@
+"""
+Unit Tests for the Shared Embedding Cache and IntentRouter Centroid Matrix
+
+Verifies content-hashed caching, micro-batching of concurrent embed calls
+and that single-matvec classification matches per-centroid cosine.
+
+Run with: pytest tests/unit/test_embedding_cache.py -v
+"""
+
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from api.ai.cache.embedding_cache import EmbeddingBatcher, EmbeddingCache
+
+DIM = 16
+
+
+class FakeProvider:
+    """Deterministic embeddings; records every embed call."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def embed(self, texts, model=None, metadata=None):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        return {"embeddings": [self.vector(t).tolist() for t in texts], "model": "fake"}
+
+    @staticmethod
+    def vector(text: str) -> np.ndarray:
+        seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+
+
+@pytest.fixture
+def provider():
+    return FakeProvider()
+
+
+@pytest.fixture
+def embedder(provider):
+    return EmbeddingBatcher(
+        provider, cache=EmbeddingCache(use_redis=False), model="fake", max_wait_ms=1
+    )
+
+
+class TestEmbeddingBatcher:
+    """Caching and batching behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_provider(self, provider, embedder):
+        first = await embedder.embed(["hello", "world"])
+        second = await embedder.embed(["world", "hello"])
+
+        assert len(provider.calls) == 1
+        np.testing.assert_array_equal(second, first[::-1])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_merge_into_one_request(self, provider, embedder):
+        texts = ["a", "b", "a", "c"]
+        results = await asyncio.gather(*(embedder.embed([t]) for t in texts))
+
+        assert len(provider.calls) == 1
+        assert sorted(provider.calls[0]) == ["a", "b", "c"]
+        for text, result in zip(texts, results):
+            np.testing.assert_array_equal(result[0], FakeProvider.vector(text))
+
+    @pytest.mark.asyncio
+    async def test_provider_error_propagates_and_is_not_cached(self, provider, embedder):
+        async def fail(texts, model=None, metadata=None):
+            raise RuntimeError("provider down")
+
+        provider.embed = fail
+        with pytest.raises(RuntimeError):
+            await embedder.embed(["x"])
+
+        assert embedder._inflight == {}
+        assert embedder.cache.get_stats()["memory_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_redis_round_trip(self, provider):
+        class FakeRedis:
+            def __init__(self):
+                self.store = {}
+
+            async def mget(self, keys):
+                return [self.store.get(k) for k in keys]
+
+            def pipeline(self, transaction=False):
+                redis = self
+
+                class Pipe:
+                    def set(self, key, value, ex=None):
+                        redis.store[key] = value
+
+                    async def execute(self):
+                        return []
+
+                return Pipe()
+
+        redis = FakeRedis()
+        await EmbeddingBatcher(provider, EmbeddingCache(redis), model="fake").embed(["x"])
+        # A fresh process (empty LRU) is served from Redis
+        other = EmbeddingBatcher(provider, EmbeddingCache(redis), model="fake")
+        result = await other.embed(["x"])
+
+        assert len(provider.calls) == 1
+        np.testing.assert_array_equal(result[0], FakeProvider.vector("x"))
+
+
+class TestIntentRouterCentroids:
+    """Classification through the centroid matrix"""
+
+    @pytest.mark.asyncio
+    async def test_matvec_matches_cosine_and_examples_batch_once(self, provider, embedder):
+        from api.ai.routers.intent_router import IntentRouter
+
+        router = IntentRouter(provider=provider, embedder=embedder)
+        message = "How much for 50 people?"
+
+        suggestions = await router.suggest_agent(message, top_k=4)
+        await router.classify_intent(message)
+
+        # All intent examples in one request, then the message once
+        assert len(provider.calls) == 2
+        message_vec = FakeProvider.vector(message)
+        for suggestion in suggestions:
+            agent = next(a for a in router._centroid_agents if a.value == suggestion["agent_type"])
+            expected = router._cosine_similarity(message_vec, router._intent_embeddings[agent])
+            assert suggestion["confidence"] == pytest.approx(expected, abs=1e-3)
@@ -0,0 +1,298 @@
+"""
+Unit Tests for the CQRS Event Store
+
+Verifies chain-head hash chaining under the advisory lock, batched
+streaming replay, snapshot-based aggregate rehydration and the Booking
+aggregate built on it.
+
+Run with: pytest tests/unit/test_event_store.py -v
+"""
+
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from cqrs.base import AggregateRoot, Event, EventStore
+from cqrs.booking_aggregate import BookingAggregate
+from sql_fakes import sql
+
+
+class FakeStream:
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    async def partitions(self):
+        for start in range(0, len(self.rows), self.batch_size):
+            yield self.rows[start : start + self.batch_size]
+
+
+class FakeSession:
+    def __init__(self, scalars=(), stream_rows=(), snapshot=None):
+        self.scalars = list(scalars)
+        self.stream_rows = list(stream_rows)
+        self.snapshot = snapshot
+        self.statements = []
+        self.added = []
+        self.expunged = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.scalars.pop(0)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        pass
+
+    async def stream_scalars(self, statement):
+        self.statements.append(statement)
+        batch_size = statement.get_execution_options()["yield_per"]
+        return FakeStream(self.stream_rows, batch_size)
+
+    def expunge(self, obj):
+        self.expunged.append(obj)
+
+    async def get(self, model, key):
+        return self.snapshot
+
+
+def _event(version):
+    return Event(
+        aggregate_id=uuid4(),
+        aggregate_type="Booking",
+        event_type="BookingUpdated",
+        version=version,
+        occurred_at=datetime(2026, 10, 1, tzinfo=UTC),
+    )
+
+
+class Counter(AggregateRoot):
+    """Aggregate that counts its events"""
+
+    aggregate_type = "Counter"
+    snapshot_every = 3
+
+    def __init__(self, aggregate_id):
+        super().__init__(aggregate_id)
+        self.count = 0
+
+    @classmethod
+    def from_events(cls, events):
+        raise NotImplementedError
+
+    def apply(self, event):
+        self.count += 1
+
+    def snapshot_state(self):
+        return {"count": self.count}
+
+    @classmethod
+    def from_snapshot(cls, aggregate_id, version, state):
+        aggregate = cls(aggregate_id)
+        aggregate.version = version
+        aggregate.count = state["count"]
+        return aggregate
+
+
+class TestHashChain:
+    """Appends chain from the head row under the advisory lock"""
+
+    @pytest.mark.asyncio
+    async def test_append_chains_from_head_and_advances_it(self):
+        session = FakeSession(scalars=["a" * 64])
+
+        persisted = await EventStore(session).append_events([_event(1), _event(2)])
+
+        lock, head_read, head_write = (sql(s) for s in session.statements)
+        assert "pg_advisory_xact_lock" in lock
+        assert "FROM events.event_chain_head" in head_read
+        assert "domain_events" not in head_read.split("WHERE")[0].split("FROM")[1]
+        assert "INSERT INTO events.event_chain_head" in head_write
+        assert "ON CONFLICT (name) DO UPDATE" in head_write
+
+        first, second = persisted
+        assert first.hash_previous == "a" * 64
+        assert second.hash_previous == first.hash_current
+        assert session.statements[2].compile().params["hash_current"] == second.hash_current
+
+    @pytest.mark.asyncio
+    async def test_first_append_seeds_from_latest_event(self):
+        session = FakeSession(scalars=[None, "b" * 64])
+
+        persisted = await EventStore(session).append_events([_event(1)])
+
+        assert "FROM events.domain_events" in sql(session.statements[2])
+        assert persisted[0].hash_previous == "b" * 64
+
+    @pytest.mark.asyncio
+    async def test_empty_log_starts_at_genesis(self):
+        session = FakeSession(scalars=[None, None])
+
+        persisted = await EventStore(session).append_events([_event(1)])
+
+        assert persisted[0].hash_previous == "genesis"
+
+
+class TestStreamingReplay:
+    """Server-side cursor replay"""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_batches_and_expunges(self):
+        rows = [SimpleNamespace(version=i) for i in range(5)]
+        session = FakeSession(stream_rows=rows)
+
+        seen = []
+        async for event in EventStore(session).stream_events(batch_size=2):
+            seen.append(event)
+            # Earlier batches are released before later ones are read
+            assert len(session.expunged) == (len(seen) - 1) // 2 * 2
+
+        assert seen == rows
+        assert session.expunged == rows
+        query = sql(session.statements[0])
+        assert "ORDER BY events.domain_events.occurred_at ASC, events.domain_events.id ASC" in query
+
+
+class TestSnapshots:
+    """Snapshot rehydration"""
+
+    @pytest.mark.asyncio
+    async def test_load_replays_only_after_snapshot(self):
+        aggregate_id = uuid4()
+        snapshot = SimpleNamespace(version=10, state={"count": 10})
+        session = FakeSession(
+            stream_rows=[SimpleNamespace(version=11), SimpleNamespace(version=12)],
+            snapshot=snapshot,
+        )
+
+        counter = await EventStore(session).load_aggregate(Counter, aggregate_id)
+
+        assert (counter.version, counter.count) == (12, 12)
+        assert "events.domain_events.version >" in sql(session.statements[0])
+        # 2 events since the snapshot: below snapshot_every, nothing written
+        assert len(session.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_written_every_n_events(self):
+        session = FakeSession(stream_rows=[SimpleNamespace(version=v) for v in (1, 2, 3, 4)])
+
+        counter = await EventStore(session).load_aggregate(Counter, uuid4())
+
+        assert counter.count == 4
+        upsert = sql(session.statements[-1])
+        assert "INSERT INTO events.aggregate_snapshots" in upsert
+        assert "WHERE events.aggregate_snapshots.version < excluded.version" in upsert
+
+    @pytest.mark.asyncio
+    async def test_unknown_aggregate_returns_none(self):
+        session = FakeSession()
+
+        assert await EventStore(session).load_aggregate(Counter, uuid4()) is None
+
+
+def _stored(aggregate_id, version, event_type, **payload):
+    """DomainEvent stand-in as streamed from events.domain_events"""
+    return SimpleNamespace(
+        aggregate_id=aggregate_id, version=version, event_type=event_type, payload=payload
+    )
+
+
+class TestBookingAggregate:
+    """Booking state folded from events and restored from snapshots"""
+
+    def _created(self, aggregate_id):
+        return _stored(
+            aggregate_id,
+            1,
+            "BookingCreated",
+            date="2026-11-20",
+            slot="18:00",
+            total_guests=12,
+            total_due_cents=72000,
+            deposit_due_cents=10000,
+            source="web",
+            customer_email="guest@example.com",
+        )
+
+    @pytest.mark.asyncio
+    async def test_rehydrates_from_snapshot_and_newer_events(self):
+        booking_id = uuid4()
+        snapshot = SimpleNamespace(
+            version=40,
+            state={
+                "status": "confirmed",
+                "date": "2026-11-20",
+                "slot": "18:00",
+                "total_guests": 12,
+                "total_due_cents": 72000,
+                "deposit_due_cents": 10000,
+                "source": "web",
+            },
+        )
+        session = FakeSession(
+            stream_rows=[
+                _stored(booking_id, 41, "BookingUpdated", changes={"total_guests": 14}),
+                _stored(booking_id, 42, "BookingUpdated", changes={"date": "2026-11-21"}),
+            ],
+            snapshot=snapshot,
+        )
+
+        booking = await EventStore(session).load_aggregate(BookingAggregate, booking_id)
+
+        assert booking.version == 42
+        assert (booking.date, booking.slot, booking.total_guests) == (
+            date(2026, 11, 21),
+            "18:00",
+            14,
+        )
+        assert "events.domain_events.version > " in sql(session.statements[0])
+
+    @pytest.mark.asyncio
+    async def test_long_history_writes_snapshot_without_pii(self):
+        booking_id = uuid4()
+        history = [self._created(booking_id)] + [
+            _stored(booking_id, v, "BookingUpdated", changes={"total_guests": v})
+            for v in range(2, BookingAggregate.snapshot_every + 1)
+        ]
+        session = FakeSession(stream_rows=history)
+
+        booking = await EventStore(session).load_aggregate(BookingAggregate, booking_id)
+
+        upsert = session.statements[-1]
+        assert "INSERT INTO events.aggregate_snapshots" in sql(upsert)
+        state = upsert.compile().params["state"]
+        assert state["total_guests"] == booking.total_guests == BookingAggregate.snapshot_every
+        assert "customer_email" not in state
+
+        restored = BookingAggregate.from_snapshot(booking_id, booking.version, state)
+        assert restored.snapshot_state() == booking.snapshot_state()
+
+    def test_update_records_only_effective_changes(self):
+        booking = BookingAggregate.from_events([self._created(uuid4())])
+
+        changes = booking.update(
+            {"slot": "18:00", "total_guests": 15}, updated_by="admin", update_reason="party grew"
+        )
+
+        (event,) = booking.get_uncommitted_events()
+        assert changes == {"total_guests": 15}
+        assert event.changes == {"total_guests": 15}
+        assert event.version == 2
+        assert booking.total_guests == 15
+
+    def test_cancelled_booking_rejects_commands(self):
+        booking = BookingAggregate.from_events([self._created(uuid4())])
+        booking.cancel("customer request", cancelled_by="customer", refund_amount_cents=0)
+
+        assert booking.is_cancelled
+        with pytest.raises(ValueError):
+            booking.cancel("again", cancelled_by="customer", refund_amount_cents=0)
+        with pytest.raises(ValueError):
+            booking.update({"total_guests": 2}, updated_by="admin", update_reason="x")
@@ -0,0 +1,81 @@
+"""
+Unit Tests for ProductionKnowledgeBaseService BM25 Search
+
+Verifies the inverted index ranks relevant chunks first and stays in sync
+with add / update / delete_knowledge_chunk.
+
+Run with: pytest tests/unit/test_knowledge_base_bm25.py -v
+"""
+
+import pytest
+
+from api.ai.endpoints.services.knowledge_base_simple import (
+    BM25Index,
+    ProductionKnowledgeBaseService,
+    tokenize,
+)
+
+
+@pytest.fixture
+def kb():
+    return ProductionKnowledgeBaseService()
+
+
+class TestBM25Index:
+    """Index-level behaviour"""
+
+    def test_only_query_term_postings_are_scored(self):
+        index = BM25Index()
+        index.add("a", "Zelle and Venmo payments accepted", ["payment"])
+        index.add("b", "Outdoor events need electricity", ["setup"])
+
+        scores, keyword_hits = index.score("payment options")
+
+        assert set(scores) == {"a"}
+        assert keyword_hits == {"a"}
+        assert 0 < scores["a"] < 1
+
+    def test_remove_cleans_postings(self):
+        index = BM25Index()
+        index.add("a", "sake pairing", [])
+        index.remove("a")
+
+        assert index.postings == {}
+        assert index.total_length == 0
+        assert index.score("sake") == ({}, set())
+
+    def test_tokenize_drops_stop_words_and_folds_plurals(self):
+        assert tokenize("What are the payments for guests?") == ["what", "payment", "guest"]
+
+
+class TestKnowledgeBaseSearch:
+    """Service search over the built-in business knowledge"""
+
+    @pytest.mark.asyncio
+    async def test_best_chunk_ranks_first(self, kb):
+        results = await kb.search_knowledge_base("cancellation refund policy", limit=3)
+
+        assert results[0]["metadata"]["category"] == "faq_cancellation"
+        assert results[0]["match_type"] == "keyword"
+        assert [r["score"] for r in results] == sorted(
+            (r["score"] for r in results), reverse=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_unrelated_query_returns_nothing(self, kb):
+        assert await kb.search_knowledge_base("xylophone") == []
+
+    @pytest.mark.asyncio
+    async def test_incremental_updates(self, kb):
+        chunk_id = await kb.add_knowledge_chunk(
+            "Sake pairing is available for adult guests",
+            {"keywords": ["sake", "drinks"], "priority": 5},
+        )
+        assert (await kb.search_knowledge_base("sake"))[0]["id"] == chunk_id
+
+        await kb.update_knowledge_chunk(chunk_id, content="Wine pairing is available")
+        assert await kb.search_knowledge_base("sake") == []
+        assert (await kb.search_knowledge_base("wine pairing"))[0]["id"] == chunk_id
+
+        await kb.delete_knowledge_chunk(chunk_id)
+        assert await kb.search_knowledge_base("wine pairing") == []
@@ -0,0 +1,166 @@
+"""
+Unit Tests for Write-Behind Message Persistence
+
+Verifies group commit of concurrent store_message() calls, the durable
+ack (callers return only after commit), per-message fallback when a batch
+fails, and the multi-row statements.
+
+Run with: pytest tests/unit/test_message_write_behind.py -v
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.ai.memory.context_cache import ConversationContextCache
+from api.ai.memory.memory_backend import MessageRole
+from api.ai.memory.postgresql_memory import PostgreSQLMemory
+from api.ai.memory.write_behind import (
+    MessageWriteBuffer,
+    conversation_upsert,
+    merge_conversation_rows,
+)
+from sql_fakes import sql
+
+T0 = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    def __init__(self, db):
+        self.db = db
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def commit(self):
+        await asyncio.sleep(0)
+        rows = [p for s in self.statements if "ai.messages" in sql(s) for p in _rows(s)]
+        if any(row["content"] == "poison" for row in rows):
+            raise RuntimeError("bad row")
+        self.db.commits.append(rows)
+
+
+def _rows(statement):
+    """Multi-row VALUES of an insert, keyed by column name."""
+    return [
+        {getattr(column, "key", column): value for column, value in row.items()}
+        for row in statement._multi_values[0]
+    ]
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.commits = []
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def _conversation(cid, minutes=0, user_id=None):
+    ts = T0 + timedelta(minutes=minutes)
+    return {
+        "id": cid,
+        "user_id": user_id,
+        "channel": "web",
+        "created_at": ts,
+        "last_message_at": ts,
+        "message_count": 1,
+    }
+
+
+class TestStatements:
+    """Multi-row statements"""
+
+    def test_rows_merged_per_conversation_in_id_order(self):
+        rows = [_conversation("b", 0), _conversation("a", 1), _conversation("b", 2, "u1")]
+
+        merged = merge_conversation_rows(rows)
+
+        assert [r["id"] for r in merged] == ["a", "b"]
+        assert merged[1]["message_count"] == 2
+        assert merged[1]["last_message_at"] == T0 + timedelta(minutes=2)
+        assert merged[1]["user_id"] == "u1"
+
+    def test_upsert_adds_batch_counts(self):
+        query = sql(conversation_upsert([_conversation("a"), _conversation("b")]))
+
+        assert "ON CONFLICT (id) DO UPDATE" in query
+        assert "greatest(ai.conversations.last_message_at, excluded.last_message_at)" in query
+        assert "ai.conversations.message_count + excluded.message_count" in query
+
+
+class TestGroupCommit:
+    """Batching and durable acknowledgement"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_commit(self):
+        db = FakeDatabase()
+        buffer = MessageWriteBuffer(session_factory=db, flush_interval=0.01)
+
+        await asyncio.gather(
+            *(buffer.submit(_conversation("a"), {"id": f"m{i}", "content": "hi"}) for i in range(5))
+        )
+
+        assert len(db.commits) == 1
+        assert [row["id"] for row in db.commits[0]] == ["m0", "m1", "m2", "m3", "m4"]
+        assert buffer.get_stats()["messages"] == 5
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        db = FakeDatabase()
+        buffer = MessageWriteBuffer(session_factory=db, flush_interval=60, max_batch=2)
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                buffer.submit(_conversation("a"), {"id": "m0", "content": "hi"}),
+                buffer.submit(_conversation("a"), {"id": "m1", "content": "hi"}),
+            ),
+            timeout=1,
+        )
+
+        assert len(db.commits) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_only_fails_bad_message(self):
+        db = FakeDatabase()
+        buffer = MessageWriteBuffer(session_factory=db, flush_interval=0.01)
+
+        results = await asyncio.gather(
+            buffer.submit(_conversation("a"), {"id": "m0", "content": "ok"}),
+            buffer.submit(_conversation("a"), {"id": "m1", "content": "poison"}),
+            buffer.submit(_conversation("b"), {"id": "m2", "content": "ok"}),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], RuntimeError)
+        assert [[row["id"] for row in rows] for rows in db.commits] == [["m0"], ["m2"]]
+
+
+class TestPostgreSQLMemoryWriteBehind:
+    """store_message() through the buffer"""
+
+    @pytest.mark.asyncio
+    async def test_store_message_acks_after_commit(self):
+        db = FakeDatabase()
+        memory = PostgreSQLMemory(
+            context_cache=ConversationContextCache(use_redis=False), write_behind=True
+        )
+        memory.write_buffer = MessageWriteBuffer(session_factory=db, flush_interval=0.01)
+
+        stored = await asyncio.gather(
+            memory.store_message("conv_1", MessageRole.USER, "How much for 50 people?"),
+            memory.store_message("conv_2", MessageRole.USER, "Do you travel to Napa?"),
+        )
+
+        assert len(db.commits) == 1
+        assert {row["id"] for row in db.commits[0]} == {m.id for m in stored}
+        assert db.commits[0][0]["role"] == "user"
@@ -0,0 +1,98 @@
+"""
+Unit Tests for the Newsletter Segment Compiler
+
+Verifies that filter specs compile to a single predicate (with channel
+consent) and that invalid specs are rejected before reaching SQL.
+
+Run with: pytest tests/unit/test_newsletter_segments.py -v
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from db.models.newsletter import Campaign, CampaignChannel, Subscriber
+from services.newsletter.segments import (
+    campaign_audience,
+    compile_segment,
+    snapshot_audience,
+)
+
+
+def render(predicate) -> str:
+    return str(
+        select(Subscriber.id)
+        .where(predicate)
+        .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+
+class TestCompileSegment:
+    """Filter spec -> predicate"""
+
+    def test_empty_spec_is_subscribed_only(self):
+        sql = render(compile_segment(None))
+        assert "subscribers.subscribed" in sql
+        assert "consent" not in sql
+
+    def test_all_filters_in_one_predicate(self):
+        now = datetime(2026, 1, 31, tzinfo=timezone.utc)
+        sql = render(
+            compile_segment(
+                {
+                    "tags": ["vip"],
+                    "engagement_min": 40,
+                    "engagement_max": 90,
+                    "last_opened_days": 30,
+                    "channel": "sms",
+                },
+                now=now,
+            )
+        )
+
+        assert "tags && ARRAY['vip']" in sql
+        assert "engagement_score >= 40" in sql
+        assert "engagement_score <= 90" in sql
+        assert "last_opened_date >= '2026-01-01" in sql
+        assert "sms_consent" in sql and "phone_enc IS NOT NULL" in sql
+
+    def test_channel_argument_overrides_spec(self):
+        sql = render(compile_segment({"channel": "sms"}, channel=CampaignChannel.EMAIL))
+        assert "email_consent" in sql
+        assert "sms_consent" not in sql
+
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            {"unknown": 1},
+            {"engagement_min": 80, "engagement_max": 20},
+            {"engagement_min": 150},
+            {"last_opened_days": 0},
+            {"channel": "fax"},
+        ],
+    )
+    def test_invalid_specs_rejected(self, spec):
+        with pytest.raises(ValidationError):
+            compile_segment(spec)
+
+
+class TestCampaignAudience:
+    """Send-time audiences"""
+
+    def test_both_channel_campaign_targets_sms_consent(self):
+        campaign = Campaign(
+            id=uuid4(), channel=CampaignChannel.BOTH, segment_filter={"tags": ["vip"]}
+        )
+        sql = render(campaign_audience(campaign))
+        assert "tags && ARRAY['vip']" in sql
+        assert "sms_consent" in sql and "email_consent" not in sql
+
+    def test_snapshot_audience_rechecks_consent(self):
+        campaign = Campaign(id=uuid4(), channel=CampaignChannel.SMS, segment_filter=None)
+        sql = render(snapshot_audience(campaign))
+        assert "EXISTS (SELECT" in sql and "campaign_audience.subscriber_id = newsletter.subscribers.id" in sql
+        assert "subscribers.subscribed" in sql and "sms_consent" in sql
@@ -0,0 +1,285 @@
+"""
+Unit Tests for Outbox Worker Claims
+
+Verifies the lease-based claim query (FOR UPDATE SKIP LOCKED on the
+indexed event_type column), bounded per-worker concurrency, batched,
+claim-fenced status updates, NOTIFY-driven wakeups and that the worker
+settings reach the workers built at startup.
+
+Run with: pytest tests/unit/test_outbox_claims.py -v
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from db.models.events import OutboxStatus
+import workers.outbox_processors as outbox_processors
+from workers.outbox_processors import OutboxWakeup, OutboxWorkerBase, WorkerConfig
+from sql_fakes import sql
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, log, claimed):
+        self.log = log
+        self.claimed = claimed
+
+    async def execute(self, statement, params=None):
+        self.log.append((statement, params))
+        return FakeResult(self.claimed)
+
+    async def commit(self):
+        pass
+
+
+class RecordingWorker(OutboxWorkerBase):
+    notify_targets = ("ringcentral",)
+
+    def __init__(self, config, fail_ids=()):
+        super().__init__(config)
+        self.fail_ids = set(fail_ids)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get_supported_event_types(self):
+        return ["sms_send", "sms_reminder"]
+
+    async def _process_event(self, event, db):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if event.id in self.fail_ids:
+            raise RuntimeError("provider down")
+
+
+def _event(retry_count=0):
+    return SimpleNamespace(id=uuid4(), retry_count=retry_count, payload={})
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Route get_db_context to fake sessions; the first one returns the claim."""
+    log = []
+    claims = []
+
+    @asynccontextmanager
+    async def fake_context():
+        yield FakeSession(log, claims.pop(0) if claims else [])
+
+    monkeypatch.setattr(outbox_processors, "get_db_context", fake_context)
+    return SimpleNamespace(log=log, claims=claims)
+
+
+class TestClaimQuery:
+    """Claim statement shape"""
+
+    @pytest.mark.asyncio
+    async def test_claim_uses_skip_locked_lease(self, fake_db):
+        worker = RecordingWorker(WorkerConfig(batch_size=7))
+
+        await worker._claim_events(FakeSession(fake_db.log, []))
+
+        query = sql(fake_db.log[0][0])
+        assert query.startswith("UPDATE events.outbox SET status=")
+        assert "FOR UPDATE SKIP LOCKED" in query
+        assert "events.outbox.event_type IN" in query
+        assert "payload" not in query.split("RETURNING")[0]
+        assert "lease_expires_at < now()" in query
+        assert "RETURNING" in query
+
+
+class TestBatchProcessing:
+    """Concurrency and batched outcome writes"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, fake_db):
+        events = [_event() for _ in range(6)]
+        fake_db.claims.append(events)
+        worker = RecordingWorker(WorkerConfig(batch_size=6, concurrency=2))
+
+        claimed = await worker._process_batch()
+
+        assert claimed == 6
+        assert worker.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_outcomes_written_in_two_fenced_statements(self, fake_db):
+        ok, bad, exhausted = _event(), _event(), _event(retry_count=1)
+        fake_db.claims.append([ok, bad, exhausted])
+        worker = RecordingWorker(
+            WorkerConfig(max_retries=2, concurrency=3), fail_ids={bad.id, exhausted.id}
+        )
+
+        await worker._process_batch()
+
+        success, failure = fake_db.log[1:]
+        assert "claimed_by =" in sql(success[0]) and "claimed_by =" in sql(failure[0])
+        assert success[0].compile().params["id_1"] == [ok.id]
+
+        by_id = {row["b_id"]: row for row in failure[1]}
+        assert by_id[bad.id]["status"] == OutboxStatus.PENDING
+        assert by_id[bad.id]["next_retry_at"] is not None
+        assert by_id[exhausted.id]["status"] == OutboxStatus.FAILED
+        assert by_id[exhausted.id]["retry_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_claim_skips_processing(self, fake_db):
+        worker = RecordingWorker(WorkerConfig())
+
+        assert await worker._process_batch() == 0
+        assert len(fake_db.log) == 1
+
+
+class OpenConnection:
+    def is_closed(self):
+        return False
+
+
+class WriteSession:
+    def __init__(self):
+        self.added = []
+        self.statements = []
+
+    def add(self, entry):
+        self.added.append(entry)
+
+    async def flush(self):
+        pass
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+class TestNotifyWakeups:
+    """NOTIFY on write, LISTEN-driven waits in workers"""
+
+    @pytest.mark.asyncio
+    async def test_create_entries_notifies_each_target_once(self):
+        from cqrs.base import OutboxProcessor
+
+        session = WriteSession()
+        events = [
+            SimpleNamespace(
+                id=uuid4(),
+                aggregate_id=uuid4(),
+                aggregate_type="Booking",
+                event_type="BookingCreated",
+                occurred_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+                payload={},
+            )
+            for _ in range(2)
+        ]
+
+        entries = await OutboxProcessor(session).create_outbox_entries(
+            events, targets=["email", "stripe", "email"]
+        )
+
+        assert len(entries) == 6
+        assert {entry.destination for entry in entries} == {"email", "stripe"}
+        assert entries[0].status == OutboxStatus.PENDING
+        notified = [sql(s) for s in session.statements]
+        assert len(notified) == 2 and all("pg_notify(" in q for q in notified)
+        channels = [next(iter(s.compile().params.values())) for s in session.statements]
+        assert channels == ["outbox_email", "outbox_stripe"]
+
+    def test_notification_sets_only_subscribed_workers(self):
+        wakeup = OutboxWakeup("postgresql+asyncpg://u:p@db/app")
+        sms = RecordingWorker(WorkerConfig())
+        sms.attach_wakeup(wakeup)
+        other = wakeup.subscribe(["outbox_email"])
+
+        wakeup._on_notify(None, 1, "outbox_ringcentral", "")
+
+        assert wakeup.dsn == "postgresql://u:p@db/app"
+        assert sms._woken.is_set() and not other.is_set()
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_on_notify_not_fallback(self):
+        wakeup = OutboxWakeup("postgresql+asyncpg://u:p@db/app")
+        wakeup._connection = OpenConnection()
+        worker = RecordingWorker(WorkerConfig(poll_interval_seconds=5, fallback_poll_seconds=30))
+        worker.attach_wakeup(wakeup)
+
+        asyncio.get_running_loop().call_later(
+            0.01, wakeup._on_notify, None, 1, "outbox_ringcentral", ""
+        )
+        started = time.monotonic()
+        await worker._wait_for_work()
+
+        assert time.monotonic() - started < 1
+
+    @pytest.mark.asyncio
+    async def test_wait_capped_by_next_retry(self):
+        worker = RecordingWorker(WorkerConfig(poll_interval_seconds=5))
+        worker._next_retry_in = 0.01
+
+        started = time.monotonic()
+        await worker._wait_for_work()
+
+        assert time.monotonic() - started < 1
+
+
+class TestWorkerConfigs:
+    """settings.get_worker_configs() -> create_outbox_processor_manager"""
+
+    def test_concurrency_and_listen_settings_reach_workers(self):
+        from core.config import get_settings
+
+        settings = get_settings().model_copy(
+            update={
+                "SMS_WORKER_CONCURRENCY": 3,
+                "EMAIL_WORKER_ENABLED": True,
+                "EMAIL_WORKER_CONCURRENCY": 7,
+                "EMAIL_ENABLED": True,
+                "EMAIL_PROVIDER": "smtp",
+                "SMTP_HOST": "smtp.example.com",
+                "SMTP_USER": "mailer",
+                "SMTP_PASSWORD": "secret",
+                "FROM_EMAIL": "noreply@example.com",
+                "STRIPE_WORKER_ENABLED": True,
+                "STRIPE_WORKER_CONCURRENCY": 4,
+                "STRIPE_SECRET_KEY": "sk_test_x",
+                "OUTBOX_LISTEN_ENABLED": True,
+                "OUTBOX_FALLBACK_POLL_SECONDS": 45,
+                "DATABASE_URL": "postgresql+asyncpg://u:p@db/app",
+            }
+        )
+
+        configs = settings.get_worker_configs()
+        manager = outbox_processors.create_outbox_processor_manager(configs)
+        workers = {type(worker).__name__: worker for worker in manager.workers}
+
+        assert configs["sms_worker"]["concurrency"] == 3
+        assert workers["EmailWorker"].config.concurrency == 7
+        assert workers["StripeWorker"].config.concurrency == 4
+        assert isinstance(manager.wakeup, OutboxWakeup)
+        assert manager.wakeup.dsn == "postgresql://u:p@db/app"
+        assert all(worker.config.fallback_poll_seconds == 45 for worker in manager.workers)
+
+    def test_disabled_worker_is_not_started(self):
+        from core.config import get_settings
+
+        settings = get_settings().model_copy(
+            update={"STRIPE_WORKER_ENABLED": False, "STRIPE_SECRET_KEY": "sk_test_x"}
+        )
+
+        manager = outbox_processors.create_outbox_processor_manager(settings.get_worker_configs())
+
+        assert "StripeWorker" not in {type(worker).__name__ for worker in manager.workers}
@@ -0,0 +1,311 @@
+"""
+Unit Tests for the CQRS Projection Runner
+
+Verifies booking ledger folding, partitioned replay with per-batch
+checkpoints, and the blue/green prepare/swap phases.
+
+Run with: pytest tests/unit/test_projection_runner.py -v
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from cqrs.projections import BookingLedgerProjection, Projection, ProjectionRunner
+from db.models.events import ProjectionCheckpoint, ProjectionState
+from sql_fakes import sql
+
+T0 = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _event(event_type, aggregate_id, minutes=0, **payload):
+    return SimpleNamespace(
+        id=uuid4(),
+        event_type=event_type,
+        aggregate_id=str(aggregate_id),
+        occurred_at=T0 + timedelta(minutes=minutes),
+        payload=payload,
+    )
+
+
+class FakeResult:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def mappings(self):
+        return iter(self.rows)
+
+    def scalar_one(self):
+        return self.rows[0]
+
+
+class FakeStream:
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    async def partitions(self):
+        for start in range(0, len(self.rows), self.batch_size):
+            yield self.rows[start : start + self.batch_size]
+
+
+class FakeSession:
+    """Records statements; queued results are returned by execute()."""
+
+    def __init__(self, log, results=(), stream_rows=(), checkpoint=None, locked=True):
+        self.log = log
+        self.results = list(results)
+        self.stream_rows = list(stream_rows)
+        self.checkpoint = checkpoint
+        self.locked = locked
+        self.added = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.log.append(statement)
+        return FakeResult(self.results.pop(0) if self.results else [])
+
+    async def scalar(self, statement):
+        self.log.append(statement)
+        return self.locked
+
+    async def stream_scalars(self, statement):
+        self.log.append(statement)
+        return FakeStream(self.stream_rows, statement.get_execution_options()["yield_per"])
+
+    async def get(self, model, key):
+        return self.checkpoint
+
+    def add_all(self, objects):
+        self.added.extend(objects)
+
+    def expunge(self, obj):
+        pass
+
+    async def commit(self):
+        self.log.append("COMMIT")
+
+
+def _factory(*sessions):
+    queue = list(sessions)
+    return lambda: queue.pop(0)
+
+
+class TestBookingLedger:
+    """Folding booking and payment events into ledger rows"""
+
+    def test_fold_full_lifecycle(self):
+        projection = BookingLedgerProjection()
+        booking_id = uuid4()
+        events = [
+            _event(
+                "BookingCreated",
+                booking_id,
+                date="2026-11-05",
+                slot="6PM",
+                total_guests=12,
+                total_due_cents=90000,
+                deposit_due_cents=10000,
+                source="web",
+            ),
+            _event("PaymentRecorded", uuid4(), 1, booking_id=str(booking_id), amount_cents=10000),
+            _event("BookingUpdated", booking_id, 2, changes={"date": "2026-11-06", "notes": "x"}),
+            _event("BookingCancelled", booking_id, 3, cancellation_reason="weather"),
+        ]
+
+        row = None
+        for event in events:
+            assert projection.row_key(event) == booking_id
+            row = projection.fold(row, event)
+
+        assert row["date"] == date(2026, 11, 6)
+        assert (row["paid_cents"], row["payment_count"]) == (10000, 1)
+        assert row["status"] == "cancelled"
+        assert row["created_at"] == T0 and row["updated_at"] == T0 + timedelta(minutes=3)
+        assert row["events_applied"] == 4
+        assert "notes" not in row
+
+    def test_color_tables_have_distinct_index_names(self):
+        projection = BookingLedgerProjection()
+
+        blue, green = projection.table("blue"), projection.table("green")
+
+        assert "CREATE TABLE read.booking_ledger_green" in sql(CreateTable(green))
+        blue_indexes = {sql(CreateIndex(index)) for index in blue.indexes}
+        assert (
+            "CREATE INDEX ix_booking_ledger_blue_date_slot ON read.booking_ledger_blue (date, slot)"
+            in blue_indexes
+        )
+        assert not {i.name for i in blue.indexes} & {i.name for i in green.indexes}
+
+    def test_payments_partition_with_their_booking(self):
+        query = sql(BookingLedgerProjection().partition_filter(3, 8))
+
+        assert "hashtext(coalesce(CAST((events.domain_events.payload ->> " in query
+        # aggregate_id is uuid in the database: coalesce/hashtext need text
+        assert "CAST(events.domain_events.aggregate_id AS TEXT))) & " in query
+
+    def test_default_partition_key_is_text(self):
+        key = Projection.partition_key(BookingLedgerProjection())
+
+        assert sql(key) == "CAST(events.domain_events.aggregate_id AS TEXT)"
+        assert isinstance(key.type, Text)
+
+    @pytest.mark.asyncio
+    async def test_apply_is_one_select_and_one_upsert(self):
+        projection = BookingLedgerProjection()
+        booking_id = uuid4()
+        existing = dict(
+            projection.fold(None, _event("BookingCreated", booking_id, date="2026-11-05"))
+        )
+        log = []
+        session = FakeSession(log, results=[[existing]])
+
+        written = await projection.apply(
+            session,
+            projection.table("green"),
+            [
+                _event("PaymentRecorded", uuid4(), 1, booking_id=str(booking_id), amount_cents=500),
+                _event("PaymentRecorded", uuid4(), 2, booking_id=str(booking_id), amount_cents=700),
+            ],
+        )
+
+        assert written == 1
+        select_sql, upsert_sql = (sql(s) for s in log)
+        assert "FROM read.booking_ledger_green" in select_sql
+        assert "ON CONFLICT (booking_id) DO UPDATE" in upsert_sql
+        assert log[1].compile().params["paid_cents_m0"] == 1200
+
+
+class TestPartitionReplay:
+    """Checkpointed, batched replay of one partition"""
+
+    def _checkpoint(self, **kwargs):
+        return ProjectionCheckpoint(
+            projection="booking_ledger",
+            color="green",
+            partition=2,
+            partitions=4,
+            events_applied=kwargs.pop("events_applied", 0),
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_commits_rows_and_checkpoint_per_batch(self):
+        booking_id = uuid4()
+        events = [
+            _event("BookingCreated", booking_id, 0, date="2026-11-05"),
+            _event("BookingUpdated", booking_id, 1, changes={"slot": "3PM"}),
+            _event("BookingCancelled", booking_id, 2),
+        ]
+        reader_log, writer_log = [], []
+        checkpoint = self._checkpoint()
+        reader = FakeSession(reader_log, stream_rows=events)
+        writer = FakeSession(writer_log, checkpoint=checkpoint)
+        runner = ProjectionRunner(
+            BookingLedgerProjection(), batch_size=2, session_factory=_factory(reader, writer)
+        )
+
+        applied = await runner.replay_partition("green", 2)
+
+        assert applied == 3
+        assert writer_log.count("COMMIT") == 2
+        assert checkpoint.last_event_id == events[-1].id
+        assert checkpoint.events_applied == 3
+        lock_sql, stream_sql = (sql(s) for s in reader_log)
+        assert "pg_try_advisory_xact_lock" in lock_sql
+        assert "now() - " in stream_sql
+        assert "(events.domain_events.occurred_at, events.domain_events.id) >" not in stream_sql
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_checkpoint(self):
+        reader_log = []
+        checkpoint = self._checkpoint(last_occurred_at=T0, last_event_id=uuid4(), events_applied=9)
+        runner = ProjectionRunner(
+            BookingLedgerProjection(),
+            session_factory=_factory(
+                FakeSession(reader_log), FakeSession([], checkpoint=checkpoint)
+            ),
+        )
+
+        assert await runner.replay_partition("green", 2) == 0
+        assert "(events.domain_events.occurred_at, events.domain_events.id) >" in sql(reader_log[1])
+
+    @pytest.mark.asyncio
+    async def test_skips_partition_held_by_another_runner(self):
+        reader_log = []
+        runner = ProjectionRunner(
+            BookingLedgerProjection(),
+            session_factory=_factory(FakeSession(reader_log, locked=False), FakeSession([])),
+        )
+
+        assert await runner.replay_partition("green", 2) == 0
+        assert len(reader_log) == 1
+
+
+class TestBlueGreen:
+    """Prepare and swap phases"""
+
+    @pytest.mark.asyncio
+    async def test_prepare_builds_inactive_color(self):
+        log = []
+        state = ProjectionState(projection="booking_ledger", active_color="blue")
+        session = FakeSession(log, results=[[], [state]])
+        runner = ProjectionRunner(BookingLedgerProjection(), session_factory=_factory(session))
+
+        color = await runner.prepare(partitions=4)
+
+        assert color == "green"
+        statements = [sql(s).strip() if s != "COMMIT" else s for s in log]
+        assert "DROP TABLE IF EXISTS read.booking_ledger_green" in statements
+        assert any(s.startswith("CREATE TABLE read.booking_ledger_green") for s in statements)
+        assert [c.partition for c in session.added] == [0, 1, 2, 3]
+        assert (state.building_color, state.building_partitions) == ("green", 4)
+        assert statements[-1] == "COMMIT"
+
+    @pytest.mark.asyncio
+    async def test_prepare_resumes_interrupted_build(self):
+        log = []
+        state = ProjectionState(
+            projection="booking_ledger",
+            active_color="blue",
+            building_color="green",
+            building_partitions=4,
+        )
+        runner = ProjectionRunner(
+            BookingLedgerProjection(),
+            session_factory=_factory(FakeSession(log, results=[[], [state]])),
+        )
+
+        assert await runner.prepare(partitions=4) == "green"
+        assert not any("DROP TABLE" in sql(s) for s in log)
+
+    @pytest.mark.asyncio
+    async def test_swap_repoints_view_and_clears_build(self):
+        log = []
+        state = ProjectionState(
+            projection="booking_ledger", active_color="blue", building_color="green"
+        )
+        runner = ProjectionRunner(
+            BookingLedgerProjection(),
+            session_factory=_factory(FakeSession(log, results=[[], [state]])),
+        )
+
+        await runner.swap("green")
+
+        assert str(log[2]) == "DROP VIEW IF EXISTS read.booking_ledger"
+        assert (
+            str(log[3])
+            == "CREATE VIEW read.booking_ledger AS SELECT * FROM read.booking_ledger_green"
+        )
+        assert (state.active_color, state.building_color) == ("green", None)
+        assert log[-1] == "COMMIT"
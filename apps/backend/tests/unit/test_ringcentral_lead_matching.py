@@ -0,0 +1,73 @@
+"""
+Unit Tests for RingCentral SMS Lead Matching
+
+Verifies inbound numbers are matched on the indexed E.164 handle (no
+wildcard LIKE scan) through the async session, and that leads created
+from an SMS carry a normalized phone contact.
+
+Run with: pytest tests/unit/test_ringcentral_lead_matching.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from db.models.crm import ContactChannel
+from routers.v1.ringcentral_webhooks import _create_lead_from_sms, _find_lead_by_phone
+from sql_fakes import sql
+
+
+class FakeSession:
+    def __init__(self, match=None):
+        self.match = match
+        self.statements = []
+        self.added = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: self.match))
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def flush(self):
+        pass
+
+
+class TestFindLeadByPhone:
+    """Exact indexed match"""
+
+    @pytest.mark.asyncio
+    async def test_any_format_matches_e164_handle(self):
+        lead = SimpleNamespace(id=1)
+        db = FakeSession(match=lead)
+
+        assert await _find_lead_by_phone("(555) 123-4567", db) is lead
+
+        query = sql(db.statements[0])
+        assert "lead.lead_contacts.handle_e164 = " in query
+        assert "LIKE" not in query
+        assert "+15551234567" in db.statements[0].compile().params.values()
+
+    @pytest.mark.asyncio
+    async def test_unusable_number_skips_query(self):
+        db = FakeSession()
+
+        assert await _find_lead_by_phone("12345", db) is None
+        assert db.statements == []
+
+
+class TestCreateLeadFromSms:
+    """New leads are matchable on their next text"""
+
+    @pytest.mark.asyncio
+    async def test_contact_stored_with_e164_handle(self):
+        db = FakeSession()
+
+        lead = await _create_lead_from_sms("555.123.4567", "Hi, pricing for 20?", db)
+
+        assert db.added == [lead]
+        (contact,) = lead.contacts
+        assert contact.channel == ContactChannel.SMS
+        assert contact.handle_e164 == "+15551234567"
+        assert [event.event_type for event in lead.events] == ["lead_created"]
@@ -0,0 +1,271 @@
+"""
+Unit Tests for Stripe Webhook Queue
+
+Verifies idempotent storage (INSERT ... ON CONFLICT DO NOTHING), the
+inline mode's leased rows and crash recovery, the ack-first endpoint mode,
+per-payment-intent ordering keys and the queue worker's claim query and
+retry states.
+
+Run with: pytest tests/unit/test_stripe_webhook_queue.py -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import stripe
+
+from core.config import settings
+from db.models.stripe import WebhookEventStatus
+import routers.v1.stripe.webhooks as webhooks
+from routers.v1.stripe.webhooks import event_to_dict, store_webhook_event, webhook_ordering_key
+from workers.outbox_processors import WorkerConfig
+from workers.stripe_webhook_worker import StripeWebhookWorker
+from sql_fakes import sql
+
+
+def _event(event_type="payment_intent.succeeded", obj=None):
+    return {
+        "id": f"evt_{uuid4().hex[:12]}",
+        "type": event_type,
+        "created": 1_760_000_000,
+        "data": {"object": obj or {"id": "pi_123", "object": "payment_intent"}},
+    }
+
+
+class FakeSession:
+    def __init__(self, inserted_id=None):
+        self.inserted_id = inserted_id
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar_one_or_none=lambda: self.inserted_id)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+class TestStoreWebhookEvent:
+    """Single-statement idempotent insert"""
+
+    @pytest.mark.asyncio
+    async def test_insert_on_conflict_do_nothing(self):
+        row_id = uuid4()
+        db = FakeSession(inserted_id=row_id)
+
+        assert await store_webhook_event(_event(), db) == row_id
+
+        (insert,) = db.statements
+        query = sql(insert)
+        assert "ON CONFLICT (stripe_event_id) DO NOTHING" in query
+        assert "RETURNING core.webhook_events.id" in query
+        assert insert.compile().params["ordering_key"] == "pi_123"
+        assert db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_notify_in_same_transaction(self):
+        db = FakeSession(inserted_id=uuid4())
+
+        await store_webhook_event(_event(), db, notify=True)
+
+        assert "pg_notify" in sql(db.statements[1])
+        assert db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_returns_none_without_notify(self):
+        db = FakeSession(inserted_id=None)
+
+        assert await store_webhook_event(_event(), db, notify=True) is None
+        assert len(db.statements) == 1
+
+
+class TestInlineMode:
+    """Inline events are leased to the request until their outcome is recorded"""
+
+    @staticmethod
+    def _request():
+        async def body():
+            return b"{}"
+
+        return SimpleNamespace(body=body, headers={"stripe-signature": "t=1,v1=x"})
+
+    @pytest.fixture
+    def inline_event(self, monkeypatch):
+        event = _event()
+        monkeypatch.setattr(settings, "STRIPE_WEBHOOK_ASYNC", False)
+        monkeypatch.setattr(stripe.Webhook, "construct_event", lambda *args: event)
+        return event
+
+    @pytest.mark.asyncio
+    async def test_stored_leased_to_request(self):
+        db = FakeSession(inserted_id=uuid4())
+
+        await store_webhook_event(_event(), db, lease_seconds=300)
+
+        (insert,) = db.statements
+        params = insert.compile().params
+        assert params["status"] == WebhookEventStatus.PROCESSING
+        assert params["claimed_by"] == webhooks.INLINE_CLAIMANT
+        assert "lease_expires_at" in sql(insert)
+
+    @pytest.mark.asyncio
+    async def test_processed_outcome_releases_lease(self, inline_event, monkeypatch):
+        async def dispatch_event(*args):
+            pass
+
+        monkeypatch.setattr(webhooks, "dispatch_event", dispatch_event)
+        db = FakeSession(inserted_id=uuid4())
+
+        response = await webhooks.webhook_handler(self._request(), db, stripe_service=None)
+
+        assert response.processed is True
+        outcome = db.statements[-1]
+        assert outcome.compile().params["status"] == WebhookEventStatus.PROCESSED
+        assert "core.webhook_events.claimed_by = " in sql(outcome)
+
+    @pytest.mark.asyncio
+    async def test_handler_failure_left_for_worker(self, inline_event, monkeypatch):
+        async def dispatch_event(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(webhooks, "dispatch_event", dispatch_event)
+        db = FakeSession(inserted_id=uuid4())
+
+        response = await webhooks.webhook_handler(self._request(), db, stripe_service=None)
+
+        assert response.processed is False
+        outcome, notify = db.statements[-2:]
+        params = outcome.compile().params
+        assert params["status"] == WebhookEventStatus.RECEIVED
+        assert params["retry_count"] == 1
+        assert params["processing_error"] == "boom"
+        assert "pg_notify" in sql(notify)
+
+    @pytest.mark.asyncio
+    async def test_crash_then_redelivery_is_recovered_by_worker(
+        self, inline_event, monkeypatch
+    ):
+        async def crash(*args):
+            raise asyncio.CancelledError()
+
+        monkeypatch.setattr(webhooks, "dispatch_event", crash)
+        db = FakeSession(inserted_id=uuid4())
+
+        with pytest.raises(asyncio.CancelledError):
+            await webhooks.webhook_handler(self._request(), db, stripe_service=None)
+
+        # Only the leased row was committed; no outcome was recorded
+        (insert,) = db.statements
+        assert insert.compile().params["status"] == WebhookEventStatus.PROCESSING
+        assert db.commits == 1
+
+        async def must_not_run(*args):
+            raise AssertionError("redelivery must not run the handlers twice")
+
+        monkeypatch.setattr(webhooks, "dispatch_event", must_not_run)
+        redelivery = FakeSession(inserted_id=None)
+
+        response = await webhooks.webhook_handler(
+            self._request(), redelivery, stripe_service=None
+        )
+
+        assert response.processed is False
+        # The worker reclaims the row once the inline lease expires
+        claimable = sql(StripeWebhookWorker(WorkerConfig())._claimable())
+        assert "core.webhook_events.lease_expires_at < now()" in claimable
+
+
+class TestOrderingKey:
+    """Events of one payment intent share a key"""
+
+    def test_payment_intent_related_objects(self):
+        assert webhook_ordering_key(_event()) == "pi_123"
+        charge = {"id": "ch_1", "object": "charge", "payment_intent": "pi_123"}
+        assert webhook_ordering_key(_event("charge.refunded", charge)) == "pi_123"
+
+    def test_other_objects_use_their_id(self):
+        customer = {"id": "cus_1", "object": "customer"}
+        assert webhook_ordering_key(_event("customer.updated", customer)) == "cus_1"
+
+    def test_stripe_event_converted_to_plain_dict(self):
+        event = stripe.Event.construct_from(_event(), "sk_test_x")
+
+        converted = event_to_dict(event)
+
+        assert type(converted["data"]["object"]) is dict
+        assert webhook_ordering_key(converted) == "pi_123"
+
+
+class TestAckFirst:
+    """The endpoint returns before any handler runs"""
+
+    @pytest.mark.asyncio
+    async def test_stored_and_acknowledged_without_processing(self, monkeypatch):
+        event = _event()
+        monkeypatch.setattr(settings, "STRIPE_WEBHOOK_ASYNC", True)
+        monkeypatch.setattr(stripe.Webhook, "construct_event", lambda *args: event)
+
+        async def dispatch_event(*args):
+            raise AssertionError("handlers must run in the worker")
+
+        monkeypatch.setattr(webhooks, "dispatch_event", dispatch_event)
+
+        async def body():
+            return b"{}"
+
+        request = SimpleNamespace(body=body, headers={"stripe-signature": "t=1,v1=x"})
+        db = FakeSession(inserted_id=uuid4())
+
+        response = await webhooks.webhook_handler(request, db, stripe_service=None)
+
+        assert response.received is True
+        assert response.processed is False
+        assert response.event_id == event["id"]
+        assert "pg_notify" in sql(db.statements[-1])
+
+
+class TestWorker:
+    """Claim query and retry bookkeeping"""
+
+    def test_claim_is_ordered_per_key_and_skips_locked_rows(self):
+        worker = StripeWebhookWorker(WorkerConfig(batch_size=50))
+
+        query = sql(worker._claimable())
+
+        assert "NOT (EXISTS (SELECT" in query
+        assert "webhook_events_1.ordering_key = core.webhook_events.ordering_key" in query
+        assert "coalesce(webhook_events_1.stripe_created, webhook_events_1.created_at)" in query
+
+    @pytest.mark.asyncio
+    async def test_claim_update_uses_skip_locked(self):
+        worker = StripeWebhookWorker(WorkerConfig(batch_size=50))
+
+        class ClaimSession(FakeSession):
+            async def execute(self, statement, params=None):
+                self.statements.append(statement)
+                return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+        db = ClaimSession()
+        await worker._claim_events(db)
+
+        query = sql(db.statements[0])
+        assert "FOR UPDATE SKIP LOCKED" in query
+        assert "claimed_by" in query
+
+    def test_retry_then_failed(self):
+        worker = StripeWebhookWorker(WorkerConfig(max_retries=3))
+
+        retry = worker._retry_values(SimpleNamespace(id=uuid4(), retry_count=0), "boom")
+        final = worker._retry_values(SimpleNamespace(id=uuid4(), retry_count=2), "boom")
+
+        assert retry["status"] == WebhookEventStatus.RECEIVED
+        assert retry["processing_error"] == "boom"
+        assert retry["next_retry_at"] is not None
+        assert final["status"] == WebhookEventStatus.FAILED
+        assert "error_message" not in final
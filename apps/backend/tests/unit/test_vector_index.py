@@ -0,0 +1,157 @@
+"""
+Unit Tests for the Semantic Cache Vector Index
+
+Verifies intent partitioning, expiry, float32 blob round-trips and that
+the IVF path finds the same near-duplicates as exact search, and that the
+semantic cache keeps each intent under max_embedding_cache.
+
+Run with: pytest tests/unit/test_vector_index.py -v
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from api.ai.cache.semantic_cache import CacheConfig, SemanticCache
+from api.ai.cache.vector_index import VectorIndex, pack_vector, unpack_vector
+
+DIM = 64
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(7).standard_normal((3000, DIM)).astype(np.float32)
+
+
+class TestVectorIndex:
+    """Exact and IVF search behaviour"""
+
+    def test_partitions_are_isolated(self, vectors):
+        index = VectorIndex()
+        expires = time.time() + 60
+        index.add("menu", "a", vectors[0], expires)
+        index.add("hours", "b", vectors[0], expires)
+
+        matches = index.search(vectors[0], partitions=["menu"], threshold=0.97)
+
+        assert [(m.partition, m.key) for m in matches] == [("menu", "a")]
+        assert len(index.search(vectors[0], threshold=0.97)) == 2
+
+    def test_expired_entries_are_dropped(self, vectors):
+        index = VectorIndex()
+        index.add("menu", "old", vectors[0], expires_at=100.0)
+
+        assert index.search(vectors[0], threshold=0.97, now=200.0) == []
+        assert index.partition_size("menu") == 0
+
+    def test_ivf_matches_exact_for_near_duplicates(self, vectors):
+        exact = VectorIndex(ivf_min_size=10**9)
+        ivf = VectorIndex(ivf_min_size=500, nprobe=4)
+        expires = time.time() + 60
+        for i, vec in enumerate(vectors):
+            exact.add("faq", f"k{i}", vec, expires)
+            ivf.add("faq", f"k{i}", vec, expires)
+
+        rng = np.random.default_rng(3)
+        for i in rng.choice(len(vectors), 50, replace=False):
+            query = vectors[i] + 0.05 * rng.standard_normal(DIM).astype(np.float32)
+            want = exact.search(query, threshold=0.97)
+            got = ivf.search(query, threshold=0.97)
+            assert [m.key for m in got] == [m.key for m in want] == [f"k{i}"]
+
+    def test_remove_and_replace(self, vectors):
+        index = VectorIndex(ivf_min_size=500)
+        expires = time.time() + 60
+        for i, vec in enumerate(vectors[:1000]):
+            index.add("faq", f"k{i}", vec, expires)
+
+        index.add("faq", "k1", vectors[2000], expires)  # Re-embed an existing key
+        assert index.remove("faq", "k2")
+
+        assert index.search(vectors[2000], threshold=0.97)[0].key == "k1"
+        assert index.search(vectors[2], threshold=0.97) == []
+        assert index.partition_size("faq") == 999
+
+
+def test_blob_round_trip(vectors):
+    vector, expires_at = unpack_vector(pack_vector(vectors[0].tolist(), 1234.5))
+
+    assert expires_at == 1234.5
+    assert vector.dtype == np.float32
+    np.testing.assert_array_equal(vector, vectors[0])
+
+
+class FakeRedis:
+    """Hashes, zsets and plain keys, with a recording pipeline."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+        self.keys = {}
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def hdel(self, key, *fields):
+        self.calls.append(lambda: [self.redis.hashes[key].pop(f, None) for f in fields])
+
+    def zrem(self, key, *members):
+        self.calls.append(lambda: [self.redis.zsets[key].pop(m, None) for m in members])
+
+    def delete(self, *keys):
+        self.calls.append(lambda: [self.redis.keys.pop(k, None) for k in keys])
+
+    async def execute(self):
+        return [call() for call in self.calls]
+
+
+class TestEmbeddingCap:
+    """Per-intent max_embedding_cache eviction"""
+
+    async def test_evicts_closest_to_expiry_down_to_ninety_percent(self, vectors):
+        redis = FakeRedis()
+        cache = SemanticCache(
+            redis_client=redis, config=CacheConfig(max_embedding_cache=10), index=VectorIndex()
+        )
+        now = time.time()
+        for i in range(12):
+            key, expires = f"k{i}", now + 100 + i
+            redis.hashes.setdefault("ai:cache:vectors:menu", {})[key] = pack_vector(
+                vectors[i].tolist(), expires
+            )
+            redis.zsets.setdefault("ai:cache:vectorlog:menu", {})[key] = i + 1
+            redis.keys[f"ai:cache:response:{key}"] = "{}"
+            redis.keys[f"ai:cache:metadata:{key}"] = "{}"
+            cache.index.add("menu", key, vectors[i], expires)
+
+        await cache._evict("menu", stored=12)
+
+        evicted = [f"k{i}" for i in range(3)]
+        kept = {f"k{i}" for i in range(3, 12)}
+        assert set(redis.hashes["ai:cache:vectors:menu"]) == kept
+        assert set(redis.zsets["ai:cache:vectorlog:menu"]) == kept
+        assert not any(f"ai:cache:response:{k}" in redis.keys for k in evicted)
+        assert not any(f"ai:cache:metadata:{k}" in redis.keys for k in evicted)
+        assert cache.index.partition_size("menu") == 9
+        assert cache.index.search(vectors[0], threshold=0.97) == []
+
+    async def test_no_eviction_when_others_already_trimmed(self, vectors):
+        redis = FakeRedis()
+        cache = SemanticCache(redis_client=redis, config=CacheConfig(max_embedding_cache=10))
+        redis.hashes["ai:cache:vectors:menu"] = {
+            f"k{i}": pack_vector(vectors[i].tolist(), time.time() + 60) for i in range(9)
+        }
+
+        await cache._evict("menu", stored=11)
+
+        assert len(redis.hashes["ai:cache:vectors:menu"]) == 9